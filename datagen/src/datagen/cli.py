@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
 from pathlib import Path
 
@@ -10,7 +11,8 @@ import click
 
 from datagen.engine import SimulationEngine
 from datagen.models import AthleteProfile
-from datagen.output import inject_to_api, write_json
+from datagen.output import COMPRESSIONS, inject_to_api, read_events, write_json
+from datagen.population import generate_population
 from datagen.presets import PRESETS
 
 
@@ -102,6 +104,101 @@ def generate(
             sys.exit(1)
 
 
+@main.command("generate-population")
+@click.option("--athletes", type=click.IntRange(min=1), required=True, help="Number of athletes to simulate.")
+@click.option("--days", type=click.IntRange(min=1), default=365, show_default=True, help="Days to simulate per athlete.")
+@click.option("--seed", type=int, default=0, show_default=True, help="Population seed; athlete i depends only on (seed, i).")
+@click.option(
+    "--preset", "presets",
+    type=click.Choice(list(PRESETS.keys())),
+    multiple=True,
+    help="Presets to derive athletes from (repeatable, default: all).",
+)
+@click.option(
+    "--workers", type=click.IntRange(min=1), default=None,
+    help="Worker processes (default: CPU count). Output does not depend on it.",
+)
+@click.option("--output", "-o", type=click.Path(path_type=Path), required=True, help="NDJSON output file.")
+@click.option(
+    "--compress", "compression",
+    type=click.Choice(list(COMPRESSIONS)),
+    default=None,
+    help="Output compression (default: gzip for *.gz, else none).",
+)
+@click.option("--novel-fields", is_flag=True, default=False, help="Inject novel/unknown fields for Phase 2 testing.")
+def generate_population_command(
+    athletes: int,
+    days: int,
+    seed: int,
+    presets: tuple[str, ...],
+    workers: int | None,
+    output: Path,
+    compression: str | None,
+    novel_fields: bool,
+):
+    """Generate seeded athlete variations as one NDJSON stream."""
+    if compression is None:
+        compression = "gzip" if output.suffix == ".gz" else "none"
+    workers = workers or os.cpu_count() or 1
+
+    click.echo(
+        f"Simulating {athletes} athletes for {days} days "
+        f"(seed={seed}, workers={workers}, compression={compression})..."
+    )
+    summary = generate_population(
+        output,
+        athletes=athletes,
+        days=days,
+        seed=seed,
+        presets=presets or None,
+        workers=workers,
+        compression=compression,
+        novel_fields=novel_fields,
+    )
+
+    click.echo(f"Wrote {summary.events} events for {summary.athletes} athletes to {output}")
+    for t, count in sorted(summary.event_types.items()):
+        click.echo(f"  {t}: {count}")
+
+
+@main.command("copy-to-postgres")
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--database-url", envvar="DATABASE_URL", required=True,
+    help="Postgres URL (superuser; defaults to $DATABASE_URL).",
+)
+@click.option("--user-id", type=str, help="User for events without an 'athlete' field (generate output).")
+@click.option("--skip-enqueue", is_flag=True, default=False, help="Do not create projection.update jobs.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=50_000, show_default=True, help="Events per COPY batch.")
+def copy_to_postgres(
+    input_path: Path,
+    database_url: str,
+    user_id: str | None,
+    skip_enqueue: bool,
+    batch_size: int,
+):
+    """Bulk-load a JSON/NDJSON event file into the events table via COPY."""
+    from datagen.pg_sink import copy_events
+
+    try:
+        result = copy_events(
+            database_url,
+            read_events(input_path),
+            user_id=user_id,
+            enqueue_jobs=not skip_enqueue,
+            batch_size=batch_size,
+        )
+    except (RuntimeError, ValueError) as exc:
+        click.echo(f"Error: {exc}", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"Loaded {result['inserted']} of {result['total']} events "
+        f"({result['duplicates']} duplicates) in {result['batches']} batches; "
+        f"enqueued {result['jobs']} jobs."
+    )
+
+
 @main.command("list-profiles")
 def list_profiles():
     """List available preset profiles."""
@@ -7,6 +7,7 @@ to produce a realistic, correlated stream of events.
 from __future__ import annotations
 
 import random
+from collections.abc import Iterator
 from datetime import timedelta
 
 from datagen.fatigue import (
@@ -47,14 +48,21 @@ class SimulationEngine:
 
         Returns a list of event dicts in chronological order.
         """
+        return list(self.iter_events(days))
+
+    def iter_events(self, days: int) -> Iterator[dict]:
+        """Yield the simulation's events in chronological order, day by day.
+
+        Only the athlete state is kept between days, so memory stays flat
+        for arbitrarily long simulations.
+        """
         state = AthleteState.from_profile(self.profile)
-        events: list[dict] = []
 
         # Day 0: onboarding events
-        events.extend(generate_profile_events(self.profile, state, 0))
-        events.extend(generate_goal_event(self.profile, state, 0))
-        events.extend(generate_training_plan(self.profile, state, 0))
-        events.extend(generate_target_events(self.profile, state, 0))
+        yield from generate_profile_events(self.profile, state, 0)
+        yield from generate_goal_event(self.profile, state, 0)
+        yield from generate_training_plan(self.profile, state, 0)
+        yield from generate_target_events(self.profile, state, 0)
 
         # Track yesterday's exercises for soreness generation
         yesterdays_exercises: list[str] | None = None
@@ -71,7 +79,7 @@ class SimulationEngine:
                 self.profile, state, self.rng, day_offset,
                 novel_fields=self.novel_fields,
             )
-            events.extend(sleep_events)
+            yield from sleep_events
 
             # Update sleep debt from generated sleep
             actual_sleep = sleep_events[0]["data"]["duration_hours"]
@@ -79,26 +87,22 @@ class SimulationEngine:
 
             # 2. Soreness (DOMS from yesterday's training)
             if yesterdays_exercises:
-                events.extend(
-                    generate_soreness(
-                        self.profile, state, self.rng, day_offset,
-                        trained_exercises_yesterday=yesterdays_exercises,
-                    )
+                yield from generate_soreness(
+                    self.profile, state, self.rng, day_offset,
+                    trained_exercises_yesterday=yesterdays_exercises,
                 )
 
             # 3. Energy
-            events.extend(
-                generate_energy(
-                    self.profile, state, self.rng, day_offset, is_training,
-                    novel_fields=self.novel_fields,
-                )
+            yield from generate_energy(
+                self.profile, state, self.rng, day_offset, is_training,
+                novel_fields=self.novel_fields,
             )
 
             # 4. Bodyweight (daily)
-            events.extend(generate_bodyweight(self.profile, state, self.rng, day_offset))
+            yield from generate_bodyweight(self.profile, state, self.rng, day_offset)
 
             # 5. Measurements (periodic)
-            events.extend(generate_measurements(self.profile, state, self.rng, day_offset))
+            yield from generate_measurements(self.profile, state, self.rng, day_offset)
 
             # 6. Training (if scheduled)
             if is_training:
@@ -108,7 +112,7 @@ class SimulationEngine:
                     self.profile, state, fatigue_snap, self.rng, day_offset,
                     novel_fields=self.novel_fields,
                 )
-                events.extend(training_events)
+                yield from training_events
 
                 # Update fatigue from training
                 total_sets = getattr(state, "_session_total_sets", 0)
@@ -124,24 +128,20 @@ class SimulationEngine:
                 if self.novel_fields:
                     from datagen.generators.novel_fields import generate_cardio
 
-                    events.extend(
-                        generate_cardio(self.profile, state, self.rng, day_offset)
-                    )
+                    yield from generate_cardio(self.profile, state, self.rng, day_offset)
 
             # 7. Nutrition (every day)
             nutrition_events, total_cals = generate_nutrition(
                 self.profile, state, self.rng, day_offset, is_training,
                 novel_fields=self.novel_fields,
             )
-            events.extend(nutrition_events)
+            yield from nutrition_events
 
             # 7b. Supplements (orphaned event type — no handler)
             if self.novel_fields:
                 from datagen.generators.novel_fields import generate_supplements
 
-                events.extend(
-                    generate_supplements(self.profile, state, self.rng, day_offset)
-                )
+                yield from generate_supplements(self.profile, state, self.rng, day_offset)
 
             # 8. Update bodyweight trend from nutrition
             update_bodyweight_trend(state, self.profile.calorie_target, total_cals)
@@ -154,15 +154,13 @@ class SimulationEngine:
             ):
                 # Pick affected area from current soreness
                 affected = max(state.soreness, key=state.soreness.get) if state.soreness else "lower_back"
-                events.extend(generate_injury_event(self.profile, state, day_offset, affected))
+                yield from generate_injury_event(self.profile, state, day_offset, affected)
                 injury_triggered = True
 
             # 10. Weekly 1RM progression
             if state.day.weekday() == 6:  # Sunday: weekly progression
                 self._apply_weekly_progression(state)
 
-        return events
-
     def _is_training_day(self, state: AthleteState) -> bool:
         """Determine if today is a training day based on the weekly schedule."""
         weekday = state.day.weekday()  # 0=Monday
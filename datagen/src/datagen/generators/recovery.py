@@ -98,7 +98,8 @@ def generate_soreness(
     # Get muscle groups hit yesterday
     groups = muscle_groups_for_exercises(trained_exercises_yesterday)
 
-    for group in groups:
+    # Sorted: set order follows str hashing, which varies per process.
+    for group in sorted(groups):
         # Base severity from volume (more sets = more sore)
         base_severity = rng.uniform(3.0, 6.0)
 
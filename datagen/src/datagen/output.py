@@ -1,4 +1,4 @@
-"""Output handlers — JSON file and API injection.
+"""Output handlers — JSON file, NDJSON streams and API injection.
 
 Generators produce events in a flat format:
     {"event_type", "data", "occurred_at", "idempotency_key"}
@@ -11,9 +11,12 @@ to_api_format() handles the conversion.
 
 from __future__ import annotations
 
+import gzip
 import json
 import time
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import IO
 
 import httpx
 
@@ -45,6 +48,71 @@ def write_json(events: list[dict], output_path: str | Path) -> int:
     return len(events)
 
 
+COMPRESSIONS = ("none", "gzip")
+
+
+class _OwnedGzipFile(gzip.GzipFile):
+    """GzipFile that also closes the raw file object it writes to."""
+
+    def __init__(self, raw: IO[bytes]) -> None:
+        # Empty name and zero mtime keep the member header byte-stable.
+        super().__init__(filename="", mode="wb", fileobj=raw, mtime=0)
+        self._raw = raw
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+def ndjson_line(event: dict) -> bytes:
+    """One compact NDJSON line (UTF-8, newline-terminated) for an event."""
+    return (json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def open_ndjson(path: str | Path, compression: str = "none") -> IO[bytes]:
+    """Open ``path`` for binary NDJSON writing.
+
+    gzip output is written with a zeroed header timestamp and no file name,
+    so identical events always produce identical bytes.
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if compression == "gzip":
+        return _OwnedGzipFile(open(path, "wb"))
+    return open(path, "wb")
+
+
+def write_ndjson(events: Iterable[dict], fp: IO[bytes]) -> int:
+    """Stream events to ``fp`` as NDJSON. Returns the number of events written."""
+    n = 0
+    for event in events:
+        fp.write(ndjson_line(event))
+        n += 1
+    return n
+
+
+def read_events(path: str | Path) -> Iterator[dict]:
+    """Stream events back from a write_json array or (gzipped) NDJSON file."""
+    path = Path(path)
+    with path.open("rb") as raw:
+        compressed = raw.read(2) == b"\x1f\x8b"
+    opener = gzip.open if compressed else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        if first == "[":
+            f.seek(0)
+            yield from json.load(f)
+            return
+        f.seek(0)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
 def inject_to_api(
     events: list[dict],
     base_url: str,
@@ -0,0 +1,222 @@
+"""Postgres sink — bulk-load generated events with binary COPY.
+
+For load-test fixtures at millions of events, where inject_to_api's HTTP
+batches are far too slow. Events are streamed in batches into a temporary
+staging table with binary COPY, then moved into ``events`` with one
+``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` per batch, so the API's
+idempotency keys (unique per user) still make re-runs no-ops.
+
+The load runs with ``session_replication_role = replica``, which skips the
+per-row ``trg_enqueue_event_job`` trigger (and its per-row NOTIFY). When
+jobs are wanted they are written set-based from the rows actually inserted,
+with the payload the trigger would have produced, followed by a single
+``pg_notify('kura_jobs')`` per batch. Setting that parameter needs a
+superuser (or an explicit ``GRANT SET``), i.e. a local or CI database.
+
+Requires psycopg (installed with the workers package), imported lazily so
+the rest of datagen keeps its small dependency set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from datagen.output import to_api_format
+
+# Namespace for deterministic datagen user ids (uuid5 of the athlete name).
+DATAGEN_USER_NAMESPACE = uuid.UUID("6f1c3f0e-5d1b-4c55-9d8e-2a4f7b0c9e11")
+
+_STAGE_TABLE = "datagen_events_stage"
+
+
+def datagen_user_id(athlete: str) -> uuid.UUID:
+    """Stable user id for a generated athlete."""
+    return uuid.uuid5(DATAGEN_USER_NAMESPACE, f"datagen:{athlete}")
+
+
+def datagen_event_id(user_id: uuid.UUID, timestamp: datetime, idempotency_key: str) -> uuid.UUID:
+    """Deterministic UUIDv7-layout id: event time in ms, then hashed key bits.
+
+    Ids sort by event time like the API's UUIDv7 ids, and re-loading the same
+    fixture yields the same ids.
+    """
+    ms = int(timestamp.timestamp() * 1000) & ((1 << 48) - 1)
+    digest = hashlib.sha256(f"{user_id}:{idempotency_key}".encode("utf-8")).digest()
+    rand = int.from_bytes(digest[:10], "big")
+    rand_a = rand >> 68  # 12 bits
+    rand_b = rand & ((1 << 62) - 1)
+    value = (ms << 80) | (0x7 << 76) | (rand_a << 64) | (0b10 << 62) | rand_b
+    return uuid.UUID(int=value)
+
+
+def _staged_rows(
+    events: Iterable[dict],
+    default_user_id: uuid.UUID | None,
+) -> Iterator[tuple[uuid.UUID, uuid.UUID, datetime, str, dict, dict, str | None]]:
+    for event in events:
+        athlete = event.get("athlete")
+        if athlete:
+            user_id = datagen_user_id(athlete)
+        elif default_user_id is not None:
+            user_id = default_user_id
+        else:
+            raise ValueError("Event has no 'athlete' and no user_id was given")
+        api_event = to_api_format(event)
+        timestamp = datetime.fromisoformat(api_event["timestamp"])
+        key = api_event["metadata"]["idempotency_key"]
+        yield (
+            datagen_event_id(user_id, timestamp, key),
+            user_id,
+            timestamp,
+            api_event["event_type"],
+            api_event["data"],
+            api_event["metadata"],
+            athlete,
+        )
+
+
+def _ensure_users(cur: Any, users: dict[uuid.UUID, str]) -> None:
+    cur.execute(
+        """
+        INSERT INTO users (id, email, password_hash, display_name)
+        SELECT t.id, t.email, '!datagen', t.display_name
+        FROM unnest(%s::uuid[], %s::text[], %s::text[]) AS t(id, email, display_name)
+        ON CONFLICT DO NOTHING
+        """,
+        (
+            list(users),
+            [f"{name}@datagen.invalid" for name in users.values()],
+            list(users.values()),
+        ),
+    )
+
+
+def _load_batch(
+    conn: Any,
+    rows: list[tuple],
+    *,
+    enqueue_jobs: bool,
+) -> tuple[int, int]:
+    """Stage, insert and (optionally) enqueue one batch. Returns (inserted, jobs)."""
+    users = {row[1]: row[6] or str(row[1]) for row in rows}
+    with conn.transaction(), conn.cursor() as cur:
+        _ensure_users(cur, users)
+        with cur.copy(
+            f"COPY {_STAGE_TABLE} (id, user_id, timestamp, event_type, data, metadata) "
+            "FROM STDIN (FORMAT BINARY)"
+        ) as copy:
+            copy.set_types(["uuid", "uuid", "timestamptz", "text", "jsonb", "jsonb"])
+            for row in rows:
+                copy.write_row(row[:6])
+
+        jobs_sql = (
+            """
+            , jobs AS (
+                INSERT INTO background_jobs (user_id, job_type, payload)
+                SELECT user_id, 'projection.update',
+                       jsonb_build_object(
+                           'event_id', id,
+                           'event_type', event_type,
+                           'user_id', user_id
+                       )
+                FROM inserted
+                ORDER BY timestamp, id
+                RETURNING 1
+            )
+            """
+            if enqueue_jobs
+            else ""
+        )
+        jobs_count = "(SELECT count(*) FROM jobs)" if enqueue_jobs else "0"
+        # The replica role also skips trg_record_event_retraction, so
+        # retractions are recorded here the way the trigger would.
+        cur.execute(
+            f"""
+            WITH inserted AS (
+                INSERT INTO events (id, user_id, timestamp, event_type, data, metadata)
+                SELECT id, user_id, timestamp, event_type, data, metadata
+                FROM {_STAGE_TABLE}
+                ON CONFLICT DO NOTHING
+                RETURNING id, user_id, timestamp, event_type, data
+            ), retractions AS (
+                INSERT INTO event_retractions (retracted_event_id, user_id, retracted_at)
+                SELECT (data->>'retracted_event_id')::uuid, user_id, timestamp
+                FROM inserted
+                WHERE event_type = 'event.retracted'
+                  AND data->>'retracted_event_id'
+                      ~* '^[0-9a-f]{{8}}-[0-9a-f]{{4}}-[0-9a-f]{{4}}-[0-9a-f]{{4}}-[0-9a-f]{{12}}$'
+                ON CONFLICT (retracted_event_id) DO NOTHING
+                RETURNING 1
+            ){jobs_sql}
+            SELECT (SELECT count(*) FROM inserted) AS inserted, {jobs_count} AS jobs
+            """
+        )
+        inserted, jobs = cur.fetchone()
+        if enqueue_jobs and jobs:
+            cur.execute("SELECT pg_notify('kura_jobs', 'datagen')")
+    return int(inserted), int(jobs)
+
+
+def copy_events(
+    database_url: str,
+    events: Iterable[dict],
+    *,
+    user_id: uuid.UUID | str | None = None,
+    enqueue_jobs: bool = True,
+    batch_size: int = 50_000,
+) -> dict:
+    """Bulk-load events into the ``events`` table of ``database_url``.
+
+    Events carrying an ``athlete`` field (generate-population output) go to
+    that athlete's deterministic user, created on demand; others go to
+    ``user_id``. Events whose (user, idempotency_key) already exists are
+    skipped. With ``enqueue_jobs=False`` no projection.update jobs are
+    created, so a benchmark can seed the queue separately.
+
+    Returns summary: {"total", "inserted", "duplicates", "jobs", "batches"}
+    """
+    try:
+        import psycopg
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "The Postgres sink needs psycopg (pip install 'psycopg[binary]')"
+        ) from exc
+
+    default_user_id = uuid.UUID(str(user_id)) if user_id is not None else None
+    rows = _staged_rows(events, default_user_id)
+    summary = {"total": 0, "inserted": 0, "duplicates": 0, "jobs": 0, "batches": 0}
+
+    with psycopg.connect(database_url) as conn:
+        conn.execute(
+            f"""
+            CREATE TEMP TABLE IF NOT EXISTS {_STAGE_TABLE} (
+                id          UUID NOT NULL,
+                user_id     UUID NOT NULL,
+                timestamp   TIMESTAMPTZ NOT NULL,
+                event_type  TEXT NOT NULL,
+                data        JSONB NOT NULL,
+                metadata    JSONB NOT NULL
+            ) ON COMMIT DELETE ROWS
+            """
+        )
+        conn.execute("SET session_replication_role = replica")
+        conn.commit()
+        try:
+            while batch := list(itertools.islice(rows, max(1, batch_size))):
+                inserted, jobs = _load_batch(conn, batch, enqueue_jobs=enqueue_jobs)
+                summary["total"] += len(batch)
+                summary["inserted"] += inserted
+                summary["duplicates"] += len(batch) - inserted
+                summary["jobs"] += jobs
+                summary["batches"] += 1
+        finally:
+            conn.rollback()
+            conn.execute("RESET session_replication_role")
+            conn.commit()
+
+    return summary
@@ -0,0 +1,151 @@
+"""Population-scale generation — many seeded athletes, streamed as NDJSON.
+
+Athlete ``i`` of a population is a variation of one of the presets, derived
+only from (seed, i). Each athlete is simulated by a worker process straight
+into its own shard file; the parent appends finished shards to the output
+in athlete order. Shards are independent gzip members when compressing, so
+the concatenation is a valid gzip stream. Output is therefore byte-identical
+for a given seed whatever the worker count, and memory per worker is bounded
+by one simulated day.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+import tempfile
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from pathlib import Path
+from typing import IO
+
+from datagen.engine import SimulationEngine
+from datagen.models import AthleteProfile
+from datagen.output import open_ndjson, write_ndjson
+from datagen.presets import PRESETS
+
+
+def _jitter(rng: random.Random, value: float, spread: float) -> float:
+    return round(value * rng.uniform(1.0 - spread, 1.0 + spread), 1)
+
+
+def population_profile(
+    index: int,
+    *,
+    seed: int,
+    presets: Sequence[str] | None = None,
+) -> AthleteProfile:
+    """The ``index``-th athlete of the population for ``seed``.
+
+    Presets are cycled in order; bodyweight, strength, schedule, sleep,
+    nutrition, progression and start date are varied around the preset.
+    """
+    names = list(presets) if presets else list(PRESETS)
+    base = PRESETS[names[index % len(names)]]
+    rng = random.Random(f"kura-population:{seed}:{index}")
+
+    training_days = base.training_days_per_week + rng.choice((-1, 0, 0, 1))
+    return replace(
+        base,
+        name=f"{base.name}-s{seed}-{index:06d}",
+        bodyweight_kg=_jitter(rng, base.bodyweight_kg, 0.10),
+        training_days_per_week=min(6, max(3, training_days)),
+        squat_1rm_kg=_jitter(rng, base.squat_1rm_kg, 0.15),
+        bench_1rm_kg=_jitter(rng, base.bench_1rm_kg, 0.15),
+        deadlift_1rm_kg=_jitter(rng, base.deadlift_1rm_kg, 0.15),
+        ohp_1rm_kg=_jitter(rng, base.ohp_1rm_kg, 0.15),
+        sleep_avg_hours=round(min(9.5, max(5.5, base.sleep_avg_hours + rng.gauss(0, 0.4))), 2),
+        sleep_std_hours=round(max(0.3, base.sleep_std_hours * rng.uniform(0.7, 1.3)), 2),
+        calorie_target=int(round(base.calorie_target * rng.uniform(0.9, 1.1), -1)),
+        protein_target_g=int(round(base.protein_target_g * rng.uniform(0.9, 1.1))),
+        progression_rate=round(base.progression_rate * rng.uniform(0.7, 1.3), 5),
+        start_date=base.start_date - timedelta(days=rng.randrange(28)),
+        seed=rng.getrandbits(31),
+    )
+
+
+def athlete_events(
+    profile: AthleteProfile,
+    days: int,
+    *,
+    novel_fields: bool = False,
+) -> Iterator[dict]:
+    """Events of one athlete, tagged with ``athlete`` (the profile name)."""
+    engine = SimulationEngine(profile, novel_fields=novel_fields)
+    for event in engine.iter_events(days):
+        yield {"athlete": profile.name, **event}
+
+
+@dataclass
+class PopulationSummary:
+    athletes: int = 0
+    events: int = 0
+    event_types: dict[str, int] = field(default_factory=dict)
+
+
+def _write_shard(
+    args: tuple[int, int, int, tuple[str, ...], bool, str, str],
+) -> tuple[str, int, dict[str, int]]:
+    index, seed, days, presets, novel_fields, compression, shard_dir = args
+    profile = population_profile(index, seed=seed, presets=presets)
+    path = os.path.join(shard_dir, f"athlete-{index:06d}.ndjson")
+    type_counts: dict[str, int] = {}
+
+    def counted() -> Iterator[dict]:
+        for event in athlete_events(profile, days, novel_fields=novel_fields):
+            type_counts[event["event_type"]] = type_counts.get(event["event_type"], 0) + 1
+            yield event
+
+    with open_ndjson(path, compression) as fp:
+        n = write_ndjson(counted(), fp)
+    return path, n, type_counts
+
+
+def generate_population(
+    output: str | Path,
+    *,
+    athletes: int,
+    days: int,
+    seed: int = 0,
+    presets: Sequence[str] | None = None,
+    workers: int = 1,
+    compression: str = "none",
+    novel_fields: bool = False,
+) -> PopulationSummary:
+    """Simulate ``athletes`` athletes for ``days`` days into one NDJSON file."""
+    output = Path(output)
+    preset_names = tuple(presets) if presets else tuple(PRESETS)
+    summary = PopulationSummary()
+
+    with tempfile.TemporaryDirectory(prefix=".datagen-", dir=output.parent or None) as shard_dir:
+        tasks = (
+            (index, seed, days, preset_names, novel_fields, compression, shard_dir)
+            for index in range(athletes)
+        )
+        with output.open("wb") as out:
+            if workers <= 1:
+                _append_shards(out, map(_write_shard, tasks), summary)
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    _append_shards(out, pool.map(_write_shard, tasks), summary)
+
+    return summary
+
+
+def _append_shards(
+    out: IO[bytes],
+    shards: Iterator[tuple[str, int, dict[str, int]]],
+    summary: PopulationSummary,
+) -> None:
+    # map() yields in submission (= athlete) order, which fixes the output order.
+    for path, n, type_counts in shards:
+        with open(path, "rb") as shard:
+            shutil.copyfileobj(shard, out)
+        os.remove(path)
+        summary.athletes += 1
+        summary.events += n
+        for event_type, count in type_counts.items():
+            summary.event_types[event_type] = summary.event_types.get(event_type, 0) + count
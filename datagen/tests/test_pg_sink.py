@@ -0,0 +1,73 @@
+"""Tests for the Postgres COPY sink helpers (no database required)."""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from datagen.output import open_ndjson, read_events, write_json, write_ndjson
+from datagen.pg_sink import _staged_rows, datagen_event_id, datagen_user_id
+from datagen.population import athlete_events, population_profile
+
+
+class TestIds:
+    def test_user_id_is_stable_per_athlete(self):
+        assert datagen_user_id("a") == datagen_user_id("a")
+        assert datagen_user_id("a") != datagen_user_id("b")
+
+    def test_event_id_is_uuid7_ordered_by_time(self):
+        user_id = datagen_user_id("a")
+        t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        first = datagen_event_id(user_id, t0, "k1")
+        later = datagen_event_id(user_id, t0 + timedelta(milliseconds=1), "k0")
+
+        assert first.version == 7
+        assert first.variant == uuid.RFC_4122
+        assert first < later
+        assert datagen_event_id(user_id, t0, "k1") == first
+        assert datagen_event_id(user_id, t0, "k2") != first
+
+
+class TestStagedRows:
+    def test_population_events_map_to_athlete_users(self):
+        profile = population_profile(0, seed=0)
+        events = list(athlete_events(profile, 2))
+        rows = list(_staged_rows(events, None))
+
+        assert len(rows) == len(events)
+        assert {row[1] for row in rows} == {datagen_user_id(profile.name)}
+        event_id, _, timestamp, event_type, data, metadata, athlete = rows[0]
+        assert event_type == events[0]["event_type"]
+        assert data == events[0]["data"]
+        assert metadata["idempotency_key"] == events[0]["idempotency_key"]
+        assert metadata["source"] == "datagen"
+        assert timestamp.tzinfo is not None
+        assert athlete == profile.name
+
+    def test_plain_events_need_a_user_id(self):
+        event = {
+            "event_type": "sleep.logged",
+            "data": {},
+            "occurred_at": "2026-01-01T08:00:00+00:00",
+            "idempotency_key": "k",
+        }
+        with pytest.raises(ValueError):
+            list(_staged_rows([event], None))
+        user_id = uuid.uuid4()
+        assert next(_staged_rows([event], user_id))[1] == user_id
+
+
+class TestReadEvents:
+    def test_reads_json_array_and_ndjson(self, tmp_path):
+        events = list(athlete_events(population_profile(1, seed=0), 2))
+
+        array_path = tmp_path / "events.json"
+        write_json(events, array_path)
+        assert list(read_events(array_path)) == events
+
+        for name, compression in (("events.ndjson", "none"), ("events.ndjson.gz", "gzip")):
+            path = tmp_path / name
+            with open_ndjson(path, compression) as fp:
+                write_ndjson(events, fp)
+            assert list(read_events(path)) == json.loads(json.dumps(events))
@@ -0,0 +1,81 @@
+"""Tests for population-scale generation."""
+
+import gzip
+import json
+
+from datagen.engine import SimulationEngine
+from datagen.population import athlete_events, generate_population, population_profile
+from datagen.presets import INTERMEDIATE, PRESETS
+
+
+class TestPopulationProfile:
+    def test_same_seed_and_index_same_profile(self):
+        assert population_profile(7, seed=1) == population_profile(7, seed=1)
+
+    def test_variations_are_distinct_and_cycle_presets(self):
+        profiles = [population_profile(i, seed=1) for i in range(6)]
+        assert len({p.name for p in profiles}) == 6
+        assert len({p.seed for p in profiles}) == 6
+        assert [p.experience_level for p in profiles[:3]] == list(PRESETS)
+
+    def test_variations_stay_plausible(self):
+        for i in range(30):
+            p = population_profile(i, seed=3)
+            assert 3 <= p.training_days_per_week <= 6
+            assert 5.5 <= p.sleep_avg_hours <= 9.5
+            assert p.squat_1rm_kg > 0
+
+    def test_preset_filter(self):
+        profiles = [population_profile(i, seed=1, presets=["advanced"]) for i in range(3)]
+        assert {p.experience_level for p in profiles} == {"advanced"}
+
+
+class TestStreaming:
+    def test_iter_events_matches_run(self):
+        engine_events = SimulationEngine(INTERMEDIATE).run(days=21)
+        assert list(SimulationEngine(INTERMEDIATE).iter_events(21)) == engine_events
+
+    def test_athlete_events_are_tagged(self):
+        profile = population_profile(0, seed=0)
+        events = list(athlete_events(profile, 3))
+        assert events
+        assert {e["athlete"] for e in events} == {profile.name}
+
+    def test_idempotency_keys_unique_across_athletes(self):
+        keys = [
+            e["idempotency_key"]
+            for i in range(3)
+            for e in athlete_events(population_profile(i, seed=0), 10)
+        ]
+        assert len(keys) == len(set(keys))
+
+
+class TestGeneratePopulation:
+    def test_output_independent_of_worker_count(self, tmp_path):
+        single = tmp_path / "single.ndjson.gz"
+        pooled = tmp_path / "pooled.ndjson.gz"
+        a = generate_population(single, athletes=4, days=5, seed=9, workers=1, compression="gzip")
+        b = generate_population(pooled, athletes=4, days=5, seed=9, workers=3, compression="gzip")
+
+        assert single.read_bytes() == pooled.read_bytes()
+        assert a == b
+        assert sorted(tmp_path.iterdir()) == [pooled, single]
+
+    def test_ndjson_lines_in_athlete_order(self, tmp_path):
+        out = tmp_path / "population.ndjson.gz"
+        summary = generate_population(out, athletes=3, days=4, seed=2, compression="gzip")
+
+        with gzip.open(out, "rt", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+
+        assert len(rows) == summary.events
+        assert sum(summary.event_types.values()) == summary.events
+        athletes = list(dict.fromkeys(row["athlete"] for row in rows))
+        assert athletes == [population_profile(i, seed=2).name for i in range(3)]
+
+    def test_uncompressed_output(self, tmp_path):
+        out = tmp_path / "population.ndjson"
+        summary = generate_population(out, athletes=2, days=2, seed=0)
+        lines = out.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == summary.events
+        assert json.loads(lines[0])["athlete"] == population_profile(0, seed=0).name
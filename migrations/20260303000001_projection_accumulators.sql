@@ -0,0 +1,21 @@
+-- Worker-side accumulator state for incremental projection updates.
+--
+-- Projections that are a left fold over a user's events (exercise_progression)
+-- persist their compact fold state here, next to the projection row. Append-
+-- only events are folded in O(1) instead of replaying the full history; any
+-- correction/retraction/alias change triggers a full replay that rewrites the
+-- state. Rows are internal to the worker and never exposed through the API.
+
+CREATE TABLE IF NOT EXISTS projection_accumulators (
+    user_id         UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    projection_type TEXT NOT NULL,
+    key             TEXT NOT NULL,
+    state           JSONB NOT NULL DEFAULT '{}',
+    last_event_id   UUID,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, projection_type, key)
+);
+
+ALTER TABLE projection_accumulators ENABLE ROW LEVEL SECURITY;
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON projection_accumulators TO app_worker;
@@ -0,0 +1,99 @@
+-- Indexed side table of retracted event ids.
+--
+-- Retraction filters used to probe data->>'retracted_event_id' on every
+-- event.retracted row of the global events table (a JSONB expression scan,
+-- repeated per candidate row in NOT EXISTS sub-queries). event_retractions
+-- keeps one row per retracted event, maintained in the same transaction as
+-- the event.retracted insert, so filters become a primary-key anti-join.
+-- retracted_at is the timestamp of the retracting event.
+
+CREATE TABLE IF NOT EXISTS event_retractions (
+    retracted_event_id  UUID PRIMARY KEY,
+    user_id             UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    retracted_at        TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_event_retractions_user
+    ON event_retractions (user_id);
+
+CREATE INDEX IF NOT EXISTS idx_event_retractions_retracted_at
+    ON event_retractions (retracted_at);
+
+ALTER TABLE event_retractions ENABLE ROW LEVEL SECURITY;
+
+-- The trigger below runs as the inserting role, and app_writer does not
+-- bypass RLS; without a policy every event.retracted write would be rejected.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_policies
+        WHERE schemaname = 'public'
+          AND tablename = 'event_retractions'
+          AND policyname = 'internal_access'
+    ) THEN
+        CREATE POLICY internal_access ON public.event_retractions
+            FOR ALL TO app_writer, app_worker
+            USING (true) WITH CHECK (true);
+    END IF;
+END $$;
+
+GRANT SELECT ON event_retractions TO app_worker;
+
+-- ────────────────────────────────────────────
+-- Trigger: record retractions on event INSERT
+-- ────────────────────────────────────────────
+
+-- Runs with the inserting role's privileges (app_writer for the API and for
+-- compensating events written by quality_health), like fn_enqueue_event_job;
+-- the internal_access policy above admits those inserts under RLS.
+GRANT INSERT ON event_retractions TO app_writer;
+GRANT INSERT ON event_retractions TO app_worker;
+
+CREATE OR REPLACE FUNCTION fn_record_event_retraction()
+RETURNS TRIGGER AS $$
+DECLARE
+    target TEXT := NEW.data->>'retracted_event_id';
+BEGIN
+    -- Malformed targets are ignored rather than failing the event write;
+    -- the API already rejects them.
+    IF target ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$' THEN
+        INSERT INTO event_retractions (retracted_event_id, user_id, retracted_at)
+        VALUES (target::UUID, NEW.user_id, NEW.timestamp)
+        ON CONFLICT (retracted_event_id) DO NOTHING;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+SET search_path = public, pg_temp;
+
+DROP TRIGGER IF EXISTS trg_record_event_retraction ON events;
+
+CREATE TRIGGER trg_record_event_retraction
+    AFTER INSERT ON events
+    FOR EACH ROW
+    WHEN (NEW.event_type = 'event.retracted')
+    EXECUTE FUNCTION fn_record_event_retraction();
+
+-- ────────────────────────────────────────────
+-- Backfill existing retractions (earliest retraction wins)
+-- ────────────────────────────────────────────
+
+INSERT INTO event_retractions (retracted_event_id, user_id, retracted_at)
+SELECT DISTINCT ON (target_id)
+    target_id,
+    user_id,
+    timestamp
+FROM (
+    SELECT
+        (data->>'retracted_event_id')::UUID AS target_id,
+        user_id,
+        timestamp,
+        id
+    FROM events
+    WHERE event_type = 'event.retracted'
+      AND data->>'retracted_event_id'
+          ~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+) AS retractions
+ORDER BY target_id, timestamp ASC, id ASC
+ON CONFLICT (retracted_event_id) DO NOTHING;
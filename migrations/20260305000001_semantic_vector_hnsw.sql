@@ -0,0 +1,35 @@
+-- HNSW indexes for pgvector-backed semantic matching.
+--
+-- semantic_memory now pushes top-k cosine search into Postgres whenever
+-- semantic_catalog_embeddings.embedding_vec exists. The IVFFlat indexes of
+-- the foundation migration were built on empty tables with lists = 100,
+-- which recalls poorly until they are rebuilt on real data; HNSW needs no
+-- training step. Servers with pgvector < 0.5 (no HNSW) keep IVFFlat, and
+-- servers without pgvector keep matching in-process.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
+        RAISE NOTICE 'pgvector extension unavailable; semantic matching stays in-process';
+        RETURN;
+    END IF;
+
+    ALTER TABLE semantic_catalog_embeddings
+        ADD COLUMN IF NOT EXISTS embedding_vec vector(384);
+    ALTER TABLE semantic_user_embeddings
+        ADD COLUMN IF NOT EXISTS embedding_vec vector(384);
+
+    BEGIN
+        DROP INDEX IF EXISTS idx_semantic_catalog_embeddings_vec;
+        CREATE INDEX idx_semantic_catalog_embeddings_vec
+            ON semantic_catalog_embeddings USING hnsw (embedding_vec vector_cosine_ops);
+
+        DROP INDEX IF EXISTS idx_semantic_user_embeddings_vec;
+        CREATE INDEX idx_semantic_user_embeddings_vec
+            ON semantic_user_embeddings USING hnsw (embedding_vec vector_cosine_ops);
+    EXCEPTION
+        WHEN undefined_object THEN
+            RAISE NOTICE 'pgvector without HNSW support; keeping IVFFlat indexes';
+    END;
+END
+$$;
@@ -0,0 +1,39 @@
+-- Content hashes for an idempotent semantic catalog bootstrap.
+--
+-- Every worker start used to re-upsert the whole seed catalog and re-embed
+-- it. semantic_catalog_state keeps one hash of the seed entries plus the
+-- embedding provider descriptor per model, so an unchanged catalog costs a
+-- single lookup. content_hash on each catalog embedding lets a changed
+-- catalog re-embed only the entries whose embedding text moved.
+
+ALTER TABLE semantic_catalog_embeddings
+    ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE TABLE IF NOT EXISTS semantic_catalog_state (
+    model           TEXT PRIMARY KEY,
+    catalog_hash    TEXT NOT NULL,
+    entries         INT NOT NULL CHECK (entries >= 0),
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE semantic_catalog_state ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_policies
+        WHERE schemaname = 'public'
+          AND tablename = 'semantic_catalog_state'
+          AND policyname = 'internal_access'
+    ) THEN
+        CREATE POLICY internal_access ON public.semantic_catalog_state
+            FOR ALL TO app_reader, app_writer, app_worker
+            USING (true) WITH CHECK (true);
+    END IF;
+END $$;
+
+GRANT SELECT ON semantic_catalog_state TO app_reader;
+GRANT SELECT ON semantic_catalog_state TO app_writer;
+GRANT SELECT, INSERT, UPDATE, DELETE ON semantic_catalog_state TO app_worker;
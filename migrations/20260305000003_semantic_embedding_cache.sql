@@ -0,0 +1,38 @@
+-- Global content-addressed cache of term embeddings.
+--
+-- The same term text ("bench press", "haferflocken") used to be embedded
+-- again for every user who typed it. semantic_embedding_cache stores one
+-- vector per (model, content_hash), where content_hash covers the provider
+-- descriptor and the normalized term text. The text itself is not stored:
+-- terms are user input, and the per-user copies in semantic_user_embeddings
+-- stay behind their user-isolation policies. Only the worker reads or
+-- writes this table.
+
+CREATE TABLE IF NOT EXISTS semantic_embedding_cache (
+    model           TEXT NOT NULL,
+    content_hash    TEXT NOT NULL,
+    provider        TEXT NOT NULL,
+    dimensions      INT NOT NULL CHECK (dimensions > 0),
+    embedding       JSONB NOT NULL,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (model, content_hash)
+);
+
+ALTER TABLE semantic_embedding_cache ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_policies
+        WHERE schemaname = 'public'
+          AND tablename = 'semantic_embedding_cache'
+          AND policyname = 'internal_access'
+    ) THEN
+        CREATE POLICY internal_access ON public.semantic_embedding_cache
+            FOR ALL TO app_worker
+            USING (true) WITH CHECK (true);
+    END IF;
+END $$;
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON semantic_embedding_cache TO app_worker;
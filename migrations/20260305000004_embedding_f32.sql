@@ -0,0 +1,40 @@
+-- Binary float32 storage for embeddings.
+--
+-- Embeddings were stored and read only as JSONB (~8 KB of text per 384-dim
+-- vector, parsed float by float on every load). embedding_f32 holds the
+-- same vector as big-endian float32 bytes (float4send layout, 1.5 KB),
+-- which workers read straight into NumPy buffers. Workers write both
+-- columns and read embedding_f32 first, falling back to the JSONB column,
+-- so rows written by older workers keep working during the rollout.
+
+ALTER TABLE semantic_catalog_embeddings
+    ADD COLUMN IF NOT EXISTS embedding_f32 BYTEA;
+ALTER TABLE semantic_user_embeddings
+    ADD COLUMN IF NOT EXISTS embedding_f32 BYTEA;
+ALTER TABLE semantic_embedding_cache
+    ADD COLUMN IF NOT EXISTS embedding_f32 BYTEA;
+
+-- Backfill existing rows from their JSONB vectors.
+UPDATE semantic_catalog_embeddings t
+SET embedding_f32 = (
+    SELECT string_agg(float4send(e.value::real), ''::bytea ORDER BY e.ord)
+    FROM jsonb_array_elements_text(t.embedding) WITH ORDINALITY AS e(value, ord)
+)
+WHERE t.embedding_f32 IS NULL
+  AND jsonb_typeof(t.embedding) = 'array';
+
+UPDATE semantic_user_embeddings t
+SET embedding_f32 = (
+    SELECT string_agg(float4send(e.value::real), ''::bytea ORDER BY e.ord)
+    FROM jsonb_array_elements_text(t.embedding) WITH ORDINALITY AS e(value, ord)
+)
+WHERE t.embedding_f32 IS NULL
+  AND jsonb_typeof(t.embedding) = 'array';
+
+UPDATE semantic_embedding_cache t
+SET embedding_f32 = (
+    SELECT string_agg(float4send(e.value::real), ''::bytea ORDER BY e.ord)
+    FROM jsonb_array_elements_text(t.embedding) WITH ORDINALITY AS e(value, ord)
+)
+WHERE t.embedding_f32 IS NULL
+  AND jsonb_typeof(t.embedding) = 'array';
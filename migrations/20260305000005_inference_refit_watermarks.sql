@@ -0,0 +1,21 @@
+-- Per-user watermarks for the change-aware nightly refit.
+--
+-- inference.nightly_refit used to enqueue projection.update for every user
+-- that ever logged a trigger event, so dormant accounts were re-inferred every
+-- night. It now records, per user and projection family (a group of trigger
+-- event types, see NIGHTLY_REFIT_FAMILY_EVENT_TYPES), the latest event it
+-- handed to inference. Only users whose latest family event differs from the
+-- watermark, or whose population prior changed, are refit again.
+
+CREATE TABLE IF NOT EXISTS inference_refit_watermarks (
+    user_id             UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    projection_family   TEXT NOT NULL,
+    last_event_id       UUID NOT NULL,
+    last_event_at       TIMESTAMPTZ NOT NULL,
+    refit_at            TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, projection_family)
+);
+
+ALTER TABLE inference_refit_watermarks ENABLE ROW LEVEL SECURITY;
+
+GRANT SELECT, INSERT, UPDATE, DELETE ON inference_refit_watermarks TO app_worker;
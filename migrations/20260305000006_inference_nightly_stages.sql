@@ -0,0 +1,67 @@
+-- Sharded, resumable nightly maintenance pipeline.
+--
+-- inference.nightly_refit used to run every maintenance stage (population
+-- priors, refit fan-out, issue clustering, extraction calibration, unknown
+-- dimension mining, learning backlog, consistency inboxes) back to back in one
+-- job transaction: one slow stage delayed the rest and a crash lost the whole
+-- run. The job now only plans a run. Each stage is split into shards (user
+-- ranges for per-user stages, one shard otherwise), and each shard runs as its
+-- own inference.nightly_stage job once its stage's dependencies are finished.
+-- Completed shards are never re-run, so a resumed run continues from the
+-- last completed shard.
+
+CREATE TABLE IF NOT EXISTS inference_nightly_stage_shards (
+    run_id          UUID NOT NULL,
+    stage           TEXT NOT NULL,
+    shard           INT NOT NULL CHECK (shard >= 0),
+    shard_count     INT NOT NULL CHECK (shard_count > 0),
+    -- User range [user_id_from, user_id_to); NULL bounds are open.
+    user_id_from    UUID,
+    user_id_to      UUID,
+    -- User the shard job is enqueued under (spreads jobs across worker lanes).
+    lane_user_id    UUID NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'waiting'
+                    CHECK (status IN ('waiting', 'queued', 'completed', 'failed')),
+    job_id          BIGINT REFERENCES background_jobs(id) ON DELETE SET NULL,
+    attempts        INT NOT NULL DEFAULT 0 CHECK (attempts >= 0),
+    started_at      TIMESTAMPTZ,
+    completed_at    TIMESTAMPTZ,
+    duration_ms     DOUBLE PRECISION,
+    summary         JSONB NOT NULL DEFAULT '{}',
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (run_id, stage, shard)
+);
+
+-- plan_nightly_run deletes runs past KURA_NIGHTLY_RUN_RETENTION_DAYS.
+CREATE INDEX IF NOT EXISTS idx_inference_nightly_stage_shards_created
+    ON inference_nightly_stage_shards (created_at);
+
+-- Covering index for the background_jobs foreign key (job cleanup).
+CREATE INDEX IF NOT EXISTS idx_inference_nightly_stage_shards_job_id
+    ON inference_nightly_stage_shards (job_id);
+
+ALTER TABLE inference_nightly_stage_shards ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_policies
+        WHERE schemaname = 'public'
+          AND tablename = 'inference_nightly_stage_shards'
+          AND policyname = 'internal_access'
+    ) THEN
+        CREATE POLICY internal_access ON public.inference_nightly_stage_shards
+            FOR ALL TO app_worker
+            USING (true) WITH CHECK (true);
+    END IF;
+END $$;
+
+-- Worker-only.
+GRANT SELECT, INSERT, UPDATE, DELETE ON inference_nightly_stage_shards TO app_worker;
+
+-- Run-level progress: the run being tracked and a per-stage rollup
+-- (status, shard counts, summed shard duration and wall-clock duration).
+ALTER TABLE inference_scheduler_state
+    ADD COLUMN IF NOT EXISTS current_run_id UUID,
+    ADD COLUMN IF NOT EXISTS last_run_stages JSONB NOT NULL DEFAULT '{}';
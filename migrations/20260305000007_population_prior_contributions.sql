@@ -0,0 +1,53 @@
+-- Mergeable per-user contributions for incremental population prior refresh.
+--
+-- refresh_population_prior_profiles used to recompute every cohort from all
+-- opted-in users' projections, then DELETE and re-insert the whole
+-- population_prior_profiles table, rewriting every prior even when nothing
+-- changed. Each user's samples are now reduced to mergeable
+-- sufficient statistics (weighted count, mean, M2) per prior group. A refresh
+-- recomputes only users whose source projections, cohort or eligibility
+-- changed, re-merges the groups they touch and upserts/deletes only the
+-- prior rows that actually changed.
+--
+-- These tables carry user ids and stay worker-internal: the published
+-- aggregates in population_prior_profiles remain free of user identifiers.
+
+-- One row per contributing user: the source fingerprint the contributions
+-- were computed from (cohort, in-window projection count and latest
+-- projection update). A differing fingerprint marks the user for recompute.
+CREATE TABLE IF NOT EXISTS population_prior_contributors (
+    user_id             UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    cohort_key          TEXT NOT NULL,
+    source_rows         INT NOT NULL CHECK (source_rows >= 0),
+    source_latest_at    TIMESTAMPTZ,
+    window_days         INT NOT NULL CHECK (window_days > 0),
+    computed_at         TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS population_prior_contributions (
+    user_id             UUID NOT NULL REFERENCES population_prior_contributors(user_id) ON DELETE CASCADE,
+    projection_type     TEXT NOT NULL,
+    target_key          TEXT NOT NULL,
+    cohort_key          TEXT NOT NULL,
+    sample_size         INT NOT NULL CHECK (sample_size > 0),
+    weight_sum          DOUBLE PRECISION NOT NULL CHECK (weight_sum >= 0),
+    mean                DOUBLE PRECISION NOT NULL,
+    m2                  DOUBLE PRECISION NOT NULL,
+    -- Unweighted moments for the equal-weight fallback (all weights zero).
+    count_mean          DOUBLE PRECISION NOT NULL,
+    count_m2            DOUBLE PRECISION NOT NULL,
+    min_value           DOUBLE PRECISION NOT NULL,
+    max_value           DOUBLE PRECISION NOT NULL,
+    within_var_sum      DOUBLE PRECISION NOT NULL DEFAULT 0,
+    estimand            JSONB NOT NULL DEFAULT '{}',
+    PRIMARY KEY (user_id, projection_type, target_key, cohort_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_population_prior_contributions_group
+    ON population_prior_contributions (projection_type, target_key, cohort_key);
+
+ALTER TABLE population_prior_contributors ENABLE ROW LEVEL SECURITY;
+ALTER TABLE population_prior_contributions ENABLE ROW LEVEL SECURITY;
+
+GRANT SELECT, INSERT, UPDATE, DELETE
+    ON population_prior_contributors, population_prior_contributions TO app_worker;
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized causal estimators against the pure-Python reference.
+
+Histories come from datagen presets. Each history is reduced to daily
+readiness samples the same way the causal handler frames them: treatment is
+"protein target hit today", the outcome is tomorrow's readiness score, and
+today's readiness, sleep, energy, soreness and load are the confounders.
+Both backends run the full pipeline (IPW point estimate, AIPW cross-fit,
+bootstrap) on identical rows; the report contains timings, the speedup and
+the ATE/CI deltas.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# workers/ itself is on the path for the test-side reference implementation.
+for extra in (
+    REPO_ROOT / "workers" / "src",
+    REPO_ROOT / "workers",
+    REPO_ROOT / "datagen" / "src",
+):
+    if str(extra) not in sys.path:
+        sys.path.insert(0, str(extra))
+
+from datagen.engine import SimulationEngine  # noqa: E402
+from datagen.presets import PRESETS  # noqa: E402
+
+from kura_workers import causal_inference as vectorized  # noqa: E402
+from kura_workers.eval_harness import build_readiness_daily_scores_from_event_rows  # noqa: E402
+from tests import _causal_reference as reference  # noqa: E402
+
+REPORT_SCHEMA_VERSION = "causal_inference_benchmark.v1"
+OVERLAP_FLOOR = 0.03
+
+
+def _event_rows(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for event in events:
+        rows.append(
+            {
+                "event_type": event["event_type"],
+                "timestamp": datetime.fromisoformat(event["occurred_at"]),
+                "data": dict(event.get("data") or {}),
+                "metadata": {},
+            }
+        )
+    return rows
+
+
+def build_causal_samples(events: list[dict[str, Any]], protein_target_g: float) -> list[dict[str, Any]]:
+    """Daily (treated, next-day readiness, confounders) samples from a datagen history."""
+    rows = _event_rows(events)
+    protein_by_day: dict[str, float] = defaultdict(float)
+    for row in rows:
+        if row["event_type"] == "meal.logged":
+            protein_by_day[row["timestamp"].date().isoformat()] += float(
+                row["data"].get("protein_g") or 0.0
+            )
+
+    daily = build_readiness_daily_scores_from_event_rows(rows)
+    samples: list[dict[str, Any]] = []
+    for today, tomorrow in zip(daily, daily[1:]):
+        signals = today.get("signals") or {}
+        samples.append(
+            {
+                "treated": int(protein_by_day.get(today["date"], 0.0) >= protein_target_g),
+                "outcome": float(tomorrow.get("score") or 0.0),
+                "confounders": {
+                    "baseline_readiness": float(today.get("score") or 0.0),
+                    "sleep_hours": float(signals.get("sleep_hours") or 0.0),
+                    "energy_level": float(signals.get("energy_level") or 0.0),
+                    "soreness_level": float(signals.get("soreness_level") or 0.0),
+                    "load_score": float(signals.get("load_score") or 0.0),
+                },
+            }
+        )
+    return samples
+
+
+def _run_backend(module: Any, rows: list[dict[str, Any]], names: list[str], bootstrap: int) -> dict[str, Any]:
+    started = time.perf_counter()
+    point = module._estimate_once(rows, names, overlap_floor=OVERLAP_FLOOR)
+    fitted_point = time.perf_counter()
+    aipw = module._estimate_aipw_crossfit(rows, names, overlap_floor=OVERLAP_FLOOR, folds=3)
+    fitted_aipw = time.perf_counter()
+    ates = module._bootstrap_ates(
+        rows, names, overlap_floor=OVERLAP_FLOOR, bootstrap_samples=bootstrap,
+    )
+    finished = time.perf_counter()
+    return {
+        "ipw_ate": point["ate"] if point else None,
+        "aipw_ate": aipw["ate"] if aipw else None,
+        "aipw_ci95": aipw["ci95"] if aipw else None,
+        "bootstrap_ci95": (
+            [vectorized._quantile(ates, 0.025), vectorized._quantile(ates, 0.975)] if ates else None
+        ),
+        "bootstrap_valid_samples": len(ates),
+        "timing_ms": {
+            "point": round((fitted_point - started) * 1000.0, 3),
+            "aipw": round((fitted_aipw - fitted_point) * 1000.0, 3),
+            "bootstrap": round((finished - fitted_aipw) * 1000.0, 3),
+            "total": round((finished - started) * 1000.0, 3),
+        },
+    }
+
+
+def _delta(left: Any, right: Any) -> float | None:
+    if left is None or right is None:
+        return None
+    if isinstance(left, list):
+        return round(max(abs(a - b) for a, b in zip(left, right)), 6)
+    return round(abs(float(left) - float(right)), 6)
+
+
+def run_benchmark(
+    *, profiles: list[str], days: int, bootstrap_samples: int, skip_reference: bool,
+) -> dict[str, Any]:
+    histories: list[dict[str, Any]] = []
+    for name in profiles:
+        profile = PRESETS[name]
+        events = SimulationEngine(profile).run(days)
+        samples = build_causal_samples(events, float(profile.protein_target_g))
+        rows, names = vectorized._normalize_samples(samples)
+
+        entry: dict[str, Any] = {
+            "profile": name,
+            "days": days,
+            "samples": len(rows),
+            "treated_samples": sum(int(row["treated"]) for row in rows),
+            "vectorized": _run_backend(vectorized, rows, names, bootstrap_samples),
+        }
+        if not skip_reference:
+            ref = _run_backend(reference, rows, names, bootstrap_samples)
+            fast = entry["vectorized"]
+            entry["reference"] = ref
+            entry["speedup"] = round(
+                ref["timing_ms"]["total"] / max(fast["timing_ms"]["total"], 1e-6), 1
+            )
+            entry["abs_delta"] = {
+                "ipw_ate": _delta(fast["ipw_ate"], ref["ipw_ate"]),
+                "aipw_ate": _delta(fast["aipw_ate"], ref["aipw_ate"]),
+                "aipw_ci95": _delta(fast["aipw_ci95"], ref["aipw_ci95"]),
+                # Different resample draws: only statistically comparable.
+                "bootstrap_ci95": _delta(fast["bootstrap_ci95"], ref["bootstrap_ci95"]),
+            }
+        histories.append(entry)
+
+    speedups = [h["speedup"] for h in histories if "speedup" in h]
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "bootstrap_samples": bootstrap_samples,
+        "histories": histories,
+        "median_speedup": statistics.median(speedups) if speedups else None,
+    }
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare vectorized vs reference causal estimators on datagen histories.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=sorted(PRESETS),
+        help="datagen preset(s) to simulate (default: all presets)",
+    )
+    parser.add_argument("--days", type=int, default=180, help="simulated days per history")
+    parser.add_argument(
+        "--bootstrap-samples",
+        type=int,
+        default=100,
+        help="bootstrap resamples per backend (production default is 250)",
+    )
+    parser.add_argument(
+        "--skip-reference",
+        action="store_true",
+        help="time only the vectorized backend",
+    )
+    parser.add_argument("--output", type=Path, help="write the JSON report to this path")
+    return parser
+
+
+def main() -> None:
+    args = _build_arg_parser().parse_args()
+    if args.days < 14:
+        raise SystemExit("--days must be >= 14")
+    report = run_benchmark(
+        profiles=args.profile or sorted(PRESETS),
+        days=args.days,
+        bootstrap_samples=max(1, args.bootstrap_samples),
+        skip_reference=args.skip_reference,
+    )
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+
+
+if __name__ == "__main__":
+    main()
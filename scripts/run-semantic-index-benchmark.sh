@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+REPO_ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+cd "$REPO_ROOT"
+
+PYTHONPATH=workers/src uv run --project workers python scripts/semantic_index_benchmark.py "$@"
@@ -0,0 +1,8 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+REPO_ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+cd "$REPO_ROOT"
+
+set -a && source .env && set +a
+PYTHONPATH=workers/src:datagen/src uv run --project workers python scripts/worker_backlog_benchmark.py "$@"
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Benchmark the vectorized semantic catalog index against the row-by-row scan.
+
+The seed catalog is synthetically scaled (every entry cloned with numbered
+variants, then embedded with the configured provider) to the requested
+multiples. For each size, one "user" of the given term count is matched
+the way ``update_semantic_memory`` did it before the index (JSON-decode the
+catalog, score every term against every row in pure Python) and with a
+warm ``CatalogIndex`` (one float32 matmul plus exact re-scoring of the
+shortlist). The report contains timings, the speedup, the one-time index
+build cost and whether both paths returned identical matches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for extra in (REPO_ROOT / "workers" / "src",):
+    if str(extra) not in sys.path:
+        sys.path.insert(0, str(extra))
+
+from kura_workers.embeddings import get_embedding_provider  # noqa: E402
+from kura_workers.semantic_catalog import all_catalog_entries  # noqa: E402
+from kura_workers.semantic_index import CatalogIndex, best_match_reference  # noqa: E402
+
+REPORT_SCHEMA_VERSION = "semantic_index_benchmark.v1"
+
+
+def build_scaled_catalog(domain: str, scale: int) -> list[dict[str, Any]]:
+    """Seed entries of ``domain`` cloned ``scale`` times, as stored JSON rows."""
+    provider = get_embedding_provider()
+    seed = [entry for entry in all_catalog_entries() if entry.domain == domain]
+    keys: list[str] = []
+    labels: list[str] = []
+    texts: list[str] = []
+    for copy in range(scale):
+        for entry in seed:
+            suffix = "" if copy == 0 else f" v{copy}"
+            keys.append(entry.canonical_key + suffix.replace(" ", "_"))
+            labels.append(entry.canonical_label + suffix)
+            texts.append(", ".join((entry.canonical_label + suffix, *entry.variants)))
+    vectors = provider.embed_many(texts)
+    return [
+        {"canonical_key": key, "canonical_label": label, "embedding": json.dumps(vec)}
+        for key, label, vec in zip(keys, labels, vectors)
+    ]
+
+
+def build_terms(domain: str, count: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    variants = [
+        variant
+        for entry in all_catalog_entries()
+        if entry.domain == domain
+        for variant in (entry.canonical_label, *entry.variants)
+    ]
+    terms = [
+        f"{rng.choice(variants)} {rng.choice(['', 'heavy', 'paused', 'tempo', 'x'])}".strip()
+        for _ in range(count)
+    ]
+    return get_embedding_provider().embed_many(terms)
+
+
+def _decode(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "canonical_key": row["canonical_key"],
+            "canonical_label": row["canonical_label"],
+            "embedding": [float(v) for v in json.loads(row["embedding"])],
+        }
+        for row in rows
+    ]
+
+
+def _timed(fn: Any, repeats: int) -> tuple[Any, float]:
+    samples: list[float] = []
+    result: Any = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return result, round(statistics.median(samples), 3)
+
+
+def run_benchmark(
+    *, domain: str, scales: list[int], terms: int, repeats: int, seed: int,
+) -> dict[str, Any]:
+    term_vectors = build_terms(domain, terms, seed)
+    sizes: list[dict[str, Any]] = []
+    for scale in scales:
+        rows = build_scaled_catalog(domain, scale)
+
+        def reference() -> list[Any]:
+            catalog = _decode(rows)
+            return [best_match_reference(vec, catalog) for vec in term_vectors]
+
+        index, build_ms = _timed(lambda: CatalogIndex.build(_decode(rows)), 1)
+        expected, reference_ms = _timed(reference, repeats)
+        actual, index_ms = _timed(lambda: index.best_matches(term_vectors), repeats)
+        sizes.append(
+            {
+                "scale": scale,
+                "catalog_rows": len(rows),
+                "terms": len(term_vectors),
+                "timing_ms": {
+                    "reference": reference_ms,
+                    "index": index_ms,
+                    "index_build": build_ms,
+                },
+                "speedup": round(reference_ms / max(index_ms, 1e-6), 1),
+                "identical": actual == expected,
+            }
+        )
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "domain": domain,
+        "provider": get_embedding_provider().descriptor(),
+        "sizes": sizes,
+        "all_identical": all(size["identical"] for size in sizes),
+    }
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Compare the vectorized catalog index with the row-by-row semantic scan.",
+    )
+    parser.add_argument("--domain", choices=["exercise", "food"], default="exercise")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        action="append",
+        help="catalog size as a multiple of the seed catalog (default: 1, 10, 100)",
+    )
+    parser.add_argument("--terms", type=int, default=100, help="user terms per match run")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per path (median)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="write the JSON report to this path")
+    return parser
+
+
+def main() -> None:
+    args = _build_arg_parser().parse_args()
+    scales = args.scale or [1, 10, 100]
+    if any(scale < 1 for scale in scales):
+        raise SystemExit("--scale must be >= 1")
+    report = run_benchmark(
+        domain=args.domain,
+        scales=scales,
+        terms=max(1, args.terms),
+        repeats=max(1, args.repeats),
+        seed=args.seed,
+    )
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    if not report["all_identical"]:
+        raise SystemExit("index matches differ from the reference scan")
+
+
+if __name__ == "__main__":
+    main()
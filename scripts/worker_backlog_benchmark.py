@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""Measure end-to-end worker throughput while draining a realistic backlog.
+
+Seeds N synthetic users' histories with datagen (generate-population +
+the COPY sink, without job enqueue), enqueues one projection.update job per
+seeded event, then runs a real ``Worker`` against the database until every
+job of the run (including projection.retry follow-ups) is finished.
+
+The report uses the ``performance_baseline.v1`` layout: per-handler and
+per-job-type latency entries go to ``worker.handlers`` so
+``performance_regression_gate.py`` can gate them against a baseline report
+of the same benchmark. Throughput, per-handler wall-time shares, CPU time,
+lock-contention retries and queue-lag percentiles are reported under
+``worker.backlog_drain`` (informational; queue lag while draining a backlog
+is expected to exceed per-handler latency limits).
+
+CPU time is process-level: worker-process CPU over the whole drain plus the
+CPU of tasks run in the compute pool. Slots interleave, so it is not split
+per handler; wall time minus CPU time approximates DB/IO wait.
+Re-running with the same seed reuses the already-loaded users and events.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for extra in (REPO_ROOT / "workers" / "src", REPO_ROOT / "datagen" / "src"):
+    if str(extra) not in sys.path:
+        sys.path.insert(0, str(extra))
+
+import psycopg  # noqa: E402
+from psycopg.rows import dict_row  # noqa: E402
+
+from datagen.output import read_events  # noqa: E402
+from datagen.pg_sink import copy_events, datagen_user_id  # noqa: E402
+from datagen.population import generate_population, population_profile  # noqa: E402
+from kura_workers.config import Config  # noqa: E402
+from kura_workers.metrics import get_metrics  # noqa: E402
+from kura_workers.worker import Worker  # noqa: E402
+from performance_baseline import REPORT_SCHEMA_VERSION, _git_commit  # noqa: E402
+
+DEFAULT_OUTPUT = REPO_ROOT / "docs" / "reports" / "worker-backlog-benchmark-latest.json"
+DATASET_PROFILE = "datagen_population_v1"
+DRAIN_CHECK_INTERVAL_SECONDS = 0.5
+
+
+def _seed_population(
+    *,
+    database_url: str,
+    users: int,
+    days: int,
+    seed: int,
+    gen_workers: int,
+) -> dict[str, Any]:
+    """Generate and COPY the population; no jobs are enqueued here."""
+    with tempfile.TemporaryDirectory(prefix="kura-backlog-bench-") as tmp:
+        path = Path(tmp) / "population.ndjson.gz"
+        started = time.perf_counter()
+        summary = generate_population(
+            path, athletes=users, days=days, seed=seed, workers=gen_workers, compression="gzip"
+        )
+        generated_s = time.perf_counter() - started
+        started = time.perf_counter()
+        loaded = copy_events(database_url, read_events(path), enqueue_jobs=False)
+        loaded_s = time.perf_counter() - started
+    return {
+        "events_generated": summary.events,
+        "events_inserted": loaded["inserted"],
+        "events_already_present": loaded["duplicates"],
+        "event_types": dict(sorted(summary.event_types.items())),
+        "generate_seconds": round(generated_s, 3),
+        "copy_seconds": round(loaded_s, 3),
+    }
+
+
+async def _enqueue_backlog(conn: psycopg.AsyncConnection[Any], user_ids: list[str]) -> dict[str, int]:
+    """One projection.update job per event of the benchmark users, in event order."""
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT count(*) AS n
+            FROM background_jobs
+            WHERE status IN ('pending', 'processing')
+              AND NOT (user_id = ANY(%s::uuid[]))
+            """,
+            (user_ids,),
+        )
+        foreign = (await cur.fetchone())["n"]
+        await cur.execute(
+            """
+            WITH enqueued AS (
+                INSERT INTO background_jobs (user_id, job_type, payload)
+                SELECT user_id, 'projection.update',
+                       jsonb_build_object(
+                           'event_id', id,
+                           'event_type', event_type,
+                           'user_id', user_id
+                       )
+                FROM events
+                WHERE user_id = ANY(%s::uuid[])
+                ORDER BY timestamp, id
+                RETURNING id
+            )
+            SELECT count(*) AS jobs, min(id) AS first_job_id FROM enqueued
+            """,
+            (user_ids,),
+        )
+        row = await cur.fetchone()
+    await conn.commit()
+    return {
+        "jobs": int(row["jobs"]),
+        "first_job_id": int(row["first_job_id"] or 0),
+        "foreign_pending_jobs": int(foreign),
+    }
+
+
+async def _open_jobs(conn: psycopg.AsyncConnection[Any], first_job_id: int, user_ids: list[str]) -> int:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT count(*)
+            FROM background_jobs
+            WHERE id >= %s
+              AND user_id = ANY(%s::uuid[])
+              AND status IN ('pending', 'processing')
+            """,
+            (first_job_id, user_ids),
+        )
+        (count,) = await cur.fetchone()
+    await conn.commit()
+    return int(count)
+
+
+async def _drain(
+    config: Config,
+    *,
+    database_url: str,
+    first_job_id: int,
+    user_ids: list[str],
+    timeout_seconds: float,
+) -> float:
+    """Run a Worker until the run's jobs are finished. Returns wall seconds."""
+    worker = Worker(config)
+    started = time.perf_counter()
+
+    async def monitor() -> None:
+        async with await psycopg.AsyncConnection.connect(database_url) as conn:
+            while True:
+                await asyncio.sleep(DRAIN_CHECK_INTERVAL_SECONDS)
+                if await _open_jobs(conn, first_job_id, user_ids) == 0:
+                    break
+                if time.perf_counter() - started > timeout_seconds:
+                    worker._request_shutdown()
+                    raise TimeoutError(f"Backlog not drained within {timeout_seconds}s")
+        worker._request_shutdown()
+
+    monitor_task = asyncio.create_task(monitor())
+    try:
+        await worker.run()
+    finally:
+        if not monitor_task.done():
+            monitor_task.cancel()
+    wall_seconds = time.perf_counter() - started
+    await monitor_task
+    return wall_seconds
+
+
+def _percentiles_ms(row: dict[str, Any], prefix: str) -> dict[str, float]:
+    return {
+        f"{key}_ms": round(float(row[f"{prefix}_{key}"] or 0.0), 3)
+        for key in ("p50", "p95", "p99", "max")
+    }
+
+
+async def _job_stats(
+    conn: psycopg.AsyncConnection[Any], first_job_id: int, user_ids: list[str]
+) -> list[dict[str, Any]]:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            WITH run_jobs AS (
+                SELECT job_type, status, attempt, error_message,
+                       EXTRACT(EPOCH FROM started_at - scheduled_for) * 1000 AS lag_ms,
+                       EXTRACT(EPOCH FROM completed_at - created_at) * 1000 AS e2e_ms
+                FROM background_jobs
+                WHERE id >= %s
+                  AND user_id = ANY(%s::uuid[])
+            )
+            SELECT job_type,
+                   count(*) AS jobs,
+                   count(*) FILTER (WHERE status = 'completed') AS completed,
+                   count(*) FILTER (WHERE status = 'dead') AS dead,
+                   COALESCE(sum(GREATEST(attempt - 1, 0)), 0) AS retries,
+                   count(*) FILTER (WHERE error_message LIKE 'Advisory lock%%') AS lock_retried_jobs,
+                   percentile_cont(0.50) WITHIN GROUP (ORDER BY lag_ms) AS lag_p50,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY lag_ms) AS lag_p95,
+                   percentile_cont(0.99) WITHIN GROUP (ORDER BY lag_ms) AS lag_p99,
+                   max(lag_ms) AS lag_max,
+                   percentile_cont(0.50) WITHIN GROUP (ORDER BY e2e_ms) AS e2e_p50,
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY e2e_ms) AS e2e_p95,
+                   percentile_cont(0.99) WITHIN GROUP (ORDER BY e2e_ms) AS e2e_p99,
+                   max(e2e_ms) AS e2e_max
+            FROM run_jobs
+            GROUP BY job_type
+            ORDER BY job_type
+            """,
+            (first_job_id, user_ids),
+        )
+        rows = await cur.fetchall()
+    return [
+        {
+            "job_type": row["job_type"],
+            "jobs": int(row["jobs"]),
+            "completed": int(row["completed"]),
+            "dead": int(row["dead"]),
+            "retries": int(row["retries"]),
+            "lock_retried_jobs": int(row["lock_retried_jobs"]),
+            "queue_lag": _percentiles_ms(row, "lag"),
+            "enqueue_to_complete": _percentiles_ms(row, "e2e"),
+        }
+        for row in rows
+    ]
+
+
+def _handler_entries(metrics: dict[str, Any]) -> list[dict[str, Any]]:
+    """Gate-able latency entries (histogram-interpolated percentiles)."""
+    entries: list[dict[str, Any]] = []
+    for name, stats in sorted(metrics["handlers"].items()):
+        entries.append(
+            {
+                "label": f"worker.handler.{name}",
+                "sample_count": stats["invocations"],
+                "p50_ms": stats["p50_ms"],
+                "p95_ms": stats["p95_ms"],
+                "p99_ms": stats["p99_ms"],
+            }
+        )
+    for job_type, summary in sorted(metrics["job_types"].items()):
+        entries.append(
+            {
+                "label": f"worker.job.{job_type}",
+                "sample_count": summary["count"],
+                "p50_ms": summary["p50_ms"],
+                "p95_ms": summary["p95_ms"],
+                "p99_ms": summary["p99_ms"],
+            }
+        )
+    return entries
+
+
+def _handler_time_shares(metrics: dict[str, Any]) -> list[dict[str, Any]]:
+    handlers = metrics["handlers"]
+    total_ms = sum(stats["total_duration_ms"] for stats in handlers.values()) or 1.0
+    shares = []
+    for name, stats in handlers.items():
+        wall_ms = stats["total_duration_ms"]
+        shares.append(
+            {
+                "handler": name,
+                "invocations": stats["invocations"],
+                "failures": stats["failures"],
+                "rows_loaded": stats["rows_loaded"],
+                "wall_ms": round(wall_ms, 1),
+                "time_share": round(wall_ms / total_ms, 4),
+            }
+        )
+    return sorted(shares, key=lambda entry: entry["wall_ms"], reverse=True)
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    database_url = os.environ.get("DATABASE_URL", "").strip()
+    if not database_url:
+        raise RuntimeError("DATABASE_URL must be set")
+    for name in ("users", "days", "gen_workers"):
+        if int(getattr(args, name)) <= 0:
+            raise ValueError(f"{name} must be > 0")
+
+    dataset = await asyncio.to_thread(
+        _seed_population,
+        database_url=database_url,
+        users=args.users,
+        days=args.days,
+        seed=args.seed,
+        gen_workers=args.gen_workers,
+    )
+    user_ids = [
+        str(datagen_user_id(population_profile(i, seed=args.seed).name)) for i in range(args.users)
+    ]
+    async with await psycopg.AsyncConnection.connect(database_url) as conn:
+        backlog = await _enqueue_backlog(conn, user_ids)
+
+    base = Config.from_env()
+    overrides: dict[str, Any] = {"poll_interval_seconds": args.poll_interval_seconds}
+    if args.concurrency is not None:
+        overrides["concurrency"] = args.concurrency
+        overrides["db_pool_max_size"] = max(base.db_pool_max_size, 2 * args.concurrency)
+    if args.claim_batch_size is not None:
+        overrides["batch_size"] = args.claim_batch_size
+    config = dataclasses.replace(base, **overrides)
+
+    cpu_before = time.process_time()
+    wall_seconds = await _drain(
+        config,
+        database_url=database_url,
+        first_job_id=backlog["first_job_id"],
+        user_ids=user_ids,
+        timeout_seconds=args.timeout_seconds,
+    )
+    worker_cpu_seconds = time.process_time() - cpu_before
+    metrics = get_metrics()
+    async with await psycopg.AsyncConnection.connect(database_url) as conn:
+        job_stats = await _job_stats(conn, backlog["first_job_id"], user_ids)
+
+    completed = sum(entry["completed"] for entry in job_stats)
+    update_stats = next((e for e in job_stats if e["job_type"] == "projection.update"), None)
+    events_done = update_stats["completed"] if update_stats else 0
+
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "run_command": (
+            "set -a && source .env && set +a && "
+            "PYTHONPATH=workers/src:datagen/src uv run --project workers "
+            "python scripts/worker_backlog_benchmark.py"
+        ),
+        "machine_context": {
+            "hostname": platform.node(),
+            "platform": platform.platform(),
+            "python_version": platform.python_version(),
+            "git_commit": _git_commit(),
+        },
+        "config": {
+            "users": args.users,
+            "days": args.days,
+            "seed": args.seed,
+            "concurrency": config.concurrency,
+            "claim_batch_size": config.batch_size,
+            "db_pool_max_size": config.db_pool_max_size,
+            "compute_workers": config.compute_workers,
+            "poll_interval_seconds": config.poll_interval_seconds,
+        },
+        "dataset": {
+            "profile": DATASET_PROFILE,
+            "user_count": len(user_ids),
+            **dataset,
+            "jobs_enqueued": backlog["jobs"],
+            "foreign_pending_jobs": backlog["foreign_pending_jobs"],
+        },
+        "worker": {
+            "handlers": _handler_entries(metrics),
+            "backlog_drain": {
+                "wall_seconds": round(wall_seconds, 3),
+                "jobs_completed": completed,
+                "jobs_dead": sum(entry["dead"] for entry in job_stats),
+                "jobs_per_second": round(completed / wall_seconds, 2) if wall_seconds else 0.0,
+                "events_per_second": round(events_done / wall_seconds, 2) if wall_seconds else 0.0,
+                "lock_contention": metrics["lock_contention"],
+                "lock_retried_jobs": sum(entry["lock_retried_jobs"] for entry in job_stats),
+                "retries": sum(entry["retries"] for entry in job_stats),
+                "coalesced_jobs": metrics["coalescing"]["jobs"],
+                "slot_utilization": metrics["slots"]["utilization"],
+                "slot_queue_wait": metrics["queue_wait"],
+                "worker_cpu_seconds": round(worker_cpu_seconds, 3),
+                "compute_cpu_seconds": metrics["compute"]["cpu_seconds"],
+                "handler_time": _handler_time_shares(metrics),
+                "job_types": job_stats,
+            },
+        },
+    }
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="worker_backlog_benchmark",
+        description="Seed a synthetic backlog and measure worker drain throughput.",
+    )
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Path to output JSON artifact.")
+    parser.add_argument("--users", type=int, default=20, help="Synthetic users to seed.")
+    parser.add_argument("--days", type=int, default=90, help="Days of history per user.")
+    parser.add_argument("--seed", type=int, default=0, help="datagen population seed.")
+    parser.add_argument(
+        "--gen-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="datagen processes used for seeding.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Worker concurrency slots (default: KURA_WORKER_CONCURRENCY).",
+    )
+    parser.add_argument(
+        "--claim-batch-size",
+        type=int,
+        default=None,
+        help="Jobs claimed per batch (default: KURA_BATCH_SIZE).",
+    )
+    parser.add_argument(
+        "--poll-interval-seconds",
+        type=float,
+        default=0.5,
+        help="Worker poll interval during the benchmark.",
+    )
+    parser.add_argument(
+        "--timeout-seconds",
+        type=float,
+        default=1800.0,
+        help="Fail when the backlog is not drained within this time.",
+    )
+    return parser
+
+
+def main() -> None:
+    args = _build_arg_parser().parse_args()
+    report = asyncio.run(_run(args))
+    output_path = Path(args.output).resolve()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(json.dumps({"status": "ok", "output": str(output_path)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -219,6 +219,24 @@ def build_insufficient_envelope(
     )
 
 
+def summarize_running_observations(
+    count: int,
+    mean: float,
+    m2: float,
+) -> tuple[float | None, float]:
+    """Same contract as summarize_observations from Welford running sums.
+
+    ``m2`` is the running sum of squared deviations from the mean; lets
+    incremental projections summarize without keeping every observation.
+    """
+    if count <= 0:
+        return None, 0.0
+    if count == 1:
+        return mean, max(0.05 * abs(mean), 0.05)
+    variance = m2 / (count - 1)
+    return mean, sqrt(max(_CONFIDENCE_EPS, variance))
+
+
 def summarize_observations(
     values: list[float],
     *,
@@ -1,18 +1,23 @@
 """Observational causal effect estimation utilities.
 
 This module provides a lightweight causal layer:
-- propensity score estimation (logistic regression via gradient descent),
+- propensity score estimation (L2-penalized logistic regression via Newton/IRLS),
 - inverse-propensity weighting (IPW) for average treatment effect (ATE),
-- bootstrap uncertainty intervals,
+- cross-fitted AIPW with closed-form ridge outcome models,
+- bootstrap uncertainty intervals (all resamples fitted as one numpy batch),
 - machine-readable caveats for agent-facing transparency.
+
+The pure-Python gradient-descent estimators these replace live on in
+``workers/tests/_causal_reference.py`` for equivalence tests and benchmarks.
 """
 
 from __future__ import annotations
 
 import math
-import random
 from typing import Any
 
+import numpy as np
+
 ASSUMPTIONS: list[dict[str, str]] = [
     {
         "code": "consistency",
@@ -36,6 +41,14 @@ ASSUMPTIONS: list[dict[str, str]] = [
     },
 ]
 
+_LOGISTIC_L2 = 0.02
+_LINEAR_L2 = 0.03
+_NEWTON_MAX_ITERATIONS = 50
+_NEWTON_TOLERANCE = 1e-10
+_NEWTON_MAX_STEP = 5.0
+# Upper bound on (resamples x rows x columns) materialized per bootstrap chunk.
+_BOOTSTRAP_CHUNK_ELEMENTS = 2_000_000
+
 
 def _clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
@@ -88,130 +101,121 @@ def _quantile(values: list[float], q: float) -> float:
     return ((1.0 - mix) * ordered[lo]) + (mix * ordered[hi])
 
 
-def _sigmoid(value: float) -> float:
-    if value >= 0:
-        exp_neg = math.exp(-value)
-        return 1.0 / (1.0 + exp_neg)
-    exp_pos = math.exp(value)
-    return exp_pos / (1.0 + exp_pos)
-
-
 def _normal_cdf(x: float, mu: float, sigma: float) -> float:
     sigma = max(1e-9, sigma)
     z = (x - mu) / (sigma * math.sqrt(2.0))
     return 0.5 * (1.0 + math.erf(z))
 
 
-def _standardize(matrix: list[list[float]]) -> tuple[list[list[float]], list[float], list[float]]:
-    if not matrix:
-        return [], [], []
-    cols = len(matrix[0])
-    means = [0.0] * cols
-    stds = [1.0] * cols
-
-    for col in range(cols):
-        col_vals = [row[col] for row in matrix]
-        mu = _mean(col_vals)
-        var = _variance(col_vals, center=mu)
-        sd = math.sqrt(max(var, 1e-12))
-        means[col] = mu
-        stds[col] = sd
-
-    standardized: list[list[float]] = []
-    for row in matrix:
-        standardized.append([(row[idx] - means[idx]) / stds[idx] for idx in range(cols)])
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    # tanh form is overflow-free for large |z| and matches 1 / (1 + e^-z).
+    return 0.5 * (1.0 + np.tanh(0.5 * values))
+
+
+def _design_matrix(
+    rows: list[dict[str, Any]],
+    feature_names: list[str],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    features = np.array(
+        [[float(row["confounders"].get(name, 0.0)) for name in feature_names] for row in rows],
+        dtype=float,
+    ).reshape(len(rows), len(feature_names))
+    treated = np.array([int(row["treated"]) for row in rows], dtype=float)
+    outcomes = np.array([float(row["outcome"]) for row in rows], dtype=float)
+    return features, treated, outcomes
+
+
+def _standardize(features: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Column z-scores over the row axis; works on (n, d) and batched (b, n, d)."""
+    n = features.shape[-2]
+    means = features.mean(axis=-2)
+    if n > 1:
+        var = features.var(axis=-2, ddof=1)
+    else:
+        var = np.zeros_like(means)
+    stds = np.sqrt(np.maximum(var, 1e-12))
+    standardized = (features - means[..., None, :]) / stds[..., None, :]
     return standardized, means, stds
 
 
 def _fit_logistic(
-    features: list[list[float]],
-    targets: list[int],
+    features: np.ndarray,
+    targets: np.ndarray,
     *,
-    learning_rate: float = 0.12,
-    l2: float = 0.02,
-    iterations: int = 700,
-) -> tuple[float, list[float]]:
-    if not features:
-        return 0.0, []
-    n = len(features)
-    d = len(features[0])
-    bias = 0.0
-    weights = [0.0] * d
-
-    for step in range(iterations):
-        grad_b = 0.0
-        grad_w = [0.0] * d
-        for idx, row in enumerate(features):
-            z = bias + sum(weights[j] * row[j] for j in range(d))
-            prob = _sigmoid(z)
-            err = prob - targets[idx]
-            grad_b += err
-            for j in range(d):
-                grad_w[j] += err * row[j]
-
-        inv_n = 1.0 / max(1, n)
-        lr = learning_rate / (1.0 + 0.004 * step)
-        bias -= lr * (grad_b * inv_n)
-        for j in range(d):
-            grad = (grad_w[j] * inv_n) + (l2 * weights[j])
-            weights[j] -= lr * grad
-
-    return bias, weights
+    l2: float = _LOGISTIC_L2,
+) -> tuple[np.ndarray, np.ndarray]:
+    """L2-penalized logistic regression via Newton-Raphson (IRLS).
+
+    Minimizes mean log-loss + l2/2 * ||w||^2 with an unpenalized intercept.
+    Accepts one problem (n, d) or a batch (b, n, d) and returns
+    (intercepts, weights) with the matching leading shape.
+    """
+    single = features.ndim == 2
+    if single:
+        features = features[None]
+        targets = targets[None]
+    batch, n, d = features.shape
+    design = np.concatenate([np.ones((batch, n, 1)), features], axis=2)
+    design_t = design.transpose(0, 2, 1)
+    penalty = np.full(d + 1, l2)
+    penalty[0] = 0.0
+    # Tiny intercept jitter keeps the Hessian invertible when all p(1-p) ~ 0.
+    ridge = np.diag(penalty + np.r_[1e-9, np.zeros(d)])
+    coef = np.zeros((batch, d + 1))
+    inv_n = 1.0 / max(1, n)
+
+    for _ in range(_NEWTON_MAX_ITERATIONS):
+        prob = _sigmoid(np.matmul(design, coef[..., None])[..., 0])
+        grad = np.matmul(design_t, (prob - targets)[..., None])[..., 0] * inv_n + penalty * coef
+        curvature = prob * (1.0 - prob)
+        hessian = np.matmul(design_t * curvature[:, None, :], design) * inv_n + ridge
+        step = np.linalg.solve(hessian, grad[..., None])[..., 0]
+        # Damp oversized steps (near-separable folds) instead of overshooting.
+        scale = np.maximum(1.0, np.abs(step).max(axis=1) / _NEWTON_MAX_STEP)
+        coef -= step / scale[:, None]
+        if float(np.abs(step).max()) < _NEWTON_TOLERANCE:
+            break
+
+    if single:
+        return coef[0, 0], coef[0, 1:]
+    return coef[:, 0], coef[:, 1:]
 
 
 def _fit_linear_regression(
-    features: list[list[float]],
-    targets: list[float],
+    features: np.ndarray,
+    targets: np.ndarray,
     *,
-    learning_rate: float = 0.08,
-    l2: float = 0.03,
-    iterations: int = 800,
-) -> tuple[float, list[float]]:
-    if not features:
-        return 0.0, []
-    n = len(features)
-    d = len(features[0])
-    bias = _mean(targets)
-    weights = [0.0] * d
-
-    for step in range(iterations):
-        grad_b = 0.0
-        grad_w = [0.0] * d
-        for idx, row in enumerate(features):
-            prediction = bias + sum(weights[j] * row[j] for j in range(d))
-            err = prediction - targets[idx]
-            grad_b += err
-            for j in range(d):
-                grad_w[j] += err * row[j]
-        inv_n = 1.0 / max(1, n)
-        lr = learning_rate / (1.0 + 0.003 * step)
-        bias -= lr * (grad_b * inv_n)
-        for j in range(d):
-            grad = (grad_w[j] * inv_n) + (l2 * weights[j])
-            weights[j] -= lr * grad
+    l2: float = _LINEAR_L2,
+) -> tuple[float, np.ndarray]:
+    """Closed-form ridge regression with an unpenalized intercept."""
+    n, d = features.shape
+    if n == 0:
+        return 0.0, np.zeros(d)
+    target_mean = float(targets.mean())
+    if d == 0:
+        return target_mean, np.zeros(0)
+    feature_means = features.mean(axis=0)
+    centered = features - feature_means
+    gram = (centered.T @ centered) / n + l2 * np.eye(d)
+    weights = np.linalg.solve(gram, centered.T @ (targets - target_mean) / n)
+    bias = target_mean - float(feature_means @ weights)
     return bias, weights
 
 
-def _predict_linear(bias: float, weights: list[float], row: list[float]) -> float:
-    return bias + sum(weights[idx] * row[idx] for idx in range(min(len(weights), len(row))))
+def _effective_sample_size(weights: np.ndarray) -> float:
+    total = float(weights.sum())
+    return (total ** 2) / max(float((weights * weights).sum()), 1e-9)
 
 
-def _standardize_with_reference(
-    matrix: list[list[float]],
-    means: list[float],
-    stds: list[float],
-) -> list[list[float]]:
-    if not matrix:
-        return []
-    out: list[list[float]] = []
-    for row in matrix:
-        out.append(
-            [
-                (row[idx] - means[idx]) / max(stds[idx], 1e-12)
-                for idx in range(min(len(row), len(means)))
-            ]
-        )
-    return out
+def _overlap_summary(treated_props: np.ndarray, control_props: np.ndarray) -> dict[str, Any]:
+    overlap_low = max(float(treated_props.min()), float(control_props.min()))
+    overlap_high = min(float(treated_props.max()), float(control_props.max()))
+    return {
+        "treated_propensity_range": [float(treated_props.min()), float(treated_props.max())],
+        "control_propensity_range": [float(control_props.min()), float(control_props.max())],
+        "overlap_range": [overlap_low, overlap_high],
+        "overlap_width": max(0.0, overlap_high - overlap_low),
+    }
 
 
 def _estimate_aipw_crossfit(
@@ -226,95 +230,48 @@ def _estimate_aipw_crossfit(
         return None
     folds = max(2, min(int(folds), n))
 
-    feature_matrix = [
-        [float(row["confounders"].get(name, 0.0)) for name in feature_names]
-        for row in rows
-    ]
-    treated = [int(row["treated"]) for row in rows]
-    outcomes = [float(row["outcome"]) for row in rows]
-
-    propensity_hat: list[float | None] = [None] * n
-    mu1_hat: list[float | None] = [None] * n
-    mu0_hat: list[float | None] = [None] * n
+    features, treated, outcomes = _design_matrix(rows, feature_names)
+    fold_of = np.arange(n) % folds
+    propensity = np.empty(n)
+    mu1 = np.empty(n)
+    mu0 = np.empty(n)
     fold_sizes: list[int] = []
 
-    index_to_fold = {idx: (idx % folds) for idx in range(n)}
     for fold_idx in range(folds):
-        test_indices = [idx for idx in range(n) if index_to_fold[idx] == fold_idx]
-        train_indices = [idx for idx in range(n) if index_to_fold[idx] != fold_idx]
-        if not test_indices or not train_indices:
+        test = fold_of == fold_idx
+        train = ~test
+        if not test.any() or not train.any():
             return None
 
-        x_train_raw = [feature_matrix[idx] for idx in train_indices]
-        x_train, means, stds = _standardize(x_train_raw)
-        y_treat_train = [treated[idx] for idx in train_indices]
-        y_outcome_train = [outcomes[idx] for idx in train_indices]
-
-        treated_train_count = sum(y_treat_train)
-        control_train_count = len(y_treat_train) - treated_train_count
+        x_train, means, stds = _standardize(features[train])
+        t_train = treated[train]
+        y_train = outcomes[train]
+        is_treated = t_train == 1.0
+        treated_train_count = int(is_treated.sum())
+        control_train_count = len(t_train) - treated_train_count
         if treated_train_count < 3 or control_train_count < 3:
             return None
 
-        prop_bias, prop_weights = _fit_logistic(x_train, y_treat_train)
-
-        treated_features = [x_train[i] for i, t in enumerate(y_treat_train) if t == 1]
-        treated_outcomes = [y_outcome_train[i] for i, t in enumerate(y_treat_train) if t == 1]
-        control_features = [x_train[i] for i, t in enumerate(y_treat_train) if t == 0]
-        control_outcomes = [y_outcome_train[i] for i, t in enumerate(y_treat_train) if t == 0]
-        if len(treated_features) < 3 or len(control_features) < 3:
-            return None
-
-        mu1_bias, mu1_weights = _fit_linear_regression(treated_features, treated_outcomes)
-        mu0_bias, mu0_weights = _fit_linear_regression(control_features, control_outcomes)
-
-        x_test_raw = [feature_matrix[idx] for idx in test_indices]
-        x_test = _standardize_with_reference(x_test_raw, means, stds)
-        fold_sizes.append(len(test_indices))
-        for pos, row_idx in enumerate(test_indices):
-            row = x_test[pos]
-            e_hat = _sigmoid(prop_bias + sum(prop_weights[j] * row[j] for j in range(len(prop_weights))))
-            e_hat = _clamp(e_hat, overlap_floor, 1.0 - overlap_floor)
-            propensity_hat[row_idx] = e_hat
-            mu1_hat[row_idx] = _predict_linear(mu1_bias, mu1_weights, row)
-            mu0_hat[row_idx] = _predict_linear(mu0_bias, mu0_weights, row)
-
-    if any(v is None for v in propensity_hat) or any(v is None for v in mu1_hat) or any(v is None for v in mu0_hat):
-        return None
+        prop_bias, prop_weights = _fit_logistic(x_train, t_train)
+        mu1_bias, mu1_weights = _fit_linear_regression(x_train[is_treated], y_train[is_treated])
+        mu0_bias, mu0_weights = _fit_linear_regression(x_train[~is_treated], y_train[~is_treated])
 
-    e = [float(v) for v in propensity_hat]
-    mu1 = [float(v) for v in mu1_hat]
-    mu0 = [float(v) for v in mu0_hat]
-
-    pseudo_outcomes: list[float] = []
-    treated_props: list[float] = []
-    control_props: list[float] = []
-    aipw_weights: list[float] = []
-    treated_weights: list[float] = []
-    control_weights: list[float] = []
-    for idx in range(n):
-        t = treated[idx]
-        y = outcomes[idx]
-        e_i = _clamp(e[idx], overlap_floor, 1.0 - overlap_floor)
-        m1_i = mu1[idx]
-        m0_i = mu0[idx]
-        pseudo = m1_i - m0_i + (t * (y - m1_i) / e_i) - ((1 - t) * (y - m0_i) / (1.0 - e_i))
-        pseudo_outcomes.append(pseudo)
-
-        if t == 1:
-            treated_props.append(e_i)
-            w = 1.0 / e_i
-            treated_weights.append(w)
-            control_weights.append(0.0)
-            aipw_weights.append(w)
-        else:
-            control_props.append(e_i)
-            w = 1.0 / (1.0 - e_i)
-            treated_weights.append(0.0)
-            control_weights.append(w)
-            aipw_weights.append(w)
-
-    ate = _mean(pseudo_outcomes)
-    pseudo_var = _variance(pseudo_outcomes, center=ate)
+        x_test = (features[test] - means) / np.maximum(stds, 1e-12)
+        fold_sizes.append(int(test.sum()))
+        propensity[test] = np.clip(
+            _sigmoid(prop_bias + x_test @ prop_weights), overlap_floor, 1.0 - overlap_floor,
+        )
+        mu1[test] = mu1_bias + x_test @ mu1_weights
+        mu0[test] = mu0_bias + x_test @ mu0_weights
+
+    pseudo_outcomes = (
+        mu1
+        - mu0
+        + treated * (outcomes - mu1) / propensity
+        - (1.0 - treated) * (outcomes - mu0) / (1.0 - propensity)
+    )
+    ate = float(pseudo_outcomes.mean())
+    pseudo_var = float(pseudo_outcomes.var(ddof=1))
     if not math.isfinite(pseudo_var):
         return None
     effect_sd = math.sqrt(max(pseudo_var, 1e-9))
@@ -323,19 +280,8 @@ def _estimate_aipw_crossfit(
     ci95 = [ate - delta, ate + delta]
     probability_positive = 1.0 - _normal_cdf(0.0, ate, max(se, 1e-9))
 
-    treated_weight_sum = sum(treated_weights)
-    control_weight_sum = sum(control_weights)
-    treated_effective_n = (
-        (treated_weight_sum ** 2)
-        / max(sum(w * w for w in treated_weights if w > 0.0), 1e-9)
-    )
-    control_effective_n = (
-        (control_weight_sum ** 2)
-        / max(sum(w * w for w in control_weights if w > 0.0), 1e-9)
-    )
-    overlap_low = max(min(treated_props), min(control_props))
-    overlap_high = min(max(treated_props), max(control_props))
-    overlap_width = max(0.0, overlap_high - overlap_low)
+    is_treated = treated == 1.0
+    aipw_weights = np.where(is_treated, 1.0 / propensity, 1.0 / (1.0 - propensity))
 
     return {
         "ate": ate,
@@ -345,63 +291,43 @@ def _estimate_aipw_crossfit(
         "folds": folds,
         "fold_sizes": fold_sizes,
         "diagnostics": {
-            "overlap": {
-                "treated_propensity_range": [min(treated_props), max(treated_props)],
-                "control_propensity_range": [min(control_props), max(control_props)],
-                "overlap_range": [overlap_low, overlap_high],
-                "overlap_width": overlap_width,
-            },
+            "overlap": _overlap_summary(propensity[is_treated], propensity[~is_treated]),
             "weights": {
-                "max": max(aipw_weights),
-                "p95": _quantile(aipw_weights, 0.95),
+                "max": float(aipw_weights.max()),
+                "p95": float(np.quantile(aipw_weights, 0.95)),
             },
             "effective_sample_size": {
-                "treated": treated_effective_n,
-                "control": control_effective_n,
+                "treated": _effective_sample_size(aipw_weights[is_treated]),
+                "control": _effective_sample_size(aipw_weights[~is_treated]),
             },
         },
     }
 
 
-def _weighted_mean(values: list[float], weights: list[float]) -> float:
-    total_weight = sum(weights)
-    if total_weight <= 0.0:
-        return 0.0
-    return sum(v * w for v, w in zip(values, weights)) / total_weight
-
-
-def _weighted_variance(values: list[float], weights: list[float], center: float) -> float:
-    total_weight = sum(weights)
-    if total_weight <= 0.0:
-        return 0.0
-    return sum(w * (v - center) ** 2 for v, w in zip(values, weights)) / total_weight
-
-
-def _standardized_mean_difference(
-    treated_values: list[float],
-    control_values: list[float],
-    treated_weights: list[float] | None = None,
-    control_weights: list[float] | None = None,
-) -> float:
-    if not treated_values or not control_values:
-        return 0.0
-
-    if treated_weights is None:
-        mu_t = _mean(treated_values)
-        var_t = _variance(treated_values, center=mu_t)
-    else:
-        mu_t = _weighted_mean(treated_values, treated_weights)
-        var_t = _weighted_variance(treated_values, treated_weights, mu_t)
-
-    if control_weights is None:
-        mu_c = _mean(control_values)
-        var_c = _variance(control_values, center=mu_c)
-    else:
-        mu_c = _weighted_mean(control_values, control_weights)
-        var_c = _weighted_variance(control_values, control_weights, mu_c)
-
-    denom = math.sqrt(max((var_t + var_c) / 2.0, 1e-12))
-    return (mu_t - mu_c) / denom
+def _standardized_mean_differences(
+    treated_values: np.ndarray,
+    control_values: np.ndarray,
+    treated_weights: np.ndarray | None = None,
+    control_weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """Per-column SMD; unweighted groups use sample variance, weighted ones population."""
+
+    def _moments(values: np.ndarray, weights: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+        if weights is None:
+            center = values.mean(axis=0)
+            if len(values) <= 1:
+                return center, np.zeros_like(center)
+            return center, values.var(axis=0, ddof=1)
+        total = float(weights.sum())
+        if total <= 0.0:
+            zeros = np.zeros(values.shape[1])
+            return zeros, zeros
+        center = (weights @ values) / total
+        return center, (weights @ (values - center) ** 2) / total
+
+    mu_t, var_t = _moments(treated_values, treated_weights)
+    mu_c, var_c = _moments(control_values, control_weights)
+    return (mu_t - mu_c) / np.sqrt(np.maximum((var_t + var_c) / 2.0, 1e-12))
 
 
 def _normalize_samples(
@@ -438,6 +364,21 @@ def _normalize_samples(
     return normalized, sorted(feature_names)
 
 
+
+def _ipw_weights(
+    treated: np.ndarray,
+    propensities: np.ndarray,
+    treated_rate: np.ndarray | float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Stabilized IPW weights split into (treated, control) arrays."""
+    rate = np.asarray(treated_rate)[..., None] if np.ndim(treated_rate) else treated_rate
+    treated_weights = np.where(treated == 1.0, rate / np.maximum(propensities, 1e-9), 0.0)
+    control_weights = np.where(
+        treated == 0.0, (1.0 - rate) / np.maximum(1.0 - propensities, 1e-9), 0.0,
+    )
+    return treated_weights, control_weights
+
+
 def _estimate_once(
     rows: list[dict[str, Any]],
     feature_names: list[str],
@@ -447,37 +388,31 @@ def _estimate_once(
     if not rows:
         return None
 
-    outcomes = [float(row["outcome"]) for row in rows]
-    treated = [int(row["treated"]) for row in rows]
-    treated_rate = _mean([float(v) for v in treated])
+    features, treated, outcomes = _design_matrix(rows, feature_names)
+    treated_rate = float(treated.mean())
 
     if treated_rate <= 0.0 or treated_rate >= 1.0:
         return None
 
-    feature_matrix = [
-        [float(row["confounders"].get(name, 0.0)) for name in feature_names]
-        for row in rows
-    ]
-    standardized_matrix, means, stds = _standardize(feature_matrix)
+    standardized_matrix, means, stds = _standardize(features)
 
     if feature_names:
         bias, coefficients = _fit_logistic(standardized_matrix, treated)
-        propensity_raw = [
-            _sigmoid(bias + sum(coefficients[j] * row[j] for j in range(len(feature_names))))
-            for row in standardized_matrix
-        ]
+        propensity_raw = _sigmoid(bias + standardized_matrix @ coefficients)
         model = {
-            "method": "logistic_gradient_descent",
+            "method": "logistic_newton",
             "feature_names": feature_names,
-            "intercept": round(bias, 6),
-            "coefficients": {name: round(coefficients[idx], 6) for idx, name in enumerate(feature_names)},
+            "intercept": round(float(bias), 6),
+            "coefficients": {
+                name: round(float(coefficients[idx]), 6) for idx, name in enumerate(feature_names)
+            },
             "standardization": {
-                name: {"mean": round(means[idx], 6), "std": round(stds[idx], 6)}
+                name: {"mean": round(float(means[idx]), 6), "std": round(float(stds[idx]), 6)}
                 for idx, name in enumerate(feature_names)
             },
         }
     else:
-        propensity_raw = [treated_rate] * len(rows)
+        propensity_raw = np.full(len(rows), treated_rate)
         model = {
             "method": "intercept_only",
             "feature_names": [],
@@ -486,90 +421,55 @@ def _estimate_once(
             "standardization": {},
         }
 
-    propensities = [_clamp(p, overlap_floor, 1.0 - overlap_floor) for p in propensity_raw]
+    propensities = np.clip(propensity_raw, overlap_floor, 1.0 - overlap_floor)
+    treated_weights, control_weights = _ipw_weights(treated, propensities, treated_rate)
+    all_weights = treated_weights + control_weights
 
-    treated_weights: list[float] = []
-    control_weights: list[float] = []
-    all_weights: list[float] = []
-    for idx, is_treated in enumerate(treated):
-        if is_treated == 1:
-            w = treated_rate / max(propensities[idx], 1e-9)
-            treated_weights.append(w)
-            control_weights.append(0.0)
-        else:
-            w = (1.0 - treated_rate) / max(1.0 - propensities[idx], 1e-9)
-            treated_weights.append(0.0)
-            control_weights.append(w)
-        all_weights.append(w)
-
-    treated_weight_sum = sum(treated_weights)
-    control_weight_sum = sum(control_weights)
+    treated_weight_sum = float(treated_weights.sum())
+    control_weight_sum = float(control_weights.sum())
     if treated_weight_sum <= 0.0 or control_weight_sum <= 0.0:
         return None
 
-    treated_mean = sum(
-        outcomes[idx] * treated_weights[idx] for idx in range(len(rows))
-    ) / treated_weight_sum
-    control_mean = sum(
-        outcomes[idx] * control_weights[idx] for idx in range(len(rows))
-    ) / control_weight_sum
+    treated_mean = float(outcomes @ treated_weights) / treated_weight_sum
+    control_mean = float(outcomes @ control_weights) / control_weight_sum
     ate = treated_mean - control_mean
 
-    treated_effective_n = (
-        (treated_weight_sum ** 2)
-        / max(sum(w * w for w in treated_weights if w > 0.0), 1e-9)
-    )
-    control_effective_n = (
-        (control_weight_sum ** 2)
-        / max(sum(w * w for w in control_weights if w > 0.0), 1e-9)
-    )
-
-    treated_props = [propensities[idx] for idx, flag in enumerate(treated) if flag == 1]
-    control_props = [propensities[idx] for idx, flag in enumerate(treated) if flag == 0]
-    overlap_low = max(min(treated_props), min(control_props))
-    overlap_high = min(max(treated_props), max(control_props))
-    overlap_width = max(0.0, overlap_high - overlap_low)
-
+    is_treated = treated == 1.0
     before_balance: dict[str, float] = {}
     after_balance: dict[str, float] = {}
     if feature_names:
+        t_vals = standardized_matrix[is_treated]
+        c_vals = standardized_matrix[~is_treated]
+        before = _standardized_mean_differences(t_vals, c_vals)
+        after = _standardized_mean_differences(
+            t_vals,
+            c_vals,
+            treated_weights=treated_weights[is_treated],
+            control_weights=control_weights[~is_treated],
+        )
         for idx, name in enumerate(feature_names):
-            t_vals = [standardized_matrix[row_idx][idx] for row_idx, flag in enumerate(treated) if flag == 1]
-            c_vals = [standardized_matrix[row_idx][idx] for row_idx, flag in enumerate(treated) if flag == 0]
-            t_w = [treated_weights[row_idx] for row_idx, flag in enumerate(treated) if flag == 1]
-            c_w = [control_weights[row_idx] for row_idx, flag in enumerate(treated) if flag == 0]
-            before_balance[name] = _standardized_mean_difference(t_vals, c_vals)
-            after_balance[name] = _standardized_mean_difference(
-                t_vals,
-                c_vals,
-                treated_weights=t_w,
-                control_weights=c_w,
-            )
+            before_balance[name] = float(before[idx])
+            after_balance[name] = float(after[idx])
 
     mean_abs_before = _mean([abs(value) for value in before_balance.values()]) if before_balance else 0.0
     mean_abs_after = _mean([abs(value) for value in after_balance.values()]) if after_balance else 0.0
 
     return {
         "ate": ate,
-        "weights": all_weights,
-        "propensities": propensities,
+        "weights": all_weights.tolist(),
+        "propensities": propensities.tolist(),
         "model": model,
         "diagnostics": {
             "treated_weighted_mean": treated_mean,
             "control_weighted_mean": control_mean,
             "effective_sample_size": {
-                "treated": treated_effective_n,
-                "control": control_effective_n,
-            },
-            "overlap": {
-                "treated_propensity_range": [min(treated_props), max(treated_props)],
-                "control_propensity_range": [min(control_props), max(control_props)],
-                "overlap_range": [overlap_low, overlap_high],
-                "overlap_width": overlap_width,
+                "treated": _effective_sample_size(treated_weights[is_treated]),
+                "control": _effective_sample_size(control_weights[~is_treated]),
             },
+            "overlap": _overlap_summary(propensities[is_treated], propensities[~is_treated]),
             "weights": {
-                "max": max(all_weights),
-                "p95": _quantile(all_weights, 0.95),
+                "max": float(all_weights.max()),
+                "p95": float(np.quantile(all_weights, 0.95)),
             },
             "balance": {
                 "before": {k: round(v, 4) for k, v in before_balance.items()},
@@ -588,18 +488,52 @@ def _bootstrap_ates(
     overlap_floor: float,
     bootstrap_samples: int,
 ) -> list[float]:
-    rng = random.Random(42)
-    estimates: list[float] = []
+    """IPW ATEs for all bootstrap resamples, fitted as stacked Newton batches.
+
+    Resample indices are drawn once as a (bootstrap_samples, n) matrix; rows
+    are processed in chunks bounded by ``_BOOTSTRAP_CHUNK_ELEMENTS`` so memory
+    stays flat for long histories. Degenerate resamples (all treated or all
+    control) are dropped, as before.
+    """
     n = len(rows)
-    if n == 0:
-        return estimates
+    if n == 0 or bootstrap_samples <= 0:
+        return []
 
-    for _ in range(bootstrap_samples):
-        sample = [rows[rng.randrange(n)] for _ in range(n)]
-        estimate = _estimate_once(sample, feature_names, overlap_floor=overlap_floor)
-        if estimate is None:
+    features, treated, outcomes = _design_matrix(rows, feature_names)
+    rng = np.random.default_rng(42)
+    indices = rng.integers(0, n, size=(bootstrap_samples, n))
+    chunk = max(1, _BOOTSTRAP_CHUNK_ELEMENTS // (n * (len(feature_names) + 1)))
+
+    estimates: list[float] = []
+    for start in range(0, bootstrap_samples, chunk):
+        idx = indices[start:start + chunk]
+        t = treated[idx]
+        rate = t.mean(axis=1)
+        valid = (rate > 0.0) & (rate < 1.0)
+        if not valid.any():
             continue
-        estimates.append(float(estimate["ate"]))
+        idx, t, rate = idx[valid], t[valid], rate[valid]
+        y = outcomes[idx]
+
+        if feature_names:
+            standardized, _, _ = _standardize(features[idx])
+            bias, coefficients = _fit_logistic(standardized, t)
+            propensity_raw = _sigmoid(
+                bias[:, None] + np.matmul(standardized, coefficients[..., None])[..., 0]
+            )
+        else:
+            propensity_raw = np.broadcast_to(rate[:, None], t.shape)
+
+        propensities = np.clip(propensity_raw, overlap_floor, 1.0 - overlap_floor)
+        treated_weights, control_weights = _ipw_weights(t, propensities, rate)
+        treated_sum = treated_weights.sum(axis=1)
+        control_sum = control_weights.sum(axis=1)
+        ok = (treated_sum > 0.0) & (control_sum > 0.0)
+        ates = (
+            (y * treated_weights).sum(axis=1)[ok] / treated_sum[ok]
+            - (y * control_weights).sum(axis=1)[ok] / control_sum[ok]
+        )
+        estimates.extend(float(value) for value in ates)
     return estimates
 
 
@@ -0,0 +1,221 @@
+"""Process pool for CPU-bound inference work.
+
+The worker runs every job on one asyncio loop, so a handler that spends
+seconds in NumPy/PyMC (strength sampling, causal bootstraps, quality
+invariants) would otherwise stall the LISTEN loop and the health endpoint.
+Handlers hand such pure functions to ``run_compute``; the installed
+``ProcessPoolExecutor`` runs them in child processes that import
+NumPy/PyMC once at start-up. Arguments and results cross the process
+boundary by pickling, so callers pass module-level functions with
+plain-data inputs (dicts, lists, datetimes) and get plain data back.
+
+Without an installed executor (tests, ``KURA_COMPUTE_WORKERS=0``) work runs
+inline, exactly as before. On timeout or a crashed child, callers get their
+``fallback`` (e.g. the closed-form engine) instead of an error. A timed-out
+child is not left running: the pool is recycled (its processes terminated
+and a fresh pool installed) so one stuck fit cannot starve later calls.
+
+Child CPU time is measured per completed task and exported as
+``cpu_seconds``; it does not show up in the worker's own process CPU.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import signal
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Imported in every child so the first job does not pay for them.
+_PRELOAD_MODULES = (
+    "numpy",
+    "kura_workers.causal_inference",
+    "kura_workers.inference_engine",
+    "kura_workers.pymc_runtime",
+    "pymc",
+    "arviz",
+)
+
+
+class ComputeTimeoutError(TimeoutError):
+    """Offloaded work exceeded its timeout and no fallback was given."""
+
+
+_executor: ProcessPoolExecutor | None = None
+_executor_factory: Callable[[], ProcessPoolExecutor | None] | None = None
+_timeout_seconds: float = 120.0
+_stats: dict[str, int] = {
+    "submitted": 0,
+    "completed": 0,
+    "inline": 0,
+    "timeouts": 0,
+    "broken_pools": 0,
+    "recycled_pools": 0,
+    "fallbacks": 0,
+}
+_cpu_seconds: float = 0.0
+
+
+def _initialize_compute_process() -> None:
+    """Child initializer: leave signals to the parent and preload heavy modules."""
+    # Ctrl-C / SIGTERM go to the parent, which shuts the pool down cleanly.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for module in _PRELOAD_MODULES:
+        try:
+            __import__(module)
+        except Exception as exc:  # optional dependency (pymc/arviz) or broken install
+            logger.warning("Compute process could not preload %s: %s", module, exc)
+
+
+def _call_with_cpu_time(
+    fn: Callable[..., T], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[T, float]:
+    """Child-side wrapper: return ``fn``'s result and the CPU seconds it used."""
+    started = time.process_time()
+    result = fn(*args, **kwargs)
+    return result, time.process_time() - started
+
+
+def create_compute_executor(config: Config) -> ProcessPoolExecutor | None:
+    """Build the compute pool, or None when ``compute_workers`` is 0."""
+    if config.compute_workers <= 0:
+        return None
+    try:
+        context = multiprocessing.get_context(config.compute_start_method)
+    except ValueError:
+        logger.warning(
+            "Unknown compute start method %r; using spawn", config.compute_start_method
+        )
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(
+        max_workers=config.compute_workers,
+        mp_context=context,
+        initializer=_initialize_compute_process,
+    )
+
+
+def install_compute_executor(
+    executor: ProcessPoolExecutor | None,
+    *,
+    timeout_seconds: float,
+    factory: Callable[[], ProcessPoolExecutor | None] | None = None,
+) -> None:
+    """Register (or clear) the executor used by ``run_compute``.
+
+    ``factory`` rebuilds the pool after a child process dies.
+    """
+    global _executor, _executor_factory, _timeout_seconds
+    _executor = executor
+    _executor_factory = factory
+    _timeout_seconds = timeout_seconds
+
+
+async def shutdown_compute_executor() -> None:
+    """Cancel queued work, wait for running work and stop the children."""
+    global _executor, _executor_factory
+    executor = _executor
+    _executor = None
+    _executor_factory = None
+    if executor is None:
+        return
+    await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+    logger.info("Compute executor stopped")
+
+
+def compute_executor_stats() -> dict[str, Any]:
+    """Process-lifetime counters of offloaded work."""
+    return {
+        **_stats,
+        "cpu_seconds": round(_cpu_seconds, 3),
+        "enabled": _executor is not None,
+    }
+
+
+def _replace_broken_executor(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    if _executor is not executor:
+        return  # already replaced by a concurrent caller
+    executor.shutdown(wait=False, cancel_futures=True)
+    _executor = _executor_factory() if _executor_factory is not None else None
+
+
+def _recycle_timed_out_executor(executor: ProcessPoolExecutor) -> None:
+    """Terminate the children of a pool that holds a stuck task and replace it.
+
+    Other tasks still running in that pool fail with BrokenProcessPool and
+    take their own fallback.
+    """
+    global _executor
+    if _executor is not executor:
+        return  # already recycled by a concurrent caller
+    _stats["recycled_pools"] += 1
+    _executor = _executor_factory() if _executor_factory is not None else None
+    # ProcessPoolExecutor only gained terminate_workers() in 3.14.
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_compute(
+    fn: Callable[..., T],
+    /,
+    *args: Any,
+    timeout: float | None = None,
+    fallback: Callable[[], T] | None = None,
+    **kwargs: Any,
+) -> T:
+    """Run ``fn(*args, **kwargs)`` in the compute pool and await its result.
+
+    ``fn`` and its arguments must be picklable. If the call times out or the
+    pool breaks, ``fallback()`` runs inline instead; without a fallback the
+    error propagates. Exceptions raised by ``fn`` itself always propagate.
+    """
+    global _cpu_seconds
+    executor = _executor
+    if executor is None:
+        _stats["inline"] += 1
+        return fn(*args, **kwargs)
+
+    limit = _timeout_seconds if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    _stats["submitted"] += 1
+    try:
+        future = loop.run_in_executor(
+            executor, functools.partial(_call_with_cpu_time, fn, args, kwargs)
+        )
+        result, cpu_seconds = await asyncio.wait_for(future, timeout=limit)
+    except TimeoutError:
+        _stats["timeouts"] += 1
+        _recycle_timed_out_executor(executor)
+        name = getattr(fn, "__qualname__", repr(fn))
+        if fallback is None:
+            raise ComputeTimeoutError(f"{name} exceeded {limit:.1f}s") from None
+        logger.warning("Compute task %s exceeded %.1fs; using fallback", name, limit)
+    except BrokenProcessPool:
+        _stats["broken_pools"] += 1
+        _replace_broken_executor(executor)
+        if fallback is None:
+            raise
+        logger.warning("Compute pool broke while running %s; using fallback", fn)
+    else:
+        _stats["completed"] += 1
+        _cpu_seconds += cpu_seconds
+        return result
+
+    _stats["fallbacks"] += 1
+    return fallback()
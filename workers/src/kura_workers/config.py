@@ -8,7 +8,14 @@ class Config:
     listen_database_url: str
     poll_interval_seconds: float = 5.0
     batch_size: int = 10
+    concurrency: int = 1
+    db_pool_min_size: int = 1
+    db_pool_max_size: int = 4
+    db_pool_timeout_seconds: float = 30.0
     max_retries: int = 3
+    compute_workers: int = 1
+    compute_timeout_seconds: float = 120.0
+    compute_start_method: str = "forkserver"
     health_port: int = 8081
     log_format: str = "json"
 
@@ -21,12 +28,28 @@ class Config:
         if not listen_database_url:
             listen_database_url = database_url
 
+        concurrency = max(1, int(os.environ.get("KURA_WORKER_CONCURRENCY", "1")))
+        # Listen- and poll-triggered batches may overlap, each using one
+        # connection per slot — size the default pool for both.
+        pool_min_size = max(1, int(os.environ.get("KURA_DB_POOL_MIN_SIZE", "1")))
+        pool_max_size = int(
+            os.environ.get("KURA_DB_POOL_MAX_SIZE", str(max(4, 2 * concurrency)))
+        )
+
         return cls(
             database_url=database_url,
             listen_database_url=listen_database_url,
             poll_interval_seconds=float(os.environ.get("KURA_POLL_INTERVAL", "5.0")),
             batch_size=int(os.environ.get("KURA_BATCH_SIZE", "10")),
+            concurrency=concurrency,
+            db_pool_min_size=pool_min_size,
+            db_pool_max_size=max(pool_min_size, pool_max_size),
+            db_pool_timeout_seconds=float(os.environ.get("KURA_DB_POOL_TIMEOUT", "30.0")),
             max_retries=int(os.environ.get("KURA_MAX_RETRIES", "3")),
+            # 0 runs CPU-bound inference inline on the event loop.
+            compute_workers=max(0, int(os.environ.get("KURA_COMPUTE_WORKERS", "1"))),
+            compute_timeout_seconds=float(os.environ.get("KURA_COMPUTE_TIMEOUT", "120.0")),
+            compute_start_method=os.environ.get("KURA_COMPUTE_START_METHOD", "forkserver"),
             health_port=int(os.environ.get("KURA_HEALTH_PORT", "8081")),
             log_format=os.environ.get("KURA_LOG_FORMAT", "json"),
         )
@@ -593,7 +593,11 @@ async def refresh_consistency_inbox_for_user(
 
 async def refresh_all_consistency_inboxes(
     conn: psycopg.AsyncConnection[Any],
+    *,
+    user_id_from: str | None = None,
+    user_id_to: str | None = None,
 ) -> dict[str, Any]:
+    """Refresh inboxes of all users, or of the user range [user_id_from, user_id_to)."""
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
@@ -608,11 +612,17 @@ async def refresh_all_consistency_inboxes(
                 WHERE projection_type = 'quality_health'
                   AND key = 'overview'
             ) AS users
+            WHERE (%s::uuid IS NULL OR user_id >= %s::uuid)
+              AND (%s::uuid IS NULL OR user_id < %s::uuid)
             ORDER BY user_id
             """,
             (
                 list(_QUALITY_EVENT_TYPES)
                 + [CONSISTENCY_REVIEW_DECISION_EVENT_TYPE],
+                user_id_from,
+                user_id_from,
+                user_id_to,
+                user_id_to,
             ),
         )
         user_rows = await cur.fetchall()
@@ -0,0 +1,80 @@
+"""Pooled database connections for the worker.
+
+One AsyncConnectionPool is shared by the listen loop, the poll loop and all
+concurrency slots. Role setup happens once per physical connection (in the
+pool's configure callback) instead of once per batch, and broken connections
+are discarded on checkout so a DB restart does not poison the pool.
+
+The LISTEN connection itself is not pooled: it must stay open in autocommit
+mode for the lifetime of the loop and may point at a dedicated URL.
+
+Pooled connections create RowCountingCursor cursors, which report fetched
+rows to the per-handler rows_loaded metric.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import psycopg
+from psycopg.rows import Row
+from psycopg_pool import AsyncConnectionPool
+
+from .config import Config
+from .metrics import count_rows_loaded
+
+logger = logging.getLogger(__name__)
+
+WORKER_ROLE = "app_worker"
+
+
+class RowCountingCursor(psycopg.AsyncCursor[Row]):
+    """Client-side cursor that counts fetched rows for the metrics module."""
+
+    async def fetchone(self) -> Row | None:
+        row = await super().fetchone()
+        if row is not None:
+            count_rows_loaded(1)
+        return row
+
+    async def fetchmany(self, size: int = 0) -> list[Row]:
+        rows = await super().fetchmany(size)
+        count_rows_loaded(len(rows))
+        return rows
+
+    async def fetchall(self) -> list[Row]:
+        rows = await super().fetchall()
+        count_rows_loaded(len(rows))
+        return rows
+
+    async def __anext__(self) -> Row:
+        row = await super().__anext__()
+        count_rows_loaded(1)
+        return row
+
+
+async def configure_worker_connection(conn: psycopg.AsyncConnection[Any]) -> None:
+    """Assume app_worker role for BYPASSRLS (cross-user event/projection access)."""
+    await conn.execute(f"SET ROLE {WORKER_ROLE}")
+    await conn.commit()
+
+
+def create_worker_pool(config: Config) -> AsyncConnectionPool:
+    """Build the (unopened) worker pool. Call ``await pool.open()`` before use."""
+    return AsyncConnectionPool(
+        config.database_url,
+        min_size=config.db_pool_min_size,
+        max_size=config.db_pool_max_size,
+        open=False,
+        configure=configure_worker_connection,
+        check=AsyncConnectionPool.check_connection,
+        name="kura-worker",
+        timeout=config.db_pool_timeout_seconds,
+        kwargs={"cursor_factory": RowCountingCursor},
+    )
+
+
+def pool_stats(pool: AsyncConnectionPool) -> dict[str, int]:
+    """Point-in-time pool stats (sizes, waiting requests, error counters)."""
+    return dict(pool.get_stats())
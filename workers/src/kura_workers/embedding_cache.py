@@ -0,0 +1,278 @@
+"""Shared embedding cache and cross-job batching for user terms.
+
+Term embeddings depend only on the provider and the normalized text, so a
+term typed by many users is embedded once:
+
+- an in-process LRU (``KURA_EMBEDDING_CACHE_SIZE`` entries) answers hot
+  terms without a query;
+- ``semantic_embedding_cache`` is the global content-addressed store, keyed
+  by (model, hash of provider descriptor + text);
+- everything else goes to the ``EmbeddingBatcher``, which collects the
+  requests of concurrent jobs for a few milliseconds and runs one
+  ``embed_many`` off the event loop, so sentence-transformers inference
+  sees efficient batch sizes.
+
+Vectors produced by the hashing fallback (configured provider unavailable)
+are returned but never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any
+
+import psycopg
+from psycopg.rows import dict_row
+
+from .embeddings import EmbeddingProvider, decode_embedding, encode_embedding
+
+logger = logging.getLogger(__name__)
+
+Vector = list[float]
+
+
+def normalize_text(value: str) -> str:
+    return " ".join(value.strip().lower().split())
+
+
+def embedding_cache_key(provider_info: dict[str, str | int], text: str) -> str:
+    """Content address of ``text`` embedded by the described provider."""
+    payload = json.dumps(
+        {"provider": provider_info, "text": normalize_text(text)},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EmbeddingLRU:
+    """Bounded least-recently-used map of cache key -> vector."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(0, capacity)
+        self._items: OrderedDict[str, Vector] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Vector | None:
+        vec = self._items.get(key)
+        if vec is not None:
+            self._items.move_to_end(key)
+        return vec
+
+    def put(self, key: str, vec: Vector) -> None:
+        if self.capacity == 0:
+            return
+        self._items[key] = vec
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class EmbeddingBatcher:
+    """Merge concurrent ``embed_many`` calls into batched provider calls.
+
+    A batch runs when ``max_batch`` texts are waiting or ``max_wait_seconds``
+    after the first request, whichever comes first. Batches run one at a
+    time in a worker thread.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        *,
+        max_batch: int = 64,
+        max_wait_seconds: float = 0.005,
+    ) -> None:
+        self.provider = provider
+        self.max_batch = max(1, max_batch)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self._pending: list[tuple[list[str], asyncio.Future[tuple[list[Vector], bool]]]] = []
+        self._pending_texts = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.batches = 0
+
+    async def embed_many(self, texts: list[str]) -> tuple[list[Vector], bool]:
+        """Vectors for ``texts`` and whether the hashing fallback made them."""
+        if not texts:
+            return [], False
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[tuple[list[Vector], bool]] = loop.create_future()
+        self._pending.append((list(texts), future))
+        self._pending_texts += len(texts)
+        if self._pending_texts >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        self._pending_texts = 0
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _embed(self, texts: list[str]) -> tuple[list[Vector], bool]:
+        vectors = self.provider.embed_many(texts)
+        return vectors, self.provider.last_embed_fell_back
+
+    async def _run(
+        self,
+        pending: list[tuple[list[str], asyncio.Future[tuple[list[Vector], bool]]]],
+    ) -> None:
+        unique = list(dict.fromkeys(text for texts, _ in pending for text in texts))
+        try:
+            async with self._lock:
+                vectors, fell_back = await asyncio.to_thread(self._embed, unique)
+        except Exception as exc:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        self.batches += 1
+        by_text = dict(zip(unique, vectors))
+        for texts, future in pending:
+            if not future.done():
+                future.set_result(([by_text[text] for text in texts], fell_back))
+
+
+_lru = EmbeddingLRU(int(os.environ.get("KURA_EMBEDDING_CACHE_SIZE", "2048")))
+_batchers: dict[int, EmbeddingBatcher] = {}
+
+
+def _batcher_for(provider: EmbeddingProvider) -> EmbeddingBatcher:
+    batcher = _batchers.get(id(provider))
+    if batcher is None or batcher.provider is not provider:
+        batcher = EmbeddingBatcher(
+            provider,
+            max_batch=int(os.environ.get("KURA_EMBEDDING_BATCH_SIZE", "64")),
+            max_wait_seconds=float(os.environ.get("KURA_EMBEDDING_BATCH_WAIT_MS", "5")) / 1000.0,
+        )
+        _batchers[id(provider)] = batcher
+    return batcher
+
+
+def clear_embedding_cache() -> None:
+    """Drop the in-process LRU (tests, provider switches)."""
+    _lru.clear()
+
+
+async def _load_cached(
+    conn: psycopg.AsyncConnection[Any],
+    model: str,
+    keys: list[str],
+) -> dict[str, Vector]:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT content_hash, embedding_f32,
+                   CASE WHEN embedding_f32 IS NULL THEN embedding END AS embedding
+            FROM semantic_embedding_cache
+            WHERE model = %s
+              AND content_hash = ANY(%s)
+            """,
+            (model, keys),
+            binary=True,
+        )
+        rows = await cur.fetchall()
+    out: dict[str, Vector] = {}
+    for row in rows:
+        stored = row["embedding_f32"] if row["embedding_f32"] is not None else row["embedding"]
+        vec = decode_embedding(stored)
+        if vec.size:
+            out[row["content_hash"]] = vec.tolist()
+    return out
+
+
+async def _store_cached(
+    conn: psycopg.AsyncConnection[Any],
+    provider_info: dict[str, str | int],
+    rows: list[tuple[str, Vector]],
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO semantic_embedding_cache (
+                model, content_hash, provider, dimensions, embedding, embedding_f32
+            )
+            SELECT %s, t.content_hash, %s, %s, t.embedding, t.embedding_f32
+            FROM unnest(%s::text[], %s::jsonb[], %s::bytea[])
+                AS t(content_hash, embedding, embedding_f32)
+            ON CONFLICT (model, content_hash) DO NOTHING
+            """,
+            (
+                str(provider_info["model"]),
+                str(provider_info["provider"]),
+                int(provider_info["dimensions"]),
+                [key for key, _ in rows],
+                [json.dumps(vec) for _, vec in rows],
+                [encode_embedding(vec) for _, vec in rows],
+            ),
+        )
+
+
+async def embed_terms(
+    conn: psycopg.AsyncConnection[Any],
+    provider: EmbeddingProvider,
+    texts: list[str],
+) -> list[Vector]:
+    """Embeddings for ``texts`` (in order), served from the caches when possible."""
+    if not texts:
+        return []
+    provider_info = provider.descriptor()
+    keys = [embedding_cache_key(provider_info, text) for text in texts]
+
+    found: dict[str, Vector] = {}
+    for key in keys:
+        vec = _lru.get(key)
+        if vec is not None:
+            found[key] = vec
+
+    missing = list(dict.fromkeys(key for key in keys if key not in found))
+    if missing:
+        stored = await _load_cached(conn, str(provider_info["model"]), missing)
+        for key, vec in stored.items():
+            _lru.put(key, vec)
+        found.update(stored)
+
+    to_embed: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in to_embed:
+            to_embed[key] = normalize_text(text)
+    if to_embed:
+        if provider.provider == "hashing":
+            # Cheap and deterministic: no point in waiting for other jobs.
+            vectors = provider.embed_many(list(to_embed.values()))
+            fell_back = False
+        else:
+            vectors, fell_back = await _batcher_for(provider).embed_many(list(to_embed.values()))
+        # Round through the float32 storage layout so this job scores with
+        # exactly the values later jobs read back.
+        fresh = {
+            key: decode_embedding(encode_embedding(vec)).tolist()
+            for key, vec in zip(to_embed, vectors)
+        }
+        found.update(fresh)
+        if not fell_back:
+            for key, vec in fresh.items():
+                _lru.put(key, vec)
+            await _store_cached(conn, provider_info, list(fresh.items()))
+
+    return [found[key] for key in keys]
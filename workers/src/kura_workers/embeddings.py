@@ -8,16 +8,55 @@ pipeline functional in constrained environments.
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
 import math
 import os
 import re
 from collections import Counter
+from typing import Any
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 _TOKEN_RE = re.compile(r"[A-Za-z0-9_]+")
 
+# Byte layout of the ``embedding_f32`` bytea columns: big-endian float32,
+# the same as Postgres' float4send, which the backfill migration uses.
+EMBEDDING_F32_DTYPE = np.dtype(">f4")
+
+
+def encode_embedding(vec: list[float]) -> bytes:
+    """Pack a vector for the ``embedding_f32`` columns."""
+    return np.asarray(vec, dtype=EMBEDDING_F32_DTYPE).tobytes()
+
+
+def decode_embedding(value: Any) -> np.ndarray:
+    """Float64 array from an ``embedding_f32`` bytea or a legacy JSON embedding.
+
+    Returns an empty array for missing or malformed values.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        raw = memoryview(value)
+        if raw.nbytes == 0 or raw.nbytes % EMBEDDING_F32_DTYPE.itemsize:
+            return np.empty(0)
+        return np.frombuffer(raw, dtype=EMBEDDING_F32_DTYPE).astype(np.float64)
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except (ValueError, TypeError):
+            return np.empty(0)
+    if isinstance(value, list):
+        try:
+            arr = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            return np.empty(0)
+        if arr.ndim != 1 or not np.isfinite(arr).all():
+            return np.empty(0)
+        return arr
+    return np.empty(0)
+
 
 def cosine_similarity(a: list[float], b: list[float]) -> float:
     """Compute cosine similarity. Returns 0 for invalid vectors."""
@@ -91,6 +130,9 @@ class EmbeddingProvider:
         self.dimensions = int(os.environ.get("KURA_EMBEDDING_DIMENSIONS", "384"))
         self._sentence_model = None
         self._sentence_model_failed = False
+        # True when the last embed_many fell back from the configured
+        # provider to hashing embeddings.
+        self.last_embed_fell_back = False
 
     def descriptor(self) -> dict[str, str | int]:
         return {
@@ -103,6 +145,7 @@ class EmbeddingProvider:
         if not texts:
             return []
 
+        self.last_embed_fell_back = False
         if self.provider == "sentence_transformers":
             vecs = self._embed_sentence_transformers(texts)
             if vecs is not None:
@@ -114,6 +157,7 @@ class EmbeddingProvider:
                 return vecs
 
         # Safe fallback path.
+        self.last_embed_fell_back = self.provider != "hashing"
         return [_hashing_embedding(t, self.dimensions) for t in texts]
 
     def _embed_sentence_transformers(self, texts: list[str]) -> list[list[float]] | None:
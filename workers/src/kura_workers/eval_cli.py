@@ -33,7 +33,11 @@ def _build_parser() -> argparse.ArgumentParser:
         "--strength-engine",
         default="closed_form",
         choices=("closed_form", "pymc"),
-        help="Engine override used during strength replay windows.",
+        help=(
+            "Engine override used during strength replay windows. pymc fits every "
+            "KURA_EVAL_PYMC_WINDOW_STRIDE-th window (default 4) in a process pool "
+            "of KURA_EVAL_PYMC_WORKERS processes."
+        ),
     )
     parser.add_argument(
         "--semantic-top-k",
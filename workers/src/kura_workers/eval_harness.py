@@ -10,21 +10,25 @@ Optionally persists versioned run artifacts.
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
 import hashlib
+from bisect import bisect_left
 from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
 from .causal_inference import ASSUMPTIONS, estimate_intervention_effect
-from .embeddings import cosine_similarity, get_embedding_provider
+from .embeddings import cosine_similarity, decode_embedding, get_embedding_provider
 from .handlers.capability_estimation import build_capability_envelopes
 from .inference_engine import (
+    replay_strength_inference,
     run_readiness_inference,
     run_strength_inference,
     weekly_phase_from_date,
@@ -683,6 +687,8 @@ def _confidence_band(score: float) -> str:
 
 
 def _parse_embedding(value: Any) -> list[float]:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return decode_embedding(value).tolist()
     if not isinstance(value, list):
         return []
     out: list[float] = []
@@ -728,13 +734,101 @@ def _temporary_env(name: str, value: str | None):
             os.environ[name] = previous
 
 
+def _eval_pymc_window_stride() -> int:
+    raw = os.environ.get("KURA_EVAL_PYMC_WINDOW_STRIDE", "4")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 4
+
+
+def _eval_pymc_workers() -> int:
+    default = os.cpu_count() or 1
+    raw = os.environ.get("KURA_EVAL_PYMC_WORKERS", str(default))
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return default
+
+
+def _strength_window_stride(strength_engine: str) -> int:
+    if strength_engine != "pymc":
+        return 1
+    return _eval_pymc_window_stride()
+
+
+@contextmanager
+def _strength_replay_pool(
+    strength_engine: str,
+    pool: Executor | None = None,
+) -> Iterator[Executor | None]:
+    """Process pool for PyMC replay windows, shared by one evaluation run.
+
+    Yields ``pool`` unchanged when the caller already owns one, and None
+    when windows are fit inline (closed-form engines, or
+    KURA_EVAL_PYMC_WORKERS=1). Spawned children inherit the KURA_BAYES_*
+    settings of the moment they start.
+    """
+    if pool is not None or strength_engine != "pymc":
+        yield pool
+        return
+    workers = _eval_pymc_workers()
+    if workers <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as owned:
+        yield owned
+
+
+def _fit_strength_window(points: list[tuple[int, float]], strength_engine: str) -> dict[str, Any]:
+    return run_strength_inference(points, engine=strength_engine)
+
+
+def _iter_strength_replay_windows(
+    model_points: list[tuple[int, float]],
+    strength_engine: str,
+    stride: int,
+    pool: Executor | None = None,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (index, inference) for the replay windows ``model_points[: index + 1]``.
+
+    Closed-form engines replay every window from running sufficient
+    statistics. PyMC refits each window, so only every ``stride``-th window
+    is fit, on ``pool`` when given (see ``_strength_replay_pool``).
+    """
+    if strength_engine != "pymc":
+        for i, inference in enumerate(
+            replay_strength_inference(model_points, engine=strength_engine)
+        ):
+            if i >= 2:
+                yield i, inference
+        return
+
+    indices = list(range(2, len(model_points), stride))
+    windows = [model_points[: i + 1] for i in indices]
+    if pool is None or len(windows) <= 1:
+        for i, window in zip(indices, windows):
+            yield i, _fit_strength_window(window, strength_engine)
+        return
+
+    yield from zip(
+        indices,
+        pool.map(_fit_strength_window, windows, [strength_engine] * len(windows)),
+    )
+
+
 def evaluate_strength_history(
     key: str,
     history: Any,
     *,
     strength_engine: str = "closed_form",
+    pool: Executor | None = None,
 ) -> dict[str, Any]:
     series = _read_strength_series(history)
+    window_stride = _strength_window_stride(strength_engine)
     if len(series) < 3:
         return {
             "projection_type": "strength_inference",
@@ -742,6 +836,7 @@ def evaluate_strength_history(
             "status": "insufficient_data",
             "series_points": len(series),
             "replay_windows": 0,
+            "replay_window_stride": window_stride,
             "labeled_windows": 0,
             "metrics": {
                 "coverage_ci95": None,
@@ -756,6 +851,7 @@ def evaluate_strength_history(
 
     start = series[0][0]
     model_points = [((d - start).days, v) for d, v in series]
+    series_dates = [d for d, _ in series]
 
     replay_windows = 0
     labeled_windows = 0
@@ -772,9 +868,9 @@ def evaluate_strength_history(
     derivative_direction_eps = float(os.environ.get("KURA_STRENGTH_DERIVATIVE_VELOCITY_EPS", "0.03"))
 
     with _temporary_env("KURA_BAYES_ENGINE", strength_engine):
-        for i in range(2, len(model_points)):
-            train_points = model_points[: i + 1]
-            inference = run_strength_inference(train_points)
+        for i, inference in _iter_strength_replay_windows(
+            model_points, strength_engine, window_stride, pool
+        ):
             if inference.get("status") == "insufficient_data":
                 continue
 
@@ -795,10 +891,9 @@ def evaluate_strength_history(
             target_date = current_date + timedelta(days=horizon_days)
 
             actual_future: float | None = None
-            for future_date, future_value in series[i + 1 :]:
-                if future_date >= target_date:
-                    actual_future = future_value
-                    break
+            future_index = bisect_left(series_dates, target_date, lo=i + 1)
+            if future_index < len(series):
+                actual_future = series[future_index][1]
             if actual_future is None or pred_mean is None or pred_ci is None:
                 continue
 
@@ -851,6 +946,7 @@ def evaluate_strength_history(
         "status": status,
         "series_points": len(series),
         "replay_windows": replay_windows,
+        "replay_window_stride": window_stride,
         "labeled_windows": labeled_windows,
         "engines_used": engines_used,
         "horizon_days_seen": sorted(set(horizons_seen)),
@@ -2304,14 +2400,16 @@ def evaluate_from_event_store_rows(
     results: list[dict[str, Any]] = []
     if "strength_inference" in selected:
         histories = build_strength_histories_from_event_rows(active_rows, alias_map)
-        for key in sorted(histories):
-            result = evaluate_strength_history(
-                key,
-                histories[key],
-                strength_engine=strength_engine,
-            )
-            result["source"] = EVAL_SOURCE_EVENT_STORE
-            results.append(result)
+        with _strength_replay_pool(strength_engine) as pool:
+            for key in sorted(histories):
+                result = evaluate_strength_history(
+                    key,
+                    histories[key],
+                    strength_engine=strength_engine,
+                    pool=pool,
+                )
+                result["source"] = EVAL_SOURCE_EVENT_STORE
+                results.append(result)
 
     if "readiness_inference" in selected:
         readiness_daily = build_readiness_daily_scores_from_event_rows(active_rows)
@@ -3837,18 +3935,20 @@ async def _run_shadow_tier(
     config: dict[str, Any],
 ) -> dict[str, Any]:
     outputs: list[dict[str, Any]] = []
-    for user_id in user_ids:
-        outputs.append(
-            await run_eval_harness(
-                conn,
-                user_id=user_id,
-                projection_types=config["projection_types"],
-                strength_engine=config["strength_engine"],
-                semantic_top_k=int(config["semantic_top_k"]),
-                source=str(config["source"]),
-                persist=bool(config["persist"]),
+    with _strength_replay_pool(str(config["strength_engine"])) as pool:
+        for user_id in user_ids:
+            outputs.append(
+                await run_eval_harness(
+                    conn,
+                    user_id=user_id,
+                    projection_types=config["projection_types"],
+                    strength_engine=config["strength_engine"],
+                    semantic_top_k=int(config["semantic_top_k"]),
+                    source=str(config["source"]),
+                    persist=bool(config["persist"]),
+                    strength_pool=pool,
+                )
             )
-        )
 
     aggregate = _merge_shadow_eval_outputs(outputs)
     aggregate["model_tier"] = str(config["model_tier"])
@@ -4087,13 +4187,15 @@ async def _fetch_semantic_catalog_embeddings(
                 SELECT DISTINCT ON (c.canonical_key)
                     c.canonical_key,
                     c.canonical_label,
-                    ce.embedding
+                    ce.embedding_f32,
+                    CASE WHEN ce.embedding_f32 IS NULL THEN ce.embedding END AS embedding
                 FROM semantic_catalog c
                 JOIN semantic_catalog_embeddings ce ON ce.catalog_id = c.id
                 WHERE c.domain = %s
                 ORDER BY c.canonical_key, ce.updated_at DESC, ce.created_at DESC
                 """,
                 (domain,),
+                binary=True,
             )
             rows = await cur.fetchall()
     except Exception as exc:
@@ -4102,7 +4204,9 @@ async def _fetch_semantic_catalog_embeddings(
 
     out: list[dict[str, Any]] = []
     for row in rows:
-        vec = _parse_embedding(row["embedding"])
+        # Dual read: rows written before the float32 backfill only carry JSON.
+        stored = row.get("embedding_f32")
+        vec = _parse_embedding(stored if stored is not None else row.get("embedding"))
         if not vec:
             continue
         out.append(
@@ -4216,6 +4320,7 @@ async def _projection_history_results(
     strength_engine: str,
     semantic_labels: dict[str, str] | None = None,
     semantic_top_k: int = SEMANTIC_DEFAULT_TOP_K,
+    strength_pool: Executor | None = None,
 ) -> list[dict[str, Any]]:
     rows = await _fetch_projection_rows(conn, user_id=user_id, projection_types=projection_types)
     results: list[dict[str, Any]] = []
@@ -4228,6 +4333,7 @@ async def _projection_history_results(
                 key,
                 data.get("history"),
                 strength_engine=strength_engine,
+                pool=strength_pool,
             )
         elif projection_type == "readiness_inference":
             eval_result = evaluate_readiness_daily_scores(
@@ -4265,6 +4371,7 @@ async def _event_store_results(
     strength_engine: str,
     semantic_top_k: int = SEMANTIC_DEFAULT_TOP_K,
     semantic_catalog_embeddings: list[dict[str, Any]] | None = None,
+    strength_pool: Executor | None = None,
 ) -> list[dict[str, Any]]:
     event_types: set[str] = set()
     if "semantic_memory" in projection_types:
@@ -4309,6 +4416,7 @@ async def _event_store_results(
                 key,
                 histories[key],
                 strength_engine=strength_engine,
+                pool=strength_pool,
             )
             eval_result["source"] = EVAL_SOURCE_EVENT_STORE
             results.append(eval_result)
@@ -4368,6 +4476,7 @@ async def run_eval_harness(
     semantic_top_k: int = SEMANTIC_DEFAULT_TOP_K,
     source: str = EVAL_SOURCE_PROJECTION_HISTORY,
     persist: bool = False,
+    strength_pool: Executor | None = None,
 ) -> dict[str, Any]:
     selected = _normalize_projection_types(projection_types)
     source_mode = _normalize_source(source)
@@ -4385,28 +4494,31 @@ async def run_eval_harness(
             )
 
     results: list[dict[str, Any]] = []
-    if source_mode in {EVAL_SOURCE_PROJECTION_HISTORY, EVAL_SOURCE_BOTH}:
-        results.extend(
-            await _projection_history_results(
-                conn,
-                user_id=user_id,
-                projection_types=selected,
-                strength_engine=strength_engine,
-                semantic_labels=semantic_labels,
-                semantic_top_k=semantic_top_k,
+    with _strength_replay_pool(strength_engine, strength_pool) as pool:
+        if source_mode in {EVAL_SOURCE_PROJECTION_HISTORY, EVAL_SOURCE_BOTH}:
+            results.extend(
+                await _projection_history_results(
+                    conn,
+                    user_id=user_id,
+                    projection_types=selected,
+                    strength_engine=strength_engine,
+                    semantic_labels=semantic_labels,
+                    semantic_top_k=semantic_top_k,
+                    strength_pool=pool,
+                )
             )
-        )
-    if source_mode in {EVAL_SOURCE_EVENT_STORE, EVAL_SOURCE_BOTH}:
-        results.extend(
-            await _event_store_results(
-                conn,
-                user_id=user_id,
-                projection_types=selected,
-                strength_engine=strength_engine,
-                semantic_top_k=semantic_top_k,
-                semantic_catalog_embeddings=semantic_catalog_embeddings,
+        if source_mode in {EVAL_SOURCE_EVENT_STORE, EVAL_SOURCE_BOTH}:
+            results.extend(
+                await _event_store_results(
+                    conn,
+                    user_id=user_id,
+                    projection_types=selected,
+                    strength_engine=strength_engine,
+                    semantic_top_k=semantic_top_k,
+                    semantic_catalog_embeddings=semantic_catalog_embeddings,
+                    strength_pool=pool,
+                )
             )
-        )
 
     context_tags = await _fetch_eval_context_tags(conn, user_id=user_id)
     for row in results:
@@ -0,0 +1,121 @@
+"""Per-dispatch event snapshot shared by the projection handlers of one event.
+
+``handle_projection_update`` fans one event out to up to a dozen handlers,
+and each of them used to re-read the same user's history: retracted ids,
+alias map, timezone preference and the event rows of its own types. The
+router opens an ``EventSnapshot`` around the dispatch and the loaders in
+``utils`` serve from it:
+
+- ``get_retracted_event_ids``, ``get_alias_map`` and
+  ``load_timezone_preference`` are resolved once per dispatch;
+- ``load_user_events`` / ``load_set_corrections`` answer from a single
+  ordered scan over the union of event types the dispatched handlers
+  declare, loaded on first use.
+
+Handlers that write events mid-dispatch (quality_health repairs) call
+``invalidate_event_snapshot`` so later handlers see the new rows.
+
+Handlers get fresh lists of shallow row copies, so adding keys to a row
+does not leak into the next handler (nested ``data`` dicts are shared and
+must be treated as read-only, as they already are). Outside a dispatch
+(projection.retry, scripts, tests) every loader queries the database as
+before.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import psycopg
+from psycopg.rows import dict_row
+
+
+def _row_order_key(row: dict[str, Any]) -> tuple[Any, str]:
+    return row["timestamp"], str(row["id"])
+
+
+@dataclass
+class EventSnapshot:
+    """User-scoped event rows and resolved lookups for one dispatch."""
+
+    user_id: str
+    event_types: frozenset[str]
+    memo: dict[Any, Any] = field(default_factory=dict)
+    rows_by_type: dict[str, list[dict[str, Any]]] | None = None
+
+    def covers(self, event_types: Iterable[str]) -> bool:
+        return all(event_type in self.event_types for event_type in event_types)
+
+    async def load(self, conn: psycopg.AsyncConnection[Any]) -> None:
+        """Run the single ordered scan over all snapshot event types (once)."""
+        if self.rows_by_type is not None:
+            return
+        rows_by_type: dict[str, list[dict[str, Any]]] = {
+            event_type: [] for event_type in self.event_types
+        }
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT id, event_type, timestamp, data, metadata
+                FROM events
+                WHERE user_id = %s
+                  AND event_type = ANY(%s)
+                ORDER BY timestamp ASC, id ASC
+                """,
+                (self.user_id, sorted(self.event_types)),
+            )
+            for row in await cur.fetchall():
+                rows_by_type[row["event_type"]].append(row)
+        self.rows_by_type = rows_by_type
+
+    def invalidate(self) -> None:
+        """Drop loaded rows and memoized lookups (after events were written)."""
+        self.memo.clear()
+        self.rows_by_type = None
+
+    def rows(self, event_types: Iterable[str]) -> list[dict[str, Any]]:
+        """Rows of the given (covered) types in (timestamp, id) order."""
+        if self.rows_by_type is None:
+            raise RuntimeError("EventSnapshot.load() must run before rows()")
+        streams = [self.rows_by_type[event_type] for event_type in dict.fromkeys(event_types)]
+        if len(streams) == 1:
+            merged: Iterable[dict[str, Any]] = streams[0]
+        else:
+            merged = heapq.merge(*streams, key=_row_order_key)
+        return [dict(row) for row in merged]
+
+
+_active_snapshot: ContextVar[EventSnapshot | None] = ContextVar(
+    "kura_event_snapshot", default=None
+)
+
+
+@contextmanager
+def event_snapshot(user_id: str, event_types: Iterable[str]) -> Iterator[EventSnapshot]:
+    """Activate a snapshot for ``user_id`` in the current task while the block runs."""
+    snapshot = EventSnapshot(user_id=str(user_id), event_types=frozenset(event_types))
+    token = _active_snapshot.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _active_snapshot.reset(token)
+
+
+def active_event_snapshot(user_id: str) -> EventSnapshot | None:
+    """The snapshot of the running dispatch, if it belongs to ``user_id``."""
+    snapshot = _active_snapshot.get()
+    if snapshot is None or snapshot.user_id != str(user_id):
+        return None
+    return snapshot
+
+
+def invalidate_event_snapshot(user_id: str) -> None:
+    """Invalidate the running dispatch's snapshot for ``user_id``, if any."""
+    snapshot = active_event_snapshot(user_id)
+    if snapshot is not None:
+        snapshot.invalidate()
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 import logging
 import os
@@ -13,6 +14,8 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from .utils import iter_server_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -117,12 +120,6 @@ def _field_from_claim_class(claim_class: str) -> str:
     return claim_class.strip()
 
 
-def _mean(values: list[float]) -> float:
-    if not values:
-        return 0.0
-    return sum(values) / float(len(values))
-
-
 def _safe_ratio(numerator: float, denominator: float) -> float | None:
     if denominator <= 0.0:
         return None
@@ -160,44 +157,84 @@ def _status_from_metrics(
     return "healthy"
 
 
+@dataclass
+class CalibrationBucket:
+    """Running sufficient statistics of one calibration metric row."""
+
+    sample_count: int = 0
+    correct_count: int = 0
+    confidence_sum: float = 0.0
+    squared_error_sum: float = 0.0
+    high_conf_count: int = 0
+    high_conf_correct: int = 0
+    band_counts: dict[str, int] = field(default_factory=dict)
+    band_correct: dict[str, int] = field(default_factory=dict)
+
+
+def add_calibration_record(
+    buckets: dict[tuple[str, str, str, str], CalibrationBucket],
+    record: CalibrationRecord,
+    *,
+    settings: ExtractionCalibrationSettings,
+) -> None:
+    correct = record.label >= 0.5
+    band = _confidence_band(record.confidence)
+    for granularity in ("day", "week"):
+        bucket = buckets.setdefault(
+            (
+                granularity,
+                _period_key(record.captured_at, granularity),
+                record.claim_class,
+                record.parser_version,
+            ),
+            CalibrationBucket(),
+        )
+        bucket.sample_count += 1
+        bucket.correct_count += int(correct)
+        bucket.confidence_sum += record.confidence
+        bucket.squared_error_sum += (record.confidence - record.label) ** 2
+        if record.confidence >= settings.high_conf_threshold:
+            bucket.high_conf_count += 1
+            bucket.high_conf_correct += int(correct)
+        bucket.band_counts[band] = bucket.band_counts.get(band, 0) + 1
+        bucket.band_correct[band] = bucket.band_correct.get(band, 0) + int(correct)
+
+
 def build_calibration_metrics(
     records: list[CalibrationRecord],
     *,
     settings: ExtractionCalibrationSettings,
 ) -> list[dict[str, Any]]:
-    grouped: dict[tuple[str, str, str, str], list[CalibrationRecord]] = defaultdict(list)
-    for record in records:
-        for granularity in ("day", "week"):
-            grouped[
-                (
-                    granularity,
-                    _period_key(record.captured_at, granularity),
-                    record.claim_class,
-                    record.parser_version,
-                )
-            ].append(record)
+    buckets: dict[tuple[str, str, str, str], CalibrationBucket] = {}
+    for record in sorted(records, key=lambda item: item.captured_at):
+        add_calibration_record(buckets, record, settings=settings)
+    return build_calibration_metrics_from_buckets(buckets, settings=settings)
+
 
+def build_calibration_metrics_from_buckets(
+    buckets: dict[tuple[str, str, str, str], CalibrationBucket],
+    *,
+    settings: ExtractionCalibrationSettings,
+) -> list[dict[str, Any]]:
     metrics: list[dict[str, Any]] = []
-    for key in sorted(grouped.keys()):
+    for key in sorted(buckets.keys()):
         granularity, period_key, claim_class, parser_version = key
-        bucket = sorted(grouped[key], key=lambda item: item.captured_at)
-        sample_count = len(bucket)
-        correct_count = sum(1 for item in bucket if item.label >= 0.5)
+        bucket = buckets[key]
+        sample_count = bucket.sample_count
+        correct_count = bucket.correct_count
         incorrect_count = sample_count - correct_count
-        avg_confidence = _mean([item.confidence for item in bucket])
-        brier_score = _mean([(item.confidence - item.label) ** 2 for item in bucket])
+        avg_confidence = bucket.confidence_sum / float(sample_count)
+        brier_score = bucket.squared_error_sum / float(sample_count)
 
-        high_conf = [item for item in bucket if item.confidence >= settings.high_conf_threshold]
-        high_conf_count = len(high_conf)
-        high_conf_correct = sum(1 for item in high_conf if item.label >= 0.5)
+        high_conf_count = bucket.high_conf_count
+        high_conf_correct = bucket.high_conf_correct
         precision_high_conf = _safe_ratio(float(high_conf_correct), float(high_conf_count))
         recall_high_conf = _safe_ratio(float(high_conf_correct), float(correct_count))
 
         band_stats: dict[str, dict[str, Any]] = {}
         for band in ("high", "medium", "low"):
-            band_items = [item for item in bucket if _confidence_band(item.confidence) == band]
-            band_total = len(band_items)
-            band_correct = sum(1 for item in band_items if item.label >= 0.5)
+            band_total = bucket.band_counts.get(band, 0)
+            band_correct = bucket.band_correct.get(band, 0)
             band_stats[band] = {
                 "count": band_total,
                 "precision": (
@@ -344,10 +381,9 @@ async def _load_retracted_target_event_ids(
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT data->>'retracted_event_id' AS retracted_event_id
-            FROM events
-            WHERE event_type = 'event.retracted'
-              AND timestamp >= NOW() - make_interval(days => %s)
+            SELECT retracted_event_id::text AS retracted_event_id
+            FROM event_retractions
+            WHERE retracted_at >= NOW() - make_interval(days => %s)
             """,
             (window_days,),
         )
@@ -364,21 +400,19 @@ async def _load_corrected_fields_by_target_event(
     *,
     window_days: int,
 ) -> dict[str, set[str]]:
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT data
-            FROM events
-            WHERE event_type = 'set.corrected'
-              AND timestamp >= NOW() - make_interval(days => %s)
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (window_days,),
-        )
-        rows = await cur.fetchall()
-
     corrected: dict[str, set[str]] = defaultdict(set)
-    for row in rows:
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT data
+        FROM events
+        WHERE event_type = 'set.corrected'
+          AND timestamp >= NOW() - make_interval(days => %s)
+        ORDER BY timestamp ASC, id ASC
+        """,
+        (window_days,),
+        name="extraction_calibration_corrections",
+    ):
         data = row.get("data")
         if not isinstance(data, dict):
             continue
@@ -394,81 +428,74 @@ async def _load_corrected_fields_by_target_event(
     return corrected
 
 
-async def _load_claim_rows(
+def _iter_claim_rows(
     conn: psycopg.AsyncConnection[Any],
     *,
     window_days: int,
-) -> list[dict[str, Any]]:
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT e.id::text AS event_id, e.timestamp, e.data
-            FROM events e
-            WHERE e.event_type = 'evidence.claim.logged'
-              AND e.timestamp >= NOW() - make_interval(days => %s)
-              AND NOT EXISTS (
-                  SELECT 1
-                  FROM events r
-                  WHERE r.event_type = 'event.retracted'
-                    AND r.data->>'retracted_event_id' = e.id::text
-              )
-            ORDER BY e.timestamp ASC, e.id ASC
-            """,
-            (window_days,),
-        )
-        return await cur.fetchall()
+) -> AsyncIterator[dict[str, Any]]:
+    return iter_server_rows(
+        conn,
+        """
+        SELECT e.id::text AS event_id, e.timestamp, e.data
+        FROM events e
+        WHERE e.event_type = 'evidence.claim.logged'
+          AND e.timestamp >= NOW() - make_interval(days => %s)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM event_retractions r
+              WHERE r.retracted_event_id = e.id
+          )
+        ORDER BY e.timestamp ASC, e.id ASC
+        """,
+        (window_days,),
+        name="extraction_calibration_claims",
+    )
 
 
-def _build_calibration_records(
-    claim_rows: list[dict[str, Any]],
+def _calibration_record_from_row(
+    row: dict[str, Any],
     *,
     retracted_target_event_ids: set[str],
     corrected_fields_by_target: dict[str, set[str]],
-) -> list[CalibrationRecord]:
-    records: list[CalibrationRecord] = []
+) -> CalibrationRecord | None:
+    data = row.get("data")
+    if not isinstance(data, dict):
+        return None
+    claim_class = _normalize_text(data.get("claim_type"), "")
+    if not claim_class:
+        return None
+    confidence = _clamp_confidence(data.get("confidence"))
+    provenance = data.get("provenance")
+    if not isinstance(provenance, dict):
+        provenance = {}
+    parser_version = _normalize_text(provenance.get("parser_version"))
+    lineage = data.get("lineage")
+    if not isinstance(lineage, dict):
+        lineage = {}
+    target_event_id = _normalize_text(lineage.get("event_id"), "")
+    field_name = _field_from_claim_class(claim_class)
+
+    label = 1.0
+    if target_event_id and target_event_id in retracted_target_event_ids:
+        label = 0.0
+    elif (
+        target_event_id
+        and field_name
+        and field_name in corrected_fields_by_target.get(target_event_id, set())
+    ):
+        label = 0.0
 
-    for row in claim_rows:
-        data = row.get("data")
-        if not isinstance(data, dict):
-            continue
-        claim_class = _normalize_text(data.get("claim_type"), "")
-        if not claim_class:
-            continue
-        confidence = _clamp_confidence(data.get("confidence"))
-        provenance = data.get("provenance")
-        if not isinstance(provenance, dict):
-            provenance = {}
-        parser_version = _normalize_text(provenance.get("parser_version"))
-        lineage = data.get("lineage")
-        if not isinstance(lineage, dict):
-            lineage = {}
-        target_event_id = _normalize_text(lineage.get("event_id"), "")
-        field_name = _field_from_claim_class(claim_class)
-
-        label = 1.0
-        if target_event_id and target_event_id in retracted_target_event_ids:
-            label = 0.0
-        elif (
-            target_event_id
-            and field_name
-            and field_name in corrected_fields_by_target.get(target_event_id, set())
-        ):
-            label = 0.0
-
-        timestamp = row.get("timestamp")
-        if not isinstance(timestamp, datetime):
-            continue
-        captured_at = timestamp.astimezone(UTC) if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
-        records.append(
-            CalibrationRecord(
-                captured_at=captured_at,
-                claim_class=claim_class,
-                parser_version=parser_version,
-                confidence=confidence,
-                label=label,
-            )
-        )
-    return records
+    timestamp = row.get("timestamp")
+    if not isinstance(timestamp, datetime):
+        return None
+    captured_at = timestamp.astimezone(UTC) if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
+    return CalibrationRecord(
+        captured_at=captured_at,
+        claim_class=claim_class,
+        parser_version=parser_version,
+        confidence=confidence,
+        label=label,
+    )
 
 
 async def _record_run(
@@ -541,7 +568,6 @@ async def refresh_extraction_calibration(
         )
         return summary
 
-    claim_rows = await _load_claim_rows(conn, window_days=settings.window_days)
     retracted_target_event_ids = await _load_retracted_target_event_ids(
         conn,
         window_days=settings.window_days,
@@ -550,12 +576,21 @@ async def refresh_extraction_calibration(
         conn,
         window_days=settings.window_days,
     )
-    records = _build_calibration_records(
-        claim_rows,
-        retracted_target_event_ids=retracted_target_event_ids,
-        corrected_fields_by_target=corrected_fields_by_target,
-    )
-    metrics = build_calibration_metrics(records, settings=settings)
+    buckets: dict[tuple[str, str, str, str], CalibrationBucket] = {}
+    total_claims = 0
+    considered_claims = 0
+    async for row in _iter_claim_rows(conn, window_days=settings.window_days):
+        total_claims += 1
+        record = _calibration_record_from_row(
+            row,
+            retracted_target_event_ids=retracted_target_event_ids,
+            corrected_fields_by_target=corrected_fields_by_target,
+        )
+        if record is None:
+            continue
+        considered_claims += 1
+        add_calibration_record(buckets, record, settings=settings)
+    metrics = build_calibration_metrics_from_buckets(buckets, settings=settings)
     underperforming = build_underperforming_classes(metrics)
 
     async with conn.cursor() as cur:
@@ -642,8 +677,8 @@ async def refresh_extraction_calibration(
     summary = {
         "status": "success",
         "window_days": settings.window_days,
-        "total_claims": len(claim_rows),
-        "considered_claims": len(records),
+        "total_claims": total_claims,
+        "considered_claims": considered_claims,
         "metrics_written": len(metrics),
         "underperforming_written": len(underperforming),
     }
@@ -651,8 +686,8 @@ async def refresh_extraction_calibration(
         conn,
         status="success",
         settings=settings,
-        total_claims=len(claim_rows),
-        considered_claims=len(records),
+        total_claims=total_claims,
+        considered_claims=considered_claims,
         metrics_written=len(metrics),
         underperforming_written=len(underperforming),
         details=summary,
@@ -9,7 +9,6 @@ from datetime import datetime
 from typing import Any
 
 import psycopg
-from psycopg.rows import dict_row
 
 from ..capability_estimation_runtime import (
     STATUS_DEGRADED_COMPARABILITY,
@@ -30,6 +29,7 @@ from ..utils import (
     SessionBoundaryState,
     get_retracted_event_ids,
     load_timezone_preference,
+    load_user_events,
     next_fallback_session_key,
     normalize_temporal_point,
     resolve_timezone_context,
@@ -597,20 +597,9 @@ async def update_capability_estimation(
     timezone_context = resolve_timezone_context(timezone_pref)
     timezone_name = timezone_context["timezone"]
 
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, event_type, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = ANY(%s)
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (user_id, list(CAPABILITY_BACKFILL_TRIGGER_EVENT_TYPES)),
-        )
-        rows = await cur.fetchall()
-
-    rows = [row for row in rows if str(row.get("id") or "") not in retracted_ids]
+    rows = await load_user_events(
+        conn, user_id, CAPABILITY_BACKFILL_TRIGGER_EVENT_TYPES, retracted_ids=retracted_ids
+    )
     normalized_rows = normalize_training_signal_rows(rows, include_passthrough=True)
 
     envelopes = build_capability_envelopes(normalized_rows, timezone_name=timezone_name)
@@ -11,6 +11,7 @@ machine-readable caveats for transparent agent decisions.
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import math
@@ -28,6 +29,7 @@ from ..causal_estimand_registry_v2 import (
     build_estimand_identity_v2,
     resolve_estimand_spec_v2,
 )
+from ..compute_executor import run_compute
 from ..inference_engine import weekly_phase_from_date
 from ..inference_event_registry import CAUSAL_SIGNAL_EVENT_TYPES
 from ..inference_telemetry import (
@@ -43,6 +45,7 @@ from ..utils import (
     epley_1rm,
     get_retracted_event_ids,
     load_timezone_preference,
+    load_user_events,
     normalize_temporal_point,
     resolve_exercise_key,
     resolve_timezone_context,
@@ -755,6 +758,86 @@ def _estimate_segment_slices(
     return results
 
 
+def _estimate_intervention_outcomes(
+    readiness_samples: list[dict[str, Any]],
+    strength_aggregate_samples: list[dict[str, Any]],
+    strength_by_exercise_samples: dict[str, list[dict[str, Any]]],
+    *,
+    min_samples: int,
+    strength_min_samples: int,
+    segment_min_samples: int,
+    bootstrap_samples: int,
+    include_placebo: bool = False,
+) -> dict[str, Any]:
+    """All effect estimates of one intervention (pure; runs in the compute pool)."""
+    strength_per_exercise_results: dict[str, dict[str, Any]] = {}
+    for exercise_id, exercise_samples in sorted(
+        strength_by_exercise_samples.items(),
+        key=lambda item: item[0],
+    ):
+        strength_per_exercise_results[exercise_id] = _estimate_effect(
+            exercise_samples,
+            min_samples=strength_min_samples,
+            bootstrap_samples=bootstrap_samples,
+        )
+
+    placebo_result: dict[str, Any] | None = None
+    if include_placebo:
+        placebo_samples = _build_placebo_lead_samples(readiness_samples)
+        if placebo_samples:
+            placebo_result = _estimate_effect(
+                placebo_samples,
+                min_samples=max(16, min_samples // 2),
+                bootstrap_samples=max(80, bootstrap_samples // 2),
+            )
+
+    return {
+        "readiness": _estimate_effect(
+            readiness_samples,
+            min_samples=min_samples,
+            bootstrap_samples=bootstrap_samples,
+        ),
+        "strength_aggregate": _estimate_effect(
+            strength_aggregate_samples,
+            min_samples=strength_min_samples,
+            bootstrap_samples=bootstrap_samples,
+        ),
+        "strength_per_exercise": strength_per_exercise_results,
+        "heterogeneous_effects": {
+            "minimum_segment_samples": segment_min_samples,
+            OUTCOME_READINESS: {
+                "subgroups": _estimate_segment_slices(
+                    readiness_samples,
+                    segment_key="subgroup",
+                    min_samples=segment_min_samples,
+                    bootstrap_samples=bootstrap_samples,
+                ),
+                "phases": _estimate_segment_slices(
+                    readiness_samples,
+                    segment_key="phase",
+                    min_samples=segment_min_samples,
+                    bootstrap_samples=bootstrap_samples,
+                ),
+            },
+            OUTCOME_STRENGTH_AGGREGATE: {
+                "subgroups": _estimate_segment_slices(
+                    strength_aggregate_samples,
+                    segment_key="subgroup",
+                    min_samples=segment_min_samples,
+                    bootstrap_samples=bootstrap_samples,
+                ),
+                "phases": _estimate_segment_slices(
+                    strength_aggregate_samples,
+                    segment_key="phase",
+                    min_samples=segment_min_samples,
+                    bootstrap_samples=bootstrap_samples,
+                ),
+            },
+        },
+        "placebo": placebo_result,
+    }
+
+
 def _append_result_caveats(
     machine_caveats: list[dict[str, Any]],
     *,
@@ -1065,20 +1148,9 @@ async def update_causal_inference(
         timezone_name = timezone_context["timezone"]
         objective_mode, objective_modality = await _resolve_objective_context(conn, user_id)
 
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT id, timestamp, event_type, data, metadata
-                FROM events
-                WHERE user_id = %s
-                  AND event_type = ANY(%s)
-                ORDER BY timestamp ASC
-                """,
-                (user_id, list(CAUSAL_SIGNAL_EVENT_TYPES)),
-            )
-            rows = await cur.fetchall()
-
-        rows = [row for row in rows if str(row["id"]) not in retracted_ids]
+        rows = await load_user_events(
+            conn, user_id, CAUSAL_SIGNAL_EVENT_TYPES, retracted_ids=retracted_ids
+        )
         if not rows:
             async with conn.cursor() as cur:
                 await cur.execute(
@@ -1583,30 +1655,42 @@ async def update_causal_inference(
                 if int(_safe_float(sample.get("treated"), default=0.0)) == 1
             )
 
-            readiness_result = _estimate_effect(
-                readiness_samples,
-                min_samples=min_samples,
-                bootstrap_samples=bootstrap_samples,
-            )
             strength_aggregate_samples = outcome_samples[OUTCOME_STRENGTH_AGGREGATE]
-            strength_aggregate_result = _estimate_effect(
+            estimate_kwargs = {
+                "min_samples": min_samples,
+                "strength_min_samples": strength_min_samples,
+                "segment_min_samples": segment_min_samples,
+                "include_placebo": name == "supplement_adherence",
+            }
+            estimates = await run_compute(
+                _estimate_intervention_outcomes,
+                readiness_samples,
                 strength_aggregate_samples,
-                min_samples=strength_min_samples,
+                strength_by_exercise_samples,
                 bootstrap_samples=bootstrap_samples,
+                # On timeout, re-run inline with the minimum bootstrap budget.
+                fallback=functools.partial(
+                    _estimate_intervention_outcomes,
+                    readiness_samples,
+                    strength_aggregate_samples,
+                    strength_by_exercise_samples,
+                    bootstrap_samples=0,
+                    **estimate_kwargs,
+                ),
+                **estimate_kwargs,
             )
-
-            strength_per_exercise_results: dict[str, dict[str, Any]] = {}
-            strength_per_exercise_windows: dict[str, int] = {}
-            for exercise_id, exercise_samples in sorted(
-                strength_by_exercise_samples.items(),
-                key=lambda item: item[0],
-            ):
-                strength_per_exercise_windows[exercise_id] = len(exercise_samples)
-                strength_per_exercise_results[exercise_id] = _estimate_effect(
-                    exercise_samples,
-                    min_samples=strength_min_samples,
-                    bootstrap_samples=bootstrap_samples,
+            readiness_result = estimates["readiness"]
+            strength_aggregate_result = estimates["strength_aggregate"]
+            strength_per_exercise_results: dict[str, dict[str, Any]] = estimates[
+                "strength_per_exercise"
+            ]
+            strength_per_exercise_windows: dict[str, int] = {
+                exercise_id: len(exercise_samples)
+                for exercise_id, exercise_samples in sorted(
+                    strength_by_exercise_samples.items(),
+                    key=lambda item: item[0],
                 )
+            }
 
             readiness_target_key = build_causal_estimand_target_key(
                 intervention=name,
@@ -1694,37 +1778,7 @@ async def update_causal_inference(
                     }
                 )
 
-            heterogeneous_effects = {
-                "minimum_segment_samples": segment_min_samples,
-                OUTCOME_READINESS: {
-                    "subgroups": _estimate_segment_slices(
-                        readiness_samples,
-                        segment_key="subgroup",
-                        min_samples=segment_min_samples,
-                        bootstrap_samples=bootstrap_samples,
-                    ),
-                    "phases": _estimate_segment_slices(
-                        readiness_samples,
-                        segment_key="phase",
-                        min_samples=segment_min_samples,
-                        bootstrap_samples=bootstrap_samples,
-                    ),
-                },
-                OUTCOME_STRENGTH_AGGREGATE: {
-                    "subgroups": _estimate_segment_slices(
-                        strength_aggregate_samples,
-                        segment_key="subgroup",
-                        min_samples=segment_min_samples,
-                        bootstrap_samples=bootstrap_samples,
-                    ),
-                    "phases": _estimate_segment_slices(
-                        strength_aggregate_samples,
-                        segment_key="phase",
-                        min_samples=segment_min_samples,
-                        bootstrap_samples=bootstrap_samples,
-                    ),
-                },
-            }
+            heterogeneous_effects = estimates["heterogeneous_effects"]
 
             _append_result_caveats(
                 machine_caveats,
@@ -1791,6 +1845,7 @@ async def update_causal_inference(
                     readiness_result,
                     min_samples=min_samples,
                     bootstrap_samples=bootstrap_samples,
+                    placebo_result_override=estimates["placebo"],
                 )
             intervention_results[name] = intervention_payload
 
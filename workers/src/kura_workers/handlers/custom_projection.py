@@ -10,7 +10,9 @@ regular events arrive that match active custom rules.
 
 import json
 import logging
-from collections import defaultdict
+import os
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from datetime import date
 from typing import Any
 
@@ -26,6 +28,7 @@ from ..rule_models import (
 from ..utils import (
     get_retracted_event_ids,
     load_timezone_preference,
+    load_user_events,
     normalize_temporal_point,
     resolve_timezone_context,
 )
@@ -87,6 +90,28 @@ async def _load_active_rules(
 # ---------------------------------------------------------------------------
 
 
+async def _load_rule_events(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    source_events: list[str],
+    retracted_ids: set[str],
+) -> list[dict[str, Any]]:
+    """Non-retracted source events of a single rule, oldest first."""
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT id, timestamp, data, metadata
+            FROM events
+            WHERE user_id = %s
+              AND event_type = ANY(%s)
+            ORDER BY timestamp ASC
+            """,
+            (user_id, source_events),
+        )
+        rows = await cur.fetchall()
+    return [r for r in rows if str(r["id"]) not in retracted_ids]
+
+
 def _iso_week(d: date) -> str:
     """Return ISO week string like '2026-W06'."""
     iso = d.isocalendar()
@@ -99,32 +124,27 @@ async def _compute_field_tracking(
     rule: FieldTrackingRule,
     retracted_ids: set[str],
 ) -> dict[str, Any]:
-    """Build projection data for a field_tracking rule.
+    """Build projection data for a field_tracking rule from its own query."""
+    timezone_pref = await load_timezone_preference(conn, user_id, retracted_ids)
+    timezone_context = resolve_timezone_context(timezone_pref)
+    rows = await _load_rule_events(conn, user_id, rule.source_events, retracted_ids)
+    return _build_field_tracking(rule, rows, timezone_context)
+
 
-    Queries all matching events and computes:
+def _build_field_tracking(
+    rule: FieldTrackingRule,
+    rows: list[dict[str, Any]],
+    timezone_context: dict[str, Any],
+) -> dict[str, Any]:
+    """Projection data for a field_tracking rule over its (ordered) events.
+
+    Computes:
     - recent_entries: last 30 per-day values
     - weekly_summary: weekly averages
     - all_time: overall stats per field
     """
-    timezone_pref = await load_timezone_preference(conn, user_id, retracted_ids)
-    timezone_context = resolve_timezone_context(timezone_pref)
     timezone_name = timezone_context["timezone"]
 
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = ANY(%s)
-            ORDER BY timestamp ASC
-            """,
-            (user_id, rule.source_events),
-        )
-        rows = await cur.fetchall()
-
-    rows = [r for r in rows if str(r["id"]) not in retracted_ids]
-
     if not rows:
         return {
             "rule": rule.model_dump(),
@@ -241,26 +261,19 @@ async def _compute_categorized_tracking(
     rule: CategorizedTrackingRule,
     retracted_ids: set[str],
 ) -> dict[str, Any]:
-    """Build projection data for a categorized_tracking rule.
+    """Build projection data for a categorized_tracking rule from its own query."""
+    rows = await _load_rule_events(conn, user_id, rule.source_events, retracted_ids)
+    return _build_categorized_tracking(rule, rows)
 
-    Queries all matching events, groups by the group_by field, and computes
-    per-category statistics.
-    """
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = ANY(%s)
-            ORDER BY timestamp ASC
-            """,
-            (user_id, rule.source_events),
-        )
-        rows = await cur.fetchall()
 
-    rows = [r for r in rows if str(r["id"]) not in retracted_ids]
+def _build_categorized_tracking(
+    rule: CategorizedTrackingRule,
+    rows: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Projection data for a categorized_tracking rule over its events.
 
+    Groups by the group_by field and computes per-category statistics.
+    """
     if not rows:
         return {
             "rule": rule.model_dump(),
@@ -394,6 +407,147 @@ async def _compute_rule(
         return None
 
 
+# ---------------------------------------------------------------------------
+# Compiled rule sets (router hot path)
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    name: str
+    rule: FieldTrackingRule | CategorizedTrackingRule
+    source_events: frozenset[str]
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """A user's active, validated rules indexed by source event type.
+
+    ``version`` is the (count, latest timestamp) of the user's rule events
+    and ``retracted_ids`` the retraction set the rules were replayed with;
+    a cached set is reused while both are unchanged.
+    """
+
+    version: tuple[int, Any]
+    retracted_ids: frozenset[str]
+    rules: tuple[CompiledRule, ...]
+    by_event_type: dict[str, tuple[CompiledRule, ...]]
+
+    def matching(self, event_type: str) -> tuple[CompiledRule, ...]:
+        return self.by_event_type.get(event_type, ())
+
+
+_EMPTY_RULE_SET = CompiledRuleSet(
+    version=(0, None), retracted_ids=frozenset(), rules=(), by_event_type={}
+)
+
+_compiled_rules: OrderedDict[str, CompiledRuleSet] = OrderedDict()
+_COMPILED_RULES_CACHE_SIZE = int(os.environ.get("KURA_CUSTOM_RULE_CACHE_SIZE", "1024"))
+
+
+def invalidate_compiled_rules(user_id: str | None = None) -> None:
+    """Drop cached rule sets for one user (or all users)."""
+    if user_id is None:
+        _compiled_rules.clear()
+    else:
+        _compiled_rules.pop(str(user_id), None)
+
+
+def compile_rules(
+    active_rules: dict[str, dict[str, Any]],
+    *,
+    version: tuple[int, Any],
+    retracted_ids: frozenset[str],
+) -> CompiledRuleSet:
+    """Validate active rules once and index them by source event type."""
+    compiled: list[CompiledRule] = []
+    by_event_type: dict[str, list[CompiledRule]] = defaultdict(list)
+    for rule_name, rule_data in active_rules.items():
+        try:
+            rule = validate_rule(rule_data)
+        except (ValueError, Exception) as e:
+            logger.warning("Invalid projection rule '%s': %s", rule_data.get("name", "?"), e)
+            continue
+        entry = CompiledRule(rule_name, rule, frozenset(rule.source_events))
+        compiled.append(entry)
+        for event_type in sorted(entry.source_events):
+            by_event_type[event_type].append(entry)
+    return CompiledRuleSet(
+        version=version,
+        retracted_ids=retracted_ids,
+        rules=tuple(compiled),
+        by_event_type={k: tuple(v) for k, v in by_event_type.items()},
+    )
+
+
+async def _rule_events_version(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+) -> tuple[int, Any]:
+    """Cheap change marker for a user's rule events (index-only on events)."""
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT count(*) AS rule_events, max(timestamp) AS last_timestamp
+            FROM events
+            WHERE user_id = %s
+              AND event_type IN ('projection_rule.created', 'projection_rule.archived')
+            """,
+            (user_id,),
+        )
+        row = await cur.fetchone()
+    if not row:
+        return (0, None)
+    return (int(row["rule_events"] or 0), row["last_timestamp"])
+
+
+async def load_compiled_rules(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+) -> CompiledRuleSet:
+    """The user's compiled rule set, replayed only when rule events changed.
+
+    Users without rule events cost one count query. Otherwise the cached set
+    is reused while the rule-event version and the retraction set match;
+    projection_rule.created/archived handling also invalidates it directly.
+    """
+    version = await _rule_events_version(conn, user_id)
+    if version[0] == 0:
+        return _EMPTY_RULE_SET
+
+    retracted_ids = frozenset(await get_retracted_event_ids(conn, user_id))
+    key = str(user_id)
+    cached = _compiled_rules.get(key)
+    if (
+        cached is not None
+        and cached.version == version
+        and cached.retracted_ids == retracted_ids
+    ):
+        _compiled_rules.move_to_end(key)
+        return cached
+
+    active_rules = await _load_active_rules(conn, user_id, retracted_ids=set(retracted_ids))
+    rule_set = compile_rules(active_rules, version=version, retracted_ids=retracted_ids)
+    _compiled_rules[key] = rule_set
+    _compiled_rules.move_to_end(key)
+    while len(_compiled_rules) > max(0, _COMPILED_RULES_CACHE_SIZE):
+        _compiled_rules.popitem(last=False)
+    return rule_set
+
+
+def _build_projection(
+    rule: FieldTrackingRule | CategorizedTrackingRule,
+    rows: list[dict[str, Any]],
+    timezone_context: dict[str, Any] | None,
+) -> dict[str, Any] | None:
+    if isinstance(rule, FieldTrackingRule):
+        return _build_field_tracking(rule, rows, timezone_context or resolve_timezone_context(None))
+    if isinstance(rule, CategorizedTrackingRule):
+        return _build_categorized_tracking(rule, rows)
+    logger.warning("Unknown rule type: %s", type(rule).__name__)
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Handler entry point
 # ---------------------------------------------------------------------------
@@ -411,6 +565,7 @@ async def update_custom_projections(
     user_id = payload["user_id"]
     event_type = payload["event_type"]
     event_id = payload.get("event_id", "")
+    invalidate_compiled_rules(user_id)
 
     if event_type == "projection_rule.archived":
         # Get the rule name from the event data
@@ -483,26 +638,43 @@ async def recompute_matching_rules(
     """Recompute custom projections whose source_events include the given event_type.
 
     Called by the router when a regular event (e.g., sleep.logged) arrives and
-    the user has active custom rules matching it.
+    the user has active custom rules matching it. All matching rules are
+    evaluated over a single load of the union of their source events, so the
+    query count stays flat as a user adds rules.
     """
-    retracted_ids = await get_retracted_event_ids(conn, user_id)
-    active_rules = await _load_active_rules(conn, user_id, retracted_ids=retracted_ids)
-    if not active_rules:
+    rule_set = await load_compiled_rules(conn, user_id)
+    matching = rule_set.matching(event_type)
+    if not matching:
         return
 
-    for rule_name, rule_data in active_rules.items():
-        source_events = rule_data.get("source_events", [])
-        if event_type not in source_events:
-            continue
+    retracted_ids = set(rule_set.retracted_ids)
+    timezone_context = None
+    if any(isinstance(entry.rule, FieldTrackingRule) for entry in matching):
+        timezone_pref = await load_timezone_preference(conn, user_id, retracted_ids)
+        timezone_context = resolve_timezone_context(timezone_pref)
+
+    source_types = sorted(set().union(*(entry.source_events for entry in matching)))
+    rows = await load_user_events(conn, user_id, source_types, retracted_ids=retracted_ids)
+
+    # One pass over the events, fanning each row out to the rules reading it.
+    rule_rows: dict[str, list[dict[str, Any]]] = {entry.name: [] for entry in matching}
+    consumers: dict[str, list[list[dict[str, Any]]]] = defaultdict(list)
+    for entry in matching:
+        for source_type in entry.source_events:
+            consumers[source_type].append(rule_rows[entry.name])
+    for row in rows:
+        for bucket in consumers.get(row["event_type"], ()):
+            bucket.append(row)
 
-        projection_data = await _compute_rule(conn, user_id, rule_data, retracted_ids)
+    for entry in matching:
+        projection_data = _build_projection(entry.rule, rule_rows[entry.name], timezone_context)
         if projection_data is not None:
             await _upsert_custom_projection(
-                conn, user_id, rule_name, projection_data, event_id
+                conn, user_id, entry.name, projection_data, event_id
             )
             logger.debug(
                 "Recomputed custom projection '%s' for user=%s (triggered by %s)",
-                rule_name, user_id, event_type,
+                entry.name, user_id, event_type,
             )
 
 
@@ -515,13 +687,7 @@ async def has_matching_custom_rules(
 
     Uses active rule events, not existing custom projections, so rules remain
     live even if a custom projection row was deleted or not yet materialized.
+    Served from the compiled rule set cache.
     """
-    retracted_ids = await get_retracted_event_ids(conn, user_id)
-    active_rules = await _load_active_rules(conn, user_id, retracted_ids=retracted_ids)
-
-    for rule_data in active_rules.values():
-        source_events = rule_data.get("source_events", [])
-        if event_type in source_events:
-            return True
-
-    return False
+    rule_set = await load_compiled_rules(conn, user_id)
+    return bool(rule_set.matching(event_type))
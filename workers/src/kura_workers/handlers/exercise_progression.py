@@ -10,13 +10,17 @@ Computes per-exercise statistics:
 Alias-aware: resolves through alias map, consolidates fragmented
 projections when aliases are created, DELETEs stale alias-named projections.
 
-Full recompute on every event — idempotent by design.
+Full recompute on corrections, retractions and alias events — idempotent by
+design. Append-only set.logged events are folded onto a persisted
+accumulator state instead (O(1) per set); see _ProgressionAccumulator.
 """
 
+import base64
+import hashlib
 import json
 import logging
-from collections import defaultdict
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from typing import Any
 
 import psycopg
@@ -31,11 +35,12 @@ from ..capability_estimation_runtime import (
     data_sufficiency_block,
     effort_adjusted_e1rm,
     interval_around,
-    summarize_observations,
+    summarize_running_observations,
 )
+from ..job_coalescing import payload_event_ids
 from ..registry import projection_handler
 from ..set_corrections import apply_set_correction_chain
-from ..training_core_fields import evaluate_set_context_rows
+from ..training_core_fields import evaluate_set_context_rows, set_context_scope
 from ..utils import (
     SessionBoundaryState,
     check_expected_fields,
@@ -194,6 +199,946 @@ def _manifest_contribution(projection_rows: list[dict[str, Any]]) -> dict[str, A
     return {"exercises": [r["key"] for r in projection_rows]}
 
 
+# ---------------------------------------------------------------------------
+# Accumulator state (incremental set.logged updates)
+# ---------------------------------------------------------------------------
+#
+# The projection is a left fold over the exercise's set.logged rows in
+# (timestamp, id) order. The fold state is persisted in
+# projection_accumulators so an append-only set.logged can be folded in
+# without replaying the full history. Corrections, retractions, alias
+# changes and out-of-order events fall back to the full replay, which also
+# rebuilds the state.
+#
+# The persisted state stays bounded without changing what the projection
+# emits: only the recent-window sessions and set-context scopes are kept by
+# key, older ones survive in fixed-size Bloom filters (a hit means "maybe
+# seen before" and forces a full replay). Anomalies and unknown attributes
+# are emitted in full, so a state holding more of them than the limits
+# below is not persisted at all and that exercise stays on full replays.
+
+_ACCUMULATOR_PROJECTION_TYPE = "exercise_progression"
+_ACCUMULATOR_VERSION = 3
+_RECENT_SESSION_WINDOW = 5
+_WEEKLY_HISTORY_WINDOW = 26
+_CONTEXT_SCOPE_WINDOW = 32
+_STATE_ANOMALY_LIMIT = 20
+_STATE_OBSERVED_ATTRIBUTE_LIMIT = 50
+_SESSION_FILTER_BYTES = 1024
+_SESSION_FILTER_HASHES = 3
+
+
+def _session_filter_bits(session_key: str) -> list[int]:
+    digest = hashlib.blake2b(
+        session_key.encode(), digest_size=4 * _SESSION_FILTER_HASHES
+    ).digest()
+    return [
+        int.from_bytes(digest[4 * index : 4 * index + 4], "big") % (_SESSION_FILTER_BYTES * 8)
+        for index in range(_SESSION_FILTER_HASHES)
+    ]
+
+
+def _filter_contains(bloom: bytearray, key: str) -> bool:
+    return all(bloom[bit // 8] & (1 << (bit % 8)) for bit in _session_filter_bits(key))
+
+
+def _filter_add(bloom: bytearray, key: str) -> None:
+    for bit in _session_filter_bits(key):
+        bloom[bit // 8] |= 1 << (bit % 8)
+
+
+def _context_scope_key(scope: tuple[str, str]) -> str:
+    return "\x1f".join(scope)
+
+
+def _new_comparability_bucket() -> dict[str, Any]:
+    return {
+        "total_sets": 0,
+        "total_volume_kg": 0.0,
+        "estimated_1rm": 0.0,
+        "estimated_1rm_date": None,
+        "latest_timestamp": None,
+    }
+
+
+def _new_week_bucket() -> dict[str, Any]:
+    return {
+        "estimated_1rm": 0.0,
+        "total_sets": 0,
+        "total_volume_kg": 0.0,
+        "max_weight_kg": 0.0,
+    }
+
+
+def _dt_to_state(value: datetime | None) -> str | None:
+    return value.isoformat() if isinstance(value, datetime) else None
+
+
+def _dt_from_state(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    return datetime.fromisoformat(value)
+
+
+def _row_data(row: dict[str, Any]) -> dict[str, Any]:
+    return row.get("effective_data") or row["data"]
+
+
+def _row_order_key(row: dict[str, Any]) -> tuple[datetime, str]:
+    return (row["timestamp"], str(row["id"]))
+
+
+@dataclass
+class _ProgressionAccumulator:
+    """Fold state for one exercise_progression projection."""
+
+    primary_group: str
+    timezone_name: str
+    alias_keys: list[str]
+    last_event_id: str | None = None
+    last_timestamp: datetime | None = None
+    comparability: dict[str, dict[str, Any]] = field(default_factory=dict)
+    total_sets: int = 0
+    total_volume_kg: float = 0.0
+    best_1rm: float = 0.0
+    best_1rm_date: datetime | None = None
+    # Ordered session_key -> latest set timestamp (ISO); ties keep insertion order.
+    # Holds every session during a full replay, only the recent window once
+    # restored; session_count and session_filter cover the rest.
+    session_last_ts: dict[str, str] = field(default_factory=dict)
+    session_count: int = 0
+    session_filter: bytearray = field(
+        default_factory=lambda: bytearray(_SESSION_FILTER_BYTES)
+    )
+    recent_sets: list[dict[str, Any]] = field(default_factory=list)
+    week_data: dict[str, dict[str, Any]] = field(default_factory=dict)
+    anomalies: list[dict[str, Any]] = field(default_factory=list)
+    latest_primary_data: dict[str, Any] | None = None
+    observed_attr_counts: dict[str, dict[str, int]] = field(default_factory=dict)
+    temporal_conflicts: dict[str, int] = field(default_factory=dict)
+    e1rm_sources: dict[str, int] = field(
+        default_factory=lambda: {"explicit": 0, "inferred_from_rpe": 0, "fallback_epley": 0}
+    )
+    # Welford running stats over primary-group e1RM values.
+    e1rm_count: int = 0
+    e1rm_mean: float = 0.0
+    e1rm_m2: float = 0.0
+    fallback_session_state: SessionBoundaryState | None = None
+    # Scope defaults in first-seen order; the state keeps the last
+    # _CONTEXT_SCOPE_WINDOW of them and context_filter covers the rest.
+    context_defaults: dict[tuple[str, str], dict[str, Any]] = field(default_factory=dict)
+    context_filter: bytearray = field(
+        default_factory=lambda: bytearray(_SESSION_FILTER_BYTES)
+    )
+
+    # -- folding ----------------------------------------------------------
+
+    def remember_context_scopes(self, scopes: Any) -> None:
+        """Record scopes that carry defaults, so pruning them forces a replay."""
+        for scope in scopes:
+            if self.context_defaults.get(scope):
+                _filter_add(self.context_filter, _context_scope_key(scope))
+
+    def _session_key(
+        self,
+        metadata: dict[str, Any],
+        temporal: Any,
+    ) -> tuple[str, str | None, SessionBoundaryState | None]:
+        raw_session_id = str(metadata.get("session_id") or "").strip()
+        session_id = raw_session_id or None
+        if session_id is not None:
+            return session_id, session_id, None
+        session_key, next_state = next_fallback_session_key(
+            local_date=temporal.local_date,
+            timestamp_utc=temporal.timestamp_utc,
+            state=self.fallback_session_state,
+        )
+        return session_key, None, next_state
+
+    def fold(self, row: dict[str, Any], context_eval: dict[str, Any]) -> None:
+        """Fold one row (in (timestamp, id) order) into the state."""
+        data = _row_data(row)
+        metadata = row.get("metadata") or {}
+        row_id = str(row["id"])
+        group = _resolve_comparability_group(data)
+        self.last_event_id = row_id
+        self.last_timestamp = row["timestamp"]
+
+        bucket = self.comparability.get(group)
+        if bucket is None:
+            bucket = _new_comparability_bucket()
+            self.comparability[group] = bucket
+        bucket["total_sets"] += 1
+        bucket["latest_timestamp"] = row["timestamp"]
+        try:
+            weight = float(data.get("weight_kg", data.get("weight", 0)))
+            reps = int(data.get("reps", 0))
+        except (TypeError, ValueError):
+            weight = None
+            reps = None
+        if weight is not None and reps is not None:
+            bucket["total_volume_kg"] += weight * reps
+            group_e1rm, _ = effort_adjusted_e1rm(
+                weight,
+                reps,
+                rir=data.get("rir"),
+                rpe=data.get("rpe"),
+            )
+            if group_e1rm > bucket["estimated_1rm"]:
+                bucket["estimated_1rm"] = group_e1rm
+                bucket["estimated_1rm_date"] = row["timestamp"]
+
+        effective_defaults = context_eval.get("effective_defaults") or {}
+        temporal = normalize_temporal_point(
+            row["timestamp"],
+            timezone_name=self.timezone_name,
+            data=data,
+            metadata=metadata,
+        )
+        ts = temporal.timestamp_utc
+        local_day = temporal.local_date
+
+        for conflict in temporal.conflicts:
+            self.temporal_conflicts[conflict] = self.temporal_conflicts.get(conflict, 0) + 1
+
+        _known, unknown = separate_known_unknown(data, _KNOWN_FIELDS)
+        merge_observed_attributes(self.observed_attr_counts, row["event_type"], unknown)
+
+        if group == self.primary_group:
+            self.latest_primary_data = data
+
+        if weight is None or reps is None:
+            logger.warning("Skipping event %s: invalid weight/reps data", row["id"])
+            return
+
+        if weight < 0 or weight > 500:
+            self.anomalies.append({
+                "event_id": row_id,
+                "field": "weight_kg",
+                "value": weight,
+                "expected_range": [0, 500],
+                "message": f"Weight {weight}kg outside plausible range on {local_day.isoformat()}",
+            })
+        if reps < 0 or reps > 100:
+            self.anomalies.append({
+                "event_id": row_id,
+                "field": "reps",
+                "value": reps,
+                "expected_range": [0, 100],
+                "message": f"{reps} reps in a single set on {local_day.isoformat()}",
+            })
+
+        if group != self.primary_group:
+            return
+
+        session_key, session_id, fallback_state = self._session_key(metadata, temporal)
+        self.fallback_session_state = fallback_state
+
+        volume = weight * reps
+        self.total_sets += 1
+        self.total_volume_kg += volume
+
+        parsed_rpe: float | None = None
+        if "rpe" in data:
+            try:
+                parsed_rpe = float(data["rpe"])
+            except (ValueError, TypeError):
+                parsed_rpe = None
+        parsed_rir, rir_source = _resolve_set_rir(data, parsed_rpe)
+        if parsed_rir is None and effective_defaults.get("rir") is not None:
+            parsed_rir = _normalize_rir(effective_defaults.get("rir"))
+            rir_source = "session_default"
+
+        e1rm, e1rm_source = effort_adjusted_e1rm(
+            weight,
+            reps,
+            rir=parsed_rir,
+            rpe=parsed_rpe,
+        )
+        self.e1rm_sources[e1rm_source] = self.e1rm_sources.get(e1rm_source, 0) + 1
+        self.e1rm_count += 1
+        delta = e1rm - self.e1rm_mean
+        self.e1rm_mean += delta / self.e1rm_count
+        self.e1rm_m2 += delta * (e1rm - self.e1rm_mean)
+
+        best_1rm = self.best_1rm
+        if best_1rm > 0 and e1rm > best_1rm * 2:
+            self.anomalies.append({
+                "event_id": row_id,
+                "field": "estimated_1rm",
+                "value": round(e1rm, 1),
+                "expected_range": [0, round(best_1rm * 2, 1)],
+                "message": (
+                    f"1RM jumped from {best_1rm:.1f}kg to {e1rm:.1f}kg "
+                    f"({(e1rm / best_1rm - 1) * 100:.0f}% increase) on {local_day.isoformat()}"
+                ),
+            })
+
+        if e1rm > best_1rm:
+            self.best_1rm = e1rm
+            self.best_1rm_date = ts
+
+        week_entry = self.week_data.get(temporal.iso_week)
+        if week_entry is None:
+            week_entry = _new_week_bucket()
+            self.week_data[temporal.iso_week] = week_entry
+        week_entry["total_sets"] += 1
+        week_entry["total_volume_kg"] += volume
+        if e1rm > week_entry["estimated_1rm"]:
+            week_entry["estimated_1rm"] = e1rm
+        if weight > week_entry["max_weight_kg"]:
+            week_entry["max_weight_kg"] = weight
+
+        set_entry: dict[str, Any] = {
+            "timestamp": ts.isoformat(),
+            "weight_kg": weight,
+            "reps": reps,
+            "estimated_1rm": round(e1rm, 1),
+            "estimated_1rm_source": e1rm_source,
+            "comparability_group": group,
+            "_session_key": session_key,
+        }
+        if parsed_rpe is not None:
+            set_entry["rpe"] = parsed_rpe
+        if parsed_rir is not None:
+            set_entry["rir"] = parsed_rir
+            if rir_source and rir_source != "explicit":
+                set_entry["rir_source"] = rir_source
+
+        explicit_rest = _as_optional_float(data.get("rest_seconds"))
+        if explicit_rest is not None:
+            set_entry["rest_seconds"] = round(explicit_rest, 2)
+        elif effective_defaults.get("rest_seconds") is not None:
+            default_rest = _as_optional_float(effective_defaults.get("rest_seconds"))
+            if default_rest is not None:
+                set_entry["rest_seconds"] = round(default_rest, 2)
+                set_entry["rest_seconds_source"] = "session_default"
+
+        if isinstance(data.get("tempo"), str) and data["tempo"].strip():
+            set_entry["tempo"] = data["tempo"].strip().lower()
+        elif isinstance(effective_defaults.get("tempo"), str):
+            default_tempo = str(effective_defaults.get("tempo")).strip().lower()
+            if default_tempo:
+                set_entry["tempo"] = default_tempo
+                set_entry["tempo_source"] = "session_default"
+
+        if "set_type" in data:
+            set_entry["set_type"] = data["set_type"]
+        elif effective_defaults.get("set_type") is not None:
+            set_entry["set_type"] = effective_defaults.get("set_type")
+        if session_id is not None:
+            set_entry["session_id"] = session_id
+        if unknown:
+            set_entry["extra"] = unknown
+        if row.get("correction_history"):
+            set_entry["corrections"] = row["correction_history"]
+        if row.get("field_provenance"):
+            set_entry["field_provenance"] = row["field_provenance"]
+        if isinstance(data.get("load_context"), dict):
+            set_entry["load_context"] = data.get("load_context")
+
+        self.recent_sets.append(set_entry)
+        previous_ts = self.session_last_ts.get(session_key)
+        if previous_ts is None:
+            # New session: a restored state never folds a set of an older,
+            # pruned session (incremental_blocker rejects filter hits).
+            self.session_count += 1
+            _filter_add(self.session_filter, session_key)
+        if previous_ts is None or set_entry["timestamp"] > previous_ts:
+            self.session_last_ts[session_key] = set_entry["timestamp"]
+
+    def incremental_blocker(
+        self,
+        row: dict[str, Any],
+        *,
+        alias_keys: list[str],
+        timezone_name: str,
+    ) -> str | None:
+        """Return why ``row`` cannot be folded onto this state (None = safe)."""
+        if sorted(alias_keys) != self.alias_keys:
+            return "alias_map_changed"
+        if timezone_name != self.timezone_name:
+            return "timezone_changed"
+        if self.last_timestamp is None or self.last_event_id is None:
+            return "empty_state"
+        if _row_order_key(row) <= (self.last_timestamp, self.last_event_id):
+            return "out_of_order"
+        data = _row_data(row)
+        if _resolve_comparability_group(data) != self.primary_group:
+            return "primary_group_changed"
+
+        metadata = row.get("metadata") or {}
+        temporal = normalize_temporal_point(
+            row["timestamp"],
+            timezone_name=self.timezone_name,
+            data=data,
+            metadata=metadata,
+        )
+        session_key, _session_id, _state = self._session_key(metadata, temporal)
+        if session_key not in self.session_last_ts and _filter_contains(
+            self.session_filter, session_key
+        ):
+            # Set (maybe) joins an older session whose sets were pruned from
+            # the window.
+            return "session_outside_window"
+        scope = set_context_scope(row)
+        if scope not in self.context_defaults and _filter_contains(
+            self.context_filter, _context_scope_key(scope)
+        ):
+            # Its set-context defaults (maybe) live in a pruned scope.
+            return "context_scope_outside_window"
+        return None
+
+    def fits_state_limits(self) -> bool:
+        """False when persisting would drop anomalies or observed attributes."""
+        if len(self.anomalies) > _STATE_ANOMALY_LIMIT:
+            return False
+        return all(
+            len(counts) <= _STATE_OBSERVED_ATTRIBUTE_LIMIT
+            for counts in self.observed_attr_counts.values()
+        )
+
+    # -- output -----------------------------------------------------------
+
+    def _recent_session_keys(self) -> list[str]:
+        return sorted(
+            self.session_last_ts,
+            key=lambda key: self.session_last_ts[key],
+            reverse=True,
+        )[:_RECENT_SESSION_WINDOW]
+
+    def _recent_week_keys(self) -> list[str]:
+        return sorted(self.week_data.keys(), reverse=True)[:_WEEKLY_HISTORY_WINDOW]
+
+    def build_projection(
+        self,
+        canonical: str,
+        timezone_context: dict[str, Any],
+    ) -> dict[str, Any]:
+        recent_session_set = set(self._recent_session_keys())
+        recent_sessions = [
+            {k: v for k, v in set_row.items() if k != "_session_key"}
+            for set_row in self.recent_sets
+            if set_row["_session_key"] in recent_session_set
+        ]
+        recent_sessions.reverse()
+
+        sorted_weeks = self._recent_week_keys()
+        sorted_weeks.reverse()
+        weekly_history = [
+            {
+                "week": week_key,
+                "estimated_1rm": round(self.week_data[week_key]["estimated_1rm"], 1),
+                "total_sets": self.week_data[week_key]["total_sets"],
+                "total_volume_kg": round(self.week_data[week_key]["total_volume_kg"], 1),
+                "max_weight_kg": round(self.week_data[week_key]["max_weight_kg"], 1),
+            }
+            for week_key in sorted_weeks
+        ]
+
+        field_hints: list[dict[str, Any]] = []
+        if self.latest_primary_data is not None:
+            field_hints = check_expected_fields(self.latest_primary_data, _EXPECTED_FIELDS)
+
+        primary_group = self.primary_group
+        total_sets = self.total_sets
+        best_1rm = self.best_1rm
+        e1rm_sources = dict(self.e1rm_sources)
+
+        comparability_groups = []
+        for group, summary in sorted(
+            self.comparability.items(),
+            key=lambda item: (item[1]["latest_timestamp"], item[0]),
+            reverse=True,
+        ):
+            estimated_date = summary.get("estimated_1rm_date")
+            if isinstance(estimated_date, datetime):
+                estimated_date_value: str | None = estimated_date.isoformat()
+            else:
+                estimated_date_value = None
+            comparability_groups.append({
+                "group": group,
+                "total_sets": int(summary.get("total_sets", 0)),
+                "total_volume_kg": round(float(summary.get("total_volume_kg", 0.0)), 1),
+                "estimated_1rm": round(float(summary.get("estimated_1rm", 0.0)), 1),
+                "estimated_1rm_date": estimated_date_value,
+            })
+
+        comparability_degraded = len(comparability_groups) > 1
+        status = STATUS_OK
+        if total_sets < 3:
+            status = STATUS_INSUFFICIENT_DATA
+        elif comparability_degraded:
+            status = STATUS_DEGRADED_COMPARABILITY
+
+        mean_e1rm, sd_e1rm = summarize_running_observations(
+            self.e1rm_count, self.e1rm_mean, self.e1rm_m2,
+        )
+        if mean_e1rm is None:
+            mean_e1rm = best_1rm
+        estimate_interval = interval_around(mean_e1rm, sd_e1rm)
+        confidence = confidence_from_evidence(
+            observed_points=total_sets,
+            required_points=6,
+            comparability_degraded=comparability_degraded,
+        )
+        next_observations: list[str] = []
+        if total_sets < 6:
+            next_observations.append("Log 3-6 additional high-intent sets for this exercise.")
+        if e1rm_sources.get("fallback_epley", 0) > 0:
+            next_observations.append("Add RIR or RPE to reduce e1RM uncertainty.")
+        if comparability_degraded:
+            next_observations.append(
+                "Keep equipment/protocol consistent or persist comparability_group explicitly."
+            )
+        reason_codes: list[str] = []
+        if total_sets < 3:
+            reason_codes.append("insufficient_observation_count")
+        if comparability_degraded:
+            reason_codes.append("multiple_comparability_groups")
+        if e1rm_sources.get("fallback_epley", 0) > 0:
+            reason_codes.append("effort_context_missing")
+
+        data_sufficiency = data_sufficiency_block(
+            required_observations=6,
+            observed_observations=total_sets,
+            uncertainty_reason_codes=reason_codes,
+            recommended_next_observations=next_observations,
+        )
+        capability_estimation = build_capability_envelope(
+            capability="strength_1rm",
+            estimate_mean=mean_e1rm,
+            estimate_interval=estimate_interval,
+            status=status,
+            confidence=confidence,
+            data_sufficiency=data_sufficiency,
+            model_version="strength_effort_adjusted.v1",
+            caveats=[
+                {
+                    "code": "multiple_comparability_groups",
+                    "severity": "medium",
+                    "details": {"groups_total": len(comparability_groups)},
+                }
+            ]
+            if comparability_degraded
+            else [],
+            protocol_signature={
+                "primary_group": primary_group,
+                "group_count": len(comparability_groups),
+            },
+            comparability={
+                "primary_group": primary_group,
+                "groups_total": len(comparability_groups),
+                "multiple_groups_detected": comparability_degraded,
+            },
+            diagnostics={
+                "e1rm_source_counts": e1rm_sources,
+                "timezone": timezone_context.get("timezone"),
+            },
+        )
+
+        return {
+            "exercise": canonical,
+            "estimated_1rm": round(best_1rm, 1),
+            "estimated_1rm_interval": estimate_interval,
+            "estimated_1rm_date": self.best_1rm_date.isoformat() if self.best_1rm_date else None,
+            "status": status,
+            "confidence": confidence,
+            "data_sufficiency": data_sufficiency,
+            "capability_estimation": capability_estimation,
+            "total_sessions": self.session_count,
+            "total_sets": total_sets,
+            "total_volume_kg": round(self.total_volume_kg, 1),
+            "timezone_context": timezone_context,
+            "recent_sessions": recent_sessions,
+            "weekly_history": weekly_history,
+            "comparability": {
+                "primary_group": primary_group,
+                "groups_total": len(comparability_groups),
+                "multiple_groups_detected": len(comparability_groups) > 1,
+                "groups": comparability_groups,
+            },
+            "data_quality": {
+                "anomalies": list(self.anomalies),
+                "field_hints": field_hints,
+                "observed_attributes": self.observed_attr_counts,
+                "temporal_conflicts": self.temporal_conflicts,
+                "e1rm_source_counts": e1rm_sources,
+            },
+        }
+
+    # -- persistence ------------------------------------------------------
+
+    def to_state(self) -> dict[str, Any]:
+        """Compact JSON state; sessions, weeks and scopes are pruned to their windows."""
+        recent_session_set = set(self._recent_session_keys())
+        recent_week_set = set(self._recent_week_keys())
+        recent_scopes = [
+            scope for scope, defaults in self.context_defaults.items() if defaults
+        ][-_CONTEXT_SCOPE_WINDOW:]
+        fallback = self.fallback_session_state
+        return {
+            "version": _ACCUMULATOR_VERSION,
+            "primary_group": self.primary_group,
+            "timezone_name": self.timezone_name,
+            "alias_keys": list(self.alias_keys),
+            "last_event_id": self.last_event_id,
+            "last_timestamp": _dt_to_state(self.last_timestamp),
+            "comparability": [
+                {
+                    "group": group,
+                    "total_sets": bucket["total_sets"],
+                    "total_volume_kg": bucket["total_volume_kg"],
+                    "estimated_1rm": bucket["estimated_1rm"],
+                    "estimated_1rm_date": _dt_to_state(bucket["estimated_1rm_date"]),
+                    "latest_timestamp": _dt_to_state(bucket["latest_timestamp"]),
+                }
+                for group, bucket in self.comparability.items()
+            ],
+            "total_sets": self.total_sets,
+            "total_volume_kg": self.total_volume_kg,
+            "best_1rm": self.best_1rm,
+            "best_1rm_date": _dt_to_state(self.best_1rm_date),
+            # Lists of pairs: JSONB does not preserve object key order.
+            "session_last_ts": [
+                [key, ts] for key, ts in self.session_last_ts.items()
+                if key in recent_session_set
+            ],
+            "session_count": self.session_count,
+            "session_filter": base64.b64encode(bytes(self.session_filter)).decode("ascii"),
+            "recent_sets": [
+                entry for entry in self.recent_sets
+                if entry["_session_key"] in recent_session_set
+            ],
+            "week_data": [
+                [week, bucket] for week, bucket in self.week_data.items()
+                if week in recent_week_set
+            ],
+            "anomalies": self.anomalies,
+            "latest_primary_data": self.latest_primary_data,
+            "observed_attr_counts": self.observed_attr_counts,
+            "temporal_conflicts": self.temporal_conflicts,
+            "e1rm_sources": self.e1rm_sources,
+            "e1rm_count": self.e1rm_count,
+            "e1rm_mean": self.e1rm_mean,
+            "e1rm_m2": self.e1rm_m2,
+            "fallback_session_state": (
+                {
+                    "session_key": fallback.session_key,
+                    "session_start_utc": fallback.session_start_utc.isoformat(),
+                    "last_event_utc": fallback.last_event_utc.isoformat(),
+                    "last_local_date": fallback.last_local_date.isoformat(),
+                }
+                if fallback is not None
+                else None
+            ),
+            "context_defaults": [
+                [*scope, self.context_defaults[scope]] for scope in recent_scopes
+            ],
+            "context_filter": base64.b64encode(bytes(self.context_filter)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_state(cls, state: Any) -> "_ProgressionAccumulator | None":
+        """Restore from ``to_state`` output; None when missing or incompatible."""
+        if not isinstance(state, dict) or state.get("version") != _ACCUMULATOR_VERSION:
+            return None
+        try:
+            fallback_raw = state.get("fallback_session_state")
+            fallback = None
+            if isinstance(fallback_raw, dict):
+                fallback = SessionBoundaryState(
+                    session_key=str(fallback_raw["session_key"]),
+                    session_start_utc=datetime.fromisoformat(fallback_raw["session_start_utc"]),
+                    last_event_utc=datetime.fromisoformat(fallback_raw["last_event_utc"]),
+                    last_local_date=date.fromisoformat(fallback_raw["last_local_date"]),
+                )
+            return cls(
+                primary_group=str(state["primary_group"]),
+                timezone_name=str(state["timezone_name"]),
+                alias_keys=[str(key) for key in state["alias_keys"]],
+                last_event_id=state.get("last_event_id"),
+                last_timestamp=_dt_from_state(state.get("last_timestamp")),
+                comparability={
+                    entry["group"]: {
+                        "total_sets": int(entry["total_sets"]),
+                        "total_volume_kg": float(entry["total_volume_kg"]),
+                        "estimated_1rm": float(entry["estimated_1rm"]),
+                        "estimated_1rm_date": _dt_from_state(entry.get("estimated_1rm_date")),
+                        "latest_timestamp": _dt_from_state(entry.get("latest_timestamp")),
+                    }
+                    for entry in state["comparability"]
+                },
+                total_sets=int(state["total_sets"]),
+                total_volume_kg=float(state["total_volume_kg"]),
+                best_1rm=float(state["best_1rm"]),
+                best_1rm_date=_dt_from_state(state.get("best_1rm_date")),
+                session_last_ts={str(key): str(ts) for key, ts in state["session_last_ts"]},
+                session_count=int(state["session_count"]),
+                session_filter=_decode_session_filter(state["session_filter"]),
+                recent_sets=list(state["recent_sets"]),
+                week_data={str(week): dict(bucket) for week, bucket in state["week_data"]},
+                anomalies=list(state["anomalies"]),
+                latest_primary_data=state.get("latest_primary_data"),
+                observed_attr_counts=dict(state["observed_attr_counts"]),
+                temporal_conflicts=dict(state["temporal_conflicts"]),
+                e1rm_sources=dict(state["e1rm_sources"]),
+                e1rm_count=int(state["e1rm_count"]),
+                e1rm_mean=float(state["e1rm_mean"]),
+                e1rm_m2=float(state["e1rm_m2"]),
+                fallback_session_state=fallback,
+                context_defaults={
+                    (str(session_scope), str(exercise_scope)): dict(defaults)
+                    for session_scope, exercise_scope, defaults in state["context_defaults"]
+                },
+                context_filter=_decode_session_filter(state["context_filter"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Discarding malformed exercise_progression accumulator state")
+            return None
+
+
+def _decode_session_filter(raw: Any) -> bytearray:
+    decoded = bytearray(base64.b64decode(str(raw), validate=True))
+    if len(decoded) != _SESSION_FILTER_BYTES:
+        raise ValueError("session filter size mismatch")
+    return decoded
+
+
+def _fold_progression_rows(
+    rows: list[dict[str, Any]],
+    *,
+    timezone_name: str,
+    alias_keys: list[str],
+) -> _ProgressionAccumulator:
+    """Full replay: fold all effective rows (sorted by (timestamp, id))."""
+    primary_group = _resolve_comparability_group(_row_data(rows[-1]))
+    accumulator = _ProgressionAccumulator(
+        primary_group=primary_group,
+        timezone_name=timezone_name,
+        alias_keys=sorted(alias_keys),
+    )
+    evaluations = evaluate_set_context_rows(
+        rows, defaults_by_scope=accumulator.context_defaults,
+    )
+    context_by_event_id = {
+        entry["event_id"]: entry
+        for entry in evaluations
+        if entry.get("event_id")
+    }
+    accumulator.remember_context_scopes(accumulator.context_defaults)
+    for row in rows:
+        accumulator.fold(row, context_by_event_id.get(str(row["id"]), {}))
+    return accumulator
+
+
+def _fold_progression_row(
+    accumulator: _ProgressionAccumulator,
+    row: dict[str, Any],
+) -> None:
+    """Incremental step: fold one appended row onto restored state."""
+    evaluations = evaluate_set_context_rows(
+        [row], defaults_by_scope=accumulator.context_defaults,
+    )
+    accumulator.remember_context_scopes([set_context_scope(row)])
+    accumulator.fold(row, evaluations[0] if evaluations else {})
+
+
+async def _load_accumulator(
+    conn: psycopg.AsyncConnection[Any], user_id: str, key: str
+) -> _ProgressionAccumulator | None:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT state
+            FROM projection_accumulators
+            WHERE user_id = %s
+              AND projection_type = %s
+              AND key = %s
+            """,
+            (user_id, _ACCUMULATOR_PROJECTION_TYPE, key),
+        )
+        row = await cur.fetchone()
+    if row is None:
+        return None
+    return _ProgressionAccumulator.from_state(row["state"])
+
+
+async def _save_accumulator(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    key: str,
+    accumulator: _ProgressionAccumulator,
+) -> None:
+    if not accumulator.fits_state_limits():
+        # Persisting would truncate data_quality output; stay on full replays.
+        await _delete_accumulators(conn, user_id, [key])
+        return
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO projection_accumulators
+                (user_id, projection_type, key, state, last_event_id, updated_at)
+            VALUES (%s, %s, %s, %s, %s, NOW())
+            ON CONFLICT (user_id, projection_type, key) DO UPDATE SET
+                state = EXCLUDED.state,
+                last_event_id = EXCLUDED.last_event_id,
+                updated_at = NOW()
+            """,
+            (
+                user_id,
+                _ACCUMULATOR_PROJECTION_TYPE,
+                key,
+                json.dumps(accumulator.to_state()),
+                accumulator.last_event_id,
+            ),
+        )
+
+
+async def _delete_accumulators(
+    conn: psycopg.AsyncConnection[Any], user_id: str, keys: list[str]
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            DELETE FROM projection_accumulators
+            WHERE user_id = %s
+              AND projection_type = %s
+              AND key = ANY(%s)
+            """,
+            (user_id, _ACCUMULATOR_PROJECTION_TYPE, keys),
+        )
+
+
+async def _upsert_progression_projection(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    canonical: str,
+    projection_data: dict[str, Any],
+    last_event_id: str,
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO projections (user_id, projection_type, key, data, version, last_event_id, updated_at)
+            VALUES (%s, 'exercise_progression', %s, %s, 1, %s, NOW())
+            ON CONFLICT (user_id, projection_type, key) DO UPDATE SET
+                data = EXCLUDED.data,
+                version = projections.version + 1,
+                last_event_id = EXCLUDED.last_event_id,
+                updated_at = NOW()
+            """,
+            (user_id, canonical, json.dumps(projection_data), str(last_event_id)),
+        )
+
+
+async def _resolve_canonical_targets(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    event_type: str,
+    trigger_row: dict[str, Any],
+    alias_map: dict[str, str],
+) -> set[str]:
+    """Canonical exercises affected by one triggering event (empty = skip)."""
+    event_id = str(trigger_row["id"])
+    trigger_data = trigger_row.get("data") or {}
+    if event_type == "exercise.alias_created":
+        canonical = _normalize_token(trigger_data.get("exercise_id"))
+        if not canonical:
+            logger.warning("Alias event %s has no exercise_id, skipping", event_id)
+            return set()
+        return {resolve_through_aliases(canonical, alias_map)}
+
+    if event_type == "set.corrected":
+        target_event_id = str(trigger_data.get("target_event_id", "")).strip()
+        if not target_event_id:
+            logger.warning("Correction event %s has no target_event_id, skipping", event_id)
+            return set()
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT data
+                FROM events
+                WHERE user_id = %s
+                  AND id = %s
+                  AND event_type = 'set.logged'
+                """,
+                (user_id, target_event_id),
+            )
+            target_row = await cur.fetchone()
+        if target_row is None:
+            logger.warning(
+                "Correction event %s references missing set.logged target %s",
+                event_id,
+                target_event_id,
+            )
+            return set()
+        targets: set[str] = set()
+        raw_key = resolve_exercise_key(target_row["data"])
+        if raw_key:
+            targets.add(resolve_through_aliases(raw_key, alias_map))
+
+        changed_fields = trigger_data.get("changed_fields")
+        changed_exercise = _extract_changed_field_value(changed_fields, "exercise_id")
+        if changed_exercise is None:
+            changed_exercise = _extract_changed_field_value(changed_fields, "exercise")
+        if changed_exercise:
+            targets.add(resolve_through_aliases(changed_exercise, alias_map))
+        return targets
+
+    raw_key = resolve_exercise_key(trigger_data)
+    if not raw_key:
+        logger.warning("Event %s has no exercise field, skipping", event_id)
+        return set()
+    return {resolve_through_aliases(raw_key, alias_map)}
+
+
+async def _try_incremental_update(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    user_id: str,
+    canonical: str,
+    trigger_row: dict[str, Any],
+    alias_map: dict[str, str],
+    timezone_context: dict[str, Any],
+) -> bool:
+    """Fold an appended set.logged onto the stored state. False = needs full replay."""
+    accumulator = await _load_accumulator(conn, user_id, canonical)
+    if accumulator is None:
+        return False
+    alias_keys = list(find_all_keys_for_canonical(canonical, alias_map))
+    blocker = accumulator.incremental_blocker(
+        trigger_row,
+        alias_keys=alias_keys,
+        timezone_name=timezone_context["timezone"],
+    )
+    if blocker is not None:
+        logger.debug(
+            "exercise_progression incremental path skipped for user=%s exercise=%s: %s",
+            user_id, canonical, blocker,
+        )
+        return False
+
+    _fold_progression_row(accumulator, trigger_row)
+    projection_data = accumulator.build_projection(canonical, timezone_context)
+    await _upsert_progression_projection(
+        conn, user_id, canonical, projection_data, str(trigger_row["id"]),
+    )
+    await _save_accumulator(conn, user_id, canonical, accumulator)
+    logger.info(
+        (
+            "Updated exercise_progression incrementally for user=%s exercise=%s "
+            "(sets=%d, 1rm=%.1f, primary_group=%s)"
+        ),
+        user_id,
+        canonical,
+        accumulator.total_sets,
+        accumulator.best_1rm,
+        accumulator.primary_group,
+    )
+    return True
+
+
 @projection_handler("set.logged", "set.corrected", "exercise.alias_created", dimension_meta={
     "name": "exercise_progression",
     "description": "Strength progression per exercise over time",
@@ -273,10 +1218,14 @@ def _manifest_contribution(projection_rows: list[dict[str, Any]]) -> dict[str, A
 async def update_exercise_progression(
     conn: psycopg.AsyncConnection[Any], payload: dict[str, Any]
 ) -> None:
-    """Full recompute of exercise_progression projection for affected exercise(s)."""
+    """Update exercise_progression for affected exercise(s).
+
+    In-order set.logged events fold onto the stored accumulator; everything
+    else (and any state mismatch) runs the full recompute.
+    """
     user_id = payload["user_id"]
-    event_id = payload["event_id"]
     event_type = payload.get("event_type", "")
+    event_ids = payload_event_ids(payload)
 
     retracted_ids = await get_retracted_event_ids(conn, user_id)
     alias_map = await get_alias_map(conn, user_id, retracted_ids=retracted_ids)
@@ -286,71 +1235,57 @@ async def update_exercise_progression(
 
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
-            "SELECT data FROM events WHERE id = %s AND user_id = %s",
-            (event_id, user_id),
+            """
+            SELECT id, event_type, timestamp, data, metadata
+            FROM events
+            WHERE id = ANY(%s::uuid[]) AND user_id = %s
+            """,
+            (event_ids, user_id),
         )
-        trigger_row = await cur.fetchone()
-        if trigger_row is None:
-            logger.warning("Event %s not found, skipping", event_id)
-            return
+        trigger_rows = {str(row["id"]): row for row in await cur.fetchall()}
 
+    # A coalesced job carries several triggering events; their targets are
+    # unioned so every affected exercise is replayed exactly once.
     canonical_targets: set[str] = set()
-    trigger_data = trigger_row.get("data") or {}
-    if event_type == "exercise.alias_created":
-        canonical = _normalize_token(trigger_data.get("exercise_id"))
-        if not canonical:
-            logger.warning("Alias event %s has no exercise_id, skipping", event_id)
-            return
-        canonical_targets.add(resolve_through_aliases(canonical, alias_map))
-    elif event_type == "set.corrected":
-        target_event_id = str(trigger_data.get("target_event_id", "")).strip()
-        if not target_event_id:
-            logger.warning("Correction event %s has no target_event_id, skipping", event_id)
-            return
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT data
-                FROM events
-                WHERE user_id = %s
-                  AND id = %s
-                  AND event_type = 'set.logged'
-                """,
-                (user_id, target_event_id),
-            )
-            target_row = await cur.fetchone()
-        if target_row is None:
-            logger.warning(
-                "Correction event %s references missing set.logged target %s",
-                event_id,
-                target_event_id,
-            )
-            return
-        raw_key = resolve_exercise_key(target_row["data"])
-        if raw_key:
-            canonical_targets.add(resolve_through_aliases(raw_key, alias_map))
-
-        changed_fields = trigger_data.get("changed_fields")
-        changed_exercise = _extract_changed_field_value(changed_fields, "exercise_id")
-        if changed_exercise is None:
-            changed_exercise = _extract_changed_field_value(changed_fields, "exercise")
-        if changed_exercise:
-            canonical_targets.add(resolve_through_aliases(changed_exercise, alias_map))
-    else:
-        raw_key = resolve_exercise_key(trigger_data)
-        if not raw_key:
-            logger.warning("Event %s has no exercise field, skipping", event_id)
-            return
-        canonical_targets.add(resolve_through_aliases(raw_key, alias_map))
+    for event_id in event_ids:
+        trigger_row = trigger_rows.get(event_id)
+        if trigger_row is None:
+            logger.warning("Event %s not found, skipping", event_id)
+            continue
+        canonical_targets |= await _resolve_canonical_targets(
+            conn, user_id, event_type, trigger_row, alias_map
+        )
 
     if not canonical_targets:
         logger.warning(
-            "No canonical targets resolved for event %s (%s), skipping",
-            event_id,
+            "No canonical targets resolved for events %s (%s), skipping",
+            ", ".join(event_ids),
             event_type,
         )
         return
 
+    # Append-only fast path. A retracted set.logged is re-routed here with its
+    # own event_id, so retracted ids must take the full replay.
+    if (
+        event_type == "set.logged"
+        and len(trigger_rows) == 1
+        and len(canonical_targets) == 1
+    ):
+        trigger_row = next(iter(trigger_rows.values()))
+        if (
+            trigger_row.get("event_type") == "set.logged"
+            and str(trigger_row["id"]) not in retracted_ids
+            and await _try_incremental_update(
+                conn,
+                user_id=user_id,
+                canonical=next(iter(canonical_targets)),
+                trigger_row=trigger_row,
+                alias_map=alias_map,
+                timezone_context=timezone_context,
+            )
+        ):
+            return
+
     for canonical in sorted(canonical_targets):
         all_keys = find_all_keys_for_canonical(canonical, alias_map)
         all_keys_list = list(all_keys)
@@ -449,12 +1384,6 @@ async def update_exercise_progression(
                 filtered_rows.append(row)
         rows = filtered_rows
 
-        context_by_event_id = {
-            entry["event_id"]: entry
-            for entry in evaluate_set_context_rows(rows)
-            if entry.get("event_id")
-        }
-
         if not rows:
             async with conn.cursor() as cur:
                 await cur.execute(
@@ -466,6 +1395,7 @@ async def update_exercise_progression(
                     """,
                     (user_id, canonical),
                 )
+            await _delete_accumulators(conn, user_id, [canonical])
             logger.info(
                 (
                     "Deleted exercise_progression for user=%s exercise=%s "
@@ -476,405 +1406,16 @@ async def update_exercise_progression(
             )
             continue
 
-        comparability_summary: dict[str, dict[str, Any]] = defaultdict(
-            lambda: {
-                "total_sets": 0,
-                "total_volume_kg": 0.0,
-                "estimated_1rm": 0.0,
-                "estimated_1rm_date": None,
-                "latest_timestamp": None,
-            }
-        )
-        row_comparability_group: dict[str, str] = {}
-        for row in rows:
-            data = row.get("effective_data") or row["data"]
-            group = _resolve_comparability_group(data)
-            row_id = str(row["id"])
-            row_comparability_group[row_id] = group
-            bucket = comparability_summary[group]
-            bucket["total_sets"] += 1
-            bucket["latest_timestamp"] = row["timestamp"]
-            try:
-                weight = float(data.get("weight_kg", data.get("weight", 0)))
-                reps = int(data.get("reps", 0))
-            except (TypeError, ValueError):
-                continue
-            volume = weight * reps
-            bucket["total_volume_kg"] += volume
-            e1rm, _ = effort_adjusted_e1rm(
-                weight,
-                reps,
-                rir=data.get("rir"),
-                rpe=data.get("rpe"),
-            )
-            if e1rm > bucket["estimated_1rm"]:
-                bucket["estimated_1rm"] = e1rm
-                bucket["estimated_1rm_date"] = row["timestamp"]
-
-        latest_row_id = str(rows[-1]["id"])
-        primary_group = row_comparability_group.get(latest_row_id, "unspecified")
-
-        total_sets = 0
-        total_volume_kg = 0.0
-        best_1rm = 0.0
-        best_1rm_date: datetime | None = None
-        session_keys: set[str] = set()
-        recent_sets: list[dict[str, Any]] = []
-        last_event_id = rows[-1]["id"]
-        week_data: dict[str, dict[str, Any]] = defaultdict(
-            lambda: {
-                "estimated_1rm": 0.0,
-                "total_sets": 0,
-                "total_volume_kg": 0.0,
-                "max_weight_kg": 0.0,
-            }
-        )
-        anomalies: list[dict[str, Any]] = []
-        field_hints: list[dict[str, Any]] = []
-        observed_attr_counts: dict[str, dict[str, int]] = {}
-        temporal_conflicts: dict[str, int] = {}
-        fallback_session_state: SessionBoundaryState | None = None
-        e1rm_sources: dict[str, int] = {"explicit": 0, "inferred_from_rpe": 0, "fallback_epley": 0}
-        primary_e1rm_values: list[float] = []
-
-        for row in rows:
-            data = row.get("effective_data") or row["data"]
-            metadata = row.get("metadata") or {}
-            context_eval = context_by_event_id.get(str(row["id"]), {})
-            effective_defaults = context_eval.get("effective_defaults") or {}
-            temporal = normalize_temporal_point(
-                row["timestamp"],
-                timezone_name=timezone_name,
-                data=data,
-                metadata=metadata,
-            )
-            ts = temporal.timestamp_utc
-            local_day = temporal.local_date
-            group = row_comparability_group.get(str(row["id"]), "unspecified")
-
-            for conflict in temporal.conflicts:
-                temporal_conflicts[conflict] = temporal_conflicts.get(conflict, 0) + 1
-
-            _known, unknown = separate_known_unknown(data, _KNOWN_FIELDS)
-            merge_observed_attributes(observed_attr_counts, row["event_type"], unknown)
-
-            try:
-                weight = float(data.get("weight_kg", data.get("weight", 0)))
-                reps = int(data.get("reps", 0))
-            except (ValueError, TypeError):
-                logger.warning("Skipping event %s: invalid weight/reps data", row["id"])
-                continue
-
-            if weight < 0 or weight > 500:
-                anomalies.append({
-                    "event_id": str(row["id"]),
-                    "field": "weight_kg",
-                    "value": weight,
-                    "expected_range": [0, 500],
-                    "message": f"Weight {weight}kg outside plausible range on {local_day.isoformat()}",
-                })
-            if reps < 0 or reps > 100:
-                anomalies.append({
-                    "event_id": str(row["id"]),
-                    "field": "reps",
-                    "value": reps,
-                    "expected_range": [0, 100],
-                    "message": f"{reps} reps in a single set on {local_day.isoformat()}",
-                })
-
-            if group != primary_group:
-                continue
-
-            raw_session_id = str(metadata.get("session_id") or "").strip()
-            session_id = raw_session_id or None
-            if session_id is not None:
-                session_key = session_id
-                fallback_session_state = None
-            else:
-                session_key, fallback_session_state = next_fallback_session_key(
-                    local_date=local_day,
-                    timestamp_utc=ts,
-                    state=fallback_session_state,
-                )
-
-            volume = weight * reps
-            total_sets += 1
-            total_volume_kg += volume
-            session_keys.add(session_key)
-
-            parsed_rpe: float | None = None
-            if "rpe" in data:
-                try:
-                    parsed_rpe = float(data["rpe"])
-                except (ValueError, TypeError):
-                    parsed_rpe = None
-            parsed_rir, rir_source = _resolve_set_rir(data, parsed_rpe)
-            if parsed_rir is None and effective_defaults.get("rir") is not None:
-                parsed_rir = _normalize_rir(effective_defaults.get("rir"))
-                rir_source = "session_default"
-
-            e1rm, e1rm_source = effort_adjusted_e1rm(
-                weight,
-                reps,
-                rir=parsed_rir,
-                rpe=parsed_rpe,
-            )
-            if e1rm_source not in e1rm_sources:
-                e1rm_sources[e1rm_source] = 0
-            e1rm_sources[e1rm_source] += 1
-            primary_e1rm_values.append(e1rm)
-
-            if best_1rm > 0 and e1rm > best_1rm * 2:
-                anomalies.append({
-                    "event_id": str(row["id"]),
-                    "field": "estimated_1rm",
-                    "value": round(e1rm, 1),
-                    "expected_range": [0, round(best_1rm * 2, 1)],
-                    "message": (
-                        f"1RM jumped from {best_1rm:.1f}kg to {e1rm:.1f}kg "
-                        f"({(e1rm / best_1rm - 1) * 100:.0f}% increase) on {local_day.isoformat()}"
-                    ),
-                })
-
-            if e1rm > best_1rm:
-                best_1rm = e1rm
-                best_1rm_date = ts
-
-            week_key = temporal.iso_week
-            week_entry = week_data[week_key]
-            week_entry["total_sets"] += 1
-            week_entry["total_volume_kg"] += volume
-            if e1rm > week_entry["estimated_1rm"]:
-                week_entry["estimated_1rm"] = e1rm
-            if weight > week_entry["max_weight_kg"]:
-                week_entry["max_weight_kg"] = weight
-
-            set_entry: dict[str, Any] = {
-                "timestamp": ts.isoformat(),
-                "weight_kg": weight,
-                "reps": reps,
-                "estimated_1rm": round(e1rm, 1),
-                "estimated_1rm_source": e1rm_source,
-                "comparability_group": group,
-                "_session_key": session_key,
-            }
-            if parsed_rpe is not None:
-                set_entry["rpe"] = parsed_rpe
-            if parsed_rir is not None:
-                set_entry["rir"] = parsed_rir
-                if rir_source and rir_source != "explicit":
-                    set_entry["rir_source"] = rir_source
-
-            explicit_rest = _as_optional_float(data.get("rest_seconds"))
-            if explicit_rest is not None:
-                set_entry["rest_seconds"] = round(explicit_rest, 2)
-            elif effective_defaults.get("rest_seconds") is not None:
-                default_rest = _as_optional_float(effective_defaults.get("rest_seconds"))
-                if default_rest is not None:
-                    set_entry["rest_seconds"] = round(default_rest, 2)
-                    set_entry["rest_seconds_source"] = "session_default"
-
-            if isinstance(data.get("tempo"), str) and data["tempo"].strip():
-                set_entry["tempo"] = data["tempo"].strip().lower()
-            elif isinstance(effective_defaults.get("tempo"), str):
-                default_tempo = str(effective_defaults.get("tempo")).strip().lower()
-                if default_tempo:
-                    set_entry["tempo"] = default_tempo
-                    set_entry["tempo_source"] = "session_default"
-
-            if "set_type" in data:
-                set_entry["set_type"] = data["set_type"]
-            elif effective_defaults.get("set_type") is not None:
-                set_entry["set_type"] = effective_defaults.get("set_type")
-            if session_id is not None:
-                set_entry["session_id"] = session_id
-            if unknown:
-                set_entry["extra"] = unknown
-            if row.get("correction_history"):
-                set_entry["corrections"] = row["correction_history"]
-            if row.get("field_provenance"):
-                set_entry["field_provenance"] = row["field_provenance"]
-            if isinstance(data.get("load_context"), dict):
-                set_entry["load_context"] = data.get("load_context")
-
-            recent_sets.append(set_entry)
-
-        session_last_ts: dict[str, str] = {}
-        for set_row in recent_sets:
-            session_key = set_row["_session_key"]
-            if (
-                session_key not in session_last_ts
-                or set_row["timestamp"] > session_last_ts[session_key]
-            ):
-                session_last_ts[session_key] = set_row["timestamp"]
-        sorted_session_keys = sorted(
-            session_last_ts,
-            key=lambda key: session_last_ts[key],
-            reverse=True,
-        )[:5]
-        recent_session_set = set(sorted_session_keys)
-        recent_sessions = [
-            {k: v for k, v in set_row.items() if k != "_session_key"}
-            for set_row in recent_sets
-            if set_row["_session_key"] in recent_session_set
-        ]
-        recent_sessions.reverse()
-
-        sorted_weeks = sorted(week_data.keys(), reverse=True)[:26]
-        sorted_weeks.reverse()
-        weekly_history = [
-            {
-                "week": week_key,
-                "estimated_1rm": round(week_data[week_key]["estimated_1rm"], 1),
-                "total_sets": week_data[week_key]["total_sets"],
-                "total_volume_kg": round(week_data[week_key]["total_volume_kg"], 1),
-                "max_weight_kg": round(week_data[week_key]["max_weight_kg"], 1),
-            }
-            for week_key in sorted_weeks
-        ]
-
-        primary_rows = [
-            row
-            for row in rows
-            if row_comparability_group.get(str(row["id"])) == primary_group
-        ]
-        if primary_rows:
-            latest_data = primary_rows[-1].get("effective_data") or primary_rows[-1]["data"]
-            field_hints = check_expected_fields(latest_data, _EXPECTED_FIELDS)
-
-        comparability_groups = []
-        for group, summary in sorted(
-            comparability_summary.items(),
-            key=lambda item: (item[1]["latest_timestamp"], item[0]),
-            reverse=True,
-        ):
-            estimated_date = summary.get("estimated_1rm_date")
-            if isinstance(estimated_date, datetime):
-                estimated_date_value: str | None = estimated_date.isoformat()
-            else:
-                estimated_date_value = None
-            comparability_groups.append({
-                "group": group,
-                "total_sets": int(summary.get("total_sets", 0)),
-                "total_volume_kg": round(float(summary.get("total_volume_kg", 0.0)), 1),
-                "estimated_1rm": round(float(summary.get("estimated_1rm", 0.0)), 1),
-                "estimated_1rm_date": estimated_date_value,
-            })
-
-        comparability_degraded = len(comparability_groups) > 1
-        status = STATUS_OK
-        if total_sets < 3:
-            status = STATUS_INSUFFICIENT_DATA
-        elif comparability_degraded:
-            status = STATUS_DEGRADED_COMPARABILITY
-
-        mean_e1rm, sd_e1rm = summarize_observations(primary_e1rm_values)
-        if mean_e1rm is None:
-            mean_e1rm = best_1rm
-        estimate_interval = interval_around(mean_e1rm, sd_e1rm)
-        confidence = confidence_from_evidence(
-            observed_points=total_sets,
-            required_points=6,
-            comparability_degraded=comparability_degraded,
-        )
-        next_observations: list[str] = []
-        if total_sets < 6:
-            next_observations.append("Log 3-6 additional high-intent sets for this exercise.")
-        if e1rm_sources.get("fallback_epley", 0) > 0:
-            next_observations.append("Add RIR or RPE to reduce e1RM uncertainty.")
-        if comparability_degraded:
-            next_observations.append(
-                "Keep equipment/protocol consistent or persist comparability_group explicitly."
-            )
-        reason_codes: list[str] = []
-        if total_sets < 3:
-            reason_codes.append("insufficient_observation_count")
-        if comparability_degraded:
-            reason_codes.append("multiple_comparability_groups")
-        if e1rm_sources.get("fallback_epley", 0) > 0:
-            reason_codes.append("effort_context_missing")
-
-        data_sufficiency = data_sufficiency_block(
-            required_observations=6,
-            observed_observations=total_sets,
-            uncertainty_reason_codes=reason_codes,
-            recommended_next_observations=next_observations,
+        accumulator = _fold_progression_rows(
+            rows,
+            timezone_name=timezone_name,
+            alias_keys=all_keys_list,
         )
-        capability_estimation = build_capability_envelope(
-            capability="strength_1rm",
-            estimate_mean=mean_e1rm,
-            estimate_interval=estimate_interval,
-            status=status,
-            confidence=confidence,
-            data_sufficiency=data_sufficiency,
-            model_version="strength_effort_adjusted.v1",
-            caveats=[
-                {
-                    "code": "multiple_comparability_groups",
-                    "severity": "medium",
-                    "details": {"groups_total": len(comparability_groups)},
-                }
-            ]
-            if comparability_degraded
-            else [],
-            protocol_signature={
-                "primary_group": primary_group,
-                "group_count": len(comparability_groups),
-            },
-            comparability={
-                "primary_group": primary_group,
-                "groups_total": len(comparability_groups),
-                "multiple_groups_detected": comparability_degraded,
-            },
-            diagnostics={
-                "e1rm_source_counts": e1rm_sources,
-                "timezone": timezone_context.get("timezone"),
-            },
+        projection_data = accumulator.build_projection(canonical, timezone_context)
+        await _upsert_progression_projection(
+            conn, user_id, canonical, projection_data, str(rows[-1]["id"]),
         )
-
-        projection_data: dict[str, Any] = {
-            "exercise": canonical,
-            "estimated_1rm": round(best_1rm, 1),
-            "estimated_1rm_interval": estimate_interval,
-            "estimated_1rm_date": best_1rm_date.isoformat() if best_1rm_date else None,
-            "status": status,
-            "confidence": confidence,
-            "data_sufficiency": data_sufficiency,
-            "capability_estimation": capability_estimation,
-            "total_sessions": len(session_keys),
-            "total_sets": total_sets,
-            "total_volume_kg": round(total_volume_kg, 1),
-            "timezone_context": timezone_context,
-            "recent_sessions": recent_sessions,
-            "weekly_history": weekly_history,
-            "comparability": {
-                "primary_group": primary_group,
-                "groups_total": len(comparability_groups),
-                "multiple_groups_detected": len(comparability_groups) > 1,
-                "groups": comparability_groups,
-            },
-            "data_quality": {
-                "anomalies": anomalies,
-                "field_hints": field_hints,
-                "observed_attributes": observed_attr_counts,
-                "temporal_conflicts": temporal_conflicts,
-                "e1rm_source_counts": e1rm_sources,
-            },
-        }
-
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO projections (user_id, projection_type, key, data, version, last_event_id, updated_at)
-                VALUES (%s, 'exercise_progression', %s, %s, 1, %s, NOW())
-                ON CONFLICT (user_id, projection_type, key) DO UPDATE SET
-                    data = EXCLUDED.data,
-                    version = projections.version + 1,
-                    last_event_id = EXCLUDED.last_event_id,
-                    updated_at = NOW()
-                """,
-                (user_id, canonical, json.dumps(projection_data), str(last_event_id)),
-            )
+        await _save_accumulator(conn, user_id, canonical, accumulator)
 
         stale_keys = list(all_keys - {canonical})
         if stale_keys:
@@ -888,6 +1429,7 @@ async def update_exercise_progression(
                     """,
                     (user_id, stale_keys),
                 )
+            await _delete_accumulators(conn, user_id, stale_keys)
             logger.info(
                 "Deleted stale exercise_progression projections for user=%s keys=%s (consolidated into %s)",
                 user_id,
@@ -902,9 +1444,9 @@ async def update_exercise_progression(
             ),
             user_id,
             canonical,
-            total_sets,
-            best_1rm,
-            primary_group,
+            accumulator.total_sets,
+            accumulator.best_1rm,
+            accumulator.primary_group,
             timezone_name,
             timezone_context["assumed"],
         )
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import logging
+import time
 import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
 from typing import Any
 
 import psycopg
@@ -14,18 +17,28 @@ from ..consistency_inbox import refresh_all_consistency_inboxes
 from ..extraction_calibration import refresh_extraction_calibration
 from ..inference_event_registry import (
     CAPABILITY_BACKFILL_TRIGGER_EVENT_TYPES,
+    NIGHTLY_REFIT_FAMILY_EVENT_TYPES,
     NIGHTLY_REFIT_TRIGGER_EVENT_TYPES,
     OBJECTIVE_BACKFILL_TRIGGER_EVENT_TYPES,
 )
 from ..issue_clustering import refresh_issue_clusters
 from ..learning_backlog_bridge import refresh_learning_backlog_candidates
-from ..population_priors import refresh_population_prior_profiles
+from ..nightly_pipeline import (
+    NIGHTLY_STAGE_JOB_TYPE,
+    advance_nightly_run,
+    complete_shard,
+    event_user_ids,
+    plan_nightly_run,
+)
+from ..population_priors import refresh_population_prior_profiles, users_affected_by_prior_change
 from ..registry import register
 from ..scheduler import nightly_interval_hours
 from ..unknown_dimension_mining import refresh_unknown_dimension_proposals
 
 logger = logging.getLogger(__name__)
 
+NIGHTLY_REFIT_SOURCE = "inference.nightly_refit"
+
 
 async def _latest_event_id_for_type(
     conn: psycopg.AsyncConnection[Any],
@@ -69,6 +82,203 @@ async def _candidate_user_ids_for_event_types(
     return [str(row["user_id"]) for row in rows]
 
 
+async def _table_exists(conn: psycopg.AsyncConnection[Any], table_name: str) -> bool:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            "SELECT to_regclass(%s) IS NOT NULL AS present",
+            (table_name,),
+        )
+        row = await cur.fetchone()
+    return bool(row and row.get("present"))
+
+
+async def _lagging_refit_families(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    families: dict[str, tuple[str, ...]],
+    user_id_from: str | None = None,
+    user_id_to: str | None = None,
+) -> dict[str, list[tuple[str, str, datetime]]]:
+    """Per user in [user_id_from, user_id_to): (family, latest event) not yet refit.
+
+    A family lags when its latest event differs from the watermark. A
+    retraction is not detected here: it leaves the family's latest event id
+    unchanged, and reaches the projections through its own projection.update.
+    Distinct users are walked with a loose index scan instead of a DISTINCT
+    over the whole events table.
+    """
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            WITH RECURSIVE event_users AS (
+                (
+                    SELECT user_id
+                    FROM events
+                    WHERE %s::uuid IS NULL OR user_id >= %s::uuid
+                    ORDER BY user_id
+                    LIMIT 1
+                )
+                UNION ALL
+                SELECT (
+                    SELECT e.user_id
+                    FROM events e
+                    WHERE e.user_id > event_users.user_id
+                    ORDER BY e.user_id
+                    LIMIT 1
+                )
+                FROM event_users
+                WHERE event_users.user_id IS NOT NULL
+                  AND (%s::uuid IS NULL OR event_users.user_id < %s::uuid)
+            ),
+            families AS (
+                SELECT key AS projection_family,
+                       ARRAY(SELECT jsonb_array_elements_text(value)) AS event_types
+                FROM jsonb_each(%s::jsonb)
+            )
+            SELECT u.user_id::text AS user_id,
+                   f.projection_family,
+                   latest.id::text AS event_id,
+                   latest.timestamp AS event_at
+            FROM event_users u
+            CROSS JOIN families f
+            CROSS JOIN LATERAL (
+                SELECT e.id, e.timestamp
+                FROM events e
+                WHERE e.user_id = u.user_id
+                  AND e.event_type = ANY(f.event_types)
+                ORDER BY e.timestamp DESC, e.id DESC
+                LIMIT 1
+            ) latest
+            LEFT JOIN inference_refit_watermarks w
+              ON w.user_id = u.user_id
+             AND w.projection_family = f.projection_family
+            WHERE u.user_id IS NOT NULL
+              AND (%s::uuid IS NULL OR u.user_id < %s::uuid)
+              AND w.last_event_id IS DISTINCT FROM latest.id
+            ORDER BY u.user_id, f.projection_family
+            """,
+            (
+                user_id_from,
+                user_id_from,
+                user_id_to,
+                user_id_to,
+                Json({family: list(types) for family, types in families.items()}),
+                user_id_to,
+                user_id_to,
+            ),
+        )
+        rows = await cur.fetchall()
+
+    lagging: dict[str, list[tuple[str, str, datetime]]] = {}
+    for row in rows:
+        lagging.setdefault(str(row["user_id"]), []).append(
+            (str(row["projection_family"]), str(row["event_id"]), row["event_at"])
+        )
+    return lagging
+
+
+def _refit_watermark_payload(
+    *,
+    run_id: str,
+    family: str,
+    event_id: str,
+    event_at: datetime,
+) -> dict[str, Any]:
+    return {
+        "run_id": str(run_id),
+        "family": family,
+        "last_event_id": event_id,
+        "last_event_at": event_at.isoformat(),
+    }
+
+
+async def advance_refit_watermark(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    user_id: str,
+    watermark: dict[str, Any],
+    job_type: str,
+    event_type: str,
+    handler_name: str = "",
+) -> None:
+    """Advance a family watermark once the refit jobs carrying it succeeded.
+
+    Called by the projection router after a nightly refit job (or a retry of
+    one of its handlers) completed without failures. The watermark only moves
+    when no other job of the same run and family is still outstanding, failed
+    or dead, so a lost refit leaves the family lagging for the next night.
+    The calling job itself is excluded by (job_type, event_type, handler).
+    """
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO inference_refit_watermarks (
+                user_id, projection_family, last_event_id, last_event_at, refit_at
+            )
+            SELECT %(user_id)s::uuid, %(family)s, %(last_event_id)s::uuid,
+                   %(last_event_at)s::timestamptz, NOW()
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM background_jobs
+                WHERE user_id = %(user_id)s::uuid
+                  AND job_type IN ('projection.update', 'projection.retry')
+                  AND status IN ('pending', 'processing', 'failed', 'dead')
+                  AND payload->'refit_watermark'->>'run_id' = %(run_id)s
+                  AND payload->'refit_watermark'->>'family' = %(family)s
+                  AND NOT (
+                      job_type = %(job_type)s
+                      AND payload->>'event_type' = %(event_type)s
+                      AND COALESCE(payload->>'handler_name', '') = %(handler_name)s
+                  )
+            )
+            ON CONFLICT (user_id, projection_family) DO UPDATE
+            SET last_event_id = EXCLUDED.last_event_id,
+                last_event_at = EXCLUDED.last_event_at,
+                refit_at = EXCLUDED.refit_at
+            WHERE inference_refit_watermarks.last_event_at <= EXCLUDED.last_event_at
+            """,
+            {
+                "user_id": user_id,
+                "family": str(watermark["family"]),
+                "last_event_id": str(watermark["last_event_id"]),
+                "last_event_at": str(watermark["last_event_at"]),
+                "run_id": str(watermark["run_id"]),
+                "job_type": job_type,
+                "event_type": event_type,
+                "handler_name": handler_name,
+            },
+        )
+
+
+def _refit_event_types_by_user(
+    lagging_families_by_user: dict[str, set[str]],
+    prior_changed_user_ids: list[str],
+    *,
+    families: dict[str, tuple[str, ...]],
+) -> dict[str, tuple[str, ...]]:
+    """Trigger event types to refit per user.
+
+    Users with new evidence are refit for their lagging families only; users
+    whose population prior changed are refit for every family.
+    """
+    all_event_types = tuple(
+        dict.fromkeys(event_type for types in families.values() for event_type in types)
+    )
+    selected: dict[str, tuple[str, ...]] = {}
+    for user_id, lagging_families in lagging_families_by_user.items():
+        selected[user_id] = tuple(
+            dict.fromkeys(
+                event_type
+                for family, types in families.items()
+                if family in lagging_families
+                for event_type in types
+            )
+        )
+    for user_id in prior_changed_user_ids:
+        selected[user_id] = all_event_types
+    return dict(sorted(selected.items()))
+
+
 def _coerce_event_types(
     raw_event_types: Any,
     *,
@@ -115,6 +325,7 @@ async def _enqueue_projection_update_dedup(
     event_type: str,
     event_id: str,
     source: str,
+    extra: dict[str, Any] | None = None,
 ) -> bool:
     """Enqueue projection.update once per user/event_type/source while in-flight."""
     async with conn.cursor(row_factory=dict_row) as cur:
@@ -141,6 +352,7 @@ async def _enqueue_projection_update_dedup(
                         "event_type": event_type,
                         "user_id": user_id,
                         "source": source,
+                        **(extra or {}),
                     }
                 ),
                 source,
@@ -168,9 +380,25 @@ async def _enqueue_projection_updates_for_user_set(
     event_types: tuple[str, ...],
     source: str,
     synthetic_event_type: str | None = None,
+    families: dict[str, tuple[str, ...]] | None = None,
+    watermarks: dict[str, dict[str, Any]] | None = None,
 ) -> int:
+    """Enqueue one projection.update per user and event type with evidence.
+
+    With ``families``, the first job of each family per user is flagged
+    ``batch_refit``: handlers that refit a whole family at once (the strength
+    batch fit) run on that job only instead of once per event type.
+    ``watermarks`` (family -> refit_watermark payload) is attached to every
+    job of that family; the router advances it once they all succeeded.
+    """
+    family_by_event_type = {
+        event_type: family
+        for family, types in (families or {}).items()
+        for event_type in types
+    }
     enqueued = 0
     for user_id in user_ids:
+        led_families: set[str] = set()
         for event_type in event_types:
             latest_event_id = await _latest_event_id_for_type(conn, user_id, event_type)
             if latest_event_id is None:
@@ -182,101 +410,272 @@ async def _enqueue_projection_updates_for_user_set(
                     )
                 else:
                     continue
+            extra: dict[str, Any] | None = None
+            family = family_by_event_type.get(event_type)
+            if family is not None:
+                extra = {"batch_refit": family not in led_families}
+                led_families.add(family)
+                if watermarks and family in watermarks:
+                    extra["refit_watermark"] = watermarks[family]
             inserted = await _enqueue_projection_update_dedup(
                 conn,
                 user_id=user_id,
                 event_type=event_type,
                 event_id=latest_event_id,
                 source=source,
+                extra=extra,
             )
             if inserted:
                 enqueued += 1
     return enqueued
 
 
-@register("inference.nightly_refit")
-async def handle_inference_nightly_refit(
-    conn: psycopg.AsyncConnection[Any], payload: dict[str, Any]
-) -> None:
-    """Enqueue projection refresh jobs for nightly inference maintenance."""
-    interval_h = int(payload.get("interval_hours", nightly_interval_hours()))
-    scheduler_key = str(payload.get("scheduler_key") or "").strip()
-    missed_runs = int(payload.get("missed_runs") or 0)
-    event_types = NIGHTLY_REFIT_TRIGGER_EVENT_TYPES
-    user_ids = await _candidate_user_ids_for_event_types(conn, event_types=event_types)
-    source = "inference.nightly_refit"
-    enqueued = await _enqueue_projection_updates_for_user_set(
+def _in_user_range(user_id: str, user_id_from: str | None, user_id_to: str | None) -> bool:
+    value = uuid.UUID(user_id)
+    if user_id_from is not None and value < uuid.UUID(user_id_from):
+        return False
+    if user_id_to is not None and value >= uuid.UUID(user_id_to):
+        return False
+    return True
+
+
+async def _prior_changed_cohort_keys_for_run(
+    conn: psycopg.AsyncConnection[Any],
+    run_id: str,
+) -> list[str]:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT summary
+            FROM inference_nightly_stage_shards
+            WHERE run_id = %s
+              AND stage = 'population_priors'
+            """,
+            (run_id,),
+        )
+        row = await cur.fetchone()
+    summary = (row or {}).get("summary") or {}
+    return [str(key) for key in summary.get("prior_changed_cohort_keys") or []]
+
+
+async def _run_refit_enqueue_stage(
+    conn: psycopg.AsyncConnection[Any],
+    shard: dict[str, Any],
+) -> dict[str, Any]:
+    """Refit fan-out for one user range: new evidence or changed priors."""
+    user_id_from = shard["user_id_from"]
+    user_id_to = shard["user_id_to"]
+    prior_changed_user_ids = await users_affected_by_prior_change(
         conn,
-        user_ids=user_ids,
-        event_types=event_types,
-        source=source,
+        await _prior_changed_cohort_keys_for_run(conn, shard["run_id"]),
+        user_id_from=user_id_from,
+        user_id_to=user_id_to,
     )
 
-    population_prior_summary: dict[str, Any] | None = None
-    try:
-        population_prior_summary = await refresh_population_prior_profiles(conn)
-    except Exception as exc:
-        logger.warning("Population prior refresh skipped due to error: %s", exc)
+    families = NIGHTLY_REFIT_FAMILY_EVENT_TYPES
+    watermarks_available = await _table_exists(conn, "inference_refit_watermarks")
+    lagging: dict[str, list[tuple[str, str, datetime]]] = {}
+    if watermarks_available:
+        lagging = await _lagging_refit_families(
+            conn,
+            families=families,
+            user_id_from=user_id_from,
+            user_id_to=user_id_to,
+        )
+        lagging_families_by_user = {
+            user_id: {family for family, _, _ in user_families}
+            for user_id, user_families in lagging.items()
+        }
+    else:
+        # Pre-migration fallback: refit every user with trigger evidence.
+        lagging_families_by_user = {
+            user_id: set(families)
+            for user_id in await _candidate_user_ids_for_event_types(
+                conn, event_types=NIGHTLY_REFIT_TRIGGER_EVENT_TYPES
+            )
+            if _in_user_range(user_id, user_id_from, user_id_to)
+        }
 
-    issue_cluster_summary: dict[str, Any] | None = None
-    try:
-        issue_cluster_summary = await refresh_issue_clusters(conn)
-    except Exception as exc:
-        logger.warning("Issue clustering refresh skipped due to error: %s", exc)
+    event_types_by_user = _refit_event_types_by_user(
+        lagging_families_by_user,
+        prior_changed_user_ids,
+        families=families,
+    )
+    enqueued = 0
+    for user_id, event_types in event_types_by_user.items():
+        # Watermarks advance when the refit jobs succeed, not on enqueue.
+        watermarks = {
+            family: _refit_watermark_payload(
+                run_id=shard["run_id"],
+                family=family,
+                event_id=event_id,
+                event_at=event_at,
+            )
+            for family, event_id, event_at in lagging.get(user_id, [])
+        }
+        enqueued += await _enqueue_projection_updates_for_user_set(
+            conn,
+            user_ids=[user_id],
+            event_types=event_types,
+            source=NIGHTLY_REFIT_SOURCE,
+            families=families,
+            watermarks=watermarks,
+        )
+    return {
+        "status": "success",
+        "enqueued": enqueued,
+        "users": len(event_types_by_user),
+        "new_evidence": len(lagging_families_by_user),
+        "prior_changed": len(prior_changed_user_ids),
+    }
 
-    extraction_calibration_summary: dict[str, Any] | None = None
-    try:
-        extraction_calibration_summary = await refresh_extraction_calibration(conn)
-    except Exception as exc:
-        logger.warning("Extraction calibration refresh skipped due to error: %s", exc)
 
-    unknown_dimension_summary: dict[str, Any] | None = None
-    try:
-        unknown_dimension_summary = await refresh_unknown_dimension_proposals(conn)
-    except Exception as exc:
-        logger.warning("Unknown-dimension mining refresh skipped due to error: %s", exc)
+async def _run_population_priors_stage(
+    conn: psycopg.AsyncConnection[Any],
+    shard: dict[str, Any],
+) -> dict[str, Any]:
+    # The refit_enqueue shards read prior_changed_cohort_keys from this summary.
+    return await refresh_population_prior_profiles(conn)
 
-    learning_backlog_summary: dict[str, Any] | None = None
-    try:
-        learning_backlog_summary = await refresh_learning_backlog_candidates(conn)
-    except Exception as exc:
-        logger.warning("Learning backlog refresh skipped due to error: %s", exc)
 
-    consistency_inbox_summary: dict[str, Any] | None = None
-    try:
-        consistency_inbox_summary = await refresh_all_consistency_inboxes(conn)
-    except Exception as exc:
-        logger.warning("Consistency inbox refresh skipped due to error: %s", exc)
+async def _run_consistency_inbox_stage(
+    conn: psycopg.AsyncConnection[Any],
+    shard: dict[str, Any],
+) -> dict[str, Any]:
+    return await refresh_all_consistency_inboxes(
+        conn,
+        user_id_from=shard["user_id_from"],
+        user_id_to=shard["user_id_to"],
+    )
+
+
+_NIGHTLY_STAGE_RUNNERS: dict[
+    str,
+    Callable[[psycopg.AsyncConnection[Any], dict[str, Any]], Awaitable[dict[str, Any]]],
+] = {
+    "population_priors": _run_population_priors_stage,
+    "refit_enqueue": _run_refit_enqueue_stage,
+    "issue_clusters": lambda conn, shard: refresh_issue_clusters(conn),
+    "extraction_calibration": lambda conn, shard: refresh_extraction_calibration(conn),
+    "unknown_dimensions": lambda conn, shard: refresh_unknown_dimension_proposals(conn),
+    "learning_backlog": lambda conn, shard: refresh_learning_backlog_candidates(conn),
+    "consistency_inbox": _run_consistency_inbox_stage,
+}
 
+
+@register("inference.nightly_refit")
+async def handle_inference_nightly_refit(
+    conn: psycopg.AsyncConnection[Any], payload: dict[str, Any]
+) -> None:
+    """Plan a nightly maintenance run and enqueue its first stage shards."""
+    interval_h = int(payload.get("interval_hours", nightly_interval_hours()))
+    scheduler_key = str(payload.get("scheduler_key") or "").strip()
+    missed_runs = int(payload.get("missed_runs") or 0)
+    run_id = str(payload.get("run_id") or uuid.uuid4())
+
+    user_ids = await event_user_ids(conn)
+    if not user_ids:
+        logger.info("Nightly refit run %s skipped: no events yet", run_id)
+        return
+
+    shard_rows = await plan_nightly_run(conn, run_id=run_id, user_ids=user_ids)
     if scheduler_key:
         async with conn.cursor() as cur:
             await cur.execute(
                 """
                 UPDATE inference_scheduler_state
-                SET last_enqueued_projection_updates = %s,
+                SET current_run_id = %s,
                     last_missed_runs = %s,
                     updated_at = NOW()
                 WHERE scheduler_key = %s
                 """,
-                (
-                    enqueued,
-                    max(0, missed_runs),
-                    scheduler_key,
-                ),
+                (run_id, max(0, missed_runs), scheduler_key),
             )
+    progress = await advance_nightly_run(
+        conn,
+        run_id=run_id,
+        scheduler_key=scheduler_key,
+        resume=_coerce_bool(payload.get("resume")),
+    )
 
     logger.info(
-        "Nightly refit enqueued %d projection.update jobs across %d users (interval_h=%d, missed_runs=%d, population_priors=%s, issue_clusters=%s, extraction_calibration=%s, unknown_dimensions=%s, learning_backlog=%s, consistency_inbox=%s)",
-        enqueued,
+        "Nightly refit run %s planned %d stage shards across %d users, enqueued %d (interval_h=%d, missed_runs=%d)",
+        run_id,
+        shard_rows,
         len(user_ids),
+        progress.enqueued,
         interval_h,
         max(0, missed_runs),
-        population_prior_summary or {"status": "failed"},
-        issue_cluster_summary or {"status": "failed"},
-        extraction_calibration_summary or {"status": "failed"},
-        unknown_dimension_summary or {"status": "failed"},
-        learning_backlog_summary or {"status": "failed"},
-        consistency_inbox_summary or {"status": "failed"},
+    )
+
+
+@register(NIGHTLY_STAGE_JOB_TYPE)
+async def handle_inference_nightly_stage(
+    conn: psycopg.AsyncConnection[Any], payload: dict[str, Any]
+) -> None:
+    """Run one shard of a nightly maintenance stage, then advance the run."""
+    run_id = str(payload.get("run_id") or "")
+    stage = str(payload.get("stage") or "")
+    shard_index = int(payload.get("shard") or 0)
+    scheduler_key = str(payload.get("scheduler_key") or "").strip()
+
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT run_id::text AS run_id, stage, shard, status,
+                   user_id_from::text AS user_id_from, user_id_to::text AS user_id_to
+            FROM inference_nightly_stage_shards
+            WHERE run_id = %s AND stage = %s AND shard = %s
+            FOR UPDATE
+            """,
+            (run_id, stage, shard_index),
+        )
+        shard = await cur.fetchone()
+    if shard is None:
+        logger.warning("Nightly stage shard %s/%s/%d not found; skipping", run_id, stage, shard_index)
+        return
+    if shard["status"] in ("completed", "failed"):
+        # A resumed run may hand out a shard twice; finished shards are final.
+        return
+
+    runner = _NIGHTLY_STAGE_RUNNERS.get(stage)
+    started_at = datetime.now(timezone.utc)
+    t0 = time.monotonic()
+    status = "completed"
+    try:
+        if runner is None:
+            raise ValueError(f"Unknown nightly stage: {stage!r}")
+        # Savepoint: a failing stage is recorded without losing the shard
+        # bookkeeping, like the per-stage try/except of the monolithic run.
+        async with conn.transaction():
+            summary = await runner(conn, shard)
+    except Exception as exc:
+        logger.warning("Nightly stage %s shard %d failed: %s", stage, shard_index, exc)
+        status = "failed"
+        summary = {"status": "failed", "error": str(exc)}
+    duration_ms = (time.monotonic() - t0) * 1000
+
+    await complete_shard(
+        conn,
+        run_id=run_id,
+        stage=stage,
+        shard=shard_index,
+        status=status,
+        started_at=started_at,
+        duration_ms=duration_ms,
+        summary=summary,
+    )
+    progress = await advance_nightly_run(conn, run_id=run_id, scheduler_key=scheduler_key)
+
+    logger.info(
+        "Nightly stage %s shard %d %s in %.0fms (run=%s, enqueued=%d, summary=%s)",
+        stage,
+        shard_index,
+        status,
+        duration_ms,
+        run_id,
+        progress.enqueued,
+        summary,
     )
 
 
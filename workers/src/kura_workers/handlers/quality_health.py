@@ -22,8 +22,10 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from ..compute_executor import run_compute
 from ..consistency_inbox import refresh_consistency_inbox_for_user
 from ..event_conventions import get_event_conventions
+from ..event_snapshot import invalidate_event_snapshot
 from ..external_import_error_taxonomy import (
     classify_import_error_code,
     is_import_parse_quality_failure,
@@ -45,7 +47,7 @@ from ..training_session_completeness import (
     evaluate_session_completeness,
 )
 from ..unknown_field_advisory import unknown_field_mapping_hint
-from ..utils import get_alias_map, get_retracted_event_ids
+from ..utils import get_alias_map, get_retracted_event_ids, load_user_events
 
 logger = logging.getLogger(__name__)
 
@@ -1058,6 +1060,8 @@ async def _insert_events_with_idempotency_guard(
             inserted_keys.add(key)
 
     await conn.execute("SET LOCAL ROLE app_worker")
+    if inserted_event_ids:
+        invalidate_event_snapshot(user_id)
 
     return {
         "inserted_event_ids": inserted_event_ids,
@@ -1269,18 +1273,8 @@ async def _load_quality_source_rows(
     conn: psycopg.AsyncConnection[Any],
     user_id: str,
 ) -> list[dict[str, Any]]:
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, event_type, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = ANY(%s)
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (user_id, list(_EVENT_TYPES)),
-        )
-        return await cur.fetchall()
+    # Retracted rows are kept: invariants inspect the raw event stream.
+    return await load_user_events(conn, user_id, _EVENT_TYPES, retracted_ids=set())
 
 
 async def _load_external_import_job_rows(
@@ -3151,6 +3145,29 @@ def _manifest_contribution(projection_rows: list[dict[str, Any]]) -> dict[str, A
     }
 
 
+async def _evaluate_invariants_offloaded(
+    event_rows: list[dict[str, Any]],
+    alias_map: dict[str, str],
+    *,
+    import_job_rows: list[dict[str, Any]],
+    raw_event_rows: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], dict[str, Any]] | None:
+    """Run the invariant scan in the compute pool.
+
+    Returns None when the scan times out: re-running it inline would block
+    the event loop even longer, so the caller skips this evaluation.
+    """
+    return await run_compute(
+        _evaluate_read_only_invariants,
+        event_rows,
+        alias_map,
+        fallback=lambda: None,
+        import_job_rows=import_job_rows,
+        raw_event_rows=raw_event_rows,
+        evaluated_at=datetime.now(timezone.utc),
+    )
+
+
 @projection_handler(
     *_EVENT_TYPES,
     dimension_meta={
@@ -3375,13 +3392,19 @@ async def update_quality_health(
     response_mode_outcomes = _compute_response_mode_outcomes(outcome_signal_rows)
 
     alias_map = await get_alias_map(conn, user_id, retracted_ids=retracted_ids)
-    issues, metrics = _evaluate_read_only_invariants(
+    evaluation = await _evaluate_invariants_offloaded(
         rows,
         alias_map,
         import_job_rows=import_job_rows,
         raw_event_rows=rows_all,
-        evaluated_at=datetime.now(timezone.utc),
     )
+    if evaluation is None:
+        logger.warning(
+            "quality_health invariant scan timed out for user=%s; keeping previous projection",
+            user_id,
+        )
+        return
+    issues, metrics = evaluation
     metrics["response_mode_outcomes"] = response_mode_outcomes
     latest_quality_issue_signal_rows = await _load_latest_quality_issue_signals(
         conn,
@@ -3432,13 +3455,20 @@ async def update_quality_health(
                 )
             return
         alias_map = await get_alias_map(conn, user_id, retracted_ids=retracted_ids)
-        issues, metrics = _evaluate_read_only_invariants(
+        evaluation = await _evaluate_invariants_offloaded(
             rows,
             alias_map,
             import_job_rows=import_job_rows,
             raw_event_rows=rows_all,
-            evaluated_at=datetime.now(timezone.utc),
         )
+        if evaluation is None:
+            # Repairs are applied and evented; the next event re-verifies them.
+            logger.warning(
+                "quality_health post-repair scan timed out for user=%s; keeping previous projection",
+                user_id,
+            )
+            return
+        issues, metrics = evaluation
         metrics["response_mode_outcomes"] = response_mode_outcomes
         verified_at = datetime.now(timezone.utc).isoformat()
         await _verify_applied_repairs(
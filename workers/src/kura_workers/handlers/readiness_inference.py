@@ -11,7 +11,6 @@ from datetime import datetime, timezone
 from typing import Any
 
 import psycopg
-from psycopg.rows import dict_row
 
 from ..inference_engine import run_readiness_inference, weekly_phase_from_date
 from ..inference_event_registry import READINESS_SIGNAL_EVENT_TYPES
@@ -26,6 +25,7 @@ from ..registry import projection_handler
 from ..utils import (
     get_retracted_event_ids,
     load_timezone_preference,
+    load_user_events,
     resolve_timezone_context,
 )
 
@@ -163,20 +163,9 @@ async def update_readiness_inference(
         timezone_context = resolve_timezone_context(timezone_pref)
         timezone_name = timezone_context["timezone"]
 
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT id, timestamp, event_type, data, metadata
-                FROM events
-                WHERE user_id = %s
-                  AND event_type = ANY(%s)
-                ORDER BY timestamp ASC
-                """,
-                (user_id, list(READINESS_SIGNAL_EVENT_TYPES)),
-            )
-            rows = await cur.fetchall()
-
-        rows = [r for r in rows if str(r["id"]) not in retracted_ids]
+        rows = await load_user_events(
+            conn, user_id, READINESS_SIGNAL_EVENT_TYPES, retracted_ids=retracted_ids
+        )
         if not rows:
             async with conn.cursor() as cur:
                 await cur.execute(
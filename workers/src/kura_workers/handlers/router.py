@@ -18,13 +18,16 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from ..event_snapshot import event_snapshot
 from ..inference_telemetry import classify_inference_error, safe_record_inference_run
-from ..metrics import record_handler_invocation
+from ..metrics import record_handler_invocation, record_lock_contention, track_rows_loaded
 from ..registry import (
+    get_handler_event_types,
     get_projection_handler_by_name,
     get_projection_handlers,
     register,
 )
+from .inference_nightly import advance_refit_watermark
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +111,7 @@ async def _acquire_user_lock(
         )
         row = await cur.fetchone()
         if not row or not row[0]:
+            record_lock_contention()
             raise UserLockNotAvailable(
                 f"Advisory lock for user {user_id} held by another connection"
             )
@@ -128,6 +132,7 @@ async def handle_projection_update(
     user_id = payload.get("user_id")
     if not user_id:
         raise ValueError(f"Missing user_id in projection.update payload (event_type={event_type})")
+    refit_watermark = payload.get("refit_watermark")
 
     # Resolve retraction: re-route to the retracted event's handlers
     if event_type == "event.retracted":
@@ -155,73 +160,105 @@ async def handle_projection_update(
 
     await _acquire_user_lock(conn, user_id)
 
+    # One snapshot per dispatch: handlers share retractions, alias map,
+    # timezone and a single scan over the event types they declare.
+    snapshot_types = {event_type}
     for handler in handlers:
-        t0 = time.monotonic()
-        try:
-            async with conn.transaction():
-                await handler(conn, payload)
-            duration_ms = (time.monotonic() - t0) * 1000
-            record_handler_invocation(handler.__name__, duration_ms, success=True)
-        except Exception as exc:
-            duration_ms = (time.monotonic() - t0) * 1000
-            record_handler_invocation(handler.__name__, duration_ms, success=False)
-            logger.exception(
-                "Projection handler %s failed for event_type=%s event_id=%s — scheduling retry",
-                handler.__name__, event_type, payload.get("event_id", "?"),
-            )
-            inference_target = _inference_target_for_handler(handler.__name__)
-            if inference_target is not None:
-                projection_type, projection_key = inference_target
-                await safe_record_inference_run(
-                    conn,
-                    user_id=user_id,
-                    projection_type=projection_type,
-                    key=projection_key,
-                    engine="none",
-                    status="failed",
-                    diagnostics={
-                        "handler_name": handler.__name__,
-                        "event_type": event_type,
-                        "event_id": payload.get("event_id"),
-                    },
-                    error_message=str(exc),
-                    error_taxonomy=classify_inference_error(exc),
+        snapshot_types |= get_handler_event_types(handler.__name__)
+
+    handlers_failed = False
+    with event_snapshot(user_id, snapshot_types):
+        for handler in handlers:
+            t0 = time.monotonic()
+            rows_loaded = [0]
+            try:
+                with track_rows_loaded() as rows_loaded:
+                    async with conn.transaction():
+                        await handler(conn, payload)
+                duration_ms = (time.monotonic() - t0) * 1000
+                record_handler_invocation(
+                    handler.__name__, duration_ms, success=True, rows_loaded=rows_loaded[0]
+                )
+            except Exception as exc:
+                handlers_failed = True
+                duration_ms = (time.monotonic() - t0) * 1000
+                record_handler_invocation(
+                    handler.__name__, duration_ms, success=False, rows_loaded=rows_loaded[0]
+                )
+                logger.exception(
+                    "Projection handler %s failed for event_type=%s event_id=%s — scheduling retry",
+                    handler.__name__, event_type, payload.get("event_id", "?"),
                 )
-            # Enqueue a targeted retry job for this specific handler.
-            # This INSERT is outside the failed handler's transaction block,
-            # so it's part of the outer projection.update transaction that will commit.
+                inference_target = _inference_target_for_handler(handler.__name__)
+                if inference_target is not None:
+                    projection_type, projection_key = inference_target
+                    await safe_record_inference_run(
+                        conn,
+                        user_id=user_id,
+                        projection_type=projection_type,
+                        key=projection_key,
+                        engine="none",
+                        status="failed",
+                        diagnostics={
+                            "handler_name": handler.__name__,
+                            "event_type": event_type,
+                            "event_id": payload.get("event_id"),
+                        },
+                        error_message=str(exc),
+                        error_taxonomy=classify_inference_error(exc),
+                    )
+                # Enqueue a targeted retry job for this specific handler.
+                # This INSERT is outside the failed handler's transaction block,
+                # so it's part of the outer projection.update transaction that will commit.
+                try:
+                    await conn.execute(
+                        """
+                        INSERT INTO background_jobs (user_id, job_type, payload, max_retries)
+                        VALUES (%s, 'projection.retry', %s, 3)
+                        """,
+                        (
+                            user_id,
+                            Json({**payload, "handler_name": handler.__name__}),
+                        ),
+                    )
+                except Exception:
+                    logger.exception(
+                        "CRITICAL: Failed to enqueue retry job for handler %s — failure will be lost",
+                        handler.__name__,
+                    )
+
+        # Phase 3: Recompute custom projections matching this event_type
+        if has_custom:
+            t0 = time.monotonic()
+            rows_loaded = [0]
             try:
-                await conn.execute(
-                    """
-                    INSERT INTO background_jobs (user_id, job_type, payload, max_retries)
-                    VALUES (%s, 'projection.retry', %s, 3)
-                    """,
-                    (
-                        user_id,
-                        Json({**payload, "handler_name": handler.__name__}),
-                    ),
+                with track_rows_loaded() as rows_loaded:
+                    async with conn.transaction():
+                        await recompute_matching_rules(conn, user_id, event_type, payload.get("event_id", ""))
+                duration_ms = (time.monotonic() - t0) * 1000
+                record_handler_invocation(
+                    "custom_projection_rules", duration_ms, success=True, rows_loaded=rows_loaded[0]
                 )
             except Exception:
+                duration_ms = (time.monotonic() - t0) * 1000
+                record_handler_invocation(
+                    "custom_projection_rules", duration_ms, success=False, rows_loaded=rows_loaded[0]
+                )
                 logger.exception(
-                    "CRITICAL: Failed to enqueue retry job for handler %s — failure will be lost",
-                    handler.__name__,
+                    "Custom projection rule recompute failed for event_type=%s user=%s",
+                    event_type, user_id,
                 )
 
-    # Phase 3: Recompute custom projections matching this event_type
-    if has_custom:
-        t0 = time.monotonic()
-        try:
-            async with conn.transaction():
-                await recompute_matching_rules(conn, user_id, event_type, payload.get("event_id", ""))
-            duration_ms = (time.monotonic() - t0) * 1000
-            record_handler_invocation("custom_projection_rules", duration_ms, success=True)
-        except Exception:
-            duration_ms = (time.monotonic() - t0) * 1000
-            record_handler_invocation("custom_projection_rules", duration_ms, success=False)
-            logger.exception(
-                "Custom projection rule recompute failed for event_type=%s user=%s",
-                event_type, user_id,
-            )
+    # Nightly refit: failed handlers were re-queued as projection.retry jobs,
+    # which advance the watermark themselves once they succeed.
+    if refit_watermark and not handlers_failed:
+        await advance_refit_watermark(
+            conn,
+            user_id=user_id,
+            watermark=refit_watermark,
+            job_type="projection.update",
+            event_type=event_type,
+        )
 
 
 @register("projection.retry")
@@ -249,11 +286,24 @@ async def handle_projection_retry(
         handler_name, payload.get("event_type", "?"), user_id,
     )
     t0 = time.monotonic()
+    rows_loaded = [0]
     try:
-        await handler(conn, payload)
+        with track_rows_loaded() as rows_loaded:
+            await handler(conn, payload)
         duration_ms = (time.monotonic() - t0) * 1000
-        record_handler_invocation(handler_name, duration_ms, success=True)
+        record_handler_invocation(handler_name, duration_ms, success=True, rows_loaded=rows_loaded[0])
     except Exception:
         duration_ms = (time.monotonic() - t0) * 1000
-        record_handler_invocation(handler_name, duration_ms, success=False)
+        record_handler_invocation(handler_name, duration_ms, success=False, rows_loaded=rows_loaded[0])
         raise
+
+    refit_watermark = payload.get("refit_watermark")
+    if refit_watermark:
+        await advance_refit_watermark(
+            conn,
+            user_id=user_id,
+            watermark=refit_watermark,
+            job_type="projection.retry",
+            event_type=payload.get("event_type", ""),
+            handler_name=handler_name,
+        )
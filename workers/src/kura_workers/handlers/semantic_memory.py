@@ -16,9 +16,19 @@ from typing import Any
 import psycopg
 from psycopg.rows import dict_row
 
-from ..embeddings import cosine_similarity, get_embedding_provider
+from ..embedding_cache import embed_terms
+from ..embeddings import decode_embedding, encode_embedding, get_embedding_provider
 from ..registry import projection_handler
-from ..utils import get_retracted_event_ids
+from ..semantic_index import (
+    CatalogIndex,
+    Match,
+    cached_catalog_index,
+    catalog_version,
+    pgvector_best_matches,
+    store_catalog_index,
+    vector_literal,
+)
+from ..utils import get_retracted_event_ids, load_user_events
 
 logger = logging.getLogger(__name__)
 
@@ -29,10 +39,6 @@ def _normalize_term(value: str | None) -> str:
     return " ".join(value.strip().lower().split())
 
 
-def _vector_literal(vec: list[float]) -> str:
-    return "[" + ",".join(f"{v:.8f}" for v in vec) + "]"
-
-
 async def _has_vector_column(conn: psycopg.AsyncConnection[Any], table: str) -> bool:
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
@@ -49,16 +55,15 @@ async def _has_vector_column(conn: psycopg.AsyncConnection[Any], table: str) ->
 
 
 def _parse_embedding(value: Any) -> list[float]:
-    if isinstance(value, list):
-        return [float(v) for v in value]
-    if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-            if isinstance(parsed, list):
-                return [float(v) for v in parsed]
-        except (ValueError, TypeError):
-            return []
-    return []
+    """Vector from an ``embedding_f32`` bytea or a legacy JSON embedding."""
+    return decode_embedding(value).tolist()
+
+
+def _row_embedding(row: dict[str, Any]) -> list[float]:
+    # Dual read: rows written before the float32 backfill only carry JSON.
+    if row.get("embedding_f32") is not None:
+        return _parse_embedding(row["embedding_f32"])
+    return _parse_embedding(row.get("embedding"))
 
 
 async def _load_catalog_embeddings(
@@ -69,18 +74,20 @@ async def _load_catalog_embeddings(
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT c.canonical_key, c.canonical_label, ce.embedding
+            SELECT c.canonical_key, c.canonical_label, ce.embedding_f32,
+                   CASE WHEN ce.embedding_f32 IS NULL THEN ce.embedding END AS embedding
             FROM semantic_catalog c
             JOIN semantic_catalog_embeddings ce ON ce.catalog_id = c.id
             WHERE c.domain = %s
               AND ce.model = %s
             """,
             (domain, model),
+            binary=True,
         )
         rows = await cur.fetchall()
     out = []
     for row in rows:
-        vec = _parse_embedding(row["embedding"])
+        vec = _row_embedding(row)
         if not vec:
             continue
         out.append(
@@ -102,63 +109,74 @@ async def _load_user_embeddings(
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT term_text, embedding
+            SELECT term_text, embedding_f32,
+                   CASE WHEN embedding_f32 IS NULL THEN embedding END AS embedding
             FROM semantic_user_embeddings
             WHERE user_id = %s
               AND domain = %s
               AND model = %s
             """,
             (user_id, domain, model),
+            binary=True,
         )
         rows = await cur.fetchall()
     out: dict[str, list[float]] = {}
     for row in rows:
-        vec = _parse_embedding(row["embedding"])
+        vec = _row_embedding(row)
         if vec:
             out[row["term_text"]] = vec
     return out
 
 
-async def _upsert_user_embedding(
+async def _upsert_user_embeddings(
     conn: psycopg.AsyncConnection[Any],
     *,
     user_id: str,
-    domain: str,
-    term_text: str,
-    canonical_key: str | None,
+    rows: list[tuple[str, str, list[float]]],
     provider: str,
     model: str,
     dimensions: int,
-    embedding: list[float],
     write_vector_column: bool,
 ) -> None:
-    if write_vector_column and len(embedding) == 384:
+    """Upsert a user's new (domain, term_text, embedding) rows in one statement."""
+    if not rows:
+        return
+    domains = [domain for domain, _, _ in rows]
+    terms = [term for _, term, _ in rows]
+    embeddings = [json.dumps(vec) for _, _, vec in rows]
+    packed = [encode_embedding(vec) for _, _, vec in rows]
+
+    if write_vector_column:
         async with conn.cursor() as cur:
             await cur.execute(
                 """
                 INSERT INTO semantic_user_embeddings (
                     user_id, domain, term_text, canonical_key,
-                    provider, model, dimensions, embedding, embedding_vec
+                    provider, model, dimensions, embedding, embedding_f32, embedding_vec
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::vector)
+                SELECT %s, t.domain, t.term_text, NULL, %s, %s, %s,
+                       t.embedding, t.embedding_f32, t.vec::vector
+                FROM unnest(%s::text[], %s::text[], %s::jsonb[], %s::bytea[], %s::text[])
+                    AS t(domain, term_text, embedding, embedding_f32, vec)
                 ON CONFLICT (user_id, domain, term_text, model) DO UPDATE SET
                     canonical_key = EXCLUDED.canonical_key,
                     provider = EXCLUDED.provider,
                     dimensions = EXCLUDED.dimensions,
                     embedding = EXCLUDED.embedding,
+                    embedding_f32 = EXCLUDED.embedding_f32,
                     embedding_vec = EXCLUDED.embedding_vec,
                     updated_at = NOW()
                 """,
                 (
                     user_id,
-                    domain,
-                    term_text,
-                    canonical_key,
                     provider,
                     model,
                     dimensions,
-                    json.dumps(embedding),
-                    _vector_literal(embedding),
+                    domains,
+                    terms,
+                    embeddings,
+                    packed,
+                    [vector_literal(vec) if len(vec) == 384 else None for _, _, vec in rows],
                 ),
             )
         return
@@ -168,39 +186,109 @@ async def _upsert_user_embedding(
             """
             INSERT INTO semantic_user_embeddings (
                 user_id, domain, term_text, canonical_key,
-                provider, model, dimensions, embedding
+                provider, model, dimensions, embedding, embedding_f32
             )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            SELECT %s, t.domain, t.term_text, NULL, %s, %s, %s, t.embedding, t.embedding_f32
+            FROM unnest(%s::text[], %s::text[], %s::jsonb[], %s::bytea[])
+                AS t(domain, term_text, embedding, embedding_f32)
             ON CONFLICT (user_id, domain, term_text, model) DO UPDATE SET
                 canonical_key = EXCLUDED.canonical_key,
                 provider = EXCLUDED.provider,
                 dimensions = EXCLUDED.dimensions,
                 embedding = EXCLUDED.embedding,
+                embedding_f32 = EXCLUDED.embedding_f32,
                 updated_at = NOW()
             """,
-            (
-                user_id,
-                domain,
-                term_text,
-                canonical_key,
-                provider,
-                model,
-                dimensions,
-                json.dumps(embedding),
-            ),
+            (user_id, provider, model, dimensions, domains, terms, embeddings, packed),
         )
 
 
-def _best_match(
-    term_vec: list[float],
-    catalog_embeddings: list[dict[str, Any]],
-) -> tuple[str, str, float] | None:
-    best: tuple[str, str, float] | None = None
-    for item in catalog_embeddings:
-        score = cosine_similarity(term_vec, item["embedding"])
-        if best is None or score > best[2]:
-            best = (item["canonical_key"], item["canonical_label"], score)
-    return best
+async def _catalog_index(
+    conn: psycopg.AsyncConnection[Any],
+    domain: str,
+    model: str,
+) -> CatalogIndex:
+    """Process-wide catalog index, rebuilt only when the catalog version moves."""
+    version = await catalog_version(conn, domain, model)
+    index = cached_catalog_index(domain, model, version)
+    if index is None:
+        catalog = await _load_catalog_embeddings(conn, domain, model)
+        index = CatalogIndex.build(catalog, version=version)
+        store_catalog_index(domain, model, index)
+    return index
+
+
+async def _best_matches(
+    conn: psycopg.AsyncConnection[Any],
+    domain: str,
+    model: str,
+    term_vectors: list[list[float]],
+    *,
+    use_pgvector: bool,
+) -> list[Match | None]:
+    if use_pgvector and term_vectors:
+        try:
+            async with conn.transaction():
+                matches = await pgvector_best_matches(conn, domain, model, term_vectors)
+        except psycopg.Error as exc:
+            logger.warning(
+                "pgvector semantic search failed (domain=%s); matching in-process: %s",
+                domain,
+                exc,
+            )
+        else:
+            # Terms with a short ANN shortlist are matched exactly in-process.
+            unresolved = [pos for pos, match in enumerate(matches) if match is None]
+            if unresolved:
+                index = await _catalog_index(conn, domain, model)
+                exact = index.best_matches([term_vectors[pos] for pos in unresolved])
+                for pos, match in zip(unresolved, exact):
+                    matches[pos] = match
+            return matches
+    index = await _catalog_index(conn, domain, model)
+    return index.best_matches(term_vectors)
+
+
+async def _match_candidates(
+    conn: psycopg.AsyncConnection[Any],
+    domain: str,
+    model: str,
+    terms: Counter[str],
+    term_embeddings: dict[str, list[float]],
+    *,
+    id_field: str,
+    min_score: float,
+    use_pgvector: bool,
+) -> list[dict[str, Any]]:
+    """Score the 100 most frequent terms against the catalog in one batch."""
+    scored = [
+        (term, count, term_embeddings[term])
+        for term, count in terms.most_common(100)
+        if term_embeddings.get(term)
+    ]
+    matches = await _best_matches(
+        conn, domain, model, [vec for _, _, vec in scored], use_pgvector=use_pgvector,
+    )
+
+    candidates: list[dict[str, Any]] = []
+    for (term, count, _), best in zip(scored, matches):
+        if not best:
+            continue
+        key, label, score = best
+        if score < min_score:
+            continue
+        confidence = "high" if score >= 0.86 else ("medium" if score >= 0.78 else "low")
+        candidates.append(
+            {
+                "term": term,
+                "count": count,
+                id_field: key,
+                "label": label,
+                "score": round(score, 4),
+                "confidence": confidence,
+            }
+        )
+    return candidates
 
 
 def _manifest_contribution(projection_rows: list[dict[str, Any]]) -> dict[str, Any]:
@@ -267,20 +355,12 @@ async def update_semantic_memory(
     user_id = payload["user_id"]
     retracted_ids = await get_retracted_event_ids(conn, user_id)
 
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, event_type, data
-            FROM events
-            WHERE user_id = %s
-              AND event_type IN ('set.logged', 'exercise.alias_created', 'meal.logged')
-            ORDER BY timestamp ASC
-            """,
-            (user_id,),
-        )
-        rows = await cur.fetchall()
-
-    rows = [r for r in rows if str(r["id"]) not in retracted_ids]
+    rows = await load_user_events(
+        conn,
+        user_id,
+        ("set.logged", "exercise.alias_created", "meal.logged"),
+        retracted_ids=retracted_ids,
+    )
 
     if not rows:
         async with conn.cursor() as cur:
@@ -338,93 +418,43 @@ async def update_semantic_memory(
     exercise_emb = await _load_user_embeddings(conn, user_id, "exercise", model)
     food_emb = await _load_user_embeddings(conn, user_id, "food", model)
 
-    missing_ex_terms = [t for t in exercise_terms if t not in exercise_emb]
-    missing_food_terms = [t for t in food_terms if t not in food_emb]
-
-    if missing_ex_terms:
-        vectors = provider.embed_many(missing_ex_terms)
-        for term, vec in zip(missing_ex_terms, vectors):
-            await _upsert_user_embedding(
-                conn,
-                user_id=user_id,
-                domain="exercise",
-                term_text=term,
-                canonical_key=None,
-                provider=provider_name,
-                model=model,
-                dimensions=dimensions,
-                embedding=vec,
-                write_vector_column=user_has_vec,
-            )
-            exercise_emb[term] = vec
-
-    if missing_food_terms:
-        vectors = provider.embed_many(missing_food_terms)
-        for term, vec in zip(missing_food_terms, vectors):
-            await _upsert_user_embedding(
-                conn,
-                user_id=user_id,
-                domain="food",
-                term_text=term,
-                canonical_key=None,
-                provider=provider_name,
-                model=model,
-                dimensions=dimensions,
-                embedding=vec,
-                write_vector_column=user_has_vec,
-            )
-            food_emb[term] = vec
-
-    exercise_catalog = await _load_catalog_embeddings(conn, "exercise", model)
-    food_catalog = await _load_catalog_embeddings(conn, "food", model)
+    missing = [("exercise", t) for t in exercise_terms if t not in exercise_emb]
+    missing += [("food", t) for t in food_terms if t not in food_emb]
+
+    if missing:
+        # Shared across users: only terms nobody typed before hit the model.
+        vectors = await embed_terms(conn, provider, [term for _, term in missing])
+        new_rows = [(domain, term, vec) for (domain, term), vec in zip(missing, vectors)]
+        await _upsert_user_embeddings(
+            conn,
+            user_id=user_id,
+            rows=new_rows,
+            provider=provider_name,
+            model=model,
+            dimensions=dimensions,
+            write_vector_column=user_has_vec,
+        )
+        for domain, term, vec in new_rows:
+            (exercise_emb if domain == "exercise" else food_emb)[term] = vec
 
     min_score = float(os.environ.get("KURA_SEMANTIC_MIN_SCORE", "0.72"))
+    # "auto" pushes top-k search into pgvector when the catalog carries
+    # vector(384) columns; "in_process" always uses the cached index.
+    search_mode = os.environ.get("KURA_SEMANTIC_SEARCH_MODE", "auto").strip().lower()
+    use_pgvector = (
+        search_mode != "in_process"
+        and dimensions == 384
+        and await _has_vector_column(conn, "semantic_catalog_embeddings")
+    )
 
-    exercise_candidates: list[dict[str, Any]] = []
-    for term, count in exercise_terms.most_common(100):
-        vec = exercise_emb.get(term)
-        if not vec:
-            continue
-        best = _best_match(vec, exercise_catalog)
-        if not best:
-            continue
-        key, label, score = best
-        if score < min_score:
-            continue
-        confidence = "high" if score >= 0.86 else ("medium" if score >= 0.78 else "low")
-        exercise_candidates.append(
-            {
-                "term": term,
-                "count": count,
-                "suggested_exercise_id": key,
-                "label": label,
-                "score": round(score, 4),
-                "confidence": confidence,
-            }
-        )
-
-    food_candidates: list[dict[str, Any]] = []
-    for term, count in food_terms.most_common(100):
-        vec = food_emb.get(term)
-        if not vec:
-            continue
-        best = _best_match(vec, food_catalog)
-        if not best:
-            continue
-        key, label, score = best
-        if score < min_score:
-            continue
-        confidence = "high" if score >= 0.86 else ("medium" if score >= 0.78 else "low")
-        food_candidates.append(
-            {
-                "term": term,
-                "count": count,
-                "suggested_food_id": key,
-                "label": label,
-                "score": round(score, 4),
-                "confidence": confidence,
-            }
-        )
+    exercise_candidates = await _match_candidates(
+        conn, "exercise", model, exercise_terms, exercise_emb,
+        id_field="suggested_exercise_id", min_score=min_score, use_pgvector=use_pgvector,
+    )
+    food_candidates = await _match_candidates(
+        conn, "food", model, food_terms, food_emb,
+        id_field="suggested_food_id", min_score=min_score, use_pgvector=use_pgvector,
+    )
 
     projection_data = {
         "indexed_terms": {
@@ -13,7 +13,6 @@ from statistics import mean
 from typing import Any
 
 import psycopg
-from psycopg.rows import dict_row
 
 from ..registry import projection_handler
 from ..session_block_expansion import expand_session_logged_rows
@@ -23,7 +22,13 @@ from ..training_load_calibration_v1 import (
     calibration_profile_for_version,
     compute_row_load_components_v2,
 )
-from ..utils import get_retracted_event_ids, merge_observed_attributes, separate_known_unknown
+from ..utils import (
+    get_retracted_event_ids,
+    load_set_corrections,
+    load_user_events,
+    merge_observed_attributes,
+    separate_known_unknown,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -597,22 +602,9 @@ async def update_session_feedback(
     user_id = payload["user_id"]
     retracted_ids = await get_retracted_event_ids(conn, user_id)
 
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = 'session.completed'
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (user_id,),
-        )
-        feedback_rows = await cur.fetchall()
-
-    feedback_rows = [
-        row for row in feedback_rows if str(row["id"]) not in retracted_ids
-    ]
+    feedback_rows = await load_user_events(
+        conn, user_id, ("session.completed",), retracted_ids=retracted_ids
+    )
 
     if not feedback_rows:
         async with conn.cursor() as cur:
@@ -627,53 +619,19 @@ async def update_session_feedback(
             )
         return
 
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = 'set.logged'
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (user_id,),
-        )
-        set_rows = await cur.fetchall()
-
-    set_rows = [row for row in set_rows if str(row["id"]) not in retracted_ids]
-    set_ids = [str(row["id"]) for row in set_rows]
-    correction_rows: list[dict[str, Any]] = []
-    if set_ids:
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT id, timestamp, data
-                FROM events
-                WHERE user_id = %s
-                  AND event_type = 'set.corrected'
-                  AND data->>'target_event_id' = ANY(%s)
-                ORDER BY timestamp ASC, id ASC
-                """,
-                (user_id, set_ids),
-            )
-            correction_rows = await cur.fetchall()
-    correction_rows = [
-        row for row in correction_rows if str(row["id"]) not in retracted_ids
-    ]
+    set_rows = await load_user_events(
+        conn, user_id, ("set.logged",), retracted_ids=retracted_ids
+    )
+    correction_rows = await load_set_corrections(
+        conn,
+        user_id,
+        [str(row["id"]) for row in set_rows],
+        retracted_ids=retracted_ids,
+    )
     set_rows = apply_set_correction_chain(set_rows, correction_rows)
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = 'session.logged'
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (user_id,),
-        )
-        session_rows = await cur.fetchall()
-    session_rows = [row for row in session_rows if str(row["id"]) not in retracted_ids]
+    session_rows = await load_user_events(
+        conn, user_id, ("session.logged",), retracted_ids=retracted_ids
+    )
     set_rows = set_rows + expand_session_logged_rows(session_rows)
 
     projection_data = _build_session_feedback_projection(feedback_rows, set_rows)
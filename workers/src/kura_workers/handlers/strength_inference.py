@@ -5,9 +5,11 @@ Bayesian per-exercise trend inference over estimated 1RM history.
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
@@ -23,12 +25,18 @@ from ..capability_estimation_runtime import (
     data_sufficiency_block,
     effort_adjusted_e1rm,
 )
-from ..inference_engine import run_strength_inference, weekly_phase_from_date
+from ..compute_executor import run_compute
+from ..inference_engine import (
+    run_strength_inference,
+    run_strength_inference_batch,
+    weekly_phase_from_date,
+)
 from ..inference_telemetry import (
     INFERENCE_ERROR_INSUFFICIENT_DATA,
     classify_inference_error,
     safe_record_inference_run,
 )
+from ..job_coalescing import payload_event_ids
 from ..population_priors import resolve_population_prior
 from ..registry import projection_handler
 from ..session_block_expansion import expand_session_logged_row
@@ -39,6 +47,7 @@ from ..utils import (
     get_alias_map,
     get_retracted_event_ids,
     load_timezone_preference,
+    load_user_events,
     next_fallback_session_key,
     normalize_temporal_point,
     resolve_exercise_key,
@@ -48,11 +57,522 @@ from ..utils import (
 
 logger = logging.getLogger(__name__)
 
+NIGHTLY_REFIT_SOURCE = "inference.nightly_refit"
+
 
 def _manifest_contribution(projection_rows: list[dict[str, Any]]) -> dict[str, Any]:
     return {"exercises": [r["key"] for r in projection_rows]}
 
 
+@dataclass
+class _StrengthSeries:
+    """Aggregated e1RM evidence for one canonical exercise."""
+
+    rows: list[dict[str, Any]]
+    points: list[tuple[datetime, float]] = field(default_factory=list)
+    by_date_best: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    e1rm_sources: dict[str, int] = field(
+        default_factory=lambda: {"explicit": 0, "inferred_from_rpe": 0, "fallback_epley": 0}
+    )
+    temporal_conflicts: dict[str, int] = field(default_factory=dict)
+
+    def model_points(self) -> list[tuple[float, float]]:
+        start_ts = self.points[0][0]
+        return [
+            ((ts - start_ts).total_seconds() / 86400.0, e1rm)
+            for ts, e1rm in self.points
+        ]
+
+
+async def _load_strength_rows_by_exercise(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    *,
+    retracted_ids: set[str],
+    alias_map: dict[str, str],
+) -> dict[str, list[dict[str, Any]]]:
+    """Normalized training rows grouped by alias-resolved exercise key."""
+    rows = await load_user_events(
+        conn,
+        user_id,
+        ("set.logged", "session.logged", "set.corrected"),
+        retracted_ids=retracted_ids,
+    )
+    normalized_rows = normalize_training_signal_rows(rows, include_passthrough=False)
+
+    grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for candidate_row in normalized_rows:
+        data = candidate_row.get("data")
+        if not isinstance(data, dict):
+            continue
+        raw_key = resolve_exercise_key(data)
+        if not raw_key:
+            continue
+        grouped[resolve_through_aliases(raw_key, alias_map)].append(candidate_row)
+    for exercise_rows in grouped.values():
+        exercise_rows.sort(key=lambda entry: (entry.get("timestamp"), str(entry.get("id") or "")))
+    return dict(grouped)
+
+
+def _aggregate_strength_series(rows: list[dict[str, Any]], *, timezone_name: str) -> _StrengthSeries:
+    """Aggregate best e1rm per session/day."""
+    series = _StrengthSeries(rows=rows)
+    session_best: dict[str, tuple[datetime, float]] = {}
+    fallback_session_state: SessionBoundaryState | None = None
+    for row in rows:
+        data = row["data"]
+        ts = row["timestamp"]
+        metadata = row.get("metadata") or {}
+        temporal = normalize_temporal_point(
+            ts,
+            timezone_name=timezone_name,
+            data=data if isinstance(data, dict) else {},
+            metadata=metadata if isinstance(metadata, dict) else {},
+        )
+        ts = temporal.timestamp_utc
+        local_day = temporal.local_date
+        for conflict in temporal.conflicts:
+            series.temporal_conflicts[conflict] = series.temporal_conflicts.get(conflict, 0) + 1
+
+        try:
+            weight = float(data.get("weight_kg", data.get("weight", 0)))
+            reps = int(data.get("reps", 0))
+        except (ValueError, TypeError):
+            continue
+
+        e1rm, e1rm_source = effort_adjusted_e1rm(
+            weight,
+            reps,
+            rir=data.get("rir"),
+            rpe=data.get("rpe"),
+        )
+        if e1rm <= 0:
+            continue
+
+        if e1rm_source not in series.e1rm_sources:
+            series.e1rm_sources[e1rm_source] = 0
+        series.e1rm_sources[e1rm_source] += 1
+
+        raw_session_id = str(metadata.get("session_id") or "").strip()
+        if raw_session_id:
+            session_id = raw_session_id
+            fallback_session_state = None
+        else:
+            session_id, fallback_session_state = next_fallback_session_key(
+                local_date=local_day,
+                timestamp_utc=ts,
+                state=fallback_session_state,
+            )
+
+        prev = session_best.get(session_id)
+        if prev is None or e1rm > prev[1]:
+            session_best[session_id] = (ts, e1rm)
+
+        day_key = local_day.isoformat()
+        if e1rm > series.by_date_best[day_key]:
+            series.by_date_best[day_key] = e1rm
+
+    series.points = sorted((ts, e1rm) for ts, e1rm in session_best.values())
+    return series
+
+
+def _build_projection(
+    canonical: str,
+    series: _StrengthSeries,
+    inference: dict[str, Any],
+    timezone_context: dict[str, Any],
+) -> tuple[dict[str, Any], str, str | None, dict[str, Any]]:
+    """Return (projection_data, telemetry status, error taxonomy, telemetry diagnostics)."""
+    points = series.points
+    rows = series.rows
+    e1rm_sources = series.e1rm_sources
+    temporal_conflicts = series.temporal_conflicts
+    history = [
+        {"date": d, "estimated_1rm": round(v, 2)}
+        for d, v in sorted(series.by_date_best.items())
+    ][-120:]
+    dynamics_snapshot = dict(inference.get("dynamics", {}))
+    projection_phase = str(dynamics_snapshot.get("phase") or "unknown")
+    weekly_cycle = weekly_phase_from_date(history[-1]["date"] if history else None)
+    observed_points = len(points)
+    required_points = int(inference.get("required_points", 3) or 3)
+    insufficient = inference.get("status") == STATUS_INSUFFICIENT_DATA
+    status = STATUS_INSUFFICIENT_DATA if insufficient else STATUS_OK
+    confidence = confidence_from_evidence(
+        observed_points=observed_points,
+        required_points=required_points,
+    )
+    data_sufficiency = data_sufficiency_block(
+        required_observations=required_points,
+        observed_observations=observed_points,
+        uncertainty_reason_codes=(
+            ["insufficient_observation_count"] if insufficient else []
+        )
+        + (["effort_context_missing"] if e1rm_sources.get("fallback_epley", 0) > 0 else []),
+        recommended_next_observations=(
+            [
+                "Log additional heavy sets until at least three sessions are available.",
+                "Provide RIR or RPE to reduce e1RM uncertainty.",
+            ]
+            if insufficient
+            else (
+                ["Provide RIR or RPE for more sets to improve confidence."]
+                if e1rm_sources.get("fallback_epley", 0) > 0
+                else []
+            )
+        ),
+    )
+
+    if insufficient:
+        capability_estimation = build_insufficient_envelope(
+            capability="strength_1rm",
+            required_observations=required_points,
+            observed_observations=observed_points,
+            model_version="strength_inference.v2",
+            recommended_next_observations=data_sufficiency.get(
+                "recommended_next_observations"
+            ),
+            protocol_signature={"projection_key": canonical},
+            diagnostics={
+                "sessions_used": len(points),
+                "sets_used": len(rows),
+                "e1rm_source_counts": e1rm_sources,
+                "temporal_conflicts": temporal_conflicts,
+                "timezone": timezone_context.get("timezone"),
+            },
+        )
+    else:
+        capability_estimation = build_capability_envelope(
+            capability="strength_1rm",
+            estimate_mean=float((inference.get("estimated_1rm") or {}).get("mean", 0.0)),
+            estimate_interval=(inference.get("estimated_1rm") or {}).get("ci95") or [None, None],
+            status=status,
+            confidence=confidence,
+            data_sufficiency=data_sufficiency,
+            model_version="strength_inference.v2",
+            protocol_signature={"projection_key": canonical},
+            diagnostics={
+                "sessions_used": len(points),
+                "sets_used": len(rows),
+                "e1rm_source_counts": e1rm_sources,
+                "temporal_conflicts": temporal_conflicts,
+                "timezone": timezone_context.get("timezone"),
+                "engine": inference.get("engine"),
+            },
+        )
+
+    projection_data: dict[str, Any] = {
+        "exercise_id": canonical,
+        "history": history,
+        "status": status,
+        "confidence": confidence,
+        "data_sufficiency": data_sufficiency,
+        "estimate": {
+            "mean": (inference.get("estimated_1rm") or {}).get("mean"),
+            "interval": (inference.get("estimated_1rm") or {}).get("ci95"),
+        },
+        "capability_estimation": capability_estimation,
+        "timezone_context": timezone_context,
+        "dynamics": {"estimated_1rm": dynamics_snapshot},
+        "phase": {
+            "projection_phase": projection_phase,
+            "weekly_cycle": weekly_cycle,
+        },
+        "data_quality": {
+            "sessions_used": len(points),
+            "sets_used": len(rows),
+            "insufficient_data": inference.get("status") == "insufficient_data",
+            "e1rm_source_counts": e1rm_sources,
+            "temporal_conflicts": temporal_conflicts,
+        },
+        "diagnostics": inference.get("diagnostics", {}),
+        "engine": inference.get("engine"),
+        "population_prior": inference.get("population_prior", {"applied": False}),
+        "pooling": inference.get("pooling", {"applied": False}),
+    }
+
+    telemetry_status = "success"
+    telemetry_error_taxonomy: str | None = None
+    telemetry_diagnostics = dict(inference.get("diagnostics", {}))
+    if isinstance(inference.get("population_prior"), dict):
+        telemetry_diagnostics["population_prior"] = inference["population_prior"]
+    if isinstance(inference.get("pooling"), dict):
+        telemetry_diagnostics["pooling"] = inference["pooling"]
+    if isinstance(inference.get("runtime"), dict):
+        telemetry_diagnostics["runtime"] = inference["runtime"]
+    if inference.get("status") == "insufficient_data":
+        projection_data["status"] = STATUS_INSUFFICIENT_DATA
+        projection_data["required_points"] = inference.get("required_points", 3)
+        projection_data["observed_points"] = inference.get("observed_points", len(points))
+        telemetry_status = "skipped"
+        telemetry_error_taxonomy = INFERENCE_ERROR_INSUFFICIENT_DATA
+        telemetry_diagnostics.update(
+            {
+                "skip_reason": "insufficient_data",
+                "required_points": inference.get("required_points", 3),
+                "observed_points": inference.get("observed_points", len(points)),
+            }
+        )
+    else:
+        projection_data["trend"] = inference["trend"]
+        projection_data["estimated_1rm"] = inference["estimated_1rm"]
+        projection_data["predicted_1rm"] = inference["predicted_1rm"]
+        predicted_mean = inference["predicted_1rm"].get("mean")
+        estimated_mean = inference["estimated_1rm"].get("mean")
+        if isinstance(predicted_mean, (int, float)) and isinstance(estimated_mean, (int, float)):
+            projection_data["dynamics"]["predicted_delta_kg"] = round(
+                float(predicted_mean) - float(estimated_mean), 2
+            )
+
+    return projection_data, telemetry_status, telemetry_error_taxonomy, telemetry_diagnostics
+
+
+async def _upsert_projection(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    canonical: str,
+    projection_data: dict[str, Any],
+    last_event_id: str,
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO projections (user_id, projection_type, key, data, version, last_event_id, updated_at)
+            VALUES (%s, 'strength_inference', %s, %s, 1, %s, NOW())
+            ON CONFLICT (user_id, projection_type, key) DO UPDATE SET
+                data = EXCLUDED.data,
+                version = projections.version + 1,
+                last_event_id = EXCLUDED.last_event_id,
+                updated_at = NOW()
+            """,
+            (user_id, canonical, json.dumps(projection_data), last_event_id),
+        )
+
+
+async def _load_stored_pooling(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    canonical: str,
+) -> dict[str, Any] | None:
+    """The ``pooling`` block of the exercise's current projection, if any."""
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT data->'pooling' AS pooling
+            FROM projections
+            WHERE user_id = %s
+              AND projection_type = 'strength_inference'
+              AND key = %s
+            """,
+            (user_id, canonical),
+        )
+        row = await cur.fetchone()
+    pooling = (row or {}).get("pooling")
+    return pooling if isinstance(pooling, dict) else None
+
+
+async def _delete_projection(
+    conn: psycopg.AsyncConnection[Any], user_id: str, canonical: str
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            DELETE FROM projections
+            WHERE user_id = %s
+              AND projection_type = 'strength_inference'
+              AND key = %s
+            """,
+            (user_id, canonical),
+        )
+
+
+async def _load_trigger_rows(
+    conn: psycopg.AsyncConnection[Any], user_id: str, event_ids: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Fetch the triggering events of a (possibly coalesced) job, keyed by id."""
+    if not event_ids:
+        return {}
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT id, timestamp, data, metadata
+            FROM events
+            WHERE id = ANY(%s::uuid[])
+              AND user_id = %s
+            """,
+            (event_ids, user_id),
+        )
+        rows = await cur.fetchall()
+    return {str(row["id"]): row for row in rows}
+
+
+async def _resolve_event_canonical(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    event_type: str,
+    row: dict[str, Any],
+    alias_map: dict[str, str],
+) -> tuple[str | None, str]:
+    """Canonical exercise touched by a triggering event, or (None, skip_reason)."""
+    event_data = row.get("data") if isinstance(row.get("data"), dict) else {}
+    event_metadata = row.get("metadata") if isinstance(row.get("metadata"), dict) else {}
+
+    if event_type == "exercise.alias_created":
+        canonical = str(event_data.get("exercise_id") or "").strip().lower()
+        if not canonical:
+            return None, "alias_without_exercise_id"
+        return canonical, ""
+
+    if event_type == "session.logged":
+        expanded = expand_session_logged_row(
+            {
+                "id": row.get("id"),
+                "timestamp": row.get("timestamp"),
+                "data": event_data,
+                "metadata": event_metadata,
+            }
+        )
+        raw_key = None
+        for expanded_row in expanded:
+            expanded_data = expanded_row.get("data") or {}
+            if not isinstance(expanded_data, dict):
+                continue
+            candidate = resolve_exercise_key(expanded_data)
+            if candidate:
+                raw_key = candidate
+                break
+        if not raw_key:
+            return None, "session_without_resolved_exercise"
+        return resolve_through_aliases(raw_key, alias_map), ""
+
+    if event_type == "set.corrected":
+        raw_key = None
+        changed_fields = event_data.get("changed_fields")
+        if isinstance(changed_fields, dict):
+            for field_name in ("exercise_id", "exercise"):
+                candidate = changed_fields.get(field_name)
+                if isinstance(candidate, dict) and "value" in candidate:
+                    candidate = candidate.get("value")
+                if isinstance(candidate, str) and candidate.strip():
+                    raw_key = candidate.strip().lower()
+                    break
+        if not raw_key:
+            target_event_id = str(event_data.get("target_event_id") or "").strip()
+            target_row: dict[str, Any] | None = None
+            if target_event_id:
+                async with conn.cursor(row_factory=dict_row) as cur:
+                    await cur.execute(
+                        "SELECT data FROM events WHERE id = %s AND user_id = %s",
+                        (target_event_id, user_id),
+                    )
+                    target_row = await cur.fetchone()
+            if target_row and isinstance(target_row.get("data"), dict):
+                raw_key = resolve_exercise_key(target_row["data"])
+        if not raw_key:
+            return None, "set_correction_without_resolved_exercise"
+        return resolve_through_aliases(raw_key, alias_map), ""
+
+    raw_key = resolve_exercise_key(event_data)
+    if not raw_key:
+        return None, "exercise_unresolved"
+    return resolve_through_aliases(raw_key, alias_map), ""
+
+
+async def _refit_all_exercises(
+    conn: psycopg.AsyncConnection[Any],
+    payload: dict[str, Any],
+    *,
+    retracted_ids: set[str],
+    alias_map: dict[str, str],
+    timezone_context: dict[str, Any],
+) -> None:
+    """Nightly refit: fit every exercise of the user in one batched inference call.
+
+    The per-event path only ever touches the exercise of the triggering event,
+    so a nightly refit would otherwise refresh a single exercise per user. Here
+    all series go through ``run_strength_inference_batch``, which shares one
+    hierarchical sampler run across exercises. Its ``pooling`` block is stored
+    with each projection; per-event refits condition on it, so daytime
+    updates keep the partially pooled slope prior instead of flipping back to
+    an unpooled fit.
+    """
+    user_id = payload["user_id"]
+    event_type = payload.get("event_type", "")
+    event_id = payload["event_id"]
+    started_at = datetime.now(timezone.utc)
+
+    grouped = await _load_strength_rows_by_exercise(
+        conn, user_id, retracted_ids=retracted_ids, alias_map=alias_map
+    )
+    series_by_key: dict[str, _StrengthSeries] = {}
+    for canonical in sorted(grouped):
+        series = _aggregate_strength_series(
+            grouped[canonical], timezone_name=timezone_context["timezone"]
+        )
+        if series.points:
+            series_by_key[canonical] = series
+    if not series_by_key:
+        return
+
+    population_priors: dict[str, dict[str, Any] | None] = {}
+    for canonical in series_by_key:
+        population_priors[canonical] = await resolve_population_prior(
+            conn,
+            user_id=user_id,
+            projection_type="strength_inference",
+            target_key=canonical,
+            retracted_ids=retracted_ids,
+        )
+    batch_series = {
+        canonical: series.model_points() for canonical, series in series_by_key.items()
+    }
+    inferences = await run_compute(
+        run_strength_inference_batch,
+        batch_series,
+        population_priors=population_priors,
+        series_key=str(user_id),
+        fallback=functools.partial(
+            run_strength_inference_batch,
+            batch_series,
+            population_priors=population_priors,
+            engine="closed_form",
+        ),
+    )
+
+    for canonical, series in series_by_key.items():
+        inference = inferences[canonical]
+        projection_data, telemetry_status, telemetry_error_taxonomy, telemetry_diagnostics = (
+            _build_projection(canonical, series, inference, timezone_context)
+        )
+        await _upsert_projection(
+            conn, user_id, canonical, projection_data, str(series.rows[-1]["id"])
+        )
+        await safe_record_inference_run(
+            conn,
+            user_id=user_id,
+            projection_type="strength_inference",
+            key=canonical,
+            engine=str(inference.get("engine", "none") or "none"),
+            status=telemetry_status,
+            diagnostics={
+                **telemetry_diagnostics,
+                "event_type": event_type,
+                "event_id": event_id,
+                "sessions_used": len(series.points),
+                "sets_used": len(series.rows),
+                "batch_size": len(series_by_key),
+            },
+            error_taxonomy=telemetry_error_taxonomy,
+            started_at=started_at,
+        )
+
+    logger.info(
+        "Refit strength_inference for user=%s across %d exercises",
+        user_id,
+        len(series_by_key),
+    )
+
+
 @projection_handler("set.logged", "session.logged", "set.corrected", "exercise.alias_created", dimension_meta={
     "name": "strength_inference",
     "description": "Bayesian strength trend and near-term forecast per exercise",
@@ -116,6 +636,13 @@ def _manifest_contribution(projection_rows: list[dict[str, Any]]) -> dict[str, A
             "blend_weight": "number (optional)",
             "computed_at": "ISO 8601 datetime (optional)",
         },
+        "pooling": {
+            "applied": "boolean — slope prior conditioned on the user's hierarchical batch fit",
+            "source": "string (optional) — hierarchical_batch",
+            "beta_shift": "number (optional)",
+            "tau_beta": "number (optional)",
+            "batch_size": "integer (optional)",
+        },
         "diagnostics": "object",
         "data_quality": {
             "sessions_used": "integer",
@@ -162,17 +689,31 @@ async def update_strength_inference(
         timezone_context = resolve_timezone_context(timezone_pref)
         timezone_name = timezone_context["timezone"]
 
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT id, timestamp, data, metadata
-                FROM events
-                WHERE id = %s
-                  AND user_id = %s
-                """,
-                (event_id, user_id),
+        if payload.get("source") == NIGHTLY_REFIT_SOURCE:
+            # The nightly stage enqueues one job per training event type; only
+            # the job flagged batch_refit runs the (user-wide) batch fit.
+            if not payload.get("batch_refit", True):
+                logger.debug(
+                    "Skipping strength refit for user=%s (event_type=%s): sibling job refits",
+                    user_id,
+                    event_type,
+                )
+                return
+            await _refit_all_exercises(
+                conn,
+                payload,
+                retracted_ids=retracted_ids,
+                alias_map=alias_map,
+                timezone_context=timezone_context,
             )
-            row = await cur.fetchone()
+            return
+
+        # A coalesced job covers several events; each exercise is fit once.
+        trigger_rows = await _load_trigger_rows(conn, user_id, payload_event_ids(payload))
+        grouped: dict[str, list[dict[str, Any]]] | None = None
+        fitted: set[str] = set()
+        for event_id in payload_event_ids(payload):
+            row = trigger_rows.get(event_id)
             if row is None:
                 logger.warning("Strength inference event %s not found", event_id)
                 await _record(
@@ -183,414 +724,107 @@ async def update_strength_inference(
                         "event_id": event_id,
                     },
                 )
-                return
-
-        event_data = row.get("data") if isinstance(row.get("data"), dict) else {}
-        event_metadata = row.get("metadata") if isinstance(row.get("metadata"), dict) else {}
+                continue
 
-        if event_type == "exercise.alias_created":
-            canonical = str(event_data.get("exercise_id") or "").strip().lower()
-            if not canonical:
-                await _record(
-                    "skipped",
-                    {
-                        "skip_reason": "alias_without_exercise_id",
-                        "event_type": event_type,
-                        "event_id": event_id,
-                    },
-                )
-                return
-        elif event_type == "session.logged":
-            expanded = expand_session_logged_row(
-                {
-                    "id": row.get("id"),
-                    "timestamp": row.get("timestamp"),
-                    "data": event_data,
-                    "metadata": event_metadata,
-                }
+            canonical, skip_reason = await _resolve_event_canonical(
+                conn, user_id, event_type, row, alias_map
             )
-            raw_key = None
-            for expanded_row in expanded:
-                expanded_data = expanded_row.get("data") or {}
-                if not isinstance(expanded_data, dict):
-                    continue
-                candidate = resolve_exercise_key(expanded_data)
-                if candidate:
-                    raw_key = candidate
-                    break
-            if not raw_key:
+            if canonical is None:
                 await _record(
                     "skipped",
                     {
-                        "skip_reason": "session_without_resolved_exercise",
+                        "skip_reason": skip_reason,
                         "event_type": event_type,
                         "event_id": event_id,
                     },
                 )
-                return
-            canonical = resolve_through_aliases(raw_key, alias_map)
-        elif event_type == "set.corrected":
-            raw_key = None
-            changed_fields = event_data.get("changed_fields")
-            if isinstance(changed_fields, dict):
-                for field in ("exercise_id", "exercise"):
-                    candidate = changed_fields.get(field)
-                    if isinstance(candidate, dict) and "value" in candidate:
-                        candidate = candidate.get("value")
-                    if isinstance(candidate, str) and candidate.strip():
-                        raw_key = candidate.strip().lower()
-                        break
-            if not raw_key:
-                target_event_id = str(event_data.get("target_event_id") or "").strip()
-                target_row: dict[str, Any] | None = None
-                if target_event_id:
-                    async with conn.cursor(row_factory=dict_row) as cur:
-                        await cur.execute(
-                            "SELECT data FROM events WHERE id = %s AND user_id = %s",
-                            (target_event_id, user_id),
-                        )
-                        target_row = await cur.fetchone()
-                if target_row and isinstance(target_row.get("data"), dict):
-                    raw_key = resolve_exercise_key(target_row["data"])
-            if not raw_key:
+                continue
+            if canonical in fitted:
+                continue
+            fitted.add(canonical)
+
+            projection_key = canonical
+            telemetry_engine = "none"
+            if grouped is None:
+                grouped = await _load_strength_rows_by_exercise(
+                    conn, user_id, retracted_ids=retracted_ids, alias_map=alias_map
+                )
+            all_keys = set(find_all_keys_for_canonical(canonical, alias_map))
+            rows = [row for key in all_keys for row in grouped.get(key, [])]
+            rows.sort(key=lambda entry: (entry.get("timestamp"), str(entry.get("id") or "")))
+            if not rows:
+                await _delete_projection(conn, user_id, canonical)
                 await _record(
                     "skipped",
                     {
-                        "skip_reason": "set_correction_without_resolved_exercise",
+                        "skip_reason": "no_matching_sets",
                         "event_type": event_type,
                         "event_id": event_id,
                     },
                 )
-                return
-            canonical = resolve_through_aliases(raw_key, alias_map)
-        else:
-            raw_key = resolve_exercise_key(event_data)
-            if not raw_key:
+                continue
+
+            series = _aggregate_strength_series(rows, timezone_name=timezone_name)
+            points = series.points
+            if not points:
+                await _delete_projection(conn, user_id, canonical)
                 await _record(
                     "skipped",
                     {
-                        "skip_reason": "exercise_unresolved",
+                        "skip_reason": "no_valid_sets",
                         "event_type": event_type,
                         "event_id": event_id,
                     },
                 )
-                return
-            canonical = resolve_through_aliases(raw_key, alias_map)
-
-        projection_key = canonical
-        all_keys = list(find_all_keys_for_canonical(canonical, alias_map))
-
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT id, timestamp, event_type, data, metadata
-                FROM events
-                WHERE user_id = %s
-                  AND event_type IN ('set.logged', 'session.logged', 'set.corrected')
-                ORDER BY timestamp ASC
-                """,
-                (user_id,),
-            )
-            rows = await cur.fetchall()
-
-        rows = [r for r in rows if str(r["id"]) not in retracted_ids]
-        normalized_rows = normalize_training_signal_rows(rows, include_passthrough=False)
-
-        rows = []
-        for candidate_row in normalized_rows:
-            data = candidate_row.get("data")
-            if not isinstance(data, dict):
-                continue
-            raw_key = resolve_exercise_key(data)
-            if not raw_key:
                 continue
-            resolved = resolve_through_aliases(raw_key, alias_map)
-            if resolved in all_keys:
-                rows.append(candidate_row)
-
-        rows.sort(key=lambda entry: (entry.get("timestamp"), str(entry.get("id") or "")))
-        if not rows:
-            async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    DELETE FROM projections
-                    WHERE user_id = %s
-                      AND projection_type = 'strength_inference'
-                      AND key = %s
-                    """,
-                    (user_id, canonical),
-                )
-            await _record(
-                "skipped",
-                {
-                    "skip_reason": "no_matching_sets",
-                    "event_type": event_type,
-                    "event_id": event_id,
-                },
-            )
-            return
 
-        # Aggregate best e1rm per session/day.
-        session_best: dict[str, tuple[datetime, float]] = {}
-        by_date_best: dict[str, float] = defaultdict(float)
-        e1rm_sources: dict[str, int] = {"explicit": 0, "inferred_from_rpe": 0, "fallback_epley": 0}
-        temporal_conflicts: dict[str, int] = {}
-        fallback_session_state: SessionBoundaryState | None = None
-        for row in rows:
-            data = row["data"]
-            ts = row["timestamp"]
-            metadata = row.get("metadata") or {}
-            temporal = normalize_temporal_point(
-                ts,
-                timezone_name=timezone_name,
-                data=data if isinstance(data, dict) else {},
-                metadata=metadata if isinstance(metadata, dict) else {},
+            population_prior = await resolve_population_prior(
+                conn,
+                user_id=user_id,
+                projection_type="strength_inference",
+                target_key=canonical,
+                retracted_ids=retracted_ids,
             )
-            ts = temporal.timestamp_utc
-            local_day = temporal.local_date
-            for conflict in temporal.conflicts:
-                temporal_conflicts[conflict] = temporal_conflicts.get(conflict, 0) + 1
-
-            try:
-                weight = float(data.get("weight_kg", data.get("weight", 0)))
-                reps = int(data.get("reps", 0))
-            except (ValueError, TypeError):
-                continue
-
-            e1rm, e1rm_source = effort_adjusted_e1rm(
-                weight,
-                reps,
-                rir=data.get("rir"),
-                rpe=data.get("rpe"),
+            pooling = await _load_stored_pooling(conn, user_id, canonical)
+            model_points = series.model_points()
+            inference = await run_compute(
+                run_strength_inference,
+                model_points,
+                population_prior=population_prior,
+                series_key=f"{user_id}:{canonical}",
+                pooling=pooling,
+                fallback=functools.partial(
+                    run_strength_inference,
+                    model_points,
+                    population_prior=population_prior,
+                    engine="closed_form",
+                    pooling=pooling,
+                ),
+            )
+            telemetry_engine = str(inference.get("engine", "none") or "none")
+            projection_data, telemetry_status, telemetry_error_taxonomy, telemetry_diagnostics = (
+                _build_projection(canonical, series, inference, timezone_context)
+            )
+            await _upsert_projection(conn, user_id, canonical, projection_data, str(rows[-1]["id"]))
+
+            logger.info(
+                "Updated strength_inference for user=%s exercise=%s (sessions=%d, sets=%d)",
+                user_id,
+                canonical,
+                len(points),
+                len(rows),
             )
-            if e1rm <= 0:
-                continue
-
-            if e1rm_source not in e1rm_sources:
-                e1rm_sources[e1rm_source] = 0
-            e1rm_sources[e1rm_source] += 1
-
-            raw_session_id = str(metadata.get("session_id") or "").strip()
-            if raw_session_id:
-                session_id = raw_session_id
-                fallback_session_state = None
-            else:
-                session_id, fallback_session_state = next_fallback_session_key(
-                    local_date=local_day,
-                    timestamp_utc=ts,
-                    state=fallback_session_state,
-                )
-
-            prev = session_best.get(session_id)
-            if prev is None or e1rm > prev[1]:
-                session_best[session_id] = (ts, e1rm)
-
-            day_key = local_day.isoformat()
-            if e1rm > by_date_best[day_key]:
-                by_date_best[day_key] = e1rm
-
-        points = sorted((ts, e1rm) for ts, e1rm in session_best.values())
-        if not points:
-            async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    DELETE FROM projections
-                    WHERE user_id = %s
-                      AND projection_type = 'strength_inference'
-                      AND key = %s
-                    """,
-                    (user_id, canonical),
-                )
             await _record(
-                "skipped",
+                telemetry_status,
                 {
-                    "skip_reason": "no_valid_sets",
+                    **telemetry_diagnostics,
                     "event_type": event_type,
                     "event_id": event_id,
-                },
-            )
-            return
-
-        start_ts = points[0][0]
-        model_points: list[tuple[float, float]] = []
-        for ts, e1rm in points:
-            day_offset = (ts - start_ts).total_seconds() / 86400.0
-            model_points.append((day_offset, e1rm))
-
-        population_prior = await resolve_population_prior(
-            conn,
-            user_id=user_id,
-            projection_type="strength_inference",
-            target_key=canonical,
-            retracted_ids=retracted_ids,
-        )
-        inference = run_strength_inference(model_points, population_prior=population_prior)
-        telemetry_engine = str(inference.get("engine", "none") or "none")
-        history = [
-            {"date": d, "estimated_1rm": round(v, 2)}
-            for d, v in sorted(by_date_best.items())
-        ][-120:]
-        dynamics_snapshot = dict(inference.get("dynamics", {}))
-        projection_phase = str(dynamics_snapshot.get("phase") or "unknown")
-        weekly_cycle = weekly_phase_from_date(history[-1]["date"] if history else None)
-        observed_points = len(points)
-        required_points = int(inference.get("required_points", 3) or 3)
-        insufficient = inference.get("status") == STATUS_INSUFFICIENT_DATA
-        status = STATUS_INSUFFICIENT_DATA if insufficient else STATUS_OK
-        confidence = confidence_from_evidence(
-            observed_points=observed_points,
-            required_points=required_points,
-        )
-        data_sufficiency = data_sufficiency_block(
-            required_observations=required_points,
-            observed_observations=observed_points,
-            uncertainty_reason_codes=(
-                ["insufficient_observation_count"] if insufficient else []
-            )
-            + (["effort_context_missing"] if e1rm_sources.get("fallback_epley", 0) > 0 else []),
-            recommended_next_observations=(
-                [
-                    "Log additional heavy sets until at least three sessions are available.",
-                    "Provide RIR or RPE to reduce e1RM uncertainty.",
-                ]
-                if insufficient
-                else (
-                    ["Provide RIR or RPE for more sets to improve confidence."]
-                    if e1rm_sources.get("fallback_epley", 0) > 0
-                    else []
-                )
-            ),
-        )
-
-        if insufficient:
-            capability_estimation = build_insufficient_envelope(
-                capability="strength_1rm",
-                required_observations=required_points,
-                observed_observations=observed_points,
-                model_version="strength_inference.v2",
-                recommended_next_observations=data_sufficiency.get(
-                    "recommended_next_observations"
-                ),
-                protocol_signature={"projection_key": canonical},
-                diagnostics={
                     "sessions_used": len(points),
                     "sets_used": len(rows),
-                    "e1rm_source_counts": e1rm_sources,
-                    "temporal_conflicts": temporal_conflicts,
-                    "timezone": timezone_context.get("timezone"),
                 },
+                error_taxonomy=telemetry_error_taxonomy,
             )
-        else:
-            capability_estimation = build_capability_envelope(
-                capability="strength_1rm",
-                estimate_mean=float((inference.get("estimated_1rm") or {}).get("mean", 0.0)),
-                estimate_interval=(inference.get("estimated_1rm") or {}).get("ci95") or [None, None],
-                status=status,
-                confidence=confidence,
-                data_sufficiency=data_sufficiency,
-                model_version="strength_inference.v2",
-                protocol_signature={"projection_key": canonical},
-                diagnostics={
-                    "sessions_used": len(points),
-                    "sets_used": len(rows),
-                    "e1rm_source_counts": e1rm_sources,
-                    "temporal_conflicts": temporal_conflicts,
-                    "timezone": timezone_context.get("timezone"),
-                    "engine": inference.get("engine"),
-                },
-            )
-
-        projection_data: dict[str, Any] = {
-            "exercise_id": canonical,
-            "history": history,
-            "status": status,
-            "confidence": confidence,
-            "data_sufficiency": data_sufficiency,
-            "estimate": {
-                "mean": (inference.get("estimated_1rm") or {}).get("mean"),
-                "interval": (inference.get("estimated_1rm") or {}).get("ci95"),
-            },
-            "capability_estimation": capability_estimation,
-            "timezone_context": timezone_context,
-            "dynamics": {"estimated_1rm": dynamics_snapshot},
-            "phase": {
-                "projection_phase": projection_phase,
-                "weekly_cycle": weekly_cycle,
-            },
-            "data_quality": {
-                "sessions_used": len(points),
-                "sets_used": len(rows),
-                "insufficient_data": inference.get("status") == "insufficient_data",
-                "e1rm_source_counts": e1rm_sources,
-                "temporal_conflicts": temporal_conflicts,
-            },
-            "diagnostics": inference.get("diagnostics", {}),
-            "engine": inference.get("engine"),
-            "population_prior": inference.get("population_prior", {"applied": False}),
-        }
-
-        telemetry_status = "success"
-        telemetry_error_taxonomy: str | None = None
-        telemetry_diagnostics = dict(inference.get("diagnostics", {}))
-        if isinstance(inference.get("population_prior"), dict):
-            telemetry_diagnostics["population_prior"] = inference["population_prior"]
-        if inference.get("status") == "insufficient_data":
-            projection_data["status"] = STATUS_INSUFFICIENT_DATA
-            projection_data["required_points"] = inference.get("required_points", 3)
-            projection_data["observed_points"] = inference.get("observed_points", len(points))
-            telemetry_status = "skipped"
-            telemetry_error_taxonomy = INFERENCE_ERROR_INSUFFICIENT_DATA
-            telemetry_diagnostics.update(
-                {
-                    "skip_reason": "insufficient_data",
-                    "required_points": inference.get("required_points", 3),
-                    "observed_points": inference.get("observed_points", len(points)),
-                }
-            )
-        else:
-            projection_data["trend"] = inference["trend"]
-            projection_data["estimated_1rm"] = inference["estimated_1rm"]
-            projection_data["predicted_1rm"] = inference["predicted_1rm"]
-            predicted_mean = inference["predicted_1rm"].get("mean")
-            estimated_mean = inference["estimated_1rm"].get("mean")
-            if isinstance(predicted_mean, (int, float)) and isinstance(estimated_mean, (int, float)):
-                projection_data["dynamics"]["predicted_delta_kg"] = round(
-                    float(predicted_mean) - float(estimated_mean), 2
-                )
-
-        last_event_id = str(rows[-1]["id"])
-        async with conn.cursor() as cur:
-            await cur.execute(
-                """
-                INSERT INTO projections (user_id, projection_type, key, data, version, last_event_id, updated_at)
-                VALUES (%s, 'strength_inference', %s, %s, 1, %s, NOW())
-                ON CONFLICT (user_id, projection_type, key) DO UPDATE SET
-                    data = EXCLUDED.data,
-                    version = projections.version + 1,
-                    last_event_id = EXCLUDED.last_event_id,
-                    updated_at = NOW()
-                """,
-                (user_id, canonical, json.dumps(projection_data), last_event_id),
-            )
-
-        logger.info(
-            "Updated strength_inference for user=%s exercise=%s (sessions=%d, sets=%d)",
-            user_id,
-            canonical,
-            len(points),
-            len(rows),
-        )
-        await _record(
-            telemetry_status,
-            {
-                **telemetry_diagnostics,
-                "event_type": event_type,
-                "event_id": event_id,
-                "sessions_used": len(points),
-                "sets_used": len(rows),
-            },
-            error_taxonomy=telemetry_error_taxonomy,
-        )
     except Exception as exc:
         await _record(
             "failed",
@@ -40,7 +40,9 @@ from ..utils import (
     epley_1rm,
     get_alias_map,
     get_retracted_event_ids,
+    load_set_corrections,
     load_timezone_preference,
+    load_user_events,
     local_date_for_timezone,
     merge_observed_attributes,
     next_fallback_session_key,
@@ -432,35 +434,12 @@ async def update_training_timeline(
     timezone_context = _resolve_timezone_context(timezone_pref)
     timezone_name = timezone_context["timezone"]
 
-    # Fetch ALL set.logged events for this user (including metadata for session_id)
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = 'set.logged'
-            ORDER BY timestamp ASC
-            """,
-            (user_id,),
-        )
-        rows = await cur.fetchall()
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = 'session.logged'
-            ORDER BY timestamp ASC
-            """,
-            (user_id,),
-        )
-        session_rows = await cur.fetchall()
-
-    # Filter retracted events
-    rows = [r for r in rows if str(r["id"]) not in retracted_ids]
-    session_rows = [r for r in session_rows if str(r["id"]) not in retracted_ids]
+    # Fetch ALL non-retracted set.logged events for this user (including
+    # metadata for session_id)
+    rows = await load_user_events(conn, user_id, ("set.logged",), retracted_ids=retracted_ids)
+    session_rows = await load_user_events(
+        conn, user_id, ("session.logged",), retracted_ids=retracted_ids
+    )
     legacy_backfill_source_ids = extract_backfilled_set_event_ids(session_rows)
     if legacy_backfill_source_ids:
         rows = [
@@ -480,25 +459,9 @@ async def update_training_timeline(
             "confidence": completeness.get("confidence"),
             "log_valid": bool(completeness.get("log_valid")),
         }
-    row_ids = [str(r["id"]) for r in rows]
-    correction_rows: list[dict[str, Any]] = []
-    if row_ids:
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
-                """
-                SELECT id, timestamp, data
-                FROM events
-                WHERE user_id = %s
-                  AND event_type = 'set.corrected'
-                  AND data->>'target_event_id' = ANY(%s)
-                ORDER BY timestamp ASC, id ASC
-                """,
-                (user_id, row_ids),
-            )
-            correction_rows = await cur.fetchall()
-    correction_rows = [
-        row for row in correction_rows if str(row["id"]) not in retracted_ids
-    ]
+    correction_rows = await load_set_corrections(
+        conn, user_id, [str(r["id"]) for r in rows], retracted_ids=retracted_ids
+    )
     rows = apply_set_correction_chain(rows, correction_rows)
     session_expanded_rows = expand_session_logged_rows(session_rows)
     for expanded in session_expanded_rows:
@@ -508,19 +471,9 @@ async def update_training_timeline(
             expanded["_session_completeness_confidence"] = hint.get("confidence")
             expanded["_session_log_valid"] = hint.get("log_valid")
 
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, data, metadata
-            FROM events
-            WHERE user_id = %s
-              AND event_type = 'external.activity_imported'
-            ORDER BY timestamp ASC
-            """,
-            (user_id,),
-        )
-        external_rows = await cur.fetchall()
-    external_rows = [r for r in external_rows if str(r["id"]) not in retracted_ids]
+    external_rows = await load_user_events(
+        conn, user_id, ("external.activity_imported",), retracted_ids=retracted_ids
+    )
 
     relation_capabilities = await detect_relation_capabilities(
         conn,
@@ -22,7 +22,7 @@ from psycopg.rows import dict_row
 
 from ..recovery_daily_checkin import normalize_daily_checkin_payload
 from ..registry import get_dimension_metadata, projection_handler, registered_event_types
-from ..utils import get_retracted_event_ids
+from ..utils import get_retracted_event_ids, load_user_events
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,20 @@ _INTERNAL_NON_ORPHAN_EVENT_TYPES = {
     "learning.signal.logged",
 }
 
+# Event types replayed into the profile (a subset of the registered triggers).
+_PROFILE_SOURCE_EVENT_TYPES = (
+    "set.logged", "session.logged", "set.corrected", "exercise.alias_created", "preference.set",
+    "goal.set", "objective.set", "objective.updated", "objective.archived",
+    "profile.updated", "program.started", "injury.reported",
+    "bodyweight.logged", "session.completed", "recovery.daily_checkin",
+    "supplement.regimen.set", "supplement.regimen.paused", "supplement.regimen.resumed",
+    "supplement.regimen.stopped", "supplement.taken", "supplement.skipped",
+    "supplement.logged",
+    "advisory.override.recorded",
+    "workflow.onboarding.closed", "workflow.onboarding.override_granted",
+    "workflow.onboarding.aborted", "workflow.onboarding.restarted",
+)
+
 _BASELINE_REQUIRED_SLOTS = (
     "age_or_date_of_birth",
     "bodyweight_kg",
@@ -1028,33 +1042,10 @@ async def update_user_profile(
     user_id = payload["user_id"]
     retracted_ids = await get_retracted_event_ids(conn, user_id)
 
-    # Fetch all relevant events for this user
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT id, timestamp, event_type, data
-            FROM events
-            WHERE user_id = %s
-              AND event_type IN (
-                  'set.logged', 'session.logged', 'set.corrected', 'exercise.alias_created', 'preference.set',
-                  'goal.set', 'objective.set', 'objective.updated', 'objective.archived',
-                  'profile.updated', 'program.started', 'injury.reported',
-                  'bodyweight.logged', 'session.completed', 'recovery.daily_checkin',
-                  'supplement.regimen.set', 'supplement.regimen.paused', 'supplement.regimen.resumed',
-                  'supplement.regimen.stopped', 'supplement.taken', 'supplement.skipped',
-                  'supplement.logged',
-                  'advisory.override.recorded',
-                  'workflow.onboarding.closed', 'workflow.onboarding.override_granted',
-                  'workflow.onboarding.aborted', 'workflow.onboarding.restarted'
-              )
-            ORDER BY timestamp ASC, id ASC
-            """,
-            (user_id,),
-        )
-        rows = await cur.fetchall()
-
-    # Filter retracted events
-    rows = [r for r in rows if str(r["id"]) not in retracted_ids]
+    # Fetch all relevant (non-retracted) events for this user
+    rows = await load_user_events(
+        conn, user_id, _PROFILE_SOURCE_EVENT_TYPES, retracted_ids=retracted_ids
+    )
 
     if not rows:
         # Clean up: delete any existing projection
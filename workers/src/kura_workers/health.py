@@ -1,6 +1,7 @@
 """Minimal async HTTP health endpoint for Docker healthchecks.
 
-Uses raw asyncio.start_server — no external dependencies.
+Uses raw asyncio.start_server — no external dependencies. ``/health``
+returns JSON (with a DB probe), ``/metrics`` the Prometheus text format.
 """
 
 import asyncio
@@ -9,13 +10,16 @@ import logging
 
 import psycopg
 
-from .metrics import get_metrics
+from .metrics import get_metrics, render_prometheus
 
 logger = logging.getLogger(__name__)
 
 _HTTP_200 = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
 _HTTP_503 = "HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\n"
 _HTTP_404 = "HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n"
+_HTTP_200_PROMETHEUS = (
+    "HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+)
 
 
 async def _check_db(db_url: str) -> str:
@@ -58,6 +62,11 @@ async def _handle_request(
 
             status_line = _HTTP_200 if status == "ok" else _HTTP_503
             response = f"{status_line}Content-Length: {len(body)}\r\n\r\n{body}"
+        elif path == "/metrics":
+            body = render_prometheus()
+            response = (
+                f"{_HTTP_200_PROMETHEUS}Content-Length: {len(body.encode())}\r\n\r\n{body}"
+            )
         else:
             body = json.dumps({"error": "not_found"})
             response = f"{_HTTP_404}Content-Length: {len(body)}\r\n\r\n{body}"
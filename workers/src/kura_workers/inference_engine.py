@@ -5,6 +5,8 @@ from __future__ import annotations
 import logging
 import math
 import os
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from statistics import mean
 from typing import Any
@@ -171,6 +173,35 @@ def summarize_signal_dynamics(
 
     sorted_points = sorted(points, key=lambda item: item[0])
     slopes, accelerations = _derivative_samples(sorted_points)
+    return _signal_dynamics_summary(
+        sorted_points[-1][1],
+        len(sorted_points),
+        slopes,
+        accelerations,
+        slope_count=len(slopes),
+        acceleration_count=len(accelerations),
+        velocity_epsilon=velocity_epsilon,
+        acceleration_epsilon=acceleration_epsilon,
+    )
+
+
+def _signal_dynamics_summary(
+    value: float,
+    samples: int,
+    slopes: list[float],
+    accelerations: list[float],
+    *,
+    slope_count: int,
+    acceleration_count: int,
+    velocity_epsilon: float,
+    acceleration_epsilon: float,
+) -> dict[str, Any]:
+    """Dynamics block from the derivative tails of a non-empty series.
+
+    Only the last three slopes and last two accelerations are read, so
+    callers tracking a growing series may pass trimmed tails together with
+    the full counts.
+    """
     velocity = _tail_weighted_average(slopes, window=3)
     acceleration = _tail_weighted_average(accelerations, window=2)
     trajectory_code, phase, direction, momentum = _trajectory_code(
@@ -180,12 +211,12 @@ def summarize_signal_dynamics(
         acceleration_epsilon=acceleration_epsilon,
     )
 
-    slope_strength = min(1.0, len(slopes) / 3.0)
-    accel_strength = min(1.0, len(accelerations) / 2.0)
+    slope_strength = min(1.0, slope_count / 3.0)
+    accel_strength = min(1.0, acceleration_count / 2.0)
     confidence = min(1.0, (0.7 * slope_strength) + (0.3 * accel_strength))
 
     return {
-        "value": _round_or_none(sorted_points[-1][1], 3),
+        "value": _round_or_none(value, 3),
         "velocity_per_day": _round_or_none(velocity, 6),
         "velocity_per_week": _round_or_none((velocity * 7.0) if velocity is not None else None, 6),
         "acceleration_per_day2": _round_or_none(acceleration, 6),
@@ -194,7 +225,7 @@ def summarize_signal_dynamics(
         "direction": direction,
         "momentum": momentum,
         "confidence": round(confidence, 3),
-        "samples": len(sorted_points),
+        "samples": samples,
     }
 
 
@@ -281,6 +312,35 @@ def _resolve_strength_beta_prior(population_prior: dict[str, Any] | None) -> tup
     return prior_mean, max(prior_var, 1e-6), meta
 
 
+def _resolve_pooled_beta_prior(
+    prior_mean: float,
+    prior_var: float,
+    pooling: dict[str, Any] | None,
+) -> tuple[float, float, dict[str, Any]]:
+    """Conditional slope prior of one exercise under the user's batch fit.
+
+    The hierarchical model draws each slope as
+    ``beta_mu + beta_shift + tau_beta * beta_sigma * z``; given the batch
+    posterior's hyperparameters that is ``N(beta_mu + beta_shift,
+    (tau_beta * beta_sigma)^2)``, so single-series refits keep the pooling.
+    """
+    meta: dict[str, Any] = {"applied": False}
+    if not isinstance(pooling, dict) or not pooling.get("applied"):
+        return prior_mean, prior_var, meta
+    shift = _as_float(pooling.get("beta_shift"))
+    tau = _as_float(pooling.get("tau_beta"))
+    if shift is None or tau is None or tau <= 0.0:
+        return prior_mean, prior_var, meta
+    meta = {
+        "applied": True,
+        "source": "hierarchical_batch",
+        "beta_shift": shift,
+        "tau_beta": tau,
+        "batch_size": pooling.get("batch_size"),
+    }
+    return prior_mean + shift, max(tau * tau * prior_var, 1e-6), meta
+
+
 def _resolve_readiness_prior(
     population_prior: dict[str, Any] | None,
     *,
@@ -327,23 +387,59 @@ def _closed_form_strength(
     x_mean = sum(x) / len(x)
     x_centered = [xi - x_mean for xi in x]
 
+    # Empirical noise estimate with floor.
+    y_mu = sum(y) / len(y)
+    sample_var = sum((yi - y_mu) ** 2 for yi in y) / max(1, len(y) - 1)
+
+    return _closed_form_strength_from_moments(
+        n=len(x_centered),
+        y_sum=sum(yi for yi in y),
+        alpha_prior_mean=mean(y),
+        sample_var=sample_var,
+        x_centered_sum=sum(x_centered),
+        x_centered_ss=sum(xi * xi for xi in x_centered),
+        x_centered_y=sum(xi * yi for xi, yi in zip(x_centered, y)),
+        x_last=x_centered[-1],
+        horizon_days=horizon_days,
+        slope_plateau_threshold=slope_plateau_threshold,
+        prior_beta_mean=prior_beta_mean,
+        prior_beta_var=prior_beta_var,
+    )
+
+
+def _closed_form_strength_from_moments(
+    *,
+    n: int,
+    y_sum: float,
+    alpha_prior_mean: float,
+    sample_var: float,
+    x_centered_sum: float,
+    x_centered_ss: float,
+    x_centered_y: float,
+    x_last: float,
+    horizon_days: float,
+    slope_plateau_threshold: float,
+    prior_beta_mean: float,
+    prior_beta_var: float,
+) -> dict:
+    """Closed-form posterior from the regression's sufficient statistics.
+
+    x is centered on its mean; ``x_last`` is the last centered day offset.
+    """
     # Model: y = alpha + beta*x + eps
     # Prior
-    prior_mean = [mean(y), prior_beta_mean]  # alpha, beta
+    prior_mean = [alpha_prior_mean, prior_beta_mean]  # alpha, beta
     prior_cov = [[400.0, 0.0], [0.0, max(1e-6, prior_beta_var)]]
     prior_prec = _inv2(prior_cov)
 
-    # Empirical noise estimate with floor.
-    y_mu = sum(y) / len(y)
-    sample_var = sum((yi - y_mu) ** 2 for yi in y) / max(1, len(y) - 1)
     sigma2 = max(25.0, sample_var)
 
     # X'X and X'y for [1, x]
-    s11 = float(len(x_centered))
-    s12 = sum(x_centered)
-    s22 = sum(xi * xi for xi in x_centered)
+    s11 = float(n)
+    s12 = x_centered_sum
+    s22 = x_centered_ss
     xtx = [[s11 / sigma2, s12 / sigma2], [s12 / sigma2, s22 / sigma2]]
-    xty = [sum(yi for yi in y) / sigma2, sum(xi * yi for xi, yi in zip(x_centered, y)) / sigma2]
+    xty = [y_sum / sigma2, x_centered_y / sigma2]
 
     post_prec = [
         [xtx[0][0] + prior_prec[0][0], xtx[0][1] + prior_prec[0][1]],
@@ -357,7 +453,6 @@ def _closed_form_strength(
     alpha_sd = math.sqrt(max(post_cov[0][0], 1e-9))
     beta_sd = math.sqrt(max(post_cov[1][1], 1e-9))
 
-    x_last = x_centered[-1]
     x_future = x_last + horizon_days
 
     current_mu = alpha_mu + beta_mu * x_last
@@ -420,7 +515,27 @@ def _hierarchical_surrogate_strength(
         prior_beta_mean=prior_beta_mean,
         prior_beta_var=prior_beta_var,
     )
-    n = max(1, len(x))
+    return _shrink_strength_result(
+        base,
+        len(x),
+        horizon_days,
+        slope_plateau_threshold,
+        prior_beta_mean=prior_beta_mean,
+        prior_beta_var=prior_beta_var,
+    )
+
+
+def _shrink_strength_result(
+    base: dict,
+    n_points: int,
+    horizon_days: float,
+    slope_plateau_threshold: float,
+    *,
+    prior_beta_mean: float,
+    prior_beta_var: float,
+) -> dict:
+    """Apply the surrogate's deterministic slope shrinkage to a closed-form fit."""
+    n = max(1, n_points)
     shrinkage = min(0.7, max(0.15, 4.0 / (n + 4.0)))
     slope = _as_float((base.get("trend") or {}).get("slope_kg_per_day")) or 0.0
     shrunk_slope = ((1.0 - shrinkage) * slope) + (shrinkage * prior_beta_mean)
@@ -468,6 +583,48 @@ def _hierarchical_surrogate_strength(
     }
 
 
+def _summarize_strength_draws(
+    alpha_samples: Any,
+    beta_samples: Any,
+    *,
+    x_last: float,
+    horizon_days: float,
+    slope_plateau_threshold: float,
+) -> dict[str, Any]:
+    """Trend/estimate/forecast blocks from posterior draws of (alpha, beta)."""
+    import numpy as np
+
+    x_future = x_last + horizon_days
+    current_samples = alpha_samples + beta_samples * x_last
+    future_samples = alpha_samples + beta_samples * x_future
+
+    slope_mu = float(beta_samples.mean())
+    plateau_probability = float((beta_samples <= slope_plateau_threshold).mean())
+    improving_probability = float((beta_samples > 0.0).mean())
+
+    def q(values, p):
+        return float(np.quantile(values, p))
+
+    return {
+        "trend": {
+            "slope_kg_per_day": round(slope_mu, 4),
+            "slope_kg_per_week": round(slope_mu * 7.0, 3),
+            "slope_ci95": [round(q(beta_samples, 0.025), 4), round(q(beta_samples, 0.975), 4)],
+            "plateau_probability": round(plateau_probability, 4),
+            "improving_probability": round(improving_probability, 4),
+        },
+        "estimated_1rm": {
+            "mean": round(float(current_samples.mean()), 2),
+            "ci95": [round(q(current_samples, 0.025), 2), round(q(current_samples, 0.975), 2)],
+        },
+        "predicted_1rm": {
+            "horizon_days": int(horizon_days),
+            "mean": round(float(future_samples.mean()), 2),
+            "ci95": [round(q(future_samples, 0.025), 2), round(q(future_samples, 0.975), 2)],
+        },
+    }
+
+
 def _pymc_strength(
     x: list[float],
     y: list[float],
@@ -476,12 +633,18 @@ def _pymc_strength(
     *,
     prior_beta_mean: float = 0.0,
     prior_beta_var: float = 4.0,
+    series_key: str | None = None,
 ) -> dict | None:
-    """PyMC posterior sampling path. Returns None on unavailable/runtime failure."""
+    """PyMC posterior sampling path. Returns None on unavailable/runtime failure.
+
+    Sampling goes through ``pymc_runtime``: the model graph is compiled once
+    per process, unchanged series are served from the posterior cache, and
+    refits of ``series_key`` warm-start from its previous fit.
+    """
     try:
-        import arviz as az
         import numpy as np
-        import pymc as pm
+
+        from .pymc_runtime import sample_strength_posterior
     except Exception as exc:
         logger.warning("PyMC path unavailable (%s); using closed-form strength inference", exc)
         return None
@@ -492,83 +655,134 @@ def _pymc_strength(
         x_mean = float(xa.mean())
         xc = xa - x_mean
 
-        with pm.Model():
-            alpha = pm.Normal("alpha", mu=float(ya.mean()), sigma=30.0)
-            beta = pm.Normal("beta", mu=prior_beta_mean, sigma=math.sqrt(max(1e-6, prior_beta_var)))
-            sigma = pm.HalfNormal("sigma", sigma=10.0)
-            mu = alpha + beta * xc
-            pm.Normal("obs", mu=mu, sigma=sigma, observed=ya)
-            trace = pm.sample(
-                draws=600,
-                tune=600,
-                chains=2,
-                cores=1,
-                progressbar=False,
-                random_seed=42,
-                target_accept=0.9,
-            )
-
-        alpha_samples = trace.posterior["alpha"].values.flatten()
-        beta_samples = trace.posterior["beta"].values.flatten()
-        sigma_samples = trace.posterior["sigma"].values.flatten()
+        posterior, runtime = sample_strength_posterior(
+            xc,
+            ya,
+            beta_mu=prior_beta_mean,
+            beta_sigma=math.sqrt(max(1e-6, prior_beta_var)),
+            series_key=series_key,
+        )
+    except ImportError as exc:
+        logger.warning("PyMC path unavailable (%s); using closed-form strength inference", exc)
+        return None
+    except Exception as exc:  # Sampling/runtime failures fallback safely.
+        logger.warning("PyMC strength inference failed (%s); using closed-form fallback", exc)
+        return None
 
-        x_last = float(xc[-1])
-        x_future = x_last + horizon_days
+    return {
+        "engine": "pymc",
+        **_summarize_strength_draws(
+            posterior.alpha,
+            posterior.beta,
+            x_last=float(xc[-1]),
+            horizon_days=horizon_days,
+            slope_plateau_threshold=slope_plateau_threshold,
+        ),
+        "diagnostics": {
+            "rhat": round(posterior.rhat, 4),
+            "ess_min": round(posterior.ess, 1),
+            "sigma_mean": round(float(posterior.sigma.mean()), 3),
+            "draws": int(posterior.alpha.size),
+        },
+        "runtime": runtime,
+    }
 
-        current_samples = alpha_samples + beta_samples * x_last
-        future_samples = alpha_samples + beta_samples * x_future
 
-        slope_mu = float(beta_samples.mean())
-        plateau_probability = float((beta_samples <= slope_plateau_threshold).mean())
-        improving_probability = float((beta_samples > 0.0).mean())
+def _pymc_hierarchical_strength(
+    series: dict[str, tuple[list[float], list[float], float, float]],
+    horizon_days: float,
+    slope_plateau_threshold: float,
+    *,
+    series_key: str | None = None,
+) -> dict[str, dict] | None:
+    """Fit all exercise series in one hierarchical PyMC model.
+
+    ``series`` maps exercise key -> (x, y, prior_beta_mean, prior_beta_var).
+    Alpha is per exercise; slopes share a population shift and scale
+    (non-centered, each exercise's prior sd scales its deviation); noise is
+    per exercise under a shared half-normal hyperprior. The posterior is split
+    back into one result dict per exercise. Returns None on
+    unavailable/runtime failure so callers fall back to per-series fits.
+    """
+    try:
+        import numpy as np
 
-        rhat = float(az.rhat(trace).to_array().max().item())
-        ess = float(az.ess(trace).to_array().min().item())
+        from .pymc_runtime import sample_hierarchical_strength_posterior
+    except Exception as exc:
+        logger.warning("PyMC path unavailable (%s); using per-exercise strength inference", exc)
+        return None
 
-        def q(values, p):
-            return float(np.quantile(values, p))
+    keys = list(series)
+    try:
+        x_parts: list[Any] = []
+        y_parts: list[Any] = []
+        group_parts: list[Any] = []
+        x_last: list[float] = []
+        for group, key in enumerate(keys):
+            x, y, _, _ = series[key]
+            xa = np.array(x, dtype=float)
+            xc = xa - float(xa.mean())
+            x_parts.append(xc)
+            y_parts.append(np.array(y, dtype=float))
+            group_parts.append(np.full(len(xc), group, dtype=np.int64))
+            x_last.append(float(xc[-1]))
+
+        posterior, runtime = sample_hierarchical_strength_posterior(
+            np.concatenate(x_parts),
+            np.concatenate(y_parts),
+            np.concatenate(group_parts),
+            alpha_mu=np.array([float(part.mean()) for part in y_parts]),
+            beta_mu=np.array([float(series[key][2]) for key in keys]),
+            beta_sigma=np.array(
+                [math.sqrt(max(1e-6, float(series[key][3]))) for key in keys]
+            ),
+            series_key=series_key,
+        )
+    except ImportError as exc:
+        logger.warning("PyMC path unavailable (%s); using per-exercise strength inference", exc)
+        return None
+    except Exception as exc:  # Sampling/runtime failures fallback safely.
+        logger.warning(
+            "Hierarchical PyMC strength inference failed (%s); using per-exercise fallback", exc
+        )
+        return None
 
-        return {
-            "engine": "pymc",
-            "trend": {
-                "slope_kg_per_day": round(slope_mu, 4),
-                "slope_kg_per_week": round(slope_mu * 7.0, 3),
-                "slope_ci95": [round(q(beta_samples, 0.025), 4), round(q(beta_samples, 0.975), 4)],
-                "plateau_probability": round(plateau_probability, 4),
-                "improving_probability": round(improving_probability, 4),
-            },
-            "estimated_1rm": {
-                "mean": round(float(current_samples.mean()), 2),
-                "ci95": [round(q(current_samples, 0.025), 2), round(q(current_samples, 0.975), 2)],
-            },
-            "predicted_1rm": {
-                "horizon_days": int(horizon_days),
-                "mean": round(float(future_samples.mean()), 2),
-                "ci95": [round(q(future_samples, 0.025), 2), round(q(future_samples, 0.975), 2)],
-            },
+    pooling = {
+        "applied": True,
+        "source": "hierarchical_batch",
+        "beta_shift": round(float(posterior.beta_shift.mean()), 4),
+        "tau_beta": round(float(posterior.tau_beta.mean()), 4),
+        "batch_size": len(keys),
+    }
+    results: dict[str, dict] = {}
+    for group, key in enumerate(keys):
+        results[key] = {
+            "engine": "hierarchical_bayes_mcmc",
+            "pooling": dict(pooling),
+            **_summarize_strength_draws(
+                posterior.alpha[:, group],
+                posterior.beta[:, group],
+                x_last=x_last[group],
+                horizon_days=horizon_days,
+                slope_plateau_threshold=slope_plateau_threshold,
+            ),
             "diagnostics": {
-                "rhat": round(rhat, 4),
-                "ess_min": round(ess, 1),
-                "sigma_mean": round(float(sigma_samples.mean()), 3),
-                "draws": int(alpha_samples.size),
+                "rhat": round(posterior.rhat, 4),
+                "ess_min": round(posterior.ess, 1),
+                "sigma_mean": round(float(posterior.sigma[:, group].mean()), 3),
+                "draws": int(posterior.alpha.shape[0]),
+                "hierarchical": True,
+                "batch_size": len(keys),
+                "tau_beta_mean": round(float(posterior.tau_beta.mean()), 4),
+                "beta_shift_mean": round(float(posterior.beta_shift.mean()), 4),
             },
+            "runtime": runtime,
         }
-    except Exception as exc:  # Sampling/runtime failures fallback safely.
-        logger.warning("PyMC strength inference failed (%s); using closed-form fallback", exc)
-        return None
+    return results
 
 
-def run_strength_inference(
-    points: list[tuple[float, float]],
-    *,
-    population_prior: dict[str, Any] | None = None,
-) -> dict:
-    """Run strength inference over (day_offset, estimated_1rm) points."""
-    prior_beta_mean, prior_beta_var, population_prior_meta = _resolve_strength_beta_prior(
-        population_prior
-    )
-
-    dynamics = summarize_signal_dynamics(
+def _strength_dynamics(points: list[tuple[float, float]]) -> dict[str, Any]:
+    return summarize_signal_dynamics(
         points,
         velocity_epsilon=float(os.environ.get("KURA_STRENGTH_DERIVATIVE_VELOCITY_EPS", "0.03")),
         acceleration_epsilon=float(
@@ -576,25 +790,44 @@ def run_strength_inference(
         ),
     )
 
-    if len(points) < 3:
-        return {
-            "engine": "none",
-            "status": "insufficient_data",
-            "required_points": 3,
-            "observed_points": len(points),
-            "dynamics": dynamics,
-            "population_prior": population_prior_meta,
-        }
 
-    x = [p[0] for p in points]
-    y = [p[1] for p in points]
+def _strength_model_settings(engine: str | None = None) -> tuple[float, float, str]:
     horizon_days = float(int(os.environ.get("KURA_BAYES_FORECAST_DAYS", "28")))
     slope_plateau_threshold = float(os.environ.get("KURA_BAYES_PLATEAU_SLOPE_PER_DAY", "0.02"))
-    preferred_engine = os.environ.get("KURA_BAYES_ENGINE", "pymc").strip().lower()
+    preferred_engine = (engine or os.environ.get("KURA_BAYES_ENGINE", "pymc")).strip().lower()
+    return horizon_days, slope_plateau_threshold, preferred_engine
 
-    result: dict[str, Any]
+
+def _insufficient_strength_result(
+    points: list[tuple[float, float]],
+    dynamics: dict[str, Any],
+    population_prior_meta: dict[str, Any],
+    pooling_meta: dict[str, Any] | None = None,
+) -> dict:
+    return {
+        "engine": "none",
+        "status": "insufficient_data",
+        "required_points": 3,
+        "observed_points": len(points),
+        "dynamics": dynamics,
+        "population_prior": population_prior_meta,
+        "pooling": pooling_meta or {"applied": False},
+    }
+
+
+def _fit_strength_series(
+    x: list[float],
+    y: list[float],
+    *,
+    horizon_days: float,
+    slope_plateau_threshold: float,
+    preferred_engine: str,
+    prior_beta_mean: float,
+    prior_beta_var: float,
+    series_key: str | None,
+) -> dict[str, Any]:
     if preferred_engine == "hierarchical_bayes":
-        result = _hierarchical_surrogate_strength(
+        return _hierarchical_surrogate_strength(
             x,
             y,
             horizon_days,
@@ -602,7 +835,7 @@ def run_strength_inference(
             prior_beta_mean=prior_beta_mean,
             prior_beta_var=prior_beta_var,
         )
-    elif preferred_engine == "pymc":
+    if preferred_engine == "pymc":
         pymc_result = _pymc_strength(
             x,
             y,
@@ -610,28 +843,26 @@ def run_strength_inference(
             slope_plateau_threshold,
             prior_beta_mean=prior_beta_mean,
             prior_beta_var=prior_beta_var,
+            series_key=series_key,
         )
         if pymc_result is not None:
-            result = pymc_result
-        else:
-            result = _closed_form_strength(
-                x,
-                y,
-                horizon_days,
-                slope_plateau_threshold,
-                prior_beta_mean=prior_beta_mean,
-                prior_beta_var=prior_beta_var,
-            )
-    else:
-        result = _closed_form_strength(
-            x,
-            y,
-            horizon_days,
-            slope_plateau_threshold,
-            prior_beta_mean=prior_beta_mean,
-            prior_beta_var=prior_beta_var,
-        )
+            return pymc_result
+    return _closed_form_strength(
+        x,
+        y,
+        horizon_days,
+        slope_plateau_threshold,
+        prior_beta_mean=prior_beta_mean,
+        prior_beta_var=prior_beta_var,
+    )
+
 
+def _finalize_strength_result(
+    result: dict[str, Any],
+    dynamics: dict[str, Any],
+    population_prior_meta: dict[str, Any],
+    pooling_meta: dict[str, Any] | None = None,
+) -> dict:
     trend = result.get("trend") or {}
     slope_ci95 = trend.get("slope_ci95")
     if isinstance(slope_ci95, list) and len(slope_ci95) == 2:
@@ -647,9 +878,265 @@ def run_strength_inference(
 
     result["dynamics"] = dynamics
     result["population_prior"] = population_prior_meta
+    result.setdefault("pooling", pooling_meta or {"applied": False})
     return result
 
 
+def run_strength_inference(
+    points: list[tuple[float, float]],
+    *,
+    population_prior: dict[str, Any] | None = None,
+    series_key: str | None = None,
+    engine: str | None = None,
+    pooling: dict[str, Any] | None = None,
+) -> dict:
+    """Run strength inference over (day_offset, estimated_1rm) points.
+
+    ``series_key`` (e.g. "<user_id>:<exercise_id>") lets the PyMC engine
+    warm-start refits of the same series; the result then carries a
+    ``runtime`` block with cache and timing telemetry. ``engine`` overrides
+    KURA_BAYES_ENGINE (e.g. "closed_form" as a compute-timeout fallback).
+    ``pooling`` is the ``pooling`` block of the exercise's last batch fit;
+    the slope prior then follows the user's hierarchical posterior.
+    """
+    prior_beta_mean, prior_beta_var, population_prior_meta = _resolve_strength_beta_prior(
+        population_prior
+    )
+    prior_beta_mean, prior_beta_var, pooling_meta = _resolve_pooled_beta_prior(
+        prior_beta_mean, prior_beta_var, pooling
+    )
+    dynamics = _strength_dynamics(points)
+    if len(points) < 3:
+        return _insufficient_strength_result(
+            points, dynamics, population_prior_meta, pooling_meta
+        )
+
+    horizon_days, slope_plateau_threshold, preferred_engine = _strength_model_settings(engine)
+    result = _fit_strength_series(
+        [p[0] for p in points],
+        [p[1] for p in points],
+        horizon_days=horizon_days,
+        slope_plateau_threshold=slope_plateau_threshold,
+        preferred_engine=preferred_engine,
+        prior_beta_mean=prior_beta_mean,
+        prior_beta_var=prior_beta_var,
+        series_key=series_key,
+    )
+    return _finalize_strength_result(result, dynamics, population_prior_meta, pooling_meta)
+
+
+def run_strength_inference_batch(
+    series: dict[str, list[tuple[float, float]]],
+    *,
+    population_priors: dict[str, dict[str, Any] | None] | None = None,
+    series_key: str | None = None,
+    engine: str | None = None,
+) -> dict[str, dict]:
+    """Run strength inference for many exercises of one user at once.
+
+    Returns the same per-exercise dicts as ``run_strength_inference``. With
+    the PyMC engine and at least two eligible series, all exercises are fit
+    in a single hierarchical model (one compile/tune per user instead of one
+    per exercise, with partial pooling of slopes). Other engines, a single
+    eligible series, or a failed batch fit run per exercise as before.
+    Hierarchical results carry a ``pooling`` block with the batch
+    hyperparameters, which per-event refits pass back to
+    ``run_strength_inference``. ``series_key`` identifies the user's batch for
+    warm starts; ``engine`` overrides KURA_BAYES_ENGINE.
+    """
+    priors = population_priors or {}
+    horizon_days, slope_plateau_threshold, preferred_engine = _strength_model_settings(engine)
+
+    results: dict[str, dict] = {}
+    prepared: dict[str, tuple[dict[str, Any], dict[str, Any], float, float]] = {}
+    for key, points in series.items():
+        prior_beta_mean, prior_beta_var, meta = _resolve_strength_beta_prior(priors.get(key))
+        dynamics = _strength_dynamics(points)
+        if len(points) < 3:
+            results[key] = _insufficient_strength_result(points, dynamics, meta)
+            continue
+        prepared[key] = (dynamics, meta, prior_beta_mean, prior_beta_var)
+
+    fitted: dict[str, dict] | None = None
+    if preferred_engine == "pymc" and len(prepared) >= 2:
+        fitted = _pymc_hierarchical_strength(
+            {
+                key: (
+                    [p[0] for p in series[key]],
+                    [p[1] for p in series[key]],
+                    prior_beta_mean,
+                    prior_beta_var,
+                )
+                for key, (_, _, prior_beta_mean, prior_beta_var) in prepared.items()
+            },
+            horizon_days,
+            slope_plateau_threshold,
+            series_key=series_key,
+        )
+
+    for key, (dynamics, meta, prior_beta_mean, prior_beta_var) in prepared.items():
+        if fitted is not None:
+            result = fitted[key]
+        else:
+            result = _fit_strength_series(
+                [p[0] for p in series[key]],
+                [p[1] for p in series[key]],
+                horizon_days=horizon_days,
+                slope_plateau_threshold=slope_plateau_threshold,
+                preferred_engine=preferred_engine,
+                prior_beta_mean=prior_beta_mean,
+                prior_beta_var=prior_beta_var,
+                series_key=f"{series_key}:{key}" if series_key else None,
+            )
+        results[key] = _finalize_strength_result(result, dynamics, meta)
+    return {key: results[key] for key in series}
+
+
+@dataclass(slots=True)
+class _StrengthReplayState:
+    """Running sufficient statistics of a growing, day-sorted strength series.
+
+    The regression moments use Welford's recurrences (centered sums of
+    squares and the x/y co-moment); the derivative tails keep only the slopes
+    and accelerations the dynamics summary reads.
+    """
+
+    count: int = 0
+    y_sum: float = 0.0
+    x_mean: float = 0.0
+    y_mean: float = 0.0
+    x_m2: float = 0.0
+    y_m2: float = 0.0
+    xy_comoment: float = 0.0
+    last_point: tuple[float, float] | None = None
+    slope_tail: list[float] = field(default_factory=list)
+    slope_midpoint: float = 0.0
+    slope_count: int = 0
+    acceleration_tail: list[float] = field(default_factory=list)
+    acceleration_count: int = 0
+
+    def add(self, x: float, y: float) -> None:
+        if self.last_point is not None:
+            x0, y0 = self.last_point
+            if x < x0:
+                raise ValueError("strength replay points must be sorted by day offset")
+            if x > x0:
+                slope = (y - y0) / (x - x0)
+                midpoint = (x0 + x) / 2.0
+                if self.slope_count and midpoint > self.slope_midpoint:
+                    acceleration = (slope - self.slope_tail[-1]) / (midpoint - self.slope_midpoint)
+                    self.acceleration_tail = [*self.acceleration_tail[-1:], acceleration]
+                    self.acceleration_count += 1
+                self.slope_tail = [*self.slope_tail[-2:], slope]
+                self.slope_midpoint = midpoint
+                self.slope_count += 1
+        self.last_point = (x, y)
+
+        self.count += 1
+        self.y_sum += y
+        dx = x - self.x_mean
+        dy = y - self.y_mean
+        self.x_mean += dx / self.count
+        self.y_mean += dy / self.count
+        self.x_m2 += dx * (x - self.x_mean)
+        self.y_m2 += dy * (y - self.y_mean)
+        self.xy_comoment += dx * (y - self.y_mean)
+
+    def dynamics(self, *, velocity_epsilon: float, acceleration_epsilon: float) -> dict[str, Any]:
+        assert self.last_point is not None
+        return _signal_dynamics_summary(
+            self.last_point[1],
+            self.count,
+            self.slope_tail,
+            self.acceleration_tail,
+            slope_count=self.slope_count,
+            acceleration_count=self.acceleration_count,
+            velocity_epsilon=velocity_epsilon,
+            acceleration_epsilon=acceleration_epsilon,
+        )
+
+    def closed_form(
+        self,
+        horizon_days: float,
+        slope_plateau_threshold: float,
+        *,
+        prior_beta_mean: float,
+        prior_beta_var: float,
+    ) -> dict:
+        assert self.last_point is not None
+        return _closed_form_strength_from_moments(
+            n=self.count,
+            y_sum=self.y_sum,
+            alpha_prior_mean=self.y_sum / self.count,
+            sample_var=self.y_m2 / max(1, self.count - 1),
+            # Centered x sums to zero, so X'y on centered x is the co-moment.
+            x_centered_sum=0.0,
+            x_centered_ss=self.x_m2,
+            x_centered_y=self.xy_comoment,
+            x_last=self.last_point[0] - self.x_mean,
+            horizon_days=horizon_days,
+            slope_plateau_threshold=slope_plateau_threshold,
+            prior_beta_mean=prior_beta_mean,
+            prior_beta_var=prior_beta_var,
+        )
+
+
+def replay_strength_inference(
+    points: list[tuple[float, float]],
+    *,
+    population_prior: dict[str, Any] | None = None,
+    engine: str | None = None,
+) -> Iterator[dict]:
+    """Yield ``run_strength_inference(points[: i + 1])`` for every prefix.
+
+    Instead of refitting each prefix, the replay keeps running sufficient
+    statistics of the regression and the derivative tails, so every prefix
+    costs O(1). ``points`` must be sorted by day offset. Results match the
+    per-prefix closed-form fits up to float rounding of the moment updates.
+    Sampling engines cannot be replayed this way: ``engine`` (or
+    KURA_BAYES_ENGINE) resolving to "pymc" raises ValueError.
+    """
+    prior_beta_mean, prior_beta_var, population_prior_meta = _resolve_strength_beta_prior(
+        population_prior
+    )
+    horizon_days, slope_plateau_threshold, preferred_engine = _strength_model_settings(engine)
+    if preferred_engine == "pymc":
+        raise ValueError("PyMC strength inference cannot be replayed incrementally")
+    velocity_epsilon = float(os.environ.get("KURA_STRENGTH_DERIVATIVE_VELOCITY_EPS", "0.03"))
+    acceleration_epsilon = float(
+        os.environ.get("KURA_STRENGTH_DERIVATIVE_ACCELERATION_EPS", "0.01")
+    )
+
+    state = _StrengthReplayState()
+    for x, y in points:
+        state.add(x, y)
+        dynamics = state.dynamics(
+            velocity_epsilon=velocity_epsilon,
+            acceleration_epsilon=acceleration_epsilon,
+        )
+        if state.count < 3:
+            yield _insufficient_strength_result(
+                points[: state.count], dynamics, dict(population_prior_meta)
+            )
+            continue
+        result = state.closed_form(
+            horizon_days,
+            slope_plateau_threshold,
+            prior_beta_mean=prior_beta_mean,
+            prior_beta_var=prior_beta_var,
+        )
+        if preferred_engine == "hierarchical_bayes":
+            result = _shrink_strength_result(
+                result,
+                state.count,
+                horizon_days,
+                slope_plateau_threshold,
+                prior_beta_mean=prior_beta_mean,
+                prior_beta_var=prior_beta_var,
+            )
+        yield _finalize_strength_result(result, dynamics, dict(population_prior_meta))
+
+
 def run_readiness_inference(
     observations: list[float],
     *,
@@ -68,6 +68,40 @@ NIGHTLY_REFIT_TRIGGER_EVENT_TYPES: tuple[str, ...] = (
     "external.activity_imported",
 )
 
+# Nightly refit watermarks are tracked per family; together the families
+# cover NIGHTLY_REFIT_TRIGGER_EVENT_TYPES exactly.
+NIGHTLY_REFIT_FAMILY_EVENT_TYPES: dict[str, tuple[str, ...]] = {
+    "training": (
+        "set.logged",
+        "session.logged",
+        "set.corrected",
+        "exercise.alias_created",
+        "external.activity_imported",
+    ),
+    "objectives": (
+        "goal.set",
+        "objective.set",
+        "objective.updated",
+        "objective.archived",
+        "advisory.override.recorded",
+    ),
+    "recovery": (
+        "sleep.logged",
+        "soreness.logged",
+        "energy.logged",
+        "recovery.daily_checkin",
+    ),
+    "supplements": (
+        "supplement.regimen.set",
+        "supplement.regimen.paused",
+        "supplement.regimen.resumed",
+        "supplement.regimen.stopped",
+        "supplement.taken",
+        "supplement.skipped",
+        "supplement.logged",
+    ),
+}
+
 CAPABILITY_BACKFILL_TRIGGER_EVENT_TYPES: tuple[str, ...] = (
     "set.logged",
     "session.logged",
@@ -1,9 +1,9 @@
 """Cross-user learning telemetry clustering (2zc.2).
 
 Deterministic pipeline:
-1) read `learning.signal.logged` rows from event store
+1) stream `learning.signal.logged` rows from event store
 2) group by stable `cluster_signature`
-3) aggregate per day/week buckets
+3) aggregate per day/week buckets (per-user capped while streaming)
 4) compute explainable priority score:
    frequency * severity * impact * reproducibility
 5) persist machine-readable cluster artifacts for downstream automation
@@ -11,7 +11,8 @@ Deterministic pipeline:
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 import logging
@@ -22,6 +23,8 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from .utils import PerUserCappedBuckets, iter_server_rows
+
 logger = logging.getLogger(__name__)
 
 _SEVERITY_WEIGHT_BY_SIGNAL: dict[str, float] = {
@@ -320,43 +323,55 @@ def _sample_from_row(
     return sample, None
 
 
+def new_issue_cluster_buckets(
+    settings: IssueClusterSettings,
+) -> PerUserCappedBuckets[LearningSignalSample]:
+    return PerUserCappedBuckets(
+        max_per_user=settings.max_events_per_user_per_bucket,
+        sort_key=lambda item: (item.captured_at, item.event_id),
+        user_key=lambda item: item.pseudonymized_user_id,
+    )
+
+
+def add_issue_cluster_sample(
+    buckets: PerUserCappedBuckets[LearningSignalSample],
+    sample: LearningSignalSample,
+) -> None:
+    for granularity in ("day", "week"):
+        buckets.add(
+            (
+                granularity,
+                _period_key(sample.captured_at, granularity),
+                sample.cluster_signature,
+            ),
+            sample,
+        )
+
+
 def build_issue_clusters(
     samples: list[LearningSignalSample],
     *,
     settings: IssueClusterSettings,
 ) -> tuple[list[dict[str, Any]], dict[str, int]]:
-    grouped: dict[tuple[str, str, str], list[LearningSignalSample]] = defaultdict(list)
+    buckets = new_issue_cluster_buckets(settings)
     for sample in samples:
-        for granularity in ("day", "week"):
-            grouped[
-                (
-                    granularity,
-                    _period_key(sample.captured_at, granularity),
-                    sample.cluster_signature,
-                )
-            ].append(sample)
+        add_issue_cluster_sample(buckets, sample)
+    return build_issue_clusters_from_buckets(buckets, settings=settings)
 
+
+def build_issue_clusters_from_buckets(
+    buckets: PerUserCappedBuckets[LearningSignalSample],
+    *,
+    settings: IssueClusterSettings,
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
     clusters: list[dict[str, Any]] = []
     filtered_min_support = 0
     filtered_unique_users = 0
     dominance_dropped_events = 0
 
-    for key in sorted(grouped.keys()):
+    for key in buckets.groups():
         granularity, period_key, cluster_signature = key
-        bucket = sorted(
-            grouped[key],
-            key=lambda item: (item.captured_at, item.event_id),
-        )
-        per_user_counts: dict[str, int] = {}
-        capped_bucket: list[LearningSignalSample] = []
-        dropped_for_bucket = 0
-        for item in bucket:
-            current = per_user_counts.get(item.pseudonymized_user_id, 0)
-            if current >= settings.max_events_per_user_per_bucket:
-                dropped_for_bucket += 1
-                continue
-            per_user_counts[item.pseudonymized_user_id] = current + 1
-            capped_bucket.append(item)
+        capped_bucket, dropped_for_bucket = buckets.capped(key)
         dominance_dropped_events += dropped_for_bucket
 
         event_count = len(capped_bucket)
@@ -469,7 +484,7 @@ def build_issue_clusters(
         ),
     )
     return clusters, {
-        "groups_total": len(grouped),
+        "groups_total": len(buckets),
         "clusters_written": len(clusters),
         "filtered_min_support": filtered_min_support,
         "filtered_unique_users": filtered_unique_users,
@@ -484,27 +499,26 @@ async def _table_exists(conn: psycopg.AsyncConnection[Any], table_name: str) ->
     return bool(row and row.get("present"))
 
 
-async def _load_learning_signal_rows(
+def _iter_learning_signal_rows(
     conn: psycopg.AsyncConnection[Any], *, window_days: int
-) -> list[dict[str, Any]]:
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT e.id::text AS event_id, e.timestamp, e.data
-            FROM events e
-            WHERE e.event_type = 'learning.signal.logged'
-              AND e.timestamp >= NOW() - make_interval(days => %s)
-              AND NOT EXISTS (
-                  SELECT 1
-                  FROM events r
-                  WHERE r.event_type = 'event.retracted'
-                    AND r.data->>'retracted_event_id' = e.id::text
-              )
-            ORDER BY e.timestamp ASC, e.id ASC
-            """,
-            (window_days,),
-        )
-        return await cur.fetchall()
+) -> AsyncIterator[dict[str, Any]]:
+    return iter_server_rows(
+        conn,
+        """
+        SELECT e.id::text AS event_id, e.timestamp, e.data
+        FROM events e
+        WHERE e.event_type = 'learning.signal.logged'
+          AND e.timestamp >= NOW() - make_interval(days => %s)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM event_retractions r
+              WHERE r.retracted_event_id = e.id
+          )
+        ORDER BY e.timestamp ASC, e.id ASC
+        """,
+        (window_days,),
+        name="issue_clustering_learning_signals",
+    )
 
 
 async def _record_run(
@@ -590,25 +604,28 @@ async def refresh_issue_clusters(
         )
         return summary
 
-    rows = await _load_learning_signal_rows(conn, window_days=settings.window_days)
-    samples: list[LearningSignalSample] = []
+    buckets = new_issue_cluster_buckets(settings)
+    total_signals = 0
+    considered_signals = 0
     filtered_low_confidence = 0
     filtered_invalid_rows = 0
 
-    for row in rows:
+    async for row in _iter_learning_signal_rows(conn, window_days=settings.window_days):
+        total_signals += 1
         sample, reason = _sample_from_row(
             row,
             include_low_confidence=settings.include_low_confidence,
         )
         if sample is not None:
-            samples.append(sample)
+            considered_signals += 1
+            add_issue_cluster_sample(buckets, sample)
             continue
         if reason == "low_confidence_filtered":
             filtered_low_confidence += 1
         else:
             filtered_invalid_rows += 1
 
-    clusters, cluster_stats = build_issue_clusters(samples, settings=settings)
+    clusters, cluster_stats = build_issue_clusters_from_buckets(buckets, settings=settings)
 
     async with conn.cursor() as cur:
         await cur.execute("DELETE FROM learning_issue_clusters")
@@ -642,8 +659,8 @@ async def refresh_issue_clusters(
     summary = {
         "status": "success",
         "window_days": settings.window_days,
-        "total_signals": len(rows),
-        "considered_signals": len(samples),
+        "total_signals": total_signals,
+        "considered_signals": considered_signals,
         "clusters_written": cluster_stats["clusters_written"],
         "filtered_low_confidence": filtered_low_confidence,
         "filtered_invalid_rows": filtered_invalid_rows,
@@ -657,8 +674,8 @@ async def refresh_issue_clusters(
         conn,
         status="success",
         settings=settings,
-        total_signals=len(rows),
-        considered_signals=len(samples),
+        total_signals=total_signals,
+        considered_signals=considered_signals,
         cluster_stats=cluster_stats,
         filtered_low_confidence=filtered_low_confidence,
         filtered_invalid_rows=filtered_invalid_rows,
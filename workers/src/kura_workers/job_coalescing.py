@@ -0,0 +1,102 @@
+"""Coalescing of redundant projection.update jobs inside one claimed batch.
+
+Every event insert enqueues its own projection.update job, so a burst of
+set.logged events (one workout, an import) claims N identical jobs for the
+same user. Almost every projection handler replays the user's full history,
+so N dispatches produce N identical projections. Jobs sharing
+(user_id, event_type, source) collapse into one dispatch at the position of
+the last of them; its payload keeps that job's event_id (the anchor stored
+as last_event_id) and lists every triggering event in ``event_ids`` for the
+few handlers that target specific events.
+
+Retractions and projection rule events are never merged: each one names a
+different target (retracted event, rule) that its handler resolves from
+the single event_id.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+Job = dict[str, Any]
+
+COALESCIBLE_JOB_TYPE = "projection.update"
+NON_COALESCIBLE_EVENT_TYPES: frozenset[str] = frozenset({
+    "event.retracted",
+    "projection_rule.created",
+    "projection_rule.archived",
+})
+
+
+@dataclass
+class CoalescedBatch:
+    """Jobs to dispatch plus the ids absorbed by each surviving job."""
+
+    jobs: list[Job]
+    absorbed: dict[int, list[int]] = field(default_factory=dict)
+
+    @property
+    def jobs_saved(self) -> int:
+        return sum(len(ids) for ids in self.absorbed.values())
+
+
+def payload_event_ids(payload: dict[str, Any]) -> list[str]:
+    """All triggering event ids of a (possibly coalesced) payload, in order."""
+    event_ids = [str(event_id) for event_id in payload.get("event_ids") or [] if event_id]
+    event_id = payload.get("event_id")
+    if event_id and str(event_id) not in event_ids:
+        event_ids.append(str(event_id))
+    return event_ids
+
+
+def _coalesce_key(job: Job) -> tuple[str, str, str] | None:
+    if job.get("job_type") != COALESCIBLE_JOB_TYPE:
+        return None
+    payload = job.get("payload") or {}
+    user_id = job.get("user_id") or payload.get("user_id")
+    event_type = payload.get("event_type")
+    if not user_id or not event_type or not payload.get("event_id"):
+        return None
+    if event_type in NON_COALESCIBLE_EVENT_TYPES:
+        return None
+    return str(user_id), str(event_type), str(payload.get("source") or "")
+
+
+def coalesce_projection_updates(jobs: list[Job]) -> CoalescedBatch:
+    """Collapse same-(user, event_type, source) projection.update jobs.
+
+    Claim order is preserved for every dispatched job; a merged group runs
+    where its last job was claimed, after all of the events it covers.
+    """
+    groups: dict[tuple[str, str, str], list[Job]] = {}
+    for job in jobs:
+        key = _coalesce_key(job)
+        if key is not None:
+            groups.setdefault(key, []).append(job)
+
+    merged: dict[int, Job] = {}
+    absorbed: dict[int, list[int]] = {}
+    skipped: set[int] = set()
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        survivor = group[-1]
+        event_ids: list[str] = []
+        for job in group:
+            for event_id in payload_event_ids(job["payload"]):
+                if event_id not in event_ids:
+                    event_ids.append(event_id)
+        merged[survivor["id"]] = {
+            **survivor,
+            "payload": {**survivor["payload"], "event_ids": event_ids},
+        }
+        absorbed[survivor["id"]] = [job["id"] for job in group[:-1]]
+        skipped.update(job["id"] for job in group[:-1])
+
+    if not absorbed:
+        return CoalescedBatch(jobs=list(jobs))
+    return CoalescedBatch(
+        jobs=[merged.get(job["id"], job) for job in jobs if job["id"] not in skipped],
+        absorbed=absorbed,
+    )
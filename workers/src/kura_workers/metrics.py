@@ -1,36 +1,205 @@
 """In-memory worker metrics.
 
 Asyncio is single-threaded, so plain dicts are safe — no locking needed.
+
+Latencies go into fixed-bucket histograms (one per handler and per job
+type), so memory stays constant no matter how many invocations are
+recorded; percentiles are interpolated from the buckets. ``get_metrics``
+feeds the JSON health payload, ``render_prometheus`` the ``/metrics``
+text exposition.
 """
 
 import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .compute_executor import compute_executor_stats
 
 _start_time = time.monotonic()
 
+# Upper bounds (ms) of the latency buckets; the last bucket is +Inf.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 750.0,
+    1000.0, 2500.0, 5000.0, 10000.0, 30000.0, 60000.0,
+)
+
+# Rows fetched by the handler currently running in this task (see
+# track_rows_loaded); None outside a tracked scope.
+_rows_loaded: ContextVar[list[int] | None] = ContextVar("kura_rows_loaded", default=None)
+
 _metrics: dict = {
     "jobs_processed": 0,
     "jobs_failed": 0,
     "jobs_dead": 0,
+    "lock_contention": 0,
     "handlers": {},
+    "slots": {
+        "batches": 0,
+        "busy_ms": 0.0,
+        "capacity_ms": 0.0,
+    },
+    "queue_wait": {
+        "count": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+    },
+    "coalescing": {
+        "jobs": 0,
+        "handler_invocations_saved": 0,
+    },
+    "job_types": {},
+    "queue_lag": {},
 }
 
+# Optional live source for connection pool stats (set by the Worker on start).
+_pool_stats_source: Callable[[], dict] | None = None
+
+
+def set_pool_stats_source(source: Callable[[], dict] | None) -> None:
+    """Register (or clear) the callable that reports DB pool stats."""
+    global _pool_stats_source
+    _pool_stats_source = source
+
+
+def _new_histogram() -> dict:
+    return {"buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1), "count": 0, "sum_ms": 0.0}
+
+
+def _observe(histogram: dict, value_ms: float) -> None:
+    index = len(LATENCY_BUCKETS_MS)
+    for i, bound in enumerate(LATENCY_BUCKETS_MS):
+        if value_ms <= bound:
+            index = i
+            break
+    histogram["buckets"][index] += 1
+    histogram["count"] += 1
+    histogram["sum_ms"] += value_ms
+
+
+def histogram_quantile(histogram: dict, q: float) -> float:
+    """Estimate the q-quantile (0..1) by linear interpolation within buckets.
+
+    Values in the +Inf bucket are reported as the largest finite bound.
+    """
+    count = histogram["count"]
+    if count == 0:
+        return 0.0
+    rank = q * count
+    cumulative = 0
+    lower = 0.0
+    for i, bucket_count in enumerate(histogram["buckets"]):
+        if i == len(LATENCY_BUCKETS_MS):
+            return LATENCY_BUCKETS_MS[-1]
+        upper = LATENCY_BUCKETS_MS[i]
+        if bucket_count and cumulative + bucket_count >= rank:
+            return lower + (upper - lower) * ((rank - cumulative) / bucket_count)
+        cumulative += bucket_count
+        lower = upper
+    return LATENCY_BUCKETS_MS[-1]
+
+
+def _histogram_summary(histogram: dict) -> dict:
+    count = histogram["count"]
+    return {
+        "count": count,
+        "avg_ms": round(histogram["sum_ms"] / count, 1) if count else 0.0,
+        "p50_ms": round(histogram_quantile(histogram, 0.50), 1),
+        "p95_ms": round(histogram_quantile(histogram, 0.95), 1),
+        "p99_ms": round(histogram_quantile(histogram, 0.99), 1),
+    }
+
+
+@contextmanager
+def track_rows_loaded() -> Iterator[list[int]]:
+    """Count rows fetched in this task while the block runs (``counter[0]``)."""
+    counter = [0]
+    token = _rows_loaded.set(counter)
+    try:
+        yield counter
+    finally:
+        _rows_loaded.reset(token)
+
+
+def count_rows_loaded(rows: int) -> None:
+    """Add fetched rows to the active tracking scope, if any."""
+    counter = _rows_loaded.get()
+    if counter is not None:
+        counter[0] += rows
+
 
-def record_handler_invocation(handler_name: str, duration_ms: float, success: bool) -> None:
-    """Record a single handler invocation with timing."""
+def record_handler_invocation(
+    handler_name: str,
+    duration_ms: float,
+    success: bool,
+    rows_loaded: int = 0,
+) -> None:
+    """Record a single handler invocation with timing and rows fetched."""
     h = _metrics["handlers"].setdefault(handler_name, {
         "invocations": 0,
         "successes": 0,
         "failures": 0,
         "total_duration_ms": 0.0,
+        "rows_loaded": 0,
+        "latency": _new_histogram(),
     })
     h["invocations"] += 1
     h["total_duration_ms"] += duration_ms
+    h["rows_loaded"] += rows_loaded
+    _observe(h["latency"], duration_ms)
     if success:
         h["successes"] += 1
     else:
         h["failures"] += 1
 
 
+def record_job_duration(job_type: str, duration_ms: float) -> None:
+    """Record end-to-end processing time of one job by job_type."""
+    histogram = _metrics["job_types"].setdefault(job_type, _new_histogram())
+    _observe(histogram, duration_ms)
+
+
+def record_queue_lag(job_type: str, lag_ms: float) -> None:
+    """Record claim-time queue lag (now - scheduled_for) of one job.
+
+    ``last_ms`` is a gauge of the most recent claim, ``max_ms`` the worst lag
+    seen since start.
+    """
+    lag = _metrics["queue_lag"].setdefault(job_type, {"last_ms": 0.0, "max_ms": 0.0})
+    lag["last_ms"] = max(lag_ms, 0.0)
+    if lag_ms > lag["max_ms"]:
+        lag["max_ms"] = lag_ms
+
+
+def record_slot_batch(slots: int, wall_ms: float, busy_ms: float) -> None:
+    """Record slot occupancy for one claimed batch (busy vs. slots × wall time)."""
+    s = _metrics["slots"]
+    s["batches"] += 1
+    s["busy_ms"] += busy_ms
+    s["capacity_ms"] += slots * wall_ms
+
+
+def record_queue_wait(wait_ms: float) -> None:
+    """Record how long a claimed job waited for a free slot."""
+    q = _metrics["queue_wait"]
+    q["count"] += 1
+    q["total_ms"] += wait_ms
+    if wait_ms > q["max_ms"]:
+        q["max_ms"] = wait_ms
+
+
+def record_jobs_coalesced(jobs: int, handler_invocations_saved: int) -> None:
+    """Record projection.update jobs absorbed into another job of their batch."""
+    c = _metrics["coalescing"]
+    c["jobs"] += jobs
+    c["handler_invocations_saved"] += handler_invocations_saved
+
+
+def record_lock_contention() -> None:
+    """Record a job that found its user's advisory lock taken (and will retry)."""
+    _metrics["lock_contention"] += 1
+
+
 def record_job_completed() -> None:
     _metrics["jobs_processed"] += 1
 
@@ -45,13 +214,179 @@ def record_job_dead() -> None:
 
 def get_metrics() -> dict:
     """Return a snapshot of current metrics."""
+    slots = _metrics["slots"]
+    queue_wait = _metrics["queue_wait"]
+    db_pool: dict = {}
+    if _pool_stats_source is not None:
+        try:
+            db_pool = dict(_pool_stats_source())
+        except Exception:
+            db_pool = {}
     return {
         "uptime_seconds": round(time.monotonic() - _start_time, 1),
+        # Process-wide: with concurrent slots, CPU cannot be attributed to a
+        # single handler. Compute pool CPU is reported under "compute".
+        "process_cpu_seconds": round(time.process_time(), 3),
         "jobs_processed": _metrics["jobs_processed"],
         "jobs_failed": _metrics["jobs_failed"],
         "jobs_dead": _metrics["jobs_dead"],
+        "lock_contention": _metrics["lock_contention"],
         "handlers": {
-            name: dict(stats)
+            name: {
+                "invocations": stats["invocations"],
+                "successes": stats["successes"],
+                "failures": stats["failures"],
+                "total_duration_ms": stats["total_duration_ms"],
+                "rows_loaded": stats["rows_loaded"],
+                "p50_ms": round(histogram_quantile(stats["latency"], 0.50), 1),
+                "p95_ms": round(histogram_quantile(stats["latency"], 0.95), 1),
+                "p99_ms": round(histogram_quantile(stats["latency"], 0.99), 1),
+            }
             for name, stats in _metrics["handlers"].items()
         },
+        "job_types": {
+            job_type: _histogram_summary(histogram)
+            for job_type, histogram in _metrics["job_types"].items()
+        },
+        "queue_lag": {
+            job_type: {key: round(value, 1) for key, value in lag.items()}
+            for job_type, lag in _metrics["queue_lag"].items()
+        },
+        "slots": {
+            "batches": slots["batches"],
+            "busy_ms": round(slots["busy_ms"], 1),
+            "capacity_ms": round(slots["capacity_ms"], 1),
+            "utilization": (
+                round(slots["busy_ms"] / slots["capacity_ms"], 4)
+                if slots["capacity_ms"] > 0
+                else 0.0
+            ),
+        },
+        "queue_wait": {
+            "count": queue_wait["count"],
+            "avg_ms": (
+                round(queue_wait["total_ms"] / queue_wait["count"], 1)
+                if queue_wait["count"]
+                else 0.0
+            ),
+            "max_ms": round(queue_wait["max_ms"], 1),
+        },
+        "coalescing": dict(_metrics["coalescing"]),
+        "db_pool": db_pool,
+        "compute": compute_executor_stats(),
     }
+
+
+# ---------------------------------------------------------------------------
+# Prometheus text exposition (format 0.0.4)
+# ---------------------------------------------------------------------------
+
+
+def _label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{key}="{_label_value(value)}"' for key, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(round(float(value), 6))
+
+
+def _render_histogram(lines: list[str], name: str, histogram: dict, **labels: str) -> None:
+    cumulative = 0
+    for bound, bucket_count in zip(LATENCY_BUCKETS_MS, histogram["buckets"]):
+        cumulative += bucket_count
+        lines.append(f"{name}_bucket{_labels(**labels, le=_number(bound / 1000.0))} {cumulative}")
+    lines.append(f'{name}_bucket{_labels(**labels, le="+Inf")} {histogram["count"]}')
+    lines.append(f"{name}_sum{_labels(**labels)} {_number(histogram['sum_ms'] / 1000.0)}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram['count']}")
+
+
+def render_prometheus() -> str:
+    """Render current metrics in the Prometheus text exposition format."""
+    snapshot = get_metrics()
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family("kura_worker_uptime_seconds", "gauge", "Seconds since the worker process started.")
+    lines.append(f"kura_worker_uptime_seconds {_number(snapshot['uptime_seconds'])}")
+
+    family("kura_worker_jobs_total", "counter", "Jobs by final outcome.")
+    for outcome, key in (("completed", "jobs_processed"), ("failed", "jobs_failed"), ("dead", "jobs_dead")):
+        lines.append(f"kura_worker_jobs_total{_labels(outcome=outcome)} {snapshot[key]}")
+
+    family("kura_worker_handler_invocations_total", "counter", "Projection handler invocations.")
+    for name, stats in _metrics["handlers"].items():
+        lines.append(
+            f"kura_worker_handler_invocations_total{_labels(handler=name, outcome='success')} "
+            f"{stats['successes']}"
+        )
+        lines.append(
+            f"kura_worker_handler_invocations_total{_labels(handler=name, outcome='failure')} "
+            f"{stats['failures']}"
+        )
+
+    family("kura_worker_lock_contention_total", "counter", "Jobs that found the per-user lock taken.")
+    lines.append(f"kura_worker_lock_contention_total {snapshot['lock_contention']}")
+
+    family("kura_worker_process_cpu_seconds_total", "counter", "CPU time of the worker process (all slots).")
+    lines.append(f"kura_worker_process_cpu_seconds_total {_number(snapshot['process_cpu_seconds'])}")
+
+    family("kura_worker_handler_rows_loaded_total", "counter", "Rows fetched by projection handlers.")
+    for name, stats in _metrics["handlers"].items():
+        lines.append(f"kura_worker_handler_rows_loaded_total{_labels(handler=name)} {stats['rows_loaded']}")
+
+    family("kura_worker_handler_duration_seconds", "histogram", "Projection handler latency.")
+    for name, stats in _metrics["handlers"].items():
+        _render_histogram(lines, "kura_worker_handler_duration_seconds", stats["latency"], handler=name)
+
+    family("kura_worker_job_duration_seconds", "histogram", "Job processing latency by job type.")
+    for job_type, histogram in _metrics["job_types"].items():
+        _render_histogram(lines, "kura_worker_job_duration_seconds", histogram, job_type=job_type)
+
+    family("kura_worker_queue_lag_seconds", "gauge", "Claim time minus scheduled_for of the last claimed job.")
+    for job_type, lag in _metrics["queue_lag"].items():
+        lines.append(f"kura_worker_queue_lag_seconds{_labels(job_type=job_type)} {_number(lag['last_ms'] / 1000.0)}")
+
+    family("kura_worker_queue_lag_max_seconds", "gauge", "Largest claim-time queue lag since start.")
+    for job_type, lag in _metrics["queue_lag"].items():
+        lines.append(f"kura_worker_queue_lag_max_seconds{_labels(job_type=job_type)} {_number(lag['max_ms'] / 1000.0)}")
+
+    family("kura_worker_coalesced_jobs_total", "counter", "projection.update jobs absorbed by coalescing.")
+    lines.append(f"kura_worker_coalesced_jobs_total {snapshot['coalescing']['jobs']}")
+    family(
+        "kura_worker_coalesced_handler_invocations_saved_total",
+        "counter",
+        "Handler invocations avoided by coalescing.",
+    )
+    lines.append(
+        "kura_worker_coalesced_handler_invocations_saved_total "
+        f"{snapshot['coalescing']['handler_invocations_saved']}"
+    )
+
+    family("kura_worker_slot_utilization", "gauge", "Busy share of concurrency slot capacity.")
+    lines.append(f"kura_worker_slot_utilization {_number(snapshot['slots']['utilization'])}")
+
+    family("kura_worker_db_pool", "gauge", "Connection pool statistics.")
+    for stat, value in sorted(snapshot["db_pool"].items()):
+        if isinstance(value, (int, float)):
+            lines.append(f"kura_worker_db_pool{_labels(stat=stat)} {_number(value)}")
+
+    family("kura_worker_compute_tasks_total", "counter", "Compute pool task outcomes.")
+    for stat, value in sorted(snapshot["compute"].items()):
+        if isinstance(value, int) and not isinstance(value, bool):
+            lines.append(f"kura_worker_compute_tasks_total{_labels(outcome=stat)} {value}")
+    family("kura_worker_compute_cpu_seconds_total", "counter", "CPU time of tasks run in the compute pool.")
+    lines.append(f"kura_worker_compute_cpu_seconds_total {_number(snapshot['compute']['cpu_seconds'])}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,454 @@
+"""Stage DAG for the nightly inference maintenance run.
+
+inference.nightly_refit plans a run: one row per stage shard in
+`inference_nightly_stage_shards`. Per-user stages are split into contiguous
+user-id ranges; all other stages have a single shard. Every shard runs as its
+own inference.nightly_stage job, so independent stages run in parallel on
+whichever workers claim them, and a stage's shards are enqueued only once all
+of its dependencies are finished.
+
+Shard state moves waiting -> queued -> completed | failed. Finished shards are
+never re-run: when a shard job dies, the scheduler re-queues just the
+unfinished shards of the same run (bounded by MAX_SHARD_ATTEMPTS). Planning a
+run also deletes the shard rows of runs older than the retention window.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg.types.json import Json
+
+logger = logging.getLogger(__name__)
+
+NIGHTLY_STAGE_JOB_TYPE = "inference.nightly_stage"
+MAX_SHARD_ATTEMPTS = 3
+
+SHARD_WAITING = "waiting"
+SHARD_QUEUED = "queued"
+SHARD_COMPLETED = "completed"
+SHARD_FAILED = "failed"
+_FINISHED = frozenset({SHARD_COMPLETED, SHARD_FAILED})
+
+
+@dataclass(frozen=True)
+class NightlyStage:
+    name: str
+    depends_on: tuple[str, ...] = ()
+    sharded: bool = False
+
+
+NIGHTLY_STAGES: tuple[NightlyStage, ...] = (
+    NightlyStage("population_priors"),
+    # Needs the refreshed priors to know which users' priors changed.
+    NightlyStage("refit_enqueue", depends_on=("population_priors",), sharded=True),
+    NightlyStage("issue_clusters"),
+    NightlyStage("extraction_calibration"),
+    NightlyStage("unknown_dimensions"),
+    NightlyStage(
+        "learning_backlog",
+        depends_on=("issue_clusters", "extraction_calibration", "unknown_dimensions"),
+    ),
+    NightlyStage("consistency_inbox", sharded=True),
+)
+NIGHTLY_STAGE_BY_NAME: dict[str, NightlyStage] = {stage.name: stage for stage in NIGHTLY_STAGES}
+
+
+def nightly_shard_user_count() -> int:
+    raw = os.environ.get("KURA_NIGHTLY_SHARD_USERS", "500")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 500
+
+
+def nightly_run_retention_days() -> int:
+    raw = os.environ.get("KURA_NIGHTLY_RUN_RETENTION_DAYS", "14")
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 14
+
+
+def user_range_bounds(
+    user_ids: list[str],
+    users_per_shard: int,
+) -> list[tuple[str | None, str | None]]:
+    """Contiguous [from, to) ranges over sorted user ids, open at both ends.
+
+    Open outer bounds make the shards cover the whole id space, so users that
+    appear after planning still fall into exactly one shard.
+    """
+    starts = user_ids[users_per_shard::users_per_shard] if users_per_shard > 0 else []
+    lowers: list[str | None] = [None, *starts]
+    uppers: list[str | None] = [*starts, None]
+    return list(zip(lowers, uppers))
+
+
+@dataclass
+class NightlyRunProgress:
+    stages: dict[str, dict[str, Any]] = field(default_factory=dict)
+    enqueued: int = 0
+    active: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.stages) and all(
+            rollup["status"] in _FINISHED for rollup in self.stages.values()
+        )
+
+    @property
+    def failed_stages(self) -> list[str]:
+        return [name for name, rollup in self.stages.items() if rollup["status"] == SHARD_FAILED]
+
+
+def stage_rollup(shards: list[dict[str, Any]]) -> dict[str, Any]:
+    """Status, shard counts and durations of one stage from its shard rows."""
+    statuses = [str(shard["status"]) for shard in shards]
+    completed = statuses.count(SHARD_COMPLETED)
+    failed = statuses.count(SHARD_FAILED)
+    if completed + failed == len(statuses):
+        status = SHARD_FAILED if failed else SHARD_COMPLETED
+    elif all(value == SHARD_WAITING for value in statuses):
+        status = SHARD_WAITING
+    else:
+        status = "running"
+
+    started = [shard["started_at"] for shard in shards if shard.get("started_at") is not None]
+    ended = [shard["completed_at"] for shard in shards if shard.get("completed_at") is not None]
+    rollup: dict[str, Any] = {
+        "status": status,
+        "shards": len(statuses),
+        "shards_completed": completed,
+        "shards_failed": failed,
+        "duration_ms": round(sum(float(shard.get("duration_ms") or 0.0) for shard in shards), 3),
+    }
+    if status in _FINISHED and started and ended:
+        rollup["wall_ms"] = round((max(ended) - min(started)).total_seconds() * 1000, 3)
+    return rollup
+
+
+def ready_stages(rollups: dict[str, dict[str, Any]]) -> list[str]:
+    """Stages with waiting shards whose dependencies are all finished."""
+    return [
+        stage.name
+        for stage in NIGHTLY_STAGES
+        if rollups.get(stage.name, {}).get("status") == SHARD_WAITING
+        and all(rollups.get(dep, {}).get("status") in _FINISHED for dep in stage.depends_on)
+    ]
+
+
+async def event_user_ids(conn: psycopg.AsyncConnection[Any]) -> list[str]:
+    """Distinct event owners via a loose index scan on events(user_id, ...)."""
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            WITH RECURSIVE event_users AS (
+                (SELECT user_id FROM events ORDER BY user_id LIMIT 1)
+                UNION ALL
+                SELECT (
+                    SELECT e.user_id
+                    FROM events e
+                    WHERE e.user_id > event_users.user_id
+                    ORDER BY e.user_id
+                    LIMIT 1
+                )
+                FROM event_users
+                WHERE event_users.user_id IS NOT NULL
+            )
+            SELECT user_id::text AS user_id
+            FROM event_users
+            WHERE user_id IS NOT NULL
+            """
+        )
+        rows = await cur.fetchall()
+    return [str(row["user_id"]) for row in rows]
+
+
+async def prune_nightly_runs(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    keep_run_id: str,
+) -> int:
+    """Delete shard rows of runs past the retention window (never ``keep_run_id``)."""
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            DELETE FROM inference_nightly_stage_shards
+            WHERE created_at < NOW() - make_interval(days => %s)
+              AND run_id <> %s
+            """,
+            (nightly_run_retention_days(), keep_run_id),
+        )
+        return cur.rowcount
+
+
+async def plan_nightly_run(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    run_id: str,
+    user_ids: list[str],
+) -> int:
+    """Create the shard rows of a run. Idempotent: re-planning keeps progress."""
+    if not user_ids:
+        return 0
+    pruned = await prune_nightly_runs(conn, keep_run_id=run_id)
+    if pruned:
+        logger.info("Pruned %d nightly stage shard rows past retention", pruned)
+    bounds = user_range_bounds(user_ids, nightly_shard_user_count())
+    rows: list[tuple[Any, ...]] = []
+    lane = 0
+    for stage in NIGHTLY_STAGES:
+        stage_bounds = bounds if stage.sharded else [(None, None)]
+        for shard, (user_id_from, user_id_to) in enumerate(stage_bounds):
+            # Sharded stages run under their range's first user; single-shard
+            # stages are spread round-robin so they land in different lanes.
+            if stage.sharded:
+                lane_user_id = user_id_from or user_ids[0]
+            else:
+                lane_user_id = user_ids[lane % len(user_ids)]
+                lane += 1
+            rows.append(
+                (
+                    stage.name,
+                    shard,
+                    len(stage_bounds),
+                    user_id_from,
+                    user_id_to,
+                    lane_user_id,
+                )
+            )
+
+    stages, shards, shard_counts, froms, tos, lanes = (list(column) for column in zip(*rows))
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO inference_nightly_stage_shards (
+                run_id, stage, shard, shard_count, user_id_from, user_id_to, lane_user_id
+            )
+            SELECT %s, s.stage, s.shard, s.shard_count, s.user_id_from, s.user_id_to,
+                   s.lane_user_id
+            FROM unnest(
+                %s::text[], %s::int[], %s::int[], %s::uuid[], %s::uuid[], %s::uuid[]
+            ) AS s(stage, shard, shard_count, user_id_from, user_id_to, lane_user_id)
+            ON CONFLICT (run_id, stage, shard) DO NOTHING
+            """,
+            (run_id, stages, shards, shard_counts, froms, tos, lanes),
+        )
+    return len(rows)
+
+
+async def _lock_run(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    run_id: str,
+    scheduler_key: str,
+) -> None:
+    # Scheduler row first, like the scheduler tick, then the run itself so
+    # shards finishing concurrently advance the run one at a time.
+    async with conn.cursor() as cur:
+        if scheduler_key:
+            await cur.execute(
+                "SELECT 1 FROM inference_scheduler_state WHERE scheduler_key = %s FOR UPDATE",
+                (scheduler_key,),
+            )
+        await cur.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(%s)::bigint)",
+            (f"kura:nightly_run:{run_id}",),
+        )
+
+
+async def _load_shards(
+    conn: psycopg.AsyncConnection[Any],
+    run_id: str,
+) -> list[dict[str, Any]]:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT s.stage, s.shard, s.status, s.attempts, s.lane_user_id::text AS lane_user_id,
+                   s.started_at, s.completed_at, s.duration_ms, s.summary,
+                   j.status AS job_status
+            FROM inference_nightly_stage_shards s
+            LEFT JOIN background_jobs j ON j.id = s.job_id
+            WHERE s.run_id = %s
+            ORDER BY s.stage, s.shard
+            """,
+            (run_id,),
+        )
+        return await cur.fetchall()
+
+
+async def _enqueue_shard(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    run_id: str,
+    scheduler_key: str,
+    shard: dict[str, Any],
+) -> None:
+    payload: dict[str, Any] = {
+        "run_id": run_id,
+        "stage": shard["stage"],
+        "shard": int(shard["shard"]),
+    }
+    if scheduler_key:
+        payload["scheduler_key"] = scheduler_key
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            INSERT INTO background_jobs (user_id, job_type, payload, scheduled_for)
+            VALUES (%s, %s, %s, NOW())
+            RETURNING id
+            """,
+            (shard["lane_user_id"], NIGHTLY_STAGE_JOB_TYPE, Json(payload)),
+        )
+        job = await cur.fetchone()
+        await cur.execute(
+            """
+            UPDATE inference_nightly_stage_shards
+            SET status = 'queued',
+                job_id = %s,
+                attempts = attempts + 1
+            WHERE run_id = %s AND stage = %s AND shard = %s
+            """,
+            (job["id"], run_id, shard["stage"], shard["shard"]),
+        )
+    shard["status"] = SHARD_QUEUED
+    shard["job_status"] = "pending"
+    shard["attempts"] = int(shard["attempts"]) + 1
+
+
+async def _fail_shard(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    run_id: str,
+    shard: dict[str, Any],
+    error: str,
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            UPDATE inference_nightly_stage_shards
+            SET status = 'failed',
+                completed_at = NOW(),
+                summary = %s
+            WHERE run_id = %s AND stage = %s AND shard = %s
+            """,
+            (Json({"error": error}), run_id, shard["stage"], shard["shard"]),
+        )
+    shard["status"] = SHARD_FAILED
+
+
+async def complete_shard(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    run_id: str,
+    stage: str,
+    shard: int,
+    status: str,
+    started_at: Any,
+    duration_ms: float,
+    summary: dict[str, Any],
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            UPDATE inference_nightly_stage_shards
+            SET status = %s,
+                started_at = %s,
+                completed_at = NOW(),
+                duration_ms = %s,
+                summary = %s
+            WHERE run_id = %s AND stage = %s AND shard = %s
+            """,
+            (
+                status,
+                started_at,
+                duration_ms,
+                Json(summary, dumps=lambda value: json.dumps(value, default=str)),
+                run_id,
+                stage,
+                shard,
+            ),
+        )
+
+
+async def advance_nightly_run(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    run_id: str,
+    scheduler_key: str = "",
+    resume: bool = False,
+) -> NightlyRunProgress:
+    """Enqueue shards of newly ready stages and publish the stage rollup.
+
+    With ``resume``, queued shards whose job is gone or dead are re-queued
+    (or failed once MAX_SHARD_ATTEMPTS is reached) — the scheduler uses this
+    to continue a run after a worker crash.
+    """
+    await _lock_run(conn, run_id=run_id, scheduler_key=scheduler_key)
+    shards = await _load_shards(conn, run_id)
+    progress = NightlyRunProgress()
+    if not shards:
+        return progress
+
+    if resume:
+        for shard in shards:
+            if shard["status"] != SHARD_QUEUED or shard["job_status"] in ("pending", "processing"):
+                continue
+            if int(shard["attempts"]) < MAX_SHARD_ATTEMPTS:
+                await _enqueue_shard(conn, run_id=run_id, scheduler_key=scheduler_key, shard=shard)
+                progress.enqueued += 1
+            else:
+                await _fail_shard(
+                    conn,
+                    run_id=run_id,
+                    shard=shard,
+                    error=f"stage job lost after {shard['attempts']} attempts",
+                )
+
+    by_stage: dict[str, list[dict[str, Any]]] = {}
+    for shard in shards:
+        by_stage.setdefault(str(shard["stage"]), []).append(shard)
+
+    rollups = {name: stage_rollup(rows) for name, rows in by_stage.items()}
+    ready = ready_stages(rollups)
+    for name in ready:
+        for shard in by_stage[name]:
+            await _enqueue_shard(conn, run_id=run_id, scheduler_key=scheduler_key, shard=shard)
+            progress.enqueued += 1
+    if ready:
+        rollups = {name: stage_rollup(rows) for name, rows in by_stage.items()}
+
+    progress.stages = {
+        stage.name: rollups[stage.name] for stage in NIGHTLY_STAGES if stage.name in rollups
+    }
+    progress.active = sum(
+        1
+        for shard in shards
+        if shard["status"] == SHARD_QUEUED and shard["job_status"] in ("pending", "processing")
+    )
+
+    if scheduler_key:
+        enqueued_updates = sum(
+            int((shard.get("summary") or {}).get("enqueued") or 0)
+            for shard in by_stage.get("refit_enqueue", [])
+        )
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                UPDATE inference_scheduler_state
+                SET last_run_stages = %s,
+                    last_enqueued_projection_updates = %s,
+                    updated_at = NOW()
+                WHERE scheduler_key = %s
+                  AND current_run_id = %s
+                """,
+                (Json(progress.stages), enqueued_updates, scheduler_key, run_id),
+            )
+    return progress
@@ -6,14 +6,23 @@ can then optionally blend local priors with cohort-level priors.
 
 Strict separation:
 - No user identifiers are stored in population prior artifacts.
-- Only aggregated cohort statistics are persisted.
+- Only aggregated cohort statistics are published.
+
+Refreshes are incremental: each user's samples are kept as mergeable
+sufficient statistics (`CohortStats`) in the worker-only
+`population_prior_contributions` table, so only users whose source
+projections changed are recomputed and only the affected prior groups are
+re-merged and upserted.
 """
 
 from __future__ import annotations
 
+import json
 import logging
 import math
 import os
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
@@ -21,6 +30,8 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from .utils import iter_server_rows
+
 logger = logging.getLogger(__name__)
 
 POPULATION_OPT_IN_KEY = "population_priors_opt_in"
@@ -135,6 +146,120 @@ def _weighted_stats(values: list[float], weights: list[float]) -> tuple[float, f
     return mean, max(1e-6, var)
 
 
+def _merge_moments(
+    weight_a: float,
+    mean_a: float,
+    m2_a: float,
+    weight_b: float,
+    mean_b: float,
+    m2_b: float,
+) -> tuple[float, float]:
+    total = weight_a + weight_b
+    if total <= 0.0:
+        return mean_a, m2_a + m2_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (weight_b / total)
+    m2 = m2_a + m2_b + delta * delta * (weight_a * weight_b / total)
+    return mean, m2
+
+
+@dataclass(frozen=True)
+class CohortStats:
+    """Mergeable sufficient statistics of one prior group.
+
+    Holds the weighted count, mean and M2 (sum of weighted squared
+    deviations) so per-user contributions combine with the parallel
+    variance update instead of a pass over every sample. The unweighted
+    moments back the equal-weight fallback of `_weighted_stats` for groups
+    whose weights are all zero.
+    """
+
+    participants: int
+    sample_size: int
+    weight_sum: float
+    mean: float
+    m2: float
+    count_mean: float
+    count_m2: float
+    min_value: float
+    max_value: float
+    # Weighted sum of per-sample within-effect variances (causal priors).
+    within_var_sum: float = 0.0
+    estimand: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_samples(
+        cls,
+        values: list[float],
+        weights: list[float],
+        *,
+        within_vars: list[float] | None = None,
+        estimand: dict[str, Any] | None = None,
+    ) -> CohortStats:
+        if not values:
+            raise ValueError("Cannot compute stats on empty value list")
+        if len(values) != len(weights):
+            raise ValueError("Values and weights must have same length")
+        safe_weights = [max(0.0, w) for w in weights]
+        weight_sum = sum(safe_weights)
+        mean = (
+            sum(v * w for v, w in zip(values, safe_weights)) / weight_sum
+            if weight_sum > 0.0
+            else 0.0
+        )
+        count_mean = sum(values) / float(len(values))
+        return cls(
+            participants=1,
+            sample_size=len(values),
+            weight_sum=weight_sum,
+            mean=mean,
+            m2=sum(w * ((v - mean) ** 2) for v, w in zip(values, safe_weights)),
+            count_mean=count_mean,
+            count_m2=sum((v - count_mean) ** 2 for v in values),
+            min_value=min(values),
+            max_value=max(values),
+            within_var_sum=sum(
+                w * max(1e-6, variance)
+                for w, variance in zip(safe_weights, within_vars or [])
+            ),
+            estimand=dict(estimand or {}),
+        )
+
+    def merge(self, other: CohortStats) -> CohortStats:
+        mean, m2 = _merge_moments(
+            self.weight_sum, self.mean, self.m2, other.weight_sum, other.mean, other.m2
+        )
+        count_mean, count_m2 = _merge_moments(
+            float(self.sample_size),
+            self.count_mean,
+            self.count_m2,
+            float(other.sample_size),
+            other.count_mean,
+            other.count_m2,
+        )
+        return CohortStats(
+            participants=self.participants + other.participants,
+            sample_size=self.sample_size + other.sample_size,
+            weight_sum=self.weight_sum + other.weight_sum,
+            mean=mean,
+            m2=m2,
+            count_mean=count_mean,
+            count_m2=count_m2,
+            min_value=min(self.min_value, other.min_value),
+            max_value=max(self.max_value, other.max_value),
+            within_var_sum=self.within_var_sum + other.within_var_sum,
+            estimand=self.estimand or other.estimand,
+        )
+
+    def mean_var(self) -> tuple[float, float]:
+        """Same result as `_weighted_stats` over the merged samples."""
+        if self.weight_sum > 0.0:
+            mean, var = self.mean, self.m2 / self.weight_sum
+        else:
+            mean, var = self.count_mean, self.count_m2 / float(self.sample_size)
+        return mean, max(1e-6, var)
+
+
 def _objective_mode_from_user_profile(data: dict[str, Any] | None) -> str:
     if not isinstance(data, dict):
         return "unknown"
@@ -255,14 +380,21 @@ async def _safe_record_refresh_run(
         logger.warning("Population prior refresh run telemetry skipped: %s", exc)
 
 
-async def _global_retracted_event_ids(conn: psycopg.AsyncConnection[Any]) -> set[str]:
+async def _global_retracted_event_ids(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    user_id_from: str | None = None,
+    user_id_to: str | None = None,
+) -> set[str]:
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT data->>'retracted_event_id' AS retracted_id
-            FROM events
-            WHERE event_type = 'event.retracted'
+            SELECT retracted_event_id::text AS retracted_id
+            FROM event_retractions
+            WHERE (%s::uuid IS NULL OR user_id >= %s::uuid)
+              AND (%s::uuid IS NULL OR user_id < %s::uuid)
             """,
+            (user_id_from, user_id_from, user_id_to, user_id_to),
         )
         rows = await cur.fetchall()
     return {str(r["retracted_id"]) for r in rows if r.get("retracted_id")}
@@ -272,6 +404,8 @@ async def _load_opted_in_users(
     conn: psycopg.AsyncConnection[Any],
     *,
     retracted_event_ids: set[str],
+    user_id_from: str | None = None,
+    user_id_to: str | None = None,
 ) -> set[str]:
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
@@ -280,9 +414,11 @@ async def _load_opted_in_users(
             FROM events
             WHERE event_type = 'preference.set'
               AND lower(trim(data->>'key')) = %s
+              AND (%s::uuid IS NULL OR user_id >= %s::uuid)
+              AND (%s::uuid IS NULL OR user_id < %s::uuid)
             ORDER BY timestamp ASC, id ASC
             """,
-            (POPULATION_OPT_IN_KEY,),
+            (POPULATION_OPT_IN_KEY, user_id_from, user_id_from, user_id_to, user_id_to),
         )
         rows = await cur.fetchall()
 
@@ -396,222 +532,279 @@ def _add_aggregate_sample(
     bucket["weights"].append(max(0.0, weight))
 
 
-async def _load_strength_projection_rows(
+async def _iter_strength_projection_rows(
     conn: psycopg.AsyncConnection[Any],
     *,
     user_ids: list[str],
     window_days: int,
-) -> list[dict[str, Any]]:
+) -> AsyncIterator[dict[str, Any]]:
     if not user_ids:
-        return []
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT user_id::text AS user_id, key, data
-            FROM projections
-            WHERE projection_type = 'strength_inference'
-              AND user_id::text = ANY(%s)
-              AND updated_at >= NOW() - make_interval(days => %s)
-            """,
-            (user_ids, window_days),
-        )
-        return await cur.fetchall()
-
-
-async def _load_readiness_projection_rows(
+        return
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT user_id::text AS user_id, key, data
+        FROM projections
+        WHERE projection_type = 'strength_inference'
+          AND user_id::text = ANY(%s)
+          AND updated_at >= NOW() - make_interval(days => %s)
+        """,
+        (user_ids, window_days),
+        name="population_priors_strength",
+    ):
+        yield row
+
+
+async def _iter_readiness_projection_rows(
     conn: psycopg.AsyncConnection[Any],
     *,
     user_ids: list[str],
     window_days: int,
-) -> list[dict[str, Any]]:
+) -> AsyncIterator[dict[str, Any]]:
     if not user_ids:
-        return []
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT user_id::text AS user_id, key, data
-            FROM projections
-            WHERE projection_type = 'readiness_inference'
-              AND key = %s
-              AND user_id::text = ANY(%s)
-              AND updated_at >= NOW() - make_interval(days => %s)
-            """,
-            (READINESS_TARGET_KEY, user_ids, window_days),
-        )
-        return await cur.fetchall()
-
-
-async def _load_causal_projection_rows(
+        return
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT user_id::text AS user_id, key, data
+        FROM projections
+        WHERE projection_type = 'readiness_inference'
+          AND key = %s
+          AND user_id::text = ANY(%s)
+          AND updated_at >= NOW() - make_interval(days => %s)
+        """,
+        (READINESS_TARGET_KEY, user_ids, window_days),
+        name="population_priors_readiness",
+    ):
+        yield row
+
+
+async def _iter_causal_projection_rows(
     conn: psycopg.AsyncConnection[Any],
     *,
     user_ids: list[str],
     window_days: int,
-) -> list[dict[str, Any]]:
+) -> AsyncIterator[dict[str, Any]]:
     if not user_ids:
-        return []
+        return
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT user_id::text AS user_id, key, data
+        FROM projections
+        WHERE projection_type = 'causal_inference'
+          AND key = 'overview'
+          AND user_id::text = ANY(%s)
+          AND updated_at >= NOW() - make_interval(days => %s)
+        """,
+        (user_ids, window_days),
+        name="population_priors_causal",
+    ):
+        yield row
+
+
+async def _load_existing_prior_rows(
+    conn: psycopg.AsyncConnection[Any],
+) -> dict[tuple[str, str, str], tuple[Any, ...]]:
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT user_id::text AS user_id, key, data
-            FROM projections
-            WHERE projection_type = 'causal_inference'
-              AND key = 'overview'
-              AND user_id::text = ANY(%s)
-              AND updated_at >= NOW() - make_interval(days => %s)
-            """,
-            (user_ids, window_days),
+            SELECT projection_type, target_key, cohort_key, prior_payload,
+                   participants_count, sample_size, min_cohort_size, source_window_days
+            FROM population_prior_profiles
+            """
         )
-        return await cur.fetchall()
+        rows = await cur.fetchall()
+    return {
+        (str(row["projection_type"]), str(row["target_key"]), str(row["cohort_key"])): (
+            _prior_row_signature(row)
+        )
+        for row in rows
+    }
 
 
-def _build_strength_prior_rows(
-    rows: list[dict[str, Any]],
+def _prior_row_signature(row: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        row.get("prior_payload"),
+        int(row.get("participants_count") or 0),
+        int(row.get("sample_size") or 0),
+        int(row.get("min_cohort_size") or 0),
+        int(row.get("source_window_days") or 0),
+    )
+
+
+def _prior_identity(row: dict[str, Any]) -> tuple[str, str, str]:
+    return (str(row["projection_type"]), str(row["target_key"]), str(row["cohort_key"]))
+
+
+def _diff_prior_rows(
+    previous: dict[tuple[str, str, str], tuple[Any, ...]],
+    prior_rows: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[tuple[str, str, str]]]:
+    """Rows to upsert (added or changed) and identities to delete."""
+    current = {_prior_identity(row): row for row in prior_rows}
+    upserts = [
+        row
+        for identity, row in current.items()
+        if previous.get(identity) != _prior_row_signature(row)
+    ]
+    deletes = sorted(identity for identity in previous if identity not in current)
+    return upserts, deletes
+
+
+def _changed_cohort_keys(
+    previous: dict[tuple[str, str, str], tuple[Any, ...]],
+    prior_rows: list[dict[str, Any]],
+) -> set[str]:
+    """Cohort keys with at least one prior added, removed or changed."""
+    upserts, deletes = _diff_prior_rows(previous, prior_rows)
+    return {row["cohort_key"] for row in upserts} | {identity[2] for identity in deletes}
+
+
+def _users_affected_by_cohorts(
     cohort_by_user: dict[str, str],
-    *,
-    min_cohort_size: int,
-    window_days: int,
-) -> list[dict[str, Any]]:
-    groups: dict[tuple[str, str], dict[str, Any]] = {}
+    changed_cohort_keys: set[str],
+) -> list[str]:
+    """Users whose prior lookup path (cohort variants) touches a changed cohort."""
+    if not changed_cohort_keys:
+        return []
+    return sorted(
+        user_id
+        for user_id, cohort_key in cohort_by_user.items()
+        if not changed_cohort_keys.isdisjoint(_cohort_key_variants(cohort_key))
+    )
 
-    for row in rows:
-        user_id = str(row.get("user_id") or "")
-        data = row.get("data")
-        if not isinstance(data, dict):
-            continue
-        if bool((data.get("data_quality") or {}).get("insufficient_data")):
-            continue
 
-        slope = _as_float((data.get("trend") or {}).get("slope_kg_per_day"))
-        if slope is None:
-            continue
+async def users_affected_by_prior_change(
+    conn: psycopg.AsyncConnection[Any],
+    changed_cohort_keys: list[str],
+    *,
+    user_id_from: str | None = None,
+    user_id_to: str | None = None,
+) -> list[str]:
+    """Opted-in users in [user_id_from, user_id_to) whose priors changed."""
+    if not changed_cohort_keys:
+        return []
+    retracted_ids = await _global_retracted_event_ids(
+        conn, user_id_from=user_id_from, user_id_to=user_id_to
+    )
+    opted_in_users = await _load_opted_in_users(
+        conn,
+        retracted_event_ids=retracted_ids,
+        user_id_from=user_id_from,
+        user_id_to=user_id_to,
+    )
+    cohort_by_user = await _load_user_cohorts(conn, sorted(opted_in_users))
+    return _users_affected_by_cohorts(cohort_by_user, set(changed_cohort_keys))
 
-        confidence = _as_float(
-            ((data.get("dynamics") or {}).get("estimated_1rm") or {}).get("confidence")
-        )
-        if confidence is None:
-            confidence = 0.5
-
-        cohort_key = cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2)
-        target_key = _normalize(row.get("key"))
-        for cohort_variant in _cohort_key_variants(cohort_key):
-            _add_aggregate_sample(
-                groups,
-                cohort_key=cohort_variant,
-                target_key=target_key,
-                user_id=user_id,
-                value=slope,
-                weight=confidence,
-            )
-            _add_aggregate_sample(
-                groups,
-                cohort_key=cohort_variant,
-                target_key=STRENGTH_FALLBACK_TARGET_KEY,
-                user_id=user_id,
-                value=slope,
-                weight=confidence,
-            )
 
-    out: list[dict[str, Any]] = []
-    for (cohort_key, target_key), bucket in groups.items():
-        participants_count = len(bucket["users"])
-        sample_size = len(bucket["values"])
-        if participants_count < min_cohort_size or sample_size < min_cohort_size:
-            continue
+def _add_strength_projection_row(
+    groups: dict[tuple[str, str], dict[str, Any]],
+    row: dict[str, Any],
+    cohort_by_user: dict[str, str],
+) -> None:
+    user_id = str(row.get("user_id") or "")
+    data = row.get("data")
+    if not isinstance(data, dict):
+        return
+    if bool((data.get("data_quality") or {}).get("insufficient_data")):
+        return
 
-        mean, var = _weighted_stats(bucket["values"], bucket["weights"])
-        prior_payload = {
-            "parameter": "slope_kg_per_day",
-            "mean": round(mean, 8),
-            "var": round(var, 8),
-            "std": round(math.sqrt(var), 8),
-            "min": round(min(bucket["values"]), 8),
-            "max": round(max(bucket["values"]), 8),
-            "privacy_gate_passed": True,
-        }
+    slope = _as_float((data.get("trend") or {}).get("slope_kg_per_day"))
+    if slope is None:
+        return
 
-        out.append(
-            {
-                "projection_type": "strength_inference",
-                "target_key": target_key,
-                "cohort_key": cohort_key,
-                "prior_payload": prior_payload,
-                "participants_count": participants_count,
-                "sample_size": sample_size,
-                "min_cohort_size": min_cohort_size,
-                "source_window_days": window_days,
-            }
+    confidence = _as_float(
+        ((data.get("dynamics") or {}).get("estimated_1rm") or {}).get("confidence")
+    )
+    if confidence is None:
+        confidence = 0.5
+
+    cohort_key = cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2)
+    target_key = _normalize(row.get("key"))
+    for cohort_variant in _cohort_key_variants(cohort_key):
+        _add_aggregate_sample(
+            groups,
+            cohort_key=cohort_variant,
+            target_key=target_key,
+            user_id=user_id,
+            value=slope,
+            weight=confidence,
+        )
+        _add_aggregate_sample(
+            groups,
+            cohort_key=cohort_variant,
+            target_key=STRENGTH_FALLBACK_TARGET_KEY,
+            user_id=user_id,
+            value=slope,
+            weight=confidence,
         )
-
-    return out
 
 
-def _build_readiness_prior_rows(
+def _build_strength_prior_rows(
     rows: list[dict[str, Any]],
     cohort_by_user: dict[str, str],
     *,
     min_cohort_size: int,
     window_days: int,
 ) -> list[dict[str, Any]]:
-    groups: dict[tuple[str, str], dict[str, Any]] = {}
-
-    for row in rows:
-        user_id = str(row.get("user_id") or "")
-        data = row.get("data")
-        if not isinstance(data, dict):
-            continue
-        if bool((data.get("data_quality") or {}).get("insufficient_data")):
-            continue
+    return _build_prior_rows(
+        "strength_inference",
+        _add_strength_projection_row,
+        rows,
+        cohort_by_user,
+        min_cohort_size=min_cohort_size,
+        window_days=window_days,
+    )
 
-        mean_value = _as_float(((data.get("baseline") or {}).get("posterior_mean")))
-        if mean_value is None:
-            continue
 
-        confidence = _as_float(((data.get("dynamics") or {}).get("readiness") or {}).get("confidence"))
-        if confidence is None:
-            confidence = 0.5
-
-        cohort_key = cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2)
-        for cohort_variant in _cohort_key_variants(cohort_key):
-            _add_aggregate_sample(
-                groups,
-                cohort_key=cohort_variant,
-                target_key=READINESS_TARGET_KEY,
-                user_id=user_id,
-                value=mean_value,
-                weight=confidence,
-            )
+def _add_readiness_projection_row(
+    groups: dict[tuple[str, str], dict[str, Any]],
+    row: dict[str, Any],
+    cohort_by_user: dict[str, str],
+) -> None:
+    user_id = str(row.get("user_id") or "")
+    data = row.get("data")
+    if not isinstance(data, dict):
+        return
+    if bool((data.get("data_quality") or {}).get("insufficient_data")):
+        return
 
-    out: list[dict[str, Any]] = []
-    for (cohort_key, target_key), bucket in groups.items():
-        participants_count = len(bucket["users"])
-        sample_size = len(bucket["values"])
-        if participants_count < min_cohort_size or sample_size < min_cohort_size:
-            continue
+    mean_value = _as_float(((data.get("baseline") or {}).get("posterior_mean")))
+    if mean_value is None:
+        return
 
-        mean, var = _weighted_stats(bucket["values"], bucket["weights"])
-        prior_payload = {
-            "parameter": "readiness_baseline",
-            "mean": round(mean, 8),
-            "var": round(var, 8),
-            "std": round(math.sqrt(var), 8),
-            "min": round(min(bucket["values"]), 8),
-            "max": round(max(bucket["values"]), 8),
-            "privacy_gate_passed": True,
-        }
-        out.append(
-            {
-                "projection_type": "readiness_inference",
-                "target_key": target_key,
-                "cohort_key": cohort_key,
-                "prior_payload": prior_payload,
-                "participants_count": participants_count,
-                "sample_size": sample_size,
-                "min_cohort_size": min_cohort_size,
-                "source_window_days": window_days,
-            }
+    confidence = _as_float(((data.get("dynamics") or {}).get("readiness") or {}).get("confidence"))
+    if confidence is None:
+        confidence = 0.5
+
+    cohort_key = cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2)
+    for cohort_variant in _cohort_key_variants(cohort_key):
+        _add_aggregate_sample(
+            groups,
+            cohort_key=cohort_variant,
+            target_key=READINESS_TARGET_KEY,
+            user_id=user_id,
+            value=mean_value,
+            weight=confidence,
         )
 
-    return out
+
+def _build_readiness_prior_rows(
+    rows: list[dict[str, Any]],
+    cohort_by_user: dict[str, str],
+    *,
+    min_cohort_size: int,
+    window_days: int,
+) -> list[dict[str, Any]]:
+    return _build_prior_rows(
+        "readiness_inference",
+        _add_readiness_projection_row,
+        rows,
+        cohort_by_user,
+        min_cohort_size=min_cohort_size,
+        window_days=window_days,
+    )
 
 
 def _causal_effect_variance(payload: dict[str, Any]) -> float | None:
@@ -689,145 +882,600 @@ def _extract_causal_effect_sample(payload: Any) -> tuple[float, float] | None:
     return mean_ate, variance
 
 
-def _build_causal_prior_rows(
-    rows: list[dict[str, Any]],
+def _add_causal_projection_row(
+    groups: dict[tuple[str, str], dict[str, Any]],
+    row: dict[str, Any],
     cohort_by_user: dict[str, str],
-    *,
-    min_cohort_size: int,
-    window_days: int,
-) -> list[dict[str, Any]]:
-    groups: dict[tuple[str, str], dict[str, Any]] = {}
+) -> None:
+    user_id = str(row.get("user_id") or "")
+    data = row.get("data")
+    if not isinstance(data, dict):
+        return
 
-    for row in rows:
-        user_id = str(row.get("user_id") or "")
-        data = row.get("data")
-        if not isinstance(data, dict):
-            continue
+    interventions = data.get("interventions")
+    if not isinstance(interventions, dict):
+        return
 
-        interventions = data.get("interventions")
-        if not isinstance(interventions, dict):
+    cohort_key = cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2)
+    for intervention_name, intervention_payload in interventions.items():
+        if not isinstance(intervention_payload, dict):
             continue
 
-        cohort_key = cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2)
-        for intervention_name, intervention_payload in interventions.items():
-            if not isinstance(intervention_payload, dict):
-                continue
+        objective_mode = str(intervention_payload.get("objective_mode") or "unknown")
+        modality = str(intervention_payload.get("modality") or "unknown")
+        outcomes = intervention_payload.get("outcomes")
+        if not isinstance(outcomes, dict):
+            continue
 
-            objective_mode = str(intervention_payload.get("objective_mode") or "unknown")
-            modality = str(intervention_payload.get("modality") or "unknown")
-            outcomes = intervention_payload.get("outcomes")
-            if not isinstance(outcomes, dict):
+        for outcome_name in (
+            CAUSAL_OUTCOME_READINESS,
+            CAUSAL_OUTCOME_STRENGTH_AGGREGATE,
+        ):
+            sample = _extract_causal_effect_sample(outcomes.get(outcome_name))
+            if sample is None:
                 continue
-
-            for outcome_name in (
-                CAUSAL_OUTCOME_READINESS,
-                CAUSAL_OUTCOME_STRENGTH_AGGREGATE,
-            ):
-                sample = _extract_causal_effect_sample(outcomes.get(outcome_name))
-                if sample is None:
-                    continue
-                target_key = build_causal_estimand_target_key(
+            target_key = build_causal_estimand_target_key(
+                intervention=intervention_name,
+                outcome=outcome_name,
+                objective_mode=objective_mode,
+                modality=modality,
+            )
+            for cohort_variant in _cohort_key_variants(cohort_key):
+                _add_causal_sample(
+                    groups,
+                    cohort_key=cohort_variant,
+                    target_key=target_key,
+                    user_id=user_id,
+                    mean_ate=sample[0],
+                    var_ate=sample[1],
                     intervention=intervention_name,
                     outcome=outcome_name,
-                    objective_mode=objective_mode,
-                    modality=modality,
                 )
-                for cohort_variant in _cohort_key_variants(cohort_key):
-                    _add_causal_sample(
-                        groups,
-                        cohort_key=cohort_variant,
-                        target_key=target_key,
-                        user_id=user_id,
-                        mean_ate=sample[0],
-                        var_ate=sample[1],
-                        intervention=intervention_name,
-                        outcome=outcome_name,
-                    )
 
-            per_exercise = outcomes.get(CAUSAL_OUTCOME_STRENGTH_PER_EXERCISE)
-            if not isinstance(per_exercise, dict):
-                continue
+        per_exercise = outcomes.get(CAUSAL_OUTCOME_STRENGTH_PER_EXERCISE)
+        if not isinstance(per_exercise, dict):
+            continue
 
-            for exercise_id, exercise_payload in per_exercise.items():
-                sample = _extract_causal_effect_sample(exercise_payload)
-                if sample is None:
-                    continue
-                target_key = build_causal_estimand_target_key(
+        for exercise_id, exercise_payload in per_exercise.items():
+            sample = _extract_causal_effect_sample(exercise_payload)
+            if sample is None:
+                continue
+            target_key = build_causal_estimand_target_key(
+                intervention=intervention_name,
+                outcome=CAUSAL_OUTCOME_STRENGTH_PER_EXERCISE,
+                objective_mode=objective_mode,
+                modality=modality,
+                exercise_id=str(exercise_id),
+            )
+            for cohort_variant in _cohort_key_variants(cohort_key):
+                _add_causal_sample(
+                    groups,
+                    cohort_key=cohort_variant,
+                    target_key=target_key,
+                    user_id=user_id,
+                    mean_ate=sample[0],
+                    var_ate=sample[1],
                     intervention=intervention_name,
                     outcome=CAUSAL_OUTCOME_STRENGTH_PER_EXERCISE,
-                    objective_mode=objective_mode,
-                    modality=modality,
                     exercise_id=str(exercise_id),
                 )
-                for cohort_variant in _cohort_key_variants(cohort_key):
-                    _add_causal_sample(
-                        groups,
-                        cohort_key=cohort_variant,
-                        target_key=target_key,
-                        user_id=user_id,
-                        mean_ate=sample[0],
-                        var_ate=sample[1],
-                        intervention=intervention_name,
-                        outcome=CAUSAL_OUTCOME_STRENGTH_PER_EXERCISE,
-                        exercise_id=str(exercise_id),
-                    )
 
-    out: list[dict[str, Any]] = []
-    for (cohort_key, target_key), bucket in groups.items():
-        participants_count = len(bucket["users"])
-        sample_size = len(bucket["values"])
-        if participants_count < min_cohort_size or sample_size < min_cohort_size:
-            continue
 
-        mean, between_user_var = _weighted_stats(bucket["values"], bucket["weights"])
-        safe_weights = [max(0.0, weight) for weight in bucket["weights"]]
-        total_weight = sum(safe_weights)
-        if total_weight <= 0.0:
-            safe_weights = [1.0] * len(bucket["within_vars"])
-            total_weight = float(len(safe_weights))
-        within_effect_var = sum(
-            weight * max(1e-6, variance)
-            for weight, variance in zip(safe_weights, bucket["within_vars"])
-        ) / total_weight
-        total_var = max(1e-6, between_user_var + within_effect_var)
-
-        prior_payload: dict[str, Any] = {
-            "schema_version": 1,
-            "parameter": "mean_ate",
-            "distribution": "normal",
+def _build_causal_prior_rows(
+    rows: list[dict[str, Any]],
+    cohort_by_user: dict[str, str],
+    *,
+    min_cohort_size: int,
+    window_days: int,
+) -> list[dict[str, Any]]:
+    return _build_prior_rows(
+        "causal_inference",
+        _add_causal_projection_row,
+        rows,
+        cohort_by_user,
+        min_cohort_size=min_cohort_size,
+        window_days=window_days,
+    )
+
+
+PriorKey = tuple[str, str, str]  # (projection_type, target_key, cohort_key)
+
+_PRIOR_SOURCES = (
+    ("strength_inference", _iter_strength_projection_rows, _add_strength_projection_row),
+    ("readiness_inference", _iter_readiness_projection_rows, _add_readiness_projection_row),
+    ("causal_inference", _iter_causal_projection_rows, _add_causal_projection_row),
+)
+
+
+def _user_contributions(
+    projection_type: str,
+    user_groups: dict[tuple[str, str], dict[str, Any]],
+) -> dict[PriorKey, CohortStats]:
+    """One user's samples per (cohort, target) group, reduced to CohortStats."""
+    return {
+        (projection_type, target_key, cohort_key): CohortStats.from_samples(
+            bucket["values"],
+            bucket["weights"],
+            within_vars=bucket.get("within_vars"),
+            estimand=bucket.get("estimand"),
+        )
+        for (cohort_key, target_key), bucket in user_groups.items()
+        if bucket["values"]
+    }
+
+
+def _merge_contribution(
+    merged: dict[PriorKey, CohortStats],
+    key: PriorKey,
+    stats: CohortStats,
+) -> None:
+    current = merged.get(key)
+    merged[key] = stats if current is None else current.merge(stats)
+
+
+def _merge_contributions(
+    contributions: Iterable[tuple[PriorKey, CohortStats]],
+) -> dict[PriorKey, CohortStats]:
+    merged: dict[PriorKey, CohortStats] = {}
+    for key, stats in contributions:
+        _merge_contribution(merged, key, stats)
+    return merged
+
+
+def _prior_payload(projection_type: str, stats: CohortStats, *, window_days: int) -> dict[str, Any]:
+    mean, var = stats.mean_var()
+    if projection_type != "causal_inference":
+        return {
+            "parameter": (
+                "slope_kg_per_day"
+                if projection_type == "strength_inference"
+                else "readiness_baseline"
+            ),
             "mean": round(mean, 8),
-            "var": round(total_var, 8),
-            "std": round(math.sqrt(total_var), 8),
-            "between_user_var": round(between_user_var, 8),
-            "within_effect_var": round(within_effect_var, 8),
-            "min": round(min(bucket["values"]), 8),
-            "max": round(max(bucket["values"]), 8),
+            "var": round(var, 8),
+            "std": round(math.sqrt(var), 8),
+            "min": round(stats.min_value, 8),
+            "max": round(stats.max_value, 8),
             "privacy_gate_passed": True,
-            "estimand": dict(bucket["estimand"]),
-            "evidence": {
-                "participants_count": participants_count,
-                "sample_size": sample_size,
-                "source_window_days": window_days,
-                "weighting": "inverse_effect_variance",
-            },
         }
 
-        out.append(
-            {
-                "projection_type": "causal_inference",
-                "target_key": target_key,
-                "cohort_key": cohort_key,
-                "prior_payload": prior_payload,
-                "participants_count": participants_count,
-                "sample_size": sample_size,
-                "min_cohort_size": min_cohort_size,
-                "source_window_days": window_days,
-            }
-        )
+    # Causal weights are inverse effect variances, so weight_sum > 0.
+    within_effect_var = stats.within_var_sum / stats.weight_sum
+    total_var = max(1e-6, var + within_effect_var)
+    return {
+        "schema_version": 1,
+        "parameter": "mean_ate",
+        "distribution": "normal",
+        "mean": round(mean, 8),
+        "var": round(total_var, 8),
+        "std": round(math.sqrt(total_var), 8),
+        "between_user_var": round(var, 8),
+        "within_effect_var": round(within_effect_var, 8),
+        "min": round(stats.min_value, 8),
+        "max": round(stats.max_value, 8),
+        "privacy_gate_passed": True,
+        "estimand": dict(stats.estimand),
+        "evidence": {
+            "participants_count": stats.participants,
+            "sample_size": stats.sample_size,
+            "source_window_days": window_days,
+            "weighting": "inverse_effect_variance",
+        },
+    }
 
+
+def _prior_row_from_stats(
+    key: PriorKey,
+    stats: CohortStats,
+    *,
+    min_cohort_size: int,
+    window_days: int,
+) -> dict[str, Any] | None:
+    """Prior row for a merged group, or None if it fails the privacy gate."""
+    if stats.participants < min_cohort_size or stats.sample_size < min_cohort_size:
+        return None
+    projection_type, target_key, cohort_key = key
+    return {
+        "projection_type": projection_type,
+        "target_key": target_key,
+        "cohort_key": cohort_key,
+        "prior_payload": _prior_payload(projection_type, stats, window_days=window_days),
+        "participants_count": stats.participants,
+        "sample_size": stats.sample_size,
+        "min_cohort_size": min_cohort_size,
+        "source_window_days": window_days,
+    }
+
+
+def _build_prior_rows(
+    projection_type: str,
+    add_row: Callable[[dict[tuple[str, str], dict[str, Any]], dict[str, Any], dict[str, str]], None],
+    rows: Iterable[dict[str, Any]],
+    cohort_by_user: dict[str, str],
+    *,
+    min_cohort_size: int,
+    window_days: int,
+) -> list[dict[str, Any]]:
+    groups_by_user: dict[str, dict[tuple[str, str], dict[str, Any]]] = {}
+    for row in rows:
+        add_row(groups_by_user.setdefault(str(row.get("user_id") or ""), {}), row, cohort_by_user)
+    merged = _merge_contributions(
+        item
+        for user_groups in groups_by_user.values()
+        for item in _user_contributions(projection_type, user_groups).items()
+    )
+    out: list[dict[str, Any]] = []
+    for key, stats in merged.items():
+        prior_row = _prior_row_from_stats(
+            key,
+            stats,
+            min_cohort_size=min_cohort_size,
+            window_days=window_days,
+        )
+        if prior_row is not None:
+            out.append(prior_row)
     return out
 
 
+ContributorState = tuple[str, int, datetime | None, int]
+"""(cohort_key, source_rows, source_latest_at, window_days) of a contributor."""
+
+
+async def _load_contributor_states(
+    conn: psycopg.AsyncConnection[Any],
+) -> dict[str, ContributorState]:
+    states: dict[str, ContributorState] = {}
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT user_id::text AS user_id, cohort_key, source_rows,
+               source_latest_at, window_days
+        FROM population_prior_contributors
+        """,
+        name="population_priors_contributors",
+    ):
+        states[str(row["user_id"])] = (
+            str(row["cohort_key"]),
+            int(row["source_rows"]),
+            row.get("source_latest_at"),
+            int(row["window_days"]),
+        )
+    return states
+
+
+async def _load_source_fingerprints(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    user_ids: list[str],
+    window_days: int,
+) -> dict[str, tuple[int, datetime]]:
+    """In-window source projection count and latest update per user.
+
+    Covers exactly the rows the `_iter_*_projection_rows` loaders read, so an
+    update, a new row, a deleted row or a row ageing out of the window all
+    change the fingerprint.
+    """
+    if not user_ids:
+        return {}
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT user_id::text AS user_id,
+                   COUNT(*) AS source_rows,
+                   MAX(updated_at) AS source_latest_at
+            FROM projections
+            WHERE user_id = ANY(%s::uuid[])
+              AND updated_at >= NOW() - make_interval(days => %s)
+              AND (
+                  projection_type = 'strength_inference'
+                  OR (
+                      projection_type IN ('readiness_inference', 'causal_inference')
+                      AND key = 'overview'
+                  )
+              )
+            GROUP BY user_id
+            """,
+            (user_ids, window_days),
+        )
+        rows = await cur.fetchall()
+    return {
+        str(row["user_id"]): (int(row["source_rows"]), row["source_latest_at"])
+        for row in rows
+    }
+
+
+def _stale_contributors(
+    eligible_user_ids: list[str],
+    cohort_by_user: dict[str, str],
+    fingerprints: dict[str, tuple[int, datetime]],
+    states: dict[str, ContributorState],
+    *,
+    window_days: int,
+) -> tuple[dict[str, ContributorState], list[str]]:
+    """Eligible users to recompute (with their new state) and users to drop."""
+    recompute: dict[str, ContributorState] = {}
+    for user_id in eligible_user_ids:
+        source_rows, source_latest_at = fingerprints.get(user_id, (0, None))
+        current: ContributorState = (
+            cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2),
+            source_rows,
+            source_latest_at,
+            window_days,
+        )
+        previous = states.get(user_id)
+        if previous is None and source_rows == 0:
+            continue
+        if previous != current:
+            recompute[user_id] = current
+    eligible = set(eligible_user_ids)
+    dropped = sorted(user_id for user_id in states if user_id not in eligible)
+    return recompute, dropped
+
+
+def _drifted_prior_keys(
+    existing: dict[PriorKey, tuple[Any, ...]],
+    group_counts: dict[PriorKey, tuple[int, int]],
+) -> set[PriorKey]:
+    """Priors whose participants/sample size no longer match their contributions.
+
+    Catches contributions removed outside a refresh (account deletion
+    cascades) and priors left from before contributions were tracked.
+    """
+    return {
+        key
+        for key, signature in existing.items()
+        if group_counts.get(key) != (signature[1], signature[2])
+    }
+
+
+async def _load_contribution_keys(
+    conn: psycopg.AsyncConnection[Any],
+    user_ids: list[str],
+) -> set[PriorKey]:
+    if not user_ids:
+        return set()
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT DISTINCT projection_type, target_key, cohort_key
+            FROM population_prior_contributions
+            WHERE user_id = ANY(%s::uuid[])
+            """,
+            (user_ids,),
+        )
+        rows = await cur.fetchall()
+    return {
+        (str(row["projection_type"]), str(row["target_key"]), str(row["cohort_key"]))
+        for row in rows
+    }
+
+
+async def _write_contributions(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    replaced_user_ids: list[str],
+    states: dict[str, ContributorState],
+    contributions: dict[str, dict[PriorKey, CohortStats]],
+) -> None:
+    """Replace the contributions of the given users in one batch per table."""
+    kept_states = {
+        user_id: state for user_id, state in states.items() if state[1] > 0
+    }
+    contribution_rows = [
+        (user_id, key, stats)
+        for user_id in sorted(kept_states)
+        for key, stats in sorted(contributions.get(user_id, {}).items())
+    ]
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            DELETE FROM population_prior_contributors
+            WHERE user_id = ANY(%s::uuid[])
+            """,
+            ([user_id for user_id in replaced_user_ids if user_id not in kept_states],),
+        )
+        await cur.execute(
+            """
+            DELETE FROM population_prior_contributions
+            WHERE user_id = ANY(%s::uuid[])
+            """,
+            (sorted(kept_states),),
+        )
+        if kept_states:
+            user_ids = sorted(kept_states)
+            await cur.execute(
+                """
+                INSERT INTO population_prior_contributors (
+                    user_id, cohort_key, source_rows, source_latest_at, window_days, computed_at
+                )
+                SELECT t.user_id, t.cohort_key, t.source_rows, t.source_latest_at,
+                       t.window_days, NOW()
+                FROM unnest(%s::uuid[], %s::text[], %s::int[], %s::timestamptz[], %s::int[])
+                    AS t(user_id, cohort_key, source_rows, source_latest_at, window_days)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    cohort_key = EXCLUDED.cohort_key,
+                    source_rows = EXCLUDED.source_rows,
+                    source_latest_at = EXCLUDED.source_latest_at,
+                    window_days = EXCLUDED.window_days,
+                    computed_at = NOW()
+                """,
+                (
+                    user_ids,
+                    [kept_states[user_id][0] for user_id in user_ids],
+                    [kept_states[user_id][1] for user_id in user_ids],
+                    [kept_states[user_id][2] for user_id in user_ids],
+                    [kept_states[user_id][3] for user_id in user_ids],
+                ),
+            )
+        if contribution_rows:
+            await cur.execute(
+                """
+                INSERT INTO population_prior_contributions (
+                    user_id, projection_type, target_key, cohort_key, sample_size,
+                    weight_sum, mean, m2, count_mean, count_m2, min_value, max_value,
+                    within_var_sum, estimand
+                )
+                SELECT *
+                FROM unnest(
+                    %s::uuid[], %s::text[], %s::text[], %s::text[], %s::int[],
+                    %s::float8[], %s::float8[], %s::float8[], %s::float8[], %s::float8[],
+                    %s::float8[], %s::float8[], %s::float8[], %s::jsonb[]
+                )
+                """,
+                (
+                    [user_id for user_id, _, _ in contribution_rows],
+                    [key[0] for _, key, _ in contribution_rows],
+                    [key[1] for _, key, _ in contribution_rows],
+                    [key[2] for _, key, _ in contribution_rows],
+                    [stats.sample_size for _, _, stats in contribution_rows],
+                    [float(stats.weight_sum) for _, _, stats in contribution_rows],
+                    [float(stats.mean) for _, _, stats in contribution_rows],
+                    [float(stats.m2) for _, _, stats in contribution_rows],
+                    [float(stats.count_mean) for _, _, stats in contribution_rows],
+                    [float(stats.count_m2) for _, _, stats in contribution_rows],
+                    [float(stats.min_value) for _, _, stats in contribution_rows],
+                    [float(stats.max_value) for _, _, stats in contribution_rows],
+                    [float(stats.within_var_sum) for _, _, stats in contribution_rows],
+                    [json.dumps(stats.estimand) for _, _, stats in contribution_rows],
+                ),
+            )
+
+
+async def _load_contribution_counts(
+    conn: psycopg.AsyncConnection[Any],
+) -> dict[PriorKey, tuple[int, int]]:
+    counts: dict[PriorKey, tuple[int, int]] = {}
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT projection_type, target_key, cohort_key,
+               COUNT(*) AS participants, SUM(sample_size) AS sample_size
+        FROM population_prior_contributions
+        GROUP BY projection_type, target_key, cohort_key
+        """,
+        name="population_priors_contribution_counts",
+    ):
+        counts[(str(row["projection_type"]), str(row["target_key"]), str(row["cohort_key"]))] = (
+            int(row["participants"]),
+            int(row["sample_size"]),
+        )
+    return counts
+
+
+async def _merge_stored_contributions(
+    conn: psycopg.AsyncConnection[Any],
+    keys: set[PriorKey],
+) -> dict[PriorKey, CohortStats]:
+    """Merged stats of the given groups from stored per-user contributions."""
+    merged: dict[PriorKey, CohortStats] = {}
+    if not keys:
+        return merged
+    ordered = sorted(keys)
+    # Fixed merge order keeps unchanged groups bit-identical across runs.
+    async for row in iter_server_rows(
+        conn,
+        """
+        SELECT c.projection_type, c.target_key, c.cohort_key, c.sample_size,
+               c.weight_sum, c.mean, c.m2, c.count_mean, c.count_m2,
+               c.min_value, c.max_value, c.within_var_sum, c.estimand
+        FROM population_prior_contributions c
+        JOIN unnest(%s::text[], %s::text[], %s::text[])
+            AS g(projection_type, target_key, cohort_key)
+          ON g.projection_type = c.projection_type
+         AND g.target_key = c.target_key
+         AND g.cohort_key = c.cohort_key
+        ORDER BY c.projection_type, c.target_key, c.cohort_key, c.user_id
+        """,
+        (
+            [key[0] for key in ordered],
+            [key[1] for key in ordered],
+            [key[2] for key in ordered],
+        ),
+        name="population_priors_group_contributions",
+    ):
+        _merge_contribution(
+            merged,
+            (str(row["projection_type"]), str(row["target_key"]), str(row["cohort_key"])),
+            CohortStats(
+                participants=1,
+                sample_size=int(row["sample_size"]),
+                weight_sum=float(row["weight_sum"]),
+                mean=float(row["mean"]),
+                m2=float(row["m2"]),
+                count_mean=float(row["count_mean"]),
+                count_m2=float(row["count_m2"]),
+                min_value=float(row["min_value"]),
+                max_value=float(row["max_value"]),
+                within_var_sum=float(row["within_var_sum"]),
+                estimand=row.get("estimand") if isinstance(row.get("estimand"), dict) else {},
+            ),
+        )
+    return merged
+
+
+async def _apply_prior_changes(
+    conn: psycopg.AsyncConnection[Any],
+    *,
+    upserts: list[dict[str, Any]],
+    deletes: list[PriorKey],
+) -> None:
+    async with conn.cursor() as cur:
+        if deletes:
+            await cur.execute(
+                """
+                DELETE FROM population_prior_profiles p
+                USING unnest(%s::text[], %s::text[], %s::text[])
+                    AS t(projection_type, target_key, cohort_key)
+                WHERE p.projection_type = t.projection_type
+                  AND p.target_key = t.target_key
+                  AND p.cohort_key = t.cohort_key
+                """,
+                (
+                    [key[0] for key in deletes],
+                    [key[1] for key in deletes],
+                    [key[2] for key in deletes],
+                ),
+            )
+        if upserts:
+            await cur.execute(
+                """
+                INSERT INTO population_prior_profiles (
+                    projection_type, target_key, cohort_key, prior_payload,
+                    participants_count, sample_size, min_cohort_size, source_window_days,
+                    computed_at, updated_at
+                )
+                SELECT t.projection_type, t.target_key, t.cohort_key, t.prior_payload,
+                       t.participants_count, t.sample_size, t.min_cohort_size,
+                       t.source_window_days, NOW(), NOW()
+                FROM unnest(
+                    %s::text[], %s::text[], %s::text[], %s::jsonb[],
+                    %s::int[], %s::int[], %s::int[], %s::int[]
+                ) AS t(
+                    projection_type, target_key, cohort_key, prior_payload,
+                    participants_count, sample_size, min_cohort_size, source_window_days
+                )
+                ON CONFLICT (projection_type, target_key, cohort_key) DO UPDATE SET
+                    prior_payload = EXCLUDED.prior_payload,
+                    participants_count = EXCLUDED.participants_count,
+                    sample_size = EXCLUDED.sample_size,
+                    min_cohort_size = EXCLUDED.min_cohort_size,
+                    source_window_days = EXCLUDED.source_window_days,
+                    computed_at = NOW(),
+                    updated_at = NOW()
+                """,
+                (
+                    [row["projection_type"] for row in upserts],
+                    [row["target_key"] for row in upserts],
+                    [row["cohort_key"] for row in upserts],
+                    [json.dumps(row["prior_payload"]) for row in upserts],
+                    [row["participants_count"] for row in upserts],
+                    [row["sample_size"] for row in upserts],
+                    [row["min_cohort_size"] for row in upserts],
+                    [row["source_window_days"] for row in upserts],
+                ),
+            )
+
+
 async def refresh_population_prior_profiles(
     conn: psycopg.AsyncConnection[Any],
 ) -> dict[str, Any]:
@@ -880,88 +1528,133 @@ async def refresh_population_prior_profiles(
             for user_id in opted_in_user_ids
             if quality_statuses.get(user_id) != "degraded"
         ]
-        cohort_by_user = await _load_user_cohorts(conn, eligible_user_ids)
-
-        strength_rows = await _load_strength_projection_rows(
-            conn,
-            user_ids=eligible_user_ids,
-            window_days=window_days,
-        )
-        readiness_rows = await _load_readiness_projection_rows(
-            conn,
-            user_ids=eligible_user_ids,
-            window_days=window_days,
-        )
-        causal_rows = await _load_causal_projection_rows(
-            conn,
-            user_ids=eligible_user_ids,
-            window_days=window_days,
-        )
-
-        prior_rows: list[dict[str, Any]] = []
-        prior_rows.extend(
-            _build_strength_prior_rows(
-                strength_rows,
+        # Cohorts of all opted-in users: degraded users do not contribute
+        # samples but still resolve priors, so prior changes affect them too.
+        cohort_by_user = await _load_user_cohorts(conn, opted_in_user_ids)
+
+        existing_priors = await _load_existing_prior_rows(conn)
+        incremental = await _table_exists(conn, "population_prior_contributions")
+        if incremental:
+            recompute_states, dropped_user_ids = _stale_contributors(
+                eligible_user_ids,
                 cohort_by_user,
-                min_cohort_size=min_cohort_size,
+                await _load_source_fingerprints(
+                    conn,
+                    user_ids=eligible_user_ids,
+                    window_days=window_days,
+                ),
+                await _load_contributor_states(conn),
                 window_days=window_days,
             )
-        )
-        prior_rows.extend(
-            _build_readiness_prior_rows(
-                readiness_rows,
-                cohort_by_user,
-                min_cohort_size=min_cohort_size,
+        else:
+            # Pre-migration: every eligible user is recomputed in memory.
+            recompute_states = {
+                user_id: (cohort_by_user.get(user_id, GLOBAL_COHORT_KEY_V2), 0, None, window_days)
+                for user_id in eligible_user_ids
+            }
+            dropped_user_ids = []
+        recompute_user_ids = sorted(recompute_states)
+
+        # Only recomputed users' projections are read; each user's samples
+        # are reduced to per-group CohortStats as the rows stream in.
+        candidates: dict[str, int] = {}
+        contributions: dict[str, dict[PriorKey, CohortStats]] = {}
+        for projection_type, iter_rows, add_row in _PRIOR_SOURCES:
+            groups_by_user: dict[str, dict[tuple[str, str], dict[str, Any]]] = {}
+            candidates[projection_type] = 0
+            async for row in iter_rows(
+                conn,
+                user_ids=recompute_user_ids,
                 window_days=window_days,
+            ):
+                candidates[projection_type] += 1
+                add_row(
+                    groups_by_user.setdefault(str(row.get("user_id") or ""), {}),
+                    row,
+                    cohort_by_user,
+                )
+            for user_id, user_groups in groups_by_user.items():
+                contributions.setdefault(user_id, {}).update(
+                    _user_contributions(projection_type, user_groups)
+                )
+
+        if incremental:
+            affected_keys = await _load_contribution_keys(
+                conn, recompute_user_ids + dropped_user_ids
             )
-        )
-        prior_rows.extend(
-            _build_causal_prior_rows(
-                causal_rows,
-                cohort_by_user,
+            await _write_contributions(
+                conn,
+                replaced_user_ids=recompute_user_ids + dropped_user_ids,
+                states=recompute_states,
+                contributions=contributions,
+            )
+            for user_contributions in contributions.values():
+                affected_keys.update(user_contributions)
+            group_counts = await _load_contribution_counts(conn)
+            affected_keys.update(_drifted_prior_keys(existing_priors, group_counts))
+            if any(
+                signature[3] != min_cohort_size or signature[4] != window_days
+                for signature in existing_priors.values()
+            ):
+                # Privacy gate or window changed: re-evaluate every group.
+                affected_keys.update(group_counts)
+                affected_keys.update(existing_priors)
+            merged = await _merge_stored_contributions(conn, affected_keys)
+        else:
+            merged = _merge_contributions(
+                item
+                for user_contributions in contributions.values()
+                for item in user_contributions.items()
+            )
+            affected_keys = set(merged) | set(existing_priors)
+
+        prior_rows: list[dict[str, Any]] = []
+        for key in sorted(affected_keys):
+            stats = merged.get(key)
+            if stats is None:
+                continue
+            prior_row = _prior_row_from_stats(
+                key,
+                stats,
                 min_cohort_size=min_cohort_size,
                 window_days=window_days,
             )
-        )
+            if prior_row is not None:
+                prior_rows.append(prior_row)
 
-        async with conn.cursor() as cur:
-            await cur.execute("DELETE FROM population_prior_profiles")
-            for row in prior_rows:
-                await cur.execute(
-                    """
-                    INSERT INTO population_prior_profiles (
-                        projection_type, target_key, cohort_key, prior_payload,
-                        participants_count, sample_size, min_cohort_size, source_window_days,
-                        computed_at, updated_at
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW(), NOW())
-                    """,
-                    (
-                        row["projection_type"],
-                        row["target_key"],
-                        row["cohort_key"],
-                        Json(row["prior_payload"]),
-                        row["participants_count"],
-                        row["sample_size"],
-                        row["min_cohort_size"],
-                        row["source_window_days"],
-                    ),
-                )
+        upserts, deletes = _diff_prior_rows(
+            {key: existing_priors[key] for key in affected_keys if key in existing_priors},
+            prior_rows,
+        )
+        await _apply_prior_changes(conn, upserts=upserts, deletes=deletes)
+        changed_cohort_keys = {row["cohort_key"] for row in upserts} | {
+            key[2] for key in deletes
+        }
 
-        cohorts_considered = len({row["cohort_key"] for row in prior_rows})
+        prior_keys = (set(existing_priors) - set(deletes)) | {
+            _prior_identity(row) for row in upserts
+        }
+        cohorts_considered = len({key[2] for key in prior_keys})
         await _safe_record_refresh_run(
             conn,
             status="success",
             users_opted_in=len(opted_in_users),
             cohorts_considered=cohorts_considered,
-            priors_written=len(prior_rows),
+            priors_written=len(upserts),
             details={
-                "strength_candidates": len(strength_rows),
-                "readiness_candidates": len(readiness_rows),
-                "causal_candidates": len(causal_rows),
+                "strength_candidates": candidates["strength_inference"],
+                "readiness_candidates": candidates["readiness_inference"],
+                "causal_candidates": candidates["causal_inference"],
                 "users_eligible_quality": len(eligible_user_ids),
                 "users_excluded_degraded_quality": len(opted_in_user_ids)
                 - len(eligible_user_ids),
+                "incremental": incremental,
+                "users_recomputed": len(recompute_user_ids),
+                "users_dropped": len(dropped_user_ids),
+                "groups_recomputed": len(affected_keys),
+                "priors_total": len(prior_keys),
+                "priors_removed": len(deletes),
+                "cohorts_changed": len(changed_cohort_keys),
                 "min_cohort_size": min_cohort_size,
                 "window_days": window_days,
             },
@@ -974,10 +1667,18 @@ async def refresh_population_prior_profiles(
             "users_eligible_quality": len(eligible_user_ids),
             "users_excluded_degraded_quality": len(opted_in_user_ids)
             - len(eligible_user_ids),
+            "users_recomputed": len(recompute_user_ids),
+            "users_dropped": len(dropped_user_ids),
             "cohorts_considered": cohorts_considered,
-            "priors_written": len(prior_rows),
+            "priors_written": len(upserts),
+            "priors_removed": len(deletes),
+            "priors_total": len(prior_keys),
+            "cohorts_changed": len(changed_cohort_keys),
             "min_cohort_size": min_cohort_size,
             "window_days": window_days,
+            # Stored with the nightly stage shard; refit_enqueue shards
+            # resolve the affected users of their own range from it.
+            "prior_changed_cohort_keys": sorted(changed_cohort_keys),
         }
         logger.info(
             "Refreshed population priors: users_opted_in=%d priors_written=%d",
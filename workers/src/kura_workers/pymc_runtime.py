@@ -0,0 +1,707 @@
+"""Process-local PyMC runtime for strength inference.
+
+Three layers keep repeated strength refits cheap:
+
+- compiled-model cache: one PyMC model per model structure. Observations and
+  prior hyperparameters live in ``pm.Data`` containers and the NUTS step is
+  built once, so the PyTensor logp/dlogp graph compiles once per process and
+  every later fit only swaps data via ``pm.set_data``;
+- posterior cache: draws keyed by a hash of (x, y, priors), so an unchanged
+  series returns without sampling;
+- warm starts: the unconstrained posterior mean/variance and final step size
+  of the previous fit of the same series seed the next fit's mass matrix and
+  step size, which lets incremental refits run a shorter tuning phase.
+
+The hierarchical model fits all exercise series of one user in a single
+sampler run. The number of exercises is padded up to a fixed bucket (2, 4,
+8, ...) so a handful of graphs serve every batch size; padded groups carry
+no observations and leave the posterior of the real groups unchanged.
+Hierarchical posteriors, which hold ``(draws, K)`` arrays, get their own
+small LRU instead of sharing the per-exercise one.
+
+All caches are bounded LRUs scoped to the worker process; nothing is
+persisted. PyMC/ArviZ are imported lazily so posterior-cache hits and the
+closed-form fallback work without them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+STRENGTH_MODEL_KEY = "strength_linear.v1"
+HIERARCHICAL_MODEL_KEY = "strength_hierarchical.v1"
+
+_DRAWS = 600
+_COLD_TUNE = 600
+_CHAINS = 2
+_RANDOM_SEED = 42
+_TARGET_ACCEPT = 0.9
+_ALPHA_PRIOR_SIGMA = 30.0
+_SIGMA_PRIOR_SIGMA = 10.0
+_BETA_SHIFT_SIGMA = 0.5
+_TAU_BETA_SIGMA = 0.5
+_MAX_POW2_GROUP_BUCKET = 64
+
+
+def _cache_size() -> int:
+    return max(1, int(os.environ.get("KURA_PYMC_CACHE_SIZE", "512")))
+
+
+def _hierarchical_cache_size() -> int:
+    return max(1, int(os.environ.get("KURA_PYMC_HIERARCHICAL_CACHE_SIZE", "32")))
+
+
+def _model_cache_size() -> int:
+    return max(1, int(os.environ.get("KURA_PYMC_MODEL_CACHE_SIZE", "6")))
+
+
+def _warm_tune() -> int:
+    return max(50, int(os.environ.get("KURA_PYMC_WARM_TUNE", "200")))
+
+
+class _LruCache:
+    """Small bounded LRU keyed by string; ``limit`` is read on every put."""
+
+    def __init__(self, limit: Callable[[], int] = _cache_size) -> None:
+        self._items: OrderedDict[str, Any] = OrderedDict()
+        self._limit = limit
+
+    def get(self, key: str) -> Any | None:
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        limit = self._limit()
+        while len(self._items) > limit:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+@dataclass
+class StrengthPosterior:
+    """Flattened posterior draws plus the convergence summary of one fit."""
+
+    alpha: np.ndarray
+    beta: np.ndarray
+    sigma: np.ndarray
+    rhat: float
+    ess: float
+    step_size: float | None = None
+
+
+@dataclass
+class HierarchicalStrengthPosterior:
+    """Posterior of the multi-exercise model; per-exercise draws are (draws, K)."""
+
+    alpha: np.ndarray
+    beta: np.ndarray
+    sigma: np.ndarray
+    beta_offset: np.ndarray
+    beta_shift: np.ndarray
+    tau_beta: np.ndarray
+    sigma_scale: np.ndarray
+    rhat: float
+    ess: float
+    step_size: float | None = None
+
+
+@dataclass
+class _CompiledModel:
+    model: Any
+    step: Any
+    ndim: int
+
+
+_compiled_models = _LruCache(_model_cache_size)
+_posterior_cache = _LruCache()
+_hierarchical_posterior_cache = _LruCache(_hierarchical_cache_size)
+_warm_states = _LruCache()
+_stats: dict[str, int] = {
+    "model_hits": 0,
+    "model_misses": 0,
+    "posterior_hits": 0,
+    "posterior_misses": 0,
+    "warm_starts": 0,
+    "cold_starts": 0,
+}
+
+
+def _hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+def get_pymc_runtime_stats() -> dict[str, Any]:
+    """Process-lifetime cache counters and hit rates."""
+    return {
+        **_stats,
+        "model_hit_rate": _hit_rate(_stats["model_hits"], _stats["model_misses"]),
+        "posterior_hit_rate": _hit_rate(_stats["posterior_hits"], _stats["posterior_misses"]),
+        "posterior_cache_entries": len(_posterior_cache),
+        "hierarchical_posterior_cache_entries": len(_hierarchical_posterior_cache),
+        "compiled_model_entries": len(_compiled_models),
+        "warm_state_entries": len(_warm_states),
+    }
+
+
+def reset_pymc_runtime() -> None:
+    """Drop all cached models, posteriors and warm states (tests, memory pressure)."""
+    _compiled_models.clear()
+    _posterior_cache.clear()
+    _hierarchical_posterior_cache.clear()
+    _warm_states.clear()
+    for key in _stats:
+        _stats[key] = 0
+
+
+def posterior_cache_key(
+    x_centered: np.ndarray,
+    y: np.ndarray,
+    *,
+    alpha_mu: float,
+    beta_mu: float,
+    beta_sigma: float,
+) -> str:
+    digest = hashlib.sha256(STRENGTH_MODEL_KEY.encode())
+    digest.update(np.ascontiguousarray(x_centered, dtype=np.float64).tobytes())
+    digest.update(b"|")
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    digest.update(b"|")
+    digest.update(np.array([alpha_mu, beta_mu, beta_sigma], dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def hierarchical_posterior_cache_key(
+    x_centered: np.ndarray,
+    y: np.ndarray,
+    group_index: np.ndarray,
+    *,
+    alpha_mu: np.ndarray,
+    beta_mu: np.ndarray,
+    beta_sigma: np.ndarray,
+) -> str:
+    digest = hashlib.sha256(HIERARCHICAL_MODEL_KEY.encode())
+    for part in (x_centered, y, alpha_mu, beta_mu, beta_sigma):
+        digest.update(np.ascontiguousarray(part, dtype=np.float64).tobytes())
+        digest.update(b"|")
+    digest.update(np.ascontiguousarray(group_index, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _mutable_data(pm: Any, name: str, value: Any) -> Any:
+    try:
+        return pm.Data(name, value, mutable=True)
+    except TypeError:  # newer PyMC: every Data container is mutable
+        return pm.Data(name, value)
+
+
+def _build_strength_model() -> _CompiledModel:
+    import pymc as pm
+
+    placeholder_x = np.array([-1.0, 0.0, 1.0])
+    placeholder_y = np.zeros(3)
+    with pm.Model() as model:
+        x_data = _mutable_data(pm, "x_centered", placeholder_x)
+        y_data = _mutable_data(pm, "y_observed", placeholder_y)
+        alpha_mu = _mutable_data(pm, "alpha_mu", 0.0)
+        beta_mu = _mutable_data(pm, "beta_mu", 0.0)
+        beta_sigma = _mutable_data(pm, "beta_sigma", 2.0)
+        alpha = pm.Normal("alpha", mu=alpha_mu, sigma=_ALPHA_PRIOR_SIGMA)
+        beta = pm.Normal("beta", mu=beta_mu, sigma=beta_sigma)
+        sigma = pm.HalfNormal("sigma", sigma=_SIGMA_PRIOR_SIGMA)
+        pm.Normal(
+            "obs",
+            mu=alpha + beta * x_data,
+            sigma=sigma,
+            observed=y_data,
+            shape=x_data.shape,
+        )
+        # Building the step compiles logp/dlogp against the shared data.
+        step = pm.NUTS(target_accept=_TARGET_ACCEPT)
+    return _CompiledModel(model=model, step=step, ndim=len(model.value_vars))
+
+
+def _compiled_strength_model() -> tuple[_CompiledModel, bool, float]:
+    """Return (compiled model, cache hit, compile_ms)."""
+    compiled = _compiled_models.get(STRENGTH_MODEL_KEY)
+    if compiled is not None:
+        _stats["model_hits"] += 1
+        return compiled, True, 0.0
+    _stats["model_misses"] += 1
+    started = time.perf_counter()
+    compiled = _build_strength_model()
+    _compiled_models.put(STRENGTH_MODEL_KEY, compiled)
+    return compiled, False, (time.perf_counter() - started) * 1000.0
+
+
+def _build_hierarchical_model(groups: int) -> _CompiledModel:
+    import pymc as pm
+
+    placeholder_x = np.tile(np.array([-1.0, 0.0, 1.0]), groups)
+    placeholder_y = np.zeros(3 * groups)
+    placeholder_group = np.repeat(np.arange(groups, dtype=np.int64), 3)
+    with pm.Model() as model:
+        x_data = _mutable_data(pm, "x_centered", placeholder_x)
+        y_data = _mutable_data(pm, "y_observed", placeholder_y)
+        group_data = _mutable_data(pm, "group_index", placeholder_group)
+        alpha_mu = _mutable_data(pm, "alpha_mu", np.zeros(groups))
+        beta_mu = _mutable_data(pm, "beta_mu", np.zeros(groups))
+        beta_sigma = _mutable_data(pm, "beta_sigma", np.full(groups, 2.0))
+        alpha = pm.Normal("alpha", mu=alpha_mu, sigma=_ALPHA_PRIOR_SIGMA, shape=groups)
+        # Non-centered slopes: a shared shift and spread pool the exercises,
+        # each exercise's prior sd scales its own deviation.
+        beta_shift = pm.Normal("beta_shift", mu=0.0, sigma=_BETA_SHIFT_SIGMA)
+        tau_beta = pm.HalfNormal("tau_beta", sigma=_TAU_BETA_SIGMA)
+        beta_offset = pm.Normal("beta_offset", mu=0.0, sigma=1.0, shape=groups)
+        beta = pm.Deterministic(
+            "beta", beta_mu + beta_shift + tau_beta * beta_sigma * beta_offset
+        )
+        sigma_scale = pm.HalfNormal("sigma_scale", sigma=_SIGMA_PRIOR_SIGMA)
+        sigma = pm.HalfNormal("sigma", sigma=sigma_scale, shape=groups)
+        pm.Normal(
+            "obs",
+            mu=alpha[group_data] + beta[group_data] * x_data,
+            sigma=sigma[group_data],
+            observed=y_data,
+            shape=x_data.shape,
+        )
+        step = pm.NUTS(target_accept=_TARGET_ACCEPT)
+    return _CompiledModel(model=model, step=step, ndim=len(model.value_vars))
+
+
+def group_bucket(groups: int) -> int:
+    """Padded group count the hierarchical graph is compiled for.
+
+    Powers of two up to 64, then multiples of 64, so only a few graphs are
+    ever compiled per process.
+    """
+    bucket = 2
+    while bucket < groups and bucket < _MAX_POW2_GROUP_BUCKET:
+        bucket *= 2
+    if groups <= bucket:
+        return bucket
+    return -(-groups // _MAX_POW2_GROUP_BUCKET) * _MAX_POW2_GROUP_BUCKET
+
+
+def _pad_groups(values: np.ndarray, size: int, fill: float) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    if len(values) >= size:
+        return values
+    return np.concatenate([values, np.full(size - len(values), fill)])
+
+
+def _slice_groups(
+    posterior: HierarchicalStrengthPosterior, groups: int
+) -> HierarchicalStrengthPosterior:
+    """Drop the padded groups; the shared hyperparameter draws are kept."""
+    if posterior.alpha.shape[-1] == groups:
+        return posterior
+    return HierarchicalStrengthPosterior(
+        alpha=np.ascontiguousarray(posterior.alpha[:, :groups]),
+        beta=np.ascontiguousarray(posterior.beta[:, :groups]),
+        sigma=np.ascontiguousarray(posterior.sigma[:, :groups]),
+        beta_offset=np.ascontiguousarray(posterior.beta_offset[:, :groups]),
+        beta_shift=posterior.beta_shift,
+        tau_beta=posterior.tau_beta,
+        sigma_scale=posterior.sigma_scale,
+        rhat=posterior.rhat,
+        ess=posterior.ess,
+        step_size=posterior.step_size,
+    )
+
+
+def _compiled_hierarchical_model(groups: int) -> tuple[_CompiledModel, bool, float]:
+    """Return (compiled model for a ``groups`` bucket, cache hit, compile_ms)."""
+    key = f"{HIERARCHICAL_MODEL_KEY}:{groups}"
+    compiled = _compiled_models.get(key)
+    if compiled is not None:
+        _stats["model_hits"] += 1
+        return compiled, True, 0.0
+    _stats["model_misses"] += 1
+    started = time.perf_counter()
+    compiled = _build_hierarchical_model(groups)
+    _compiled_models.put(key, compiled)
+    return compiled, False, (time.perf_counter() - started) * 1000.0
+
+
+def _warm_state_from_draws(
+    unconstrained: dict[str, np.ndarray],
+    step_size: float | None,
+) -> dict[str, Any] | None:
+    """Mass-matrix seed from draws given as {value var name: (draws, ...)}."""
+    mean: dict[str, Any] = {}
+    var: dict[str, Any] = {}
+    for name, values in unconstrained.items():
+        values = np.asarray(values, dtype=float)
+        m = values.mean(axis=0)
+        v = np.maximum(values.var(axis=0), 1e-8)
+        mean[name] = float(m) if np.ndim(m) == 0 else [float(item) for item in m]
+        var[name] = float(v) if np.ndim(v) == 0 else [float(item) for item in v]
+    if step_size is None or not math.isfinite(step_size) or step_size <= 0.0:
+        return None
+    flat = np.concatenate(
+        [np.ravel(np.asarray(value, dtype=float)) for value in (*mean.values(), *var.values())]
+    )
+    if not np.all(np.isfinite(flat)):
+        return None
+    return {"mean": mean, "var": var, "step_size": float(step_size)}
+
+
+def _warm_state(posterior: StrengthPosterior) -> dict[str, Any] | None:
+    return _warm_state_from_draws(
+        {
+            "alpha": posterior.alpha,
+            "beta": posterior.beta,
+            "sigma_log__": np.log(np.maximum(posterior.sigma, 1e-12)),
+        },
+        posterior.step_size,
+    )
+
+
+def _hierarchical_warm_state(posterior: HierarchicalStrengthPosterior) -> dict[str, Any] | None:
+    return _warm_state_from_draws(
+        {
+            "alpha": posterior.alpha,
+            "beta_shift": posterior.beta_shift,
+            "tau_beta_log__": np.log(np.maximum(posterior.tau_beta, 1e-12)),
+            "beta_offset": posterior.beta_offset,
+            "sigma_scale_log__": np.log(np.maximum(posterior.sigma_scale, 1e-12)),
+            "sigma_log__": np.log(np.maximum(posterior.sigma, 1e-12)),
+        },
+        posterior.step_size,
+    )
+
+
+def _install_adaptation(
+    compiled: _CompiledModel,
+    warm_state: dict[str, Any] | None,
+) -> int:
+    """Reset the cached NUTS step to a cold or warm start; returns tune steps.
+
+    pm.sample resets the step's adaptation to its *initial* values at the
+    start of every chain, so installing fresh adapters here decides whether
+    a fit starts cold (PyMC's adapt_diag defaults) or warm.
+    """
+    from pymc.blocking import DictToArrayBijection
+    from pymc.step_methods.hmc.quadpotential import QuadPotentialDiagAdapt
+    from pymc.step_methods.step_sizes import DualAverageAdaptation
+
+    initial_point = compiled.model.initial_point()
+    if warm_state is not None:
+        mean_point = {
+            name: np.asarray(warm_state["mean"][name], dtype=float).reshape(
+                np.shape(initial_point[name])
+            )
+            for name in initial_point
+        }
+        var_point = {
+            name: np.asarray(warm_state["var"][name], dtype=float).reshape(
+                np.shape(initial_point[name])
+            )
+            for name in initial_point
+        }
+        initial_mean = DictToArrayBijection.map(mean_point).data
+        initial_diag = DictToArrayBijection.map(var_point).data
+        step_size = float(warm_state["step_size"])
+        tune = _warm_tune()
+    else:
+        initial_mean = DictToArrayBijection.map(initial_point).data
+        initial_diag = np.ones_like(initial_mean)
+        step_size = 0.25 / initial_mean.size ** 0.25
+        tune = _COLD_TUNE
+    step = compiled.step
+    step.potential = QuadPotentialDiagAdapt(initial_mean.size, initial_mean, initial_diag, 10)
+    step.step_adapt = DualAverageAdaptation(step_size, _TARGET_ACCEPT, 0.05, 0.75, 10)
+    return tune
+
+
+def _run_sampler(compiled: _CompiledModel, tune: int) -> tuple[Any, float, float, float | None]:
+    """Sample the compiled model; returns (trace, rhat, ess, final step size)."""
+    import arviz as az
+    import pymc as pm
+
+    with compiled.model:
+        trace = pm.sample(
+            draws=_DRAWS,
+            tune=tune,
+            chains=_CHAINS,
+            cores=1,
+            step=compiled.step,
+            progressbar=False,
+            random_seed=_RANDOM_SEED,
+        )
+
+    final_step_size: float | None = None
+    step_sizes = getattr(trace, "sample_stats", None)
+    if step_sizes is not None and "step_size" in step_sizes:
+        final_step_size = float(np.asarray(step_sizes["step_size"].values)[:, -1].mean())
+    rhat = float(az.rhat(trace).to_array().max().item())
+    ess = float(az.ess(trace).to_array().min().item())
+    return trace, rhat, ess, final_step_size
+
+
+def _sample_compiled(
+    compiled: _CompiledModel,
+    x_centered: np.ndarray,
+    y: np.ndarray,
+    *,
+    alpha_mu: float,
+    beta_mu: float,
+    beta_sigma: float,
+    warm_state: dict[str, Any] | None,
+) -> tuple[StrengthPosterior, int]:
+    """Re-feed the compiled model and draw; returns (posterior, tune steps)."""
+    import pymc as pm
+
+    pm.set_data(
+        {
+            "x_centered": x_centered,
+            "y_observed": y,
+            "alpha_mu": alpha_mu,
+            "beta_mu": beta_mu,
+            "beta_sigma": beta_sigma,
+        },
+        model=compiled.model,
+    )
+    tune = _install_adaptation(compiled, warm_state)
+    trace, rhat, ess, final_step_size = _run_sampler(compiled, tune)
+
+    posterior = StrengthPosterior(
+        alpha=trace.posterior["alpha"].values.flatten(),
+        beta=trace.posterior["beta"].values.flatten(),
+        sigma=trace.posterior["sigma"].values.flatten(),
+        rhat=rhat,
+        ess=ess,
+        step_size=final_step_size,
+    )
+    return posterior, tune
+
+
+def _sample_hierarchical_compiled(
+    compiled: _CompiledModel,
+    x_centered: np.ndarray,
+    y: np.ndarray,
+    group_index: np.ndarray,
+    *,
+    alpha_mu: np.ndarray,
+    beta_mu: np.ndarray,
+    beta_sigma: np.ndarray,
+    warm_state: dict[str, Any] | None,
+) -> tuple[HierarchicalStrengthPosterior, int]:
+    """Hierarchical counterpart of ``_sample_compiled``."""
+    import pymc as pm
+
+    pm.set_data(
+        {
+            "x_centered": x_centered,
+            "y_observed": y,
+            "group_index": group_index,
+            "alpha_mu": alpha_mu,
+            "beta_mu": beta_mu,
+            "beta_sigma": beta_sigma,
+        },
+        model=compiled.model,
+    )
+    tune = _install_adaptation(compiled, warm_state)
+    trace, rhat, ess, final_step_size = _run_sampler(compiled, tune)
+
+    def per_group(name: str) -> np.ndarray:
+        values = np.asarray(trace.posterior[name].values)
+        return values.reshape(-1, values.shape[-1])
+
+    posterior = HierarchicalStrengthPosterior(
+        alpha=per_group("alpha"),
+        beta=per_group("beta"),
+        sigma=per_group("sigma"),
+        beta_offset=per_group("beta_offset"),
+        beta_shift=trace.posterior["beta_shift"].values.flatten(),
+        tau_beta=trace.posterior["tau_beta"].values.flatten(),
+        sigma_scale=trace.posterior["sigma_scale"].values.flatten(),
+        rhat=rhat,
+        ess=ess,
+        step_size=final_step_size,
+    )
+    return posterior, tune
+
+
+def sample_strength_posterior(
+    x_centered: np.ndarray,
+    y: np.ndarray,
+    *,
+    beta_mu: float,
+    beta_sigma: float,
+    series_key: str | None = None,
+) -> tuple[StrengthPosterior, dict[str, Any]]:
+    """Posterior for the linear strength model plus runtime telemetry.
+
+    ``series_key`` identifies one user's exercise series; fits of the same
+    series warm-start from each other. Raises ImportError when PyMC is not
+    installed and the posterior is not cached.
+    """
+    alpha_mu = float(np.mean(y))
+    key = posterior_cache_key(
+        x_centered, y, alpha_mu=alpha_mu, beta_mu=beta_mu, beta_sigma=beta_sigma,
+    )
+    runtime: dict[str, Any] = {
+        "model_key": STRENGTH_MODEL_KEY,
+        "posterior_cache": "miss",
+        "model_cache": None,
+        "warm_start": False,
+        "tune": 0,
+        "compile_ms": 0.0,
+        "sample_ms": 0.0,
+    }
+
+    cached = _posterior_cache.get(key)
+    if cached is not None:
+        _stats["posterior_hits"] += 1
+        runtime["posterior_cache"] = "hit"
+        runtime["cache_stats"] = get_pymc_runtime_stats()
+        return cached, runtime
+    _stats["posterior_misses"] += 1
+
+    compiled, model_hit, compile_ms = _compiled_strength_model()
+    warm_state = _warm_states.get(series_key) if series_key else None
+    if warm_state is not None:
+        _stats["warm_starts"] += 1
+    else:
+        _stats["cold_starts"] += 1
+
+    started = time.perf_counter()
+    posterior, tune = _sample_compiled(
+        compiled,
+        x_centered,
+        y,
+        alpha_mu=alpha_mu,
+        beta_mu=beta_mu,
+        beta_sigma=beta_sigma,
+        warm_state=warm_state,
+    )
+    sample_ms = (time.perf_counter() - started) * 1000.0
+
+    _posterior_cache.put(key, posterior)
+    if series_key:
+        next_warm_state = _warm_state(posterior)
+        if next_warm_state is not None:
+            _warm_states.put(series_key, next_warm_state)
+
+    runtime.update(
+        {
+            "model_cache": "hit" if model_hit else "miss",
+            "warm_start": warm_state is not None,
+            "tune": tune,
+            "compile_ms": round(compile_ms, 3),
+            "sample_ms": round(sample_ms, 3),
+            "cache_stats": get_pymc_runtime_stats(),
+        }
+    )
+    return posterior, runtime
+
+
+def sample_hierarchical_strength_posterior(
+    x_centered: np.ndarray,
+    y: np.ndarray,
+    group_index: np.ndarray,
+    *,
+    alpha_mu: np.ndarray,
+    beta_mu: np.ndarray,
+    beta_sigma: np.ndarray,
+    series_key: str | None = None,
+) -> tuple[HierarchicalStrengthPosterior, dict[str, Any]]:
+    """Joint posterior for K exercise series plus runtime telemetry.
+
+    Observations of all series are concatenated; ``group_index`` maps each
+    observation to its series (0..K-1) and the prior vectors have length K.
+    ``series_key`` identifies the user's batch for warm starts; a warm state
+    is only reused when the batch keeps the same number of series. The fit
+    runs on the padded bucket graph; the returned draws cover the K real
+    series only.
+    """
+    groups = int(len(alpha_mu))
+    bucket = group_bucket(groups)
+    key = hierarchical_posterior_cache_key(
+        x_centered,
+        y,
+        group_index,
+        alpha_mu=alpha_mu,
+        beta_mu=beta_mu,
+        beta_sigma=beta_sigma,
+    )
+    runtime: dict[str, Any] = {
+        "model_key": HIERARCHICAL_MODEL_KEY,
+        "groups": groups,
+        "group_bucket": bucket,
+        "posterior_cache": "miss",
+        "model_cache": None,
+        "warm_start": False,
+        "tune": 0,
+        "compile_ms": 0.0,
+        "sample_ms": 0.0,
+    }
+
+    cached = _hierarchical_posterior_cache.get(key)
+    if cached is not None:
+        _stats["posterior_hits"] += 1
+        runtime["posterior_cache"] = "hit"
+        runtime["cache_stats"] = get_pymc_runtime_stats()
+        return cached, runtime
+    _stats["posterior_misses"] += 1
+
+    compiled, model_hit, compile_ms = _compiled_hierarchical_model(bucket)
+    warm_key = f"{HIERARCHICAL_MODEL_KEY}:{groups}:{series_key}" if series_key else None
+    warm_state = _warm_states.get(warm_key) if warm_key else None
+    if warm_state is not None:
+        _stats["warm_starts"] += 1
+    else:
+        _stats["cold_starts"] += 1
+
+    started = time.perf_counter()
+    padded, tune = _sample_hierarchical_compiled(
+        compiled,
+        x_centered,
+        y,
+        group_index,
+        alpha_mu=_pad_groups(alpha_mu, bucket, 0.0),
+        beta_mu=_pad_groups(beta_mu, bucket, 0.0),
+        beta_sigma=_pad_groups(beta_sigma, bucket, 1.0),
+        warm_state=warm_state,
+    )
+    sample_ms = (time.perf_counter() - started) * 1000.0
+
+    # The warm state seeds the padded graph, so it is taken before slicing.
+    if warm_key:
+        next_warm_state = _hierarchical_warm_state(padded)
+        if next_warm_state is not None:
+            _warm_states.put(warm_key, next_warm_state)
+    posterior = _slice_groups(padded, groups)
+    _hierarchical_posterior_cache.put(key, posterior)
+
+    runtime.update(
+        {
+            "model_cache": "hit" if model_hit else "miss",
+            "warm_start": warm_state is not None,
+            "tune": tune,
+            "compile_ms": round(compile_ms, 3),
+            "sample_ms": round(sample_ms, 3),
+            "cache_stats": get_pymc_runtime_stats(),
+        }
+    )
+    return posterior, runtime
@@ -19,6 +19,9 @@ _projection_handlers: dict[str, list[HandlerFn]] = {}
 # Projection handler by function name: for targeted retry dispatch
 _handler_by_name: dict[str, HandlerFn] = {}
 
+# Event types each projection handler declares (by function name)
+_handler_event_types: dict[str, set[str]] = {}
+
 # Dimension metadata: declared by handlers at registration time (Decision 7)
 # Maps dimension name → metadata dict (description, granularity, relates_to, etc.)
 _dimension_metadata: dict[str, dict[str, Any]] = {}
@@ -65,6 +68,7 @@ def projection_handler(
             logger.info("Registered projection handler %s for event_type=%s", fn.__name__, et)
 
         _handler_by_name[fn.__name__] = fn
+        _handler_event_types.setdefault(fn.__name__, set()).update(event_types)
 
         if dimension_meta is not None:
             name = dimension_meta.get("name")
@@ -98,6 +102,11 @@ def get_projection_handler_by_name(name: str) -> HandlerFn | None:
     return _handler_by_name.get(name)
 
 
+def get_handler_event_types(name: str) -> frozenset[str]:
+    """Event types a projection handler is registered for."""
+    return frozenset(_handler_event_types.get(name, ()))
+
+
 def registered_types() -> list[str]:
     return list(_registry.keys())
 
@@ -5,12 +5,15 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 import logging
 import os
+import uuid
 from typing import Any
 
 import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from .nightly_pipeline import advance_nightly_run
+
 logger = logging.getLogger(__name__)
 
 NIGHTLY_SCHEDULER_KEY = "nightly_inference_refit"
@@ -73,7 +76,8 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT scheduler_key, interval_hours, next_run_at, in_flight_job_id
+            SELECT scheduler_key, interval_hours, next_run_at, in_flight_job_id,
+                   current_run_id, last_run_status
             FROM inference_scheduler_state
             WHERE scheduler_key = %s
             FOR UPDATE
@@ -133,6 +137,31 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
                 )
                 return
             elif job["status"] == "completed":
+                # The nightly job only plans the run; the run is in flight
+                # until every stage shard has finished. Shards whose job was
+                # lost are re-queued here, so the run resumes where it stopped.
+                failed_stages: list[str] = []
+                completed_at = job["completed_at"]
+                if state["current_run_id"] is not None:
+                    progress = await advance_nightly_run(
+                        conn,
+                        run_id=str(state["current_run_id"]),
+                        scheduler_key=NIGHTLY_SCHEDULER_KEY,
+                        resume=True,
+                    )
+                    if not progress.finished and (progress.active or progress.enqueued):
+                        await cur.execute(
+                            """
+                            UPDATE inference_scheduler_state
+                            SET last_run_status = 'running',
+                                updated_at = NOW()
+                            WHERE scheduler_key = %s
+                            """,
+                            (NIGHTLY_SCHEDULER_KEY,),
+                        )
+                        return
+                    failed_stages = progress.failed_stages
+                    completed_at = None
                 await cur.execute(
                     """
                     UPDATE inference_scheduler_state
@@ -140,12 +169,20 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
                         in_flight_started_at = NULL,
                         last_run_completed_at = COALESCE(%s, NOW()),
                         last_run_status = 'completed',
-                        last_error = NULL,
+                        last_error = %s,
                         total_runs = total_runs + 1,
                         updated_at = NOW()
                     WHERE scheduler_key = %s
                     """,
-                    (job["completed_at"], NIGHTLY_SCHEDULER_KEY),
+                    (
+                        completed_at,
+                        (
+                            "nightly stages failed: " + ", ".join(failed_stages)
+                            if failed_stages
+                            else None
+                        ),
+                        NIGHTLY_SCHEDULER_KEY,
+                    ),
                 )
             elif job["status"] in ("dead", "failed"):
                 await cur.execute(
@@ -164,7 +201,7 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
 
         await cur.execute(
             """
-            SELECT interval_hours, next_run_at
+            SELECT interval_hours, next_run_at, current_run_id, last_run_status
             FROM inference_scheduler_state
             WHERE scheduler_key = %s
             FOR UPDATE
@@ -208,12 +245,21 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
             return
 
         missed_runs = max(0, run_count - 1)
+        # A run whose planning job failed is resumed: re-planning keeps the
+        # shards it already finished.
+        resume = (
+            refreshed["last_run_status"] == "failed" and refreshed["current_run_id"] is not None
+        )
+        run_id = str(refreshed["current_run_id"]) if resume else str(uuid.uuid4())
         payload = {
             "interval_hours": interval_h,
             "scheduler_key": NIGHTLY_SCHEDULER_KEY,
             "due_runs": run_count,
             "missed_runs": missed_runs,
+            "run_id": run_id,
         }
+        if resume:
+            payload["resume"] = True
         await cur.execute(
             """
             INSERT INTO background_jobs (user_id, job_type, payload, scheduled_for)
@@ -231,6 +277,7 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
             """
             UPDATE inference_scheduler_state
             SET in_flight_job_id = %s,
+                current_run_id = %s,
                 in_flight_started_at = NOW(),
                 last_run_started_at = NOW(),
                 last_run_status = 'running',
@@ -242,6 +289,7 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
             """,
             (
                 new_job_id,
+                run_id,
                 interval_h * run_count,
                 missed_runs,
                 missed_runs,
@@ -250,8 +298,10 @@ async def ensure_nightly_inference_scheduler(conn: psycopg.AsyncConnection[Any])
         )
 
     logger.info(
-        "Scheduled inference.nightly_refit (job_id=%d, due_runs=%d, missed_runs=%d, interval_h=%d)",
+        "Scheduled inference.nightly_refit (job_id=%d, run_id=%s, resume=%s, due_runs=%d, missed_runs=%d, interval_h=%d)",
         new_job_id,
+        run_id,
+        resume,
         run_count,
         missed_runs,
         interval_h,
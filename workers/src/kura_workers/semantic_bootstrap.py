@@ -1,7 +1,16 @@
-"""Semantic catalog bootstrap and embedding materialization."""
+"""Semantic catalog bootstrap and embedding materialization.
+
+``ensure_semantic_catalog`` runs on every worker start. A hash of the seed
+entries plus the embedding provider descriptor is kept per model in
+``semantic_catalog_state``; when it matches, bootstrap is a single lookup.
+Otherwise catalog rows and variants are upserted in batches and only the
+entries whose embedding text (or provider) changed are re-embedded, tracked
+by ``semantic_catalog_embeddings.content_hash``.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from typing import Any
@@ -9,14 +18,48 @@ from typing import Any
 import psycopg
 from psycopg.rows import dict_row
 
-from .embeddings import get_embedding_provider
-from .semantic_catalog import all_catalog_entries
+from .embeddings import encode_embedding, get_embedding_provider
+from .semantic_catalog import CatalogEntry, all_catalog_entries
+from .semantic_index import invalidate_catalog_indexes, vector_literal
 
 logger = logging.getLogger(__name__)
 
 
-def _vector_literal(vec: list[float]) -> str:
-    return "[" + ",".join(f"{v:.8f}" for v in vec) + "]"
+def _embed_text(entry: CatalogEntry) -> str:
+    # Embedding text intentionally mixes canonical label + known variants.
+    return ", ".join((entry.canonical_label, *entry.variants))
+
+
+def _sha256(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def catalog_content_hash(
+    entries: tuple[CatalogEntry, ...],
+    provider_info: dict[str, str | int],
+) -> str:
+    """Hash of everything bootstrap writes: seed entries + provider descriptor."""
+    return _sha256(
+        {
+            "provider": provider_info,
+            "entries": [
+                [
+                    entry.domain,
+                    entry.canonical_key,
+                    entry.canonical_label,
+                    list(entry.variants),
+                    entry.metadata,
+                ]
+                for entry in entries
+            ],
+        }
+    )
+
+
+def embedding_content_hash(embed_text: str, provider_info: dict[str, str | int]) -> str:
+    """Hash of the inputs that determine one catalog embedding."""
+    return _sha256({"provider": provider_info, "text": embed_text})
 
 
 async def _catalog_embedding_has_vector_column(conn: psycopg.AsyncConnection[Any]) -> bool:
@@ -33,66 +76,224 @@ async def _catalog_embedding_has_vector_column(conn: psycopg.AsyncConnection[Any
         return await cur.fetchone() is not None
 
 
-async def ensure_semantic_catalog(conn: psycopg.AsyncConnection[Any]) -> None:
-    """Upsert static catalog entries + materialize global embeddings."""
-    provider = get_embedding_provider()
-    provider_info = provider.descriptor()
+async def _stored_catalog_hash(conn: psycopg.AsyncConnection[Any], model: str) -> str | None:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            "SELECT catalog_hash FROM semantic_catalog_state WHERE model = %s",
+            (model,),
+        )
+        row = await cur.fetchone()
+    return str(row["catalog_hash"]) if row else None
 
-    has_vector_column = await _catalog_embedding_has_vector_column(conn)
 
-    entries = all_catalog_entries()
-    texts_to_embed: list[str] = []
-    catalog_ids: list[str] = []
+async def _upsert_catalog_entries(
+    conn: psycopg.AsyncConnection[Any],
+    entries: tuple[CatalogEntry, ...],
+) -> dict[tuple[str, str], str]:
+    """Upsert all seed entries in one statement; returns catalog ids by (domain, key)."""
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            INSERT INTO semantic_catalog (domain, canonical_key, canonical_label, metadata)
+            SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::jsonb[])
+            ON CONFLICT (domain, canonical_key) DO UPDATE SET
+                canonical_label = EXCLUDED.canonical_label,
+                metadata = EXCLUDED.metadata,
+                updated_at = NOW()
+            RETURNING id, domain, canonical_key
+            """,
+            (
+                [entry.domain for entry in entries],
+                [entry.canonical_key for entry in entries],
+                [entry.canonical_label for entry in entries],
+                [json.dumps(entry.metadata) for entry in entries],
+            ),
+        )
+        rows = await cur.fetchall()
+    return {(row["domain"], row["canonical_key"]): str(row["id"]) for row in rows}
 
+
+async def _insert_variants(
+    conn: psycopg.AsyncConnection[Any],
+    entries: tuple[CatalogEntry, ...],
+    catalog_ids: dict[tuple[str, str], str],
+) -> None:
+    params: list[tuple[str, str]] = []
     for entry in entries:
-        async with conn.cursor(row_factory=dict_row) as cur:
-            await cur.execute(
+        catalog_id = catalog_ids.get((entry.domain, entry.canonical_key))
+        if catalog_id is None:
+            continue
+        for variant in sorted({entry.canonical_label, *entry.variants}):
+            norm_variant = variant.strip().lower()
+            if norm_variant:
+                params.append((catalog_id, norm_variant))
+    if not params:
+        return
+    async with conn.cursor() as cur:
+        await cur.executemany(
+            """
+            INSERT INTO semantic_variants (catalog_id, variant_text, source)
+            VALUES (%s, %s, 'seed')
+            ON CONFLICT (catalog_id, lower(variant_text)) DO NOTHING
+            """,
+            params,
+        )
+
+
+async def _load_embedding_hashes(
+    conn: psycopg.AsyncConnection[Any],
+    model: str,
+) -> dict[str, str | None]:
+    async with conn.cursor(row_factory=dict_row) as cur:
+        await cur.execute(
+            """
+            SELECT catalog_id, content_hash
+            FROM semantic_catalog_embeddings
+            WHERE model = %s
+            """,
+            (model,),
+        )
+        rows = await cur.fetchall()
+    return {str(row["catalog_id"]): row["content_hash"] for row in rows}
+
+
+async def _upsert_embeddings(
+    conn: psycopg.AsyncConnection[Any],
+    rows: list[tuple[str, list[float], str | None]],
+    *,
+    provider_name: str,
+    model: str,
+    dimensions: int,
+    write_vector_column: bool,
+) -> None:
+    """Batched upsert of (catalog_id, vector, content_hash) rows."""
+    if not rows:
+        return
+    async with conn.cursor() as cur:
+        if write_vector_column and dimensions == 384:
+            await cur.executemany(
                 """
-                INSERT INTO semantic_catalog (domain, canonical_key, canonical_label, metadata)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (domain, canonical_key) DO UPDATE SET
-                    canonical_label = EXCLUDED.canonical_label,
-                    metadata = EXCLUDED.metadata,
+                INSERT INTO semantic_catalog_embeddings (
+                    catalog_id, provider, model, dimensions, embedding, embedding_f32,
+                    embedding_vec, content_hash
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s::vector, %s)
+                ON CONFLICT (catalog_id, model) DO UPDATE SET
+                    provider = EXCLUDED.provider,
+                    dimensions = EXCLUDED.dimensions,
+                    embedding = EXCLUDED.embedding,
+                    embedding_f32 = EXCLUDED.embedding_f32,
+                    embedding_vec = EXCLUDED.embedding_vec,
+                    content_hash = EXCLUDED.content_hash,
                     updated_at = NOW()
-                RETURNING id
                 """,
-                (
-                    entry.domain,
-                    entry.canonical_key,
-                    entry.canonical_label,
-                    json.dumps(entry.metadata),
-                ),
+                [
+                    (
+                        catalog_id,
+                        provider_name,
+                        model,
+                        dimensions,
+                        json.dumps(vec),
+                        encode_embedding(vec),
+                        vector_literal(vec),
+                        content_hash,
+                    )
+                    for catalog_id, vec, content_hash in rows
+                ],
             )
-            row = await cur.fetchone()
-            if row is None:
-                continue
-            catalog_id = str(row["id"])
-
-        for variant in {entry.canonical_label, *entry.variants}:
-            norm_variant = variant.strip().lower()
-            if not norm_variant:
-                continue
-            async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    INSERT INTO semantic_variants (catalog_id, variant_text, source)
-                    VALUES (%s, %s, 'seed')
-                    ON CONFLICT (catalog_id, lower(variant_text)) DO NOTHING
-                    """,
-                    (catalog_id, norm_variant),
+            return
+        await cur.executemany(
+            """
+            INSERT INTO semantic_catalog_embeddings (
+                catalog_id, provider, model, dimensions, embedding, embedding_f32, content_hash
+            )
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (catalog_id, model) DO UPDATE SET
+                provider = EXCLUDED.provider,
+                dimensions = EXCLUDED.dimensions,
+                embedding = EXCLUDED.embedding,
+                embedding_f32 = EXCLUDED.embedding_f32,
+                content_hash = EXCLUDED.content_hash,
+                updated_at = NOW()
+            """,
+            [
+                (
+                    catalog_id,
+                    provider_name,
+                    model,
+                    dimensions,
+                    json.dumps(vec),
+                    encode_embedding(vec),
+                    content_hash,
                 )
+                for catalog_id, vec, content_hash in rows
+            ],
+        )
+
+
+async def _store_catalog_hash(
+    conn: psycopg.AsyncConnection[Any],
+    model: str,
+    catalog_hash: str,
+    entries: int,
+) -> None:
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO semantic_catalog_state (model, catalog_hash, entries)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (model) DO UPDATE SET
+                catalog_hash = EXCLUDED.catalog_hash,
+                entries = EXCLUDED.entries,
+                updated_at = NOW()
+            """,
+            (model, catalog_hash, entries),
+        )
 
-        # Embedding text intentionally mixes canonical label + known variants.
-        embed_text = ", ".join((entry.canonical_label, *entry.variants))
-        texts_to_embed.append(embed_text)
-        catalog_ids.append(catalog_id)
 
-    vectors = provider.embed_many(texts_to_embed)
+async def ensure_semantic_catalog(conn: psycopg.AsyncConnection[Any]) -> None:
+    """Upsert static catalog entries + materialize global embeddings.
+
+    No-op when the stored catalog hash for the provider's model matches.
+    """
+    provider = get_embedding_provider()
+    provider_info = provider.descriptor()
     model = str(provider_info["model"])
     provider_name = str(provider_info["provider"])
     dimensions = int(provider_info["dimensions"])
 
-    for catalog_id, vec in zip(catalog_ids, vectors):
+    entries = all_catalog_entries()
+    catalog_hash = catalog_content_hash(entries, provider_info)
+    if await _stored_catalog_hash(conn, model) == catalog_hash:
+        logger.info(
+            "Semantic catalog unchanged (entries=%d, provider=%s, model=%s); skipping bootstrap",
+            len(entries),
+            provider_name,
+            model,
+        )
+        return
+
+    has_vector_column = await _catalog_embedding_has_vector_column(conn)
+    catalog_ids = await _upsert_catalog_entries(conn, entries)
+    await _insert_variants(conn, entries, catalog_ids)
+
+    stored_hashes = await _load_embedding_hashes(conn, model)
+    pending: list[tuple[str, str, str]] = []
+    for entry in entries:
+        catalog_id = catalog_ids.get((entry.domain, entry.canonical_key))
+        if catalog_id is None:
+            continue
+        embed_text = _embed_text(entry)
+        content_hash = embedding_content_hash(embed_text, provider_info)
+        if stored_hashes.get(catalog_id) != content_hash:
+            pending.append((catalog_id, embed_text, content_hash))
+
+    vectors = provider.embed_many([embed_text for _, embed_text, _ in pending])
+    # Vectors from the hashing fallback are stored without hashes so the
+    # configured provider re-embeds them once it is available again.
+    fell_back = bool(pending) and provider.last_embed_fell_back
+    rows: list[tuple[str, list[float], str | None]] = []
+    for (catalog_id, _, content_hash), vec in zip(pending, vectors):
         if len(vec) != dimensions:
             # Dimension mismatch should never happen, but keep writes safe.
             logger.warning(
@@ -102,58 +303,25 @@ async def ensure_semantic_catalog(conn: psycopg.AsyncConnection[Any]) -> None:
                 dimensions,
             )
             continue
+        rows.append((catalog_id, vec, None if fell_back else content_hash))
 
-        if has_vector_column and len(vec) == 384:
-            vec_literal = _vector_literal(vec)
-            async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    INSERT INTO semantic_catalog_embeddings (
-                        catalog_id, provider, model, dimensions, embedding, embedding_vec
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s::vector)
-                    ON CONFLICT (catalog_id, model) DO UPDATE SET
-                        provider = EXCLUDED.provider,
-                        dimensions = EXCLUDED.dimensions,
-                        embedding = EXCLUDED.embedding,
-                        embedding_vec = EXCLUDED.embedding_vec,
-                        updated_at = NOW()
-                    """,
-                    (
-                        catalog_id,
-                        provider_name,
-                        model,
-                        dimensions,
-                        json.dumps(vec),
-                        vec_literal,
-                    ),
-                )
-        else:
-            async with conn.cursor() as cur:
-                await cur.execute(
-                    """
-                    INSERT INTO semantic_catalog_embeddings (
-                        catalog_id, provider, model, dimensions, embedding
-                    )
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (catalog_id, model) DO UPDATE SET
-                        provider = EXCLUDED.provider,
-                        dimensions = EXCLUDED.dimensions,
-                        embedding = EXCLUDED.embedding,
-                        updated_at = NOW()
-                    """,
-                    (
-                        catalog_id,
-                        provider_name,
-                        model,
-                        dimensions,
-                        json.dumps(vec),
-                    ),
-                )
+    await _upsert_embeddings(
+        conn,
+        rows,
+        provider_name=provider_name,
+        model=model,
+        dimensions=dimensions,
+        write_vector_column=has_vector_column,
+    )
+    if not fell_back and len(rows) == len(pending):
+        await _store_catalog_hash(conn, model, catalog_hash, len(entries))
+
+    invalidate_catalog_indexes()
 
     logger.info(
-        "Semantic catalog ensured (entries=%d, provider=%s, model=%s, dims=%d)",
+        "Semantic catalog ensured (entries=%d, re-embedded=%d, provider=%s, model=%s, dims=%d)",
         len(entries),
+        len(rows),
         provider_name,
         model,
         dimensions,
@@ -0,0 +1,266 @@
+"""Process-wide vectorized index over the global semantic catalog embeddings.
+
+``update_semantic_memory`` used to reload and JSON-decode every catalog
+embedding on every event, then score each user term against each catalog
+row in pure Python. The catalog is global and changes only when
+``ensure_semantic_catalog`` runs, so each worker process keeps one
+``CatalogIndex`` per (domain, model): a pre-normalized float32 matrix plus
+the original vectors. A cheap version query (row count + latest
+``updated_at``) decides whether a cached index is still current.
+
+Matching all terms of a domain is one matrix multiply. The float32 scores
+only shortlist candidates: every row within ``_NEAR_MAX_TOLERANCE`` of a
+term's best score is re-scored with ``embeddings.cosine_similarity`` in
+catalog row order, so keys, labels, scores and tie-breaks are exactly those
+of the row-by-row scan (``best_match_reference``).
+
+Where pgvector is installed, ``pgvector_best_matches`` instead asks
+Postgres for each term's nearest catalog rows (one round-trip for all
+terms, served by the HNSW index) and re-scores that shortlist the same
+exact way. The ANN shortlist can in rare cases miss the exact best row,
+and ties go to the smaller canonical key rather than catalog row order.
+The domain/model filters apply after the HNSW scan, so the search widens
+``hnsw.ef_search`` for its transaction; terms that still come back with
+fewer than ``shortlist`` rows are left unresolved for the caller to match
+against the in-process ``CatalogIndex``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import psycopg
+
+from .embeddings import cosine_similarity, decode_embedding
+
+Match = tuple[str, str, float]
+
+# Far above the float32 rounding error of a dot product of unit vectors
+# (~dims * 2**-24), so the exact best row is always shortlisted.
+_NEAR_MAX_TOLERANCE = 1e-4
+
+# Nearest rows fetched per term in pgvector mode before exact re-scoring.
+PGVECTOR_SHORTLIST = 5
+
+# HNSW candidate list size for the top-k query. The default (40) is shared
+# by every domain and model in the index, so filtered scans can run dry.
+PGVECTOR_EF_SEARCH = 200
+
+
+def best_match_reference(
+    term_vec: list[float],
+    catalog_embeddings: list[dict[str, Any]],
+) -> Match | None:
+    """Row-by-row scan; the first row with the highest score wins."""
+    best: Match | None = None
+    for item in catalog_embeddings:
+        score = cosine_similarity(term_vec, item["embedding"])
+        if best is None or score > best[2]:
+            best = (item["canonical_key"], item["canonical_label"], score)
+    return best
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """Catalog rows of one (domain, model) ready for batched matching."""
+
+    version: tuple[Any, ...]
+    keys: list[str]
+    labels: list[str]
+    vectors: list[list[float]]
+    dimensions: int
+    # Normalized float32 rows for the vectors that can score non-zero,
+    # and their positions in ``keys``.
+    matrix: np.ndarray
+    matrix_rows: np.ndarray
+    # First row that always scores 0.0 (zero norm or foreign dimensions).
+    first_zero_row: int | None
+
+    @classmethod
+    def build(
+        cls,
+        catalog_embeddings: list[dict[str, Any]],
+        *,
+        version: tuple[Any, ...] = (),
+    ) -> CatalogIndex:
+        vectors = [list(item["embedding"]) for item in catalog_embeddings]
+        dims_counts = Counter(len(vec) for vec in vectors)
+        dimensions = dims_counts.most_common(1)[0][0] if dims_counts else 0
+
+        rows: list[int] = []
+        first_zero_row: int | None = None
+        for idx, vec in enumerate(vectors):
+            if len(vec) == dimensions and any(v != 0.0 for v in vec):
+                rows.append(idx)
+            elif first_zero_row is None:
+                first_zero_row = idx
+
+        if rows:
+            raw = np.asarray([vectors[idx] for idx in rows], dtype=np.float64)
+            matrix = (raw / np.linalg.norm(raw, axis=1, keepdims=True)).astype(np.float32)
+        else:
+            matrix = np.zeros((0, dimensions), dtype=np.float32)
+
+        return cls(
+            version=version,
+            keys=[str(item["canonical_key"]) for item in catalog_embeddings],
+            labels=[str(item["canonical_label"]) for item in catalog_embeddings],
+            vectors=vectors,
+            dimensions=dimensions,
+            matrix=matrix,
+            matrix_rows=np.asarray(rows, dtype=np.int64),
+            first_zero_row=first_zero_row,
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _exact_best(self, term_vec: list[float], candidates: list[int]) -> Match:
+        best_idx = candidates[0]
+        best_score = cosine_similarity(term_vec, self.vectors[best_idx])
+        for idx in candidates[1:]:
+            score = cosine_similarity(term_vec, self.vectors[idx])
+            if score > best_score:
+                best_idx, best_score = idx, score
+        return self.keys[best_idx], self.labels[best_idx], best_score
+
+    def best_matches(self, term_vectors: list[list[float]]) -> list[Match | None]:
+        """Best catalog row per term, identical to ``best_match_reference``."""
+        if not self.keys:
+            return [None] * len(term_vectors)
+
+        results: list[Match | None] = [None] * len(term_vectors)
+        scorable: list[int] = []
+        all_rows = list(range(len(self.keys)))
+        for pos, vec in enumerate(term_vectors):
+            if self.matrix.shape[0] and len(vec) == self.dimensions and any(v != 0.0 for v in vec):
+                scorable.append(pos)
+            else:
+                # Zero or foreign-dimension terms (never produced by one
+                # provider) take the plain scan.
+                results[pos] = self._exact_best(vec, all_rows)
+
+        if not scorable:
+            return results
+
+        queries = np.asarray([term_vectors[pos] for pos in scorable], dtype=np.float64)
+        queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+        scores = queries @ self.matrix.T
+        ceilings = scores.max(axis=1) - _NEAR_MAX_TOLERANCE
+
+        for qi, pos in enumerate(scorable):
+            shortlisted = self.matrix_rows[scores[qi] >= ceilings[qi]].tolist()
+            if self.first_zero_row is not None:
+                shortlisted.append(self.first_zero_row)
+            shortlisted.sort()
+            results[pos] = self._exact_best(term_vectors[pos], shortlisted)
+        return results
+
+
+def vector_literal(vec: list[float]) -> str:
+    """pgvector text input for ``vec``."""
+    return "[" + ",".join(f"{v:.8f}" for v in vec) + "]"
+
+
+async def pgvector_best_matches(
+    conn: psycopg.AsyncConnection[Any],
+    domain: str,
+    model: str,
+    term_vectors: list[list[float]],
+    *,
+    shortlist: int = PGVECTOR_SHORTLIST,
+    ef_search: int = PGVECTOR_EF_SEARCH,
+) -> list[Match | None]:
+    """Best catalog row per term via pgvector top-k search (one query).
+
+    Must run inside a transaction (``ef_search`` is set locally). Terms
+    with fewer than ``shortlist`` neighbours are returned as ``None``:
+    the filtered HNSW scan may have missed rows, so callers resolve them
+    with ``CatalogIndex``. Requires
+    ``semantic_catalog_embeddings.embedding_vec``; callers fall back to
+    ``CatalogIndex`` when the column or the extension is missing.
+    """
+    if not term_vectors:
+        return []
+    async with conn.cursor() as cur:
+        await cur.execute(
+            "SELECT set_config('hnsw.ef_search', %s, true)",
+            (str(max(ef_search, shortlist)),),
+        )
+        await cur.execute(
+            """
+            SELECT t.ord, m.canonical_key, m.canonical_label, m.embedding_f32, m.embedding
+            FROM unnest(%s::text[]) WITH ORDINALITY AS t(vec, ord)
+            CROSS JOIN LATERAL (
+                SELECT c.canonical_key, c.canonical_label, ce.embedding_f32,
+                       CASE WHEN ce.embedding_f32 IS NULL THEN ce.embedding END AS embedding
+                FROM semantic_catalog_embeddings ce
+                JOIN semantic_catalog c ON c.id = ce.catalog_id
+                WHERE c.domain = %s
+                  AND ce.model = %s
+                  AND ce.embedding_vec IS NOT NULL
+                ORDER BY ce.embedding_vec <=> t.vec::vector
+                LIMIT %s
+            ) m
+            """,
+            ([vector_literal(vec) for vec in term_vectors], domain, model, shortlist),
+            binary=True,
+        )
+        rows = await cur.fetchall()
+
+    results: list[Match | None] = [None] * len(term_vectors)
+    found = Counter(int(row[0]) - 1 for row in rows)
+    for ord_, key, label, embedding_f32, embedding in rows:
+        pos = int(ord_) - 1
+        if found[pos] < shortlist:
+            continue
+        stored = embedding_f32 if embedding_f32 is not None else embedding
+        score = cosine_similarity(term_vectors[pos], decode_embedding(stored).tolist())
+        best = results[pos]
+        if best is None or score > best[2] or (score == best[2] and str(key) < best[0]):
+            results[pos] = (str(key), str(label), score)
+    return results
+
+
+_indexes: dict[tuple[str, str], CatalogIndex] = {}
+
+
+async def catalog_version(
+    conn: psycopg.AsyncConnection[Any],
+    domain: str,
+    model: str,
+) -> tuple[Any, ...]:
+    """Cheap fingerprint of the catalog rows an index of (domain, model) covers."""
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            SELECT COUNT(*), MAX(ce.updated_at), MAX(c.updated_at)
+            FROM semantic_catalog c
+            JOIN semantic_catalog_embeddings ce ON ce.catalog_id = c.id
+            WHERE c.domain = %s
+              AND ce.model = %s
+            """,
+            (domain, model),
+        )
+        row = await cur.fetchone()
+    return tuple(row) if row is not None else ()
+
+
+def cached_catalog_index(domain: str, model: str, version: tuple[Any, ...]) -> CatalogIndex | None:
+    """The cached index of (domain, model) if it was built at ``version``."""
+    index = _indexes.get((domain, model))
+    if index is None or index.version != version:
+        return None
+    return index
+
+
+def store_catalog_index(domain: str, model: str, index: CatalogIndex) -> None:
+    _indexes[(domain, model)] = index
+
+
+def invalidate_catalog_indexes() -> None:
+    """Drop every cached index (after this process rewrote the catalog)."""
+    _indexes.clear()
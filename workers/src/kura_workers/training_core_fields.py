@@ -281,9 +281,26 @@ def _normalize_session_scope(
     return "unknown-session"
 
 
-def evaluate_set_context_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Apply mention defaults per session+exercise and flag missing persisted fields."""
-    defaults_by_scope: dict[tuple[str, str], dict[str, Any]] = {}
+def set_context_scope(row: dict[str, Any]) -> tuple[str, str]:
+    """(session scope, exercise scope) whose defaults ``row`` inherits."""
+    return (
+        _normalize_session_scope(row.get("metadata") or {}, row.get("timestamp")),
+        _normalize_exercise_scope(row.get("data") or {}),
+    )
+
+
+def evaluate_set_context_rows(
+    rows: list[dict[str, Any]],
+    *,
+    defaults_by_scope: dict[tuple[str, str], dict[str, Any]] | None = None,
+) -> list[dict[str, Any]]:
+    """Apply mention defaults per session+exercise and flag missing persisted fields.
+
+    ``defaults_by_scope`` lets callers carry scope defaults across calls (it is
+    updated in place), so rows appended later evaluate exactly as in one pass.
+    """
+    if defaults_by_scope is None:
+        defaults_by_scope = {}
     evaluations: list[dict[str, Any]] = []
 
     for row in rows:
@@ -293,9 +310,8 @@ def evaluate_set_context_rows(rows: list[dict[str, Any]]) -> list[dict[str, Any]
         mention_bound_fields = set(
             _CORE_FIELD_REGISTRY[modality].get("mention_bound", ())
         )
-        session_scope = _normalize_session_scope(metadata, row.get("timestamp"))
-        exercise_scope = _normalize_exercise_scope(data)
-        scope = (session_scope, exercise_scope)
+        scope = set_context_scope(row)
+        session_scope, exercise_scope = scope
         current_defaults = dict(defaults_by_scope.get(scope, {}))
 
         mentions = _extract_payload_mentions(data, metadata)
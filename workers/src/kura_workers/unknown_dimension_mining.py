@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 import hashlib
@@ -15,6 +16,8 @@ import psycopg
 from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
+from .utils import PerUserCappedBuckets, iter_server_rows
+
 logger = logging.getLogger(__name__)
 
 _KNOWN_DIMENSIONS = {"motivation_pre", "discomfort_signal", "jump_baseline"}
@@ -316,40 +319,51 @@ def _proposal_scores(
     return round(_clamp01(proposal_score), 6), round(_clamp01(confidence), 6), factors
 
 
+def new_unknown_dimension_buckets(
+    settings: UnknownDimensionMiningSettings,
+) -> PerUserCappedBuckets[UnknownObservationSample]:
+    return PerUserCappedBuckets(
+        max_per_user=settings.max_events_per_user_per_cluster,
+        sort_key=lambda item: (item.captured_at, item.event_id),
+        user_key=lambda item: item.pseudonymized_user_id,
+    )
+
+
+def add_unknown_dimension_sample(
+    buckets: PerUserCappedBuckets[UnknownObservationSample],
+    sample: UnknownObservationSample,
+) -> None:
+    # Cluster on scope + dimension seed; semantic fingerprint remains in evidence.
+    # This keeps grouping deterministic while avoiding over-fragmentation from
+    # small wording differences in free-form context text.
+    cluster_signature = f"{sample.scope_level}|{sample.dimension_seed}"
+    buckets.add((_period_key(sample.captured_at), cluster_signature), sample)
+
+
 def build_unknown_dimension_proposals(
     samples: list[UnknownObservationSample],
     *,
     settings: UnknownDimensionMiningSettings,
 ) -> tuple[list[dict[str, Any]], dict[str, int]]:
-    grouped: dict[tuple[str, str], list[UnknownObservationSample]] = defaultdict(list)
+    buckets = new_unknown_dimension_buckets(settings)
     for sample in samples:
-        # Cluster on scope + dimension seed; semantic fingerprint remains in evidence.
-        # This keeps grouping deterministic while avoiding over-fragmentation from
-        # small wording differences in free-form context text.
-        cluster_signature = f"{sample.scope_level}|{sample.dimension_seed}"
-        grouped[(_period_key(sample.captured_at), cluster_signature)].append(sample)
+        add_unknown_dimension_sample(buckets, sample)
+    return build_unknown_dimension_proposals_from_buckets(buckets, settings=settings)
+
 
+def build_unknown_dimension_proposals_from_buckets(
+    buckets: PerUserCappedBuckets[UnknownObservationSample],
+    *,
+    settings: UnknownDimensionMiningSettings,
+) -> tuple[list[dict[str, Any]], dict[str, int]]:
     proposals: list[dict[str, Any]] = []
     filtered_min_support = 0
     filtered_unique_users = 0
     dominance_dropped_events = 0
 
-    for key in sorted(grouped.keys()):
+    for key in buckets.groups():
         period_key, cluster_signature = key
-        bucket = sorted(
-            grouped[key],
-            key=lambda item: (item.captured_at, item.event_id),
-        )
-        per_user_counts: dict[str, int] = {}
-        capped_bucket: list[UnknownObservationSample] = []
-        dropped_for_bucket = 0
-        for sample in bucket:
-            current = per_user_counts.get(sample.pseudonymized_user_id, 0)
-            if current >= settings.max_events_per_user_per_cluster:
-                dropped_for_bucket += 1
-                continue
-            per_user_counts[sample.pseudonymized_user_id] = current + 1
-            capped_bucket.append(sample)
+        capped_bucket, dropped_for_bucket = buckets.capped(key)
         dominance_dropped_events += dropped_for_bucket
 
         event_count = len(capped_bucket)
@@ -490,7 +504,7 @@ def build_unknown_dimension_proposals(
     )
     limited = ordered[: settings.max_proposals_per_run]
     return limited, {
-        "groups_total": len(grouped),
+        "groups_total": len(buckets),
         "proposals_generated": len(limited),
         "filtered_min_support": filtered_min_support,
         "filtered_unique_users": filtered_unique_users,
@@ -506,29 +520,28 @@ async def _table_exists(conn: psycopg.AsyncConnection[Any], table_name: str) ->
     return bool(row and row.get("present"))
 
 
-async def _load_observation_rows(
+def _iter_observation_rows(
     conn: psycopg.AsyncConnection[Any],
     *,
     window_days: int,
-) -> list[dict[str, Any]]:
-    async with conn.cursor(row_factory=dict_row) as cur:
-        await cur.execute(
-            """
-            SELECT e.id::text AS event_id, e.user_id::text AS user_id, e.timestamp, e.data
-            FROM events e
-            WHERE e.event_type = 'observation.logged'
-              AND e.timestamp >= NOW() - make_interval(days => %s)
-              AND NOT EXISTS (
-                  SELECT 1
-                  FROM events r
-                  WHERE r.event_type = 'event.retracted'
-                    AND r.data->>'retracted_event_id' = e.id::text
-              )
-            ORDER BY e.timestamp ASC, e.id ASC
-            """,
-            (window_days,),
-        )
-        return await cur.fetchall()
+) -> AsyncIterator[dict[str, Any]]:
+    return iter_server_rows(
+        conn,
+        """
+        SELECT e.id::text AS event_id, e.user_id::text AS user_id, e.timestamp, e.data
+        FROM events e
+        WHERE e.event_type = 'observation.logged'
+          AND e.timestamp >= NOW() - make_interval(days => %s)
+          AND NOT EXISTS (
+              SELECT 1
+              FROM event_retractions r
+              WHERE r.retracted_event_id = e.id
+          )
+        ORDER BY e.timestamp ASC, e.id ASC
+        """,
+        (window_days,),
+        name="unknown_dimension_observations",
+    )
 
 
 def _sample_from_row(
@@ -674,17 +687,23 @@ async def refresh_unknown_dimension_proposals(
         )
         return summary
 
-    rows = await _load_observation_rows(conn, window_days=settings.window_days)
-    samples: list[UnknownObservationSample] = []
+    buckets = new_unknown_dimension_buckets(settings)
+    total_observations = 0
+    considered_observations = 0
     filtered_invalid_rows = 0
-    for row in rows:
+    async for row in _iter_observation_rows(conn, window_days=settings.window_days):
+        total_observations += 1
         sample, reason = _sample_from_row(row)
         if sample is not None:
-            samples.append(sample)
+            considered_observations += 1
+            add_unknown_dimension_sample(buckets, sample)
         elif reason != "known_dimension_skipped":
             filtered_invalid_rows += 1
 
-    proposals, stats = build_unknown_dimension_proposals(samples, settings=settings)
+    proposals, stats = build_unknown_dimension_proposals_from_buckets(
+        buckets,
+        settings=settings,
+    )
     existing_status_by_key = await _load_existing_status_by_key(conn)
     written = 0
     promoted_or_accepted_skipped = 0
@@ -761,8 +780,8 @@ async def refresh_unknown_dimension_proposals(
     summary = {
         "status": "success",
         "window_days": settings.window_days,
-        "total_observations": len(rows),
-        "considered_observations": len(samples),
+        "total_observations": total_observations,
+        "considered_observations": considered_observations,
         "proposals_generated": stats["proposals_generated"],
         "proposals_written": written,
         "filtered_invalid_rows": filtered_invalid_rows,
@@ -773,8 +792,8 @@ async def refresh_unknown_dimension_proposals(
         conn,
         status="success",
         settings=settings,
-        total_observations=len(rows),
-        considered_observations=len(samples),
+        total_observations=total_observations,
+        considered_observations=considered_observations,
         proposals_written=written,
         filtered_invalid_rows=filtered_invalid_rows,
         filtered_noise=filtered_noise,
@@ -1,14 +1,19 @@
 """Shared utility functions for Kura workers."""
 
+import bisect
 import logging
+import os
+from collections.abc import AsyncIterator, Callable, Hashable, Iterable
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Generic, TypeVar
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import psycopg
 from psycopg.rows import dict_row
 
+from .event_snapshot import active_event_snapshot
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_ASSUMED_TIMEZONE = "UTC"
@@ -389,6 +394,21 @@ async def load_timezone_preference(
     retracted_ids: set[str],
 ) -> str | None:
     """Load latest non-retracted timezone preference for day/week semantics."""
+    snapshot = active_event_snapshot(user_id)
+    memo_key = ("timezone_preference", frozenset(retracted_ids))
+    if snapshot is not None and memo_key in snapshot.memo:
+        return snapshot.memo[memo_key]
+    timezone_pref = await _query_timezone_preference(conn, user_id, retracted_ids)
+    if snapshot is not None:
+        snapshot.memo[memo_key] = timezone_pref
+    return timezone_pref
+
+
+async def _query_timezone_preference(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    retracted_ids: set[str],
+) -> str | None:
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
@@ -423,20 +443,98 @@ async def get_retracted_event_ids(
     retracted events from its full replay. Retractions are rare, so the
     set is typically empty — but filtering must happen on every call to
     handle the case where a retraction occurred between normal events.
+    Reads the event_retractions side table, which a trigger keeps in sync
+    with event.retracted inserts. Inside a projection dispatch the set is
+    read once and shared by all handlers (see event_snapshot).
     """
+    snapshot = active_event_snapshot(user_id)
+    if snapshot is not None and "retracted_ids" in snapshot.memo:
+        return set(snapshot.memo["retracted_ids"])
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
-            SELECT data->>'retracted_event_id' AS retracted_id
-            FROM events
+            SELECT retracted_event_id::text AS retracted_id
+            FROM event_retractions
             WHERE user_id = %s
-              AND event_type = 'event.retracted'
             """,
             (user_id,),
         )
         rows = await cur.fetchall()
 
-    return {row["retracted_id"] for row in rows if row["retracted_id"]}
+    retracted_ids = {row["retracted_id"] for row in rows if row["retracted_id"]}
+    if snapshot is not None:
+        snapshot.memo["retracted_ids"] = frozenset(retracted_ids)
+    return retracted_ids
+
+
+async def load_user_events(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    event_types: Iterable[str],
+    *,
+    retracted_ids: set[str],
+) -> list[dict[str, Any]]:
+    """Non-retracted events of the given types, ordered by (timestamp, id).
+
+    Rows carry id, event_type, timestamp, data and metadata. Inside a
+    projection dispatch whose snapshot covers the types, rows come from the
+    shared snapshot scan instead of a new query.
+    """
+    types = list(dict.fromkeys(event_types))
+    snapshot = active_event_snapshot(user_id)
+    if snapshot is not None and snapshot.covers(types):
+        await snapshot.load(conn)
+        rows = snapshot.rows(types)
+    else:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT id, event_type, timestamp, data, metadata
+                FROM events
+                WHERE user_id = %s
+                  AND event_type = ANY(%s)
+                ORDER BY timestamp ASC, id ASC
+                """,
+                (user_id, types),
+            )
+            rows = await cur.fetchall()
+    return [row for row in rows if str(row["id"]) not in retracted_ids]
+
+
+async def load_set_corrections(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    target_event_ids: Iterable[str],
+    *,
+    retracted_ids: set[str],
+) -> list[dict[str, Any]]:
+    """Non-retracted set.corrected events targeting the given set.logged ids."""
+    targets = {str(event_id) for event_id in target_event_ids}
+    if not targets:
+        return []
+    snapshot = active_event_snapshot(user_id)
+    if snapshot is not None and snapshot.covers(["set.corrected"]):
+        await snapshot.load(conn)
+        rows = [
+            row
+            for row in snapshot.rows(["set.corrected"])
+            if str((row.get("data") or {}).get("target_event_id")) in targets
+        ]
+    else:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT id, timestamp, data
+                FROM events
+                WHERE user_id = %s
+                  AND event_type = 'set.corrected'
+                  AND data->>'target_event_id' = ANY(%s)
+                ORDER BY timestamp ASC, id ASC
+                """,
+                (user_id, sorted(targets)),
+            )
+            rows = await cur.fetchall()
+    return [row for row in rows if str(row["id"]) not in retracted_ids]
 
 
 def resolve_exercise_key(data: dict[str, Any]) -> str | None:
@@ -469,6 +567,21 @@ async def get_alias_map(
 
     If retracted_ids is provided, excludes those events from the map.
     """
+    snapshot = active_event_snapshot(user_id)
+    memo_key = ("alias_map", frozenset(retracted_ids or ()))
+    if snapshot is not None and memo_key in snapshot.memo:
+        return dict(snapshot.memo[memo_key])
+    alias_map = await _query_alias_map(conn, user_id, retracted_ids)
+    if snapshot is not None:
+        snapshot.memo[memo_key] = dict(alias_map)
+    return alias_map
+
+
+async def _query_alias_map(
+    conn: psycopg.AsyncConnection[Any],
+    user_id: str,
+    retracted_ids: set[str] | None,
+) -> dict[str, str]:
     async with conn.cursor(row_factory=dict_row) as cur:
         await cur.execute(
             """
@@ -508,3 +621,91 @@ def find_all_keys_for_canonical(
         if target == canonical:
             keys.add(alias)
     return keys
+
+
+# ---------------------------------------------------------------------------
+# Global analytics scans (nightly clustering, calibration, mining, priors)
+# ---------------------------------------------------------------------------
+
+ANALYTICS_FETCH_SIZE_DEFAULT = 2000
+
+_SampleT = TypeVar("_SampleT")
+
+
+def analytics_fetch_size() -> int:
+    """Rows per round trip for streaming global scans (KURA_ANALYTICS_FETCH_SIZE)."""
+    raw = os.environ.get("KURA_ANALYTICS_FETCH_SIZE", str(ANALYTICS_FETCH_SIZE_DEFAULT)).strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return ANALYTICS_FETCH_SIZE_DEFAULT
+
+
+async def iter_server_rows(
+    conn: psycopg.AsyncConnection[Any],
+    query: str,
+    params: tuple[Any, ...] | None = None,
+    *,
+    name: str,
+    fetch_size: int | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Stream dict rows through a named server-side cursor.
+
+    Global scans over events/projections grow with the whole user base;
+    fetching them in bounded batches keeps only one batch in worker memory.
+    Server-side cursors live inside a transaction, which every job handler
+    already runs in.
+    """
+    async with conn.cursor(name=name, row_factory=dict_row) as cur:
+        cur.itersize = fetch_size or analytics_fetch_size()
+        await cur.execute(query, params)
+        async for row in cur:
+            yield row
+
+
+class PerUserCappedBuckets(Generic[_SampleT]):
+    """Grouped samples capped to the first N per user, built incrementally.
+
+    Equivalent to collecting every sample per group, sorting by
+    ``sort_key`` and keeping each user's first ``max_per_user`` entries, but
+    only the kept samples are ever held: memory is bounded by
+    groups x users x cap instead of by the number of scanned rows.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_per_user: int,
+        sort_key: Callable[[_SampleT], Any],
+        user_key: Callable[[_SampleT], str],
+    ) -> None:
+        self._max_per_user = max(1, max_per_user)
+        self._sort_key = sort_key
+        self._user_key = user_key
+        self._kept: dict[Hashable, dict[str, list[tuple[Any, int, _SampleT]]]] = {}
+        self._seen: dict[Hashable, int] = {}
+        self._sequence = 0
+
+    def add(self, group: Hashable, sample: _SampleT) -> None:
+        per_user = self._kept.setdefault(group, {})
+        kept = per_user.setdefault(self._user_key(sample), [])
+        # The sequence number keeps ties in arrival order (stable sort).
+        bisect.insort(kept, (self._sort_key(sample), self._sequence, sample))
+        self._sequence += 1
+        if len(kept) > self._max_per_user:
+            kept.pop()
+        self._seen[group] = self._seen.get(group, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._kept)
+
+    def groups(self) -> list[Hashable]:
+        return sorted(self._kept)
+
+    def capped(self, group: Hashable) -> tuple[list[_SampleT], int]:
+        """Kept samples of a group in sort order, plus the dropped count."""
+        entries = sorted(
+            entry for kept in self._kept.get(group, {}).values() for entry in kept
+        )
+        samples = [entry[2] for entry in entries]
+        return samples, self._seen.get(group, 0) - len(samples)
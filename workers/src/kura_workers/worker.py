@@ -1,14 +1,35 @@
 import asyncio
 import logging
 import signal
+import time
 from typing import Any
 
 import psycopg
 from psycopg.rows import dict_row
+from psycopg.types.json import Json
+from psycopg_pool import AsyncConnectionPool
 
+from .compute_executor import (
+    create_compute_executor,
+    install_compute_executor,
+    shutdown_compute_executor,
+)
 from .config import Config
-from .metrics import record_job_completed, record_job_dead, record_job_failed
-from .registry import get_handler
+from .db_pool import create_worker_pool, pool_stats
+from .job_coalescing import coalesce_projection_updates
+from .job_lanes import group_jobs_by_user, run_lanes
+from .metrics import (
+    record_job_completed,
+    record_jobs_coalesced,
+    record_job_dead,
+    record_job_duration,
+    record_job_failed,
+    record_queue_lag,
+    record_queue_wait,
+    record_slot_batch,
+    set_pool_stats_source,
+)
+from .registry import get_handler, get_projection_handlers
 from .scheduler import ensure_log_retention_job, ensure_nightly_inference_scheduler
 from .semantic_bootstrap import ensure_semantic_catalog
 from .system_config import ensure_system_config
@@ -20,6 +41,8 @@ class Worker:
     def __init__(self, config: Config) -> None:
         self.config = config
         self._shutdown = asyncio.Event()
+        self._pool: AsyncConnectionPool | None = None
+        self._last_scheduler_tick = float("-inf")
 
     async def run(self) -> None:
         """Main entry point: run listen + poll loops until shutdown."""
@@ -28,18 +51,43 @@ class Worker:
             loop.add_signal_handler(sig, self._request_shutdown)
 
         logger.info(
-            "Worker starting (poll_interval=%.1fs, batch_size=%d)",
+            "Worker starting (poll_interval=%.1fs, batch_size=%d, concurrency=%d, "
+            "db_pool=%d..%d, compute_workers=%d)",
             self.config.poll_interval_seconds,
             self.config.batch_size,
+            self.config.concurrency,
+            self.config.db_pool_min_size,
+            self.config.db_pool_max_size,
+            self.config.compute_workers,
         )
         if self.config.listen_database_url != self.config.database_url:
             logger.info("Worker LISTEN uses dedicated database URL")
 
-        # Write system_config on startup (deployment-static, before processing jobs)
-        async with await psycopg.AsyncConnection.connect(
-            self.config.database_url
-        ) as conn:
-            await conn.execute("SET ROLE app_worker")
+        self._pool = create_worker_pool(self.config)
+        await self._pool.open(wait=True)
+        set_pool_stats_source(lambda: pool_stats(self._pool))
+        install_compute_executor(
+            create_compute_executor(self.config),
+            timeout_seconds=self.config.compute_timeout_seconds,
+            factory=lambda: create_compute_executor(self.config),
+        )
+        try:
+            await self._startup()
+
+            # Run LISTEN and poll concurrently
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._listen_loop())
+                tg.create_task(self._poll_loop())
+        finally:
+            # In-flight jobs have finished once both loops returned.
+            await shutdown_compute_executor()
+            set_pool_stats_source(None)
+            await self._pool.close()
+            self._pool = None
+
+    async def _startup(self) -> None:
+        """Write system_config on startup (deployment-static, before processing jobs)."""
+        async with self._pool.connection() as conn:
             await ensure_system_config(conn)
             try:
                 await ensure_semantic_catalog(conn)
@@ -54,11 +102,6 @@ class Worker:
             except Exception as exc:
                 logger.warning("Log retention scheduler bootstrap skipped: %s", exc)
 
-        # Run LISTEN and poll concurrently
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(self._listen_loop())
-            tg.create_task(self._poll_loop())
-
     def _request_shutdown(self) -> None:
         logger.info("Shutdown requested")
         self._shutdown.set()
@@ -113,28 +156,70 @@ class Worker:
     async def _process_batch(self) -> None:
         """Claim and process a batch of pending jobs."""
         try:
-            async with await psycopg.AsyncConnection.connect(
-                self.config.database_url
-            ) as conn:
-                # Assume app_worker role for BYPASSRLS (cross-user event/projection access)
-                await conn.execute("SET ROLE app_worker")
-                await conn.commit()
-
-                try:
-                    await ensure_nightly_inference_scheduler(conn)
-                    await ensure_log_retention_job(conn)
-                    await conn.commit()
-                except Exception as exc:
-                    logger.warning("Recurring scheduler tick skipped: %s", exc)
+            concurrent = False
+            async with self._pool.connection() as conn:
+                await self._tick_schedulers(conn)
 
                 jobs = await self._claim_jobs(conn)
+                jobs = await self._coalesce_jobs(conn, jobs)
                 await conn.commit()  # Commit claims immediately so they survive crashes
+                claimed_at = time.monotonic()
+
+                concurrent = self.config.concurrency > 1 and len(jobs) > 1
+                if not concurrent:
+                    for job in jobs:
+                        record_queue_wait((time.monotonic() - claimed_at) * 1000)
+                        await self._process_job(conn, job)
 
-                for job in jobs:
-                    await self._process_job(conn, job)
+            # The claim connection goes back to the pool before slots check
+            # out their own.
+            if concurrent:
+                await self._process_concurrently(jobs, claimed_at)
         except Exception:
             logger.exception("Error in process_batch")
 
+    async def _tick_schedulers(self, conn: psycopg.AsyncConnection[Any]) -> None:
+        """Advance recurring schedulers, at most once per poll interval.
+
+        NOTIFY storms trigger many batches per second; the schedulers only
+        need to be checked on the poll cadence.
+        """
+        now = time.monotonic()
+        if now - self._last_scheduler_tick < self.config.poll_interval_seconds:
+            return
+        self._last_scheduler_tick = now
+        try:
+            await ensure_nightly_inference_scheduler(conn)
+            await ensure_log_retention_job(conn)
+            await conn.commit()
+        except Exception as exc:
+            await conn.rollback()
+            logger.warning("Recurring scheduler tick skipped: %s", exc)
+
+    async def _process_concurrently(
+        self, jobs: list[dict[str, Any]], claimed_at: float
+    ) -> None:
+        """Run a claimed batch across concurrency slots, serialized per user.
+
+        Jobs of the same user stay in one lane (claim order), so the router's
+        per-user advisory lock is never contended from inside this worker.
+        """
+        lanes = group_jobs_by_user(jobs)
+        stats = await run_lanes(
+            lanes,
+            slot_count=self.config.concurrency,
+            open_connection=self._pool.connection,
+            run_job=self._process_job,
+            claimed_at=claimed_at,
+        )
+        for wait_ms in stats.queue_wait_ms:
+            record_queue_wait(wait_ms)
+        record_slot_batch(stats.slots, stats.wall_ms, stats.busy_ms)
+        logger.debug(
+            "Batch of %d jobs in %d lanes ran on %d slots (utilization=%.2f)",
+            len(jobs), len(lanes), stats.slots, stats.utilization,
+        )
+
     async def _claim_jobs(
         self, conn: psycopg.AsyncConnection[Any]
     ) -> list[dict[str, Any]]:
@@ -151,11 +236,60 @@ class Worker:
                     LIMIT %s
                     FOR UPDATE SKIP LOCKED
                 )
-                RETURNING id, user_id, job_type, payload, attempt, max_retries
+                RETURNING id, user_id, job_type, payload, attempt, max_retries,
+                          EXTRACT(EPOCH FROM NOW() - scheduled_for) * 1000 AS queue_lag_ms
                 """,
                 (self.config.batch_size,),
             )
-            return await cur.fetchall()
+            jobs = await cur.fetchall()
+        for job in jobs:
+            record_queue_lag(job["job_type"], float(job["queue_lag_ms"] or 0.0))
+        return jobs
+
+    async def _coalesce_jobs(
+        self, conn: psycopg.AsyncConnection[Any], jobs: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Merge redundant projection.update jobs of the claimed batch.
+
+        Runs inside the claim transaction: the survivor's merged payload is
+        persisted (so a retry still covers every event) and absorbed jobs are
+        completed with a ``coalesced_into`` marker.
+        """
+        batch = coalesce_projection_updates(jobs)
+        if not batch.absorbed:
+            return jobs
+
+        handler_invocations_saved = 0
+        async with conn.cursor() as cur:
+            for job in batch.jobs:
+                absorbed_ids = batch.absorbed.get(job["id"])
+                if not absorbed_ids:
+                    continue
+                await cur.execute(
+                    "UPDATE background_jobs SET payload = %s WHERE id = %s",
+                    (Json(job["payload"]), job["id"]),
+                )
+                await cur.execute(
+                    """
+                    UPDATE background_jobs
+                    SET status = 'completed',
+                        completed_at = NOW(),
+                        payload = payload || jsonb_build_object('coalesced_into', %s::bigint)
+                    WHERE id = ANY(%s)
+                    """,
+                    (job["id"], absorbed_ids),
+                )
+                event_type = job["payload"].get("event_type", "")
+                handler_invocations_saved += len(absorbed_ids) * len(
+                    get_projection_handlers(event_type)
+                )
+                logger.debug(
+                    "Coalesced %d projection.update jobs into job %d (event_type=%s)",
+                    len(absorbed_ids), job["id"], event_type,
+                )
+
+        record_jobs_coalesced(batch.jobs_saved, handler_invocations_saved)
+        return batch.jobs
 
     async def _process_job(
         self, conn: psycopg.AsyncConnection[Any], job: dict[str, Any]
@@ -170,6 +304,7 @@ class Worker:
             await self._fail_job(conn, job_id, f"No handler for job_type={job_type}")
             return
 
+        started = time.monotonic()
         try:
             # Handler + job completion in one transaction — no crash window
             async with conn.transaction():
@@ -183,10 +318,12 @@ class Worker:
                     (job_id,),
                 )
             record_job_completed()
+            record_job_duration(job_type, (time.monotonic() - started) * 1000)
             logger.info("Job %d completed (type=%s)", job_id, job_type)
 
         except Exception as exc:
             # conn.transaction() context manager already rolled back
+            record_job_duration(job_type, (time.monotonic() - started) * 1000)
             logger.exception("Job %d failed (type=%s)", job_id, job_type)
 
             attempt = job["attempt"]
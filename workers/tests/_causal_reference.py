@@ -0,0 +1,491 @@
+"""Pure-Python reference estimators for causal_inference (test helper).
+
+This is the original gradient-descent implementation of the propensity/IPW
+point estimate, the AIPW cross-fit and the bootstrap. Production code uses the
+vectorized numpy backend in ``kura_workers.causal_inference``; this module
+lives with the tests so they can check numerical agreement, and
+``scripts/causal_inference_benchmark.py`` imports it to measure the speedup.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Any
+
+from kura_workers.causal_inference import _clamp, _mean, _normal_cdf, _quantile, _variance
+
+
+def _sigmoid(value: float) -> float:
+    if value >= 0:
+        exp_neg = math.exp(-value)
+        return 1.0 / (1.0 + exp_neg)
+    exp_pos = math.exp(value)
+    return exp_pos / (1.0 + exp_pos)
+
+
+def _standardize(matrix: list[list[float]]) -> tuple[list[list[float]], list[float], list[float]]:
+    if not matrix:
+        return [], [], []
+    cols = len(matrix[0])
+    means = [0.0] * cols
+    stds = [1.0] * cols
+
+    for col in range(cols):
+        col_vals = [row[col] for row in matrix]
+        mu = _mean(col_vals)
+        var = _variance(col_vals, center=mu)
+        sd = math.sqrt(max(var, 1e-12))
+        means[col] = mu
+        stds[col] = sd
+
+    standardized: list[list[float]] = []
+    for row in matrix:
+        standardized.append([(row[idx] - means[idx]) / stds[idx] for idx in range(cols)])
+    return standardized, means, stds
+
+
+def _fit_logistic(
+    features: list[list[float]],
+    targets: list[int],
+    *,
+    learning_rate: float = 0.12,
+    l2: float = 0.02,
+    iterations: int = 700,
+) -> tuple[float, list[float]]:
+    if not features:
+        return 0.0, []
+    n = len(features)
+    d = len(features[0])
+    bias = 0.0
+    weights = [0.0] * d
+
+    for step in range(iterations):
+        grad_b = 0.0
+        grad_w = [0.0] * d
+        for idx, row in enumerate(features):
+            z = bias + sum(weights[j] * row[j] for j in range(d))
+            prob = _sigmoid(z)
+            err = prob - targets[idx]
+            grad_b += err
+            for j in range(d):
+                grad_w[j] += err * row[j]
+
+        inv_n = 1.0 / max(1, n)
+        lr = learning_rate / (1.0 + 0.004 * step)
+        bias -= lr * (grad_b * inv_n)
+        for j in range(d):
+            grad = (grad_w[j] * inv_n) + (l2 * weights[j])
+            weights[j] -= lr * grad
+
+    return bias, weights
+
+
+def _fit_linear_regression(
+    features: list[list[float]],
+    targets: list[float],
+    *,
+    learning_rate: float = 0.08,
+    l2: float = 0.03,
+    iterations: int = 800,
+) -> tuple[float, list[float]]:
+    if not features:
+        return 0.0, []
+    n = len(features)
+    d = len(features[0])
+    bias = _mean(targets)
+    weights = [0.0] * d
+
+    for step in range(iterations):
+        grad_b = 0.0
+        grad_w = [0.0] * d
+        for idx, row in enumerate(features):
+            prediction = bias + sum(weights[j] * row[j] for j in range(d))
+            err = prediction - targets[idx]
+            grad_b += err
+            for j in range(d):
+                grad_w[j] += err * row[j]
+        inv_n = 1.0 / max(1, n)
+        lr = learning_rate / (1.0 + 0.003 * step)
+        bias -= lr * (grad_b * inv_n)
+        for j in range(d):
+            grad = (grad_w[j] * inv_n) + (l2 * weights[j])
+            weights[j] -= lr * grad
+    return bias, weights
+
+
+def _predict_linear(bias: float, weights: list[float], row: list[float]) -> float:
+    return bias + sum(weights[idx] * row[idx] for idx in range(min(len(weights), len(row))))
+
+
+def _standardize_with_reference(
+    matrix: list[list[float]],
+    means: list[float],
+    stds: list[float],
+) -> list[list[float]]:
+    if not matrix:
+        return []
+    out: list[list[float]] = []
+    for row in matrix:
+        out.append(
+            [
+                (row[idx] - means[idx]) / max(stds[idx], 1e-12)
+                for idx in range(min(len(row), len(means)))
+            ]
+        )
+    return out
+
+
+def _estimate_aipw_crossfit(
+    rows: list[dict[str, Any]],
+    feature_names: list[str],
+    *,
+    overlap_floor: float,
+    folds: int = 3,
+) -> dict[str, Any] | None:
+    n = len(rows)
+    if n < 12:
+        return None
+    folds = max(2, min(int(folds), n))
+
+    feature_matrix = [
+        [float(row["confounders"].get(name, 0.0)) for name in feature_names]
+        for row in rows
+    ]
+    treated = [int(row["treated"]) for row in rows]
+    outcomes = [float(row["outcome"]) for row in rows]
+
+    propensity_hat: list[float | None] = [None] * n
+    mu1_hat: list[float | None] = [None] * n
+    mu0_hat: list[float | None] = [None] * n
+    fold_sizes: list[int] = []
+
+    index_to_fold = {idx: (idx % folds) for idx in range(n)}
+    for fold_idx in range(folds):
+        test_indices = [idx for idx in range(n) if index_to_fold[idx] == fold_idx]
+        train_indices = [idx for idx in range(n) if index_to_fold[idx] != fold_idx]
+        if not test_indices or not train_indices:
+            return None
+
+        x_train_raw = [feature_matrix[idx] for idx in train_indices]
+        x_train, means, stds = _standardize(x_train_raw)
+        y_treat_train = [treated[idx] for idx in train_indices]
+        y_outcome_train = [outcomes[idx] for idx in train_indices]
+
+        treated_train_count = sum(y_treat_train)
+        control_train_count = len(y_treat_train) - treated_train_count
+        if treated_train_count < 3 or control_train_count < 3:
+            return None
+
+        prop_bias, prop_weights = _fit_logistic(x_train, y_treat_train)
+
+        treated_features = [x_train[i] for i, t in enumerate(y_treat_train) if t == 1]
+        treated_outcomes = [y_outcome_train[i] for i, t in enumerate(y_treat_train) if t == 1]
+        control_features = [x_train[i] for i, t in enumerate(y_treat_train) if t == 0]
+        control_outcomes = [y_outcome_train[i] for i, t in enumerate(y_treat_train) if t == 0]
+        if len(treated_features) < 3 or len(control_features) < 3:
+            return None
+
+        mu1_bias, mu1_weights = _fit_linear_regression(treated_features, treated_outcomes)
+        mu0_bias, mu0_weights = _fit_linear_regression(control_features, control_outcomes)
+
+        x_test_raw = [feature_matrix[idx] for idx in test_indices]
+        x_test = _standardize_with_reference(x_test_raw, means, stds)
+        fold_sizes.append(len(test_indices))
+        for pos, row_idx in enumerate(test_indices):
+            row = x_test[pos]
+            e_hat = _sigmoid(prop_bias + sum(prop_weights[j] * row[j] for j in range(len(prop_weights))))
+            e_hat = _clamp(e_hat, overlap_floor, 1.0 - overlap_floor)
+            propensity_hat[row_idx] = e_hat
+            mu1_hat[row_idx] = _predict_linear(mu1_bias, mu1_weights, row)
+            mu0_hat[row_idx] = _predict_linear(mu0_bias, mu0_weights, row)
+
+    if any(v is None for v in propensity_hat) or any(v is None for v in mu1_hat) or any(v is None for v in mu0_hat):
+        return None
+
+    e = [float(v) for v in propensity_hat]
+    mu1 = [float(v) for v in mu1_hat]
+    mu0 = [float(v) for v in mu0_hat]
+
+    pseudo_outcomes: list[float] = []
+    treated_props: list[float] = []
+    control_props: list[float] = []
+    aipw_weights: list[float] = []
+    treated_weights: list[float] = []
+    control_weights: list[float] = []
+    for idx in range(n):
+        t = treated[idx]
+        y = outcomes[idx]
+        e_i = _clamp(e[idx], overlap_floor, 1.0 - overlap_floor)
+        m1_i = mu1[idx]
+        m0_i = mu0[idx]
+        pseudo = m1_i - m0_i + (t * (y - m1_i) / e_i) - ((1 - t) * (y - m0_i) / (1.0 - e_i))
+        pseudo_outcomes.append(pseudo)
+
+        if t == 1:
+            treated_props.append(e_i)
+            w = 1.0 / e_i
+            treated_weights.append(w)
+            control_weights.append(0.0)
+            aipw_weights.append(w)
+        else:
+            control_props.append(e_i)
+            w = 1.0 / (1.0 - e_i)
+            treated_weights.append(0.0)
+            control_weights.append(w)
+            aipw_weights.append(w)
+
+    ate = _mean(pseudo_outcomes)
+    pseudo_var = _variance(pseudo_outcomes, center=ate)
+    if not math.isfinite(pseudo_var):
+        return None
+    effect_sd = math.sqrt(max(pseudo_var, 1e-9))
+    se = effect_sd / math.sqrt(max(1, n))
+    delta = 1.96 * max(se, 1e-9)
+    ci95 = [ate - delta, ate + delta]
+    probability_positive = 1.0 - _normal_cdf(0.0, ate, max(se, 1e-9))
+
+    treated_weight_sum = sum(treated_weights)
+    control_weight_sum = sum(control_weights)
+    treated_effective_n = (
+        (treated_weight_sum ** 2)
+        / max(sum(w * w for w in treated_weights if w > 0.0), 1e-9)
+    )
+    control_effective_n = (
+        (control_weight_sum ** 2)
+        / max(sum(w * w for w in control_weights if w > 0.0), 1e-9)
+    )
+    overlap_low = max(min(treated_props), min(control_props))
+    overlap_high = min(max(treated_props), max(control_props))
+    overlap_width = max(0.0, overlap_high - overlap_low)
+
+    return {
+        "ate": ate,
+        "ci95": ci95,
+        "effect_sd": effect_sd,
+        "probability_positive": probability_positive,
+        "folds": folds,
+        "fold_sizes": fold_sizes,
+        "diagnostics": {
+            "overlap": {
+                "treated_propensity_range": [min(treated_props), max(treated_props)],
+                "control_propensity_range": [min(control_props), max(control_props)],
+                "overlap_range": [overlap_low, overlap_high],
+                "overlap_width": overlap_width,
+            },
+            "weights": {
+                "max": max(aipw_weights),
+                "p95": _quantile(aipw_weights, 0.95),
+            },
+            "effective_sample_size": {
+                "treated": treated_effective_n,
+                "control": control_effective_n,
+            },
+        },
+    }
+
+
+def _weighted_mean(values: list[float], weights: list[float]) -> float:
+    total_weight = sum(weights)
+    if total_weight <= 0.0:
+        return 0.0
+    return sum(v * w for v, w in zip(values, weights)) / total_weight
+
+
+def _weighted_variance(values: list[float], weights: list[float], center: float) -> float:
+    total_weight = sum(weights)
+    if total_weight <= 0.0:
+        return 0.0
+    return sum(w * (v - center) ** 2 for v, w in zip(values, weights)) / total_weight
+
+
+def _standardized_mean_difference(
+    treated_values: list[float],
+    control_values: list[float],
+    treated_weights: list[float] | None = None,
+    control_weights: list[float] | None = None,
+) -> float:
+    if not treated_values or not control_values:
+        return 0.0
+
+    if treated_weights is None:
+        mu_t = _mean(treated_values)
+        var_t = _variance(treated_values, center=mu_t)
+    else:
+        mu_t = _weighted_mean(treated_values, treated_weights)
+        var_t = _weighted_variance(treated_values, treated_weights, mu_t)
+
+    if control_weights is None:
+        mu_c = _mean(control_values)
+        var_c = _variance(control_values, center=mu_c)
+    else:
+        mu_c = _weighted_mean(control_values, control_weights)
+        var_c = _weighted_variance(control_values, control_weights, mu_c)
+
+    denom = math.sqrt(max((var_t + var_c) / 2.0, 1e-12))
+    return (mu_t - mu_c) / denom
+
+
+def _estimate_once(
+    rows: list[dict[str, Any]],
+    feature_names: list[str],
+    *,
+    overlap_floor: float,
+) -> dict[str, Any] | None:
+    if not rows:
+        return None
+
+    outcomes = [float(row["outcome"]) for row in rows]
+    treated = [int(row["treated"]) for row in rows]
+    treated_rate = _mean([float(v) for v in treated])
+
+    if treated_rate <= 0.0 or treated_rate >= 1.0:
+        return None
+
+    feature_matrix = [
+        [float(row["confounders"].get(name, 0.0)) for name in feature_names]
+        for row in rows
+    ]
+    standardized_matrix, means, stds = _standardize(feature_matrix)
+
+    if feature_names:
+        bias, coefficients = _fit_logistic(standardized_matrix, treated)
+        propensity_raw = [
+            _sigmoid(bias + sum(coefficients[j] * row[j] for j in range(len(feature_names))))
+            for row in standardized_matrix
+        ]
+        model = {
+            "method": "logistic_gradient_descent",
+            "feature_names": feature_names,
+            "intercept": round(bias, 6),
+            "coefficients": {name: round(coefficients[idx], 6) for idx, name in enumerate(feature_names)},
+            "standardization": {
+                name: {"mean": round(means[idx], 6), "std": round(stds[idx], 6)}
+                for idx, name in enumerate(feature_names)
+            },
+        }
+    else:
+        propensity_raw = [treated_rate] * len(rows)
+        model = {
+            "method": "intercept_only",
+            "feature_names": [],
+            "intercept": round(math.log(treated_rate / (1.0 - treated_rate)), 6),
+            "coefficients": {},
+            "standardization": {},
+        }
+
+    propensities = [_clamp(p, overlap_floor, 1.0 - overlap_floor) for p in propensity_raw]
+
+    treated_weights: list[float] = []
+    control_weights: list[float] = []
+    all_weights: list[float] = []
+    for idx, is_treated in enumerate(treated):
+        if is_treated == 1:
+            w = treated_rate / max(propensities[idx], 1e-9)
+            treated_weights.append(w)
+            control_weights.append(0.0)
+        else:
+            w = (1.0 - treated_rate) / max(1.0 - propensities[idx], 1e-9)
+            treated_weights.append(0.0)
+            control_weights.append(w)
+        all_weights.append(w)
+
+    treated_weight_sum = sum(treated_weights)
+    control_weight_sum = sum(control_weights)
+    if treated_weight_sum <= 0.0 or control_weight_sum <= 0.0:
+        return None
+
+    treated_mean = sum(
+        outcomes[idx] * treated_weights[idx] for idx in range(len(rows))
+    ) / treated_weight_sum
+    control_mean = sum(
+        outcomes[idx] * control_weights[idx] for idx in range(len(rows))
+    ) / control_weight_sum
+    ate = treated_mean - control_mean
+
+    treated_effective_n = (
+        (treated_weight_sum ** 2)
+        / max(sum(w * w for w in treated_weights if w > 0.0), 1e-9)
+    )
+    control_effective_n = (
+        (control_weight_sum ** 2)
+        / max(sum(w * w for w in control_weights if w > 0.0), 1e-9)
+    )
+
+    treated_props = [propensities[idx] for idx, flag in enumerate(treated) if flag == 1]
+    control_props = [propensities[idx] for idx, flag in enumerate(treated) if flag == 0]
+    overlap_low = max(min(treated_props), min(control_props))
+    overlap_high = min(max(treated_props), max(control_props))
+    overlap_width = max(0.0, overlap_high - overlap_low)
+
+    before_balance: dict[str, float] = {}
+    after_balance: dict[str, float] = {}
+    if feature_names:
+        for idx, name in enumerate(feature_names):
+            t_vals = [standardized_matrix[row_idx][idx] for row_idx, flag in enumerate(treated) if flag == 1]
+            c_vals = [standardized_matrix[row_idx][idx] for row_idx, flag in enumerate(treated) if flag == 0]
+            t_w = [treated_weights[row_idx] for row_idx, flag in enumerate(treated) if flag == 1]
+            c_w = [control_weights[row_idx] for row_idx, flag in enumerate(treated) if flag == 0]
+            before_balance[name] = _standardized_mean_difference(t_vals, c_vals)
+            after_balance[name] = _standardized_mean_difference(
+                t_vals,
+                c_vals,
+                treated_weights=t_w,
+                control_weights=c_w,
+            )
+
+    mean_abs_before = _mean([abs(value) for value in before_balance.values()]) if before_balance else 0.0
+    mean_abs_after = _mean([abs(value) for value in after_balance.values()]) if after_balance else 0.0
+
+    return {
+        "ate": ate,
+        "weights": all_weights,
+        "propensities": propensities,
+        "model": model,
+        "diagnostics": {
+            "treated_weighted_mean": treated_mean,
+            "control_weighted_mean": control_mean,
+            "effective_sample_size": {
+                "treated": treated_effective_n,
+                "control": control_effective_n,
+            },
+            "overlap": {
+                "treated_propensity_range": [min(treated_props), max(treated_props)],
+                "control_propensity_range": [min(control_props), max(control_props)],
+                "overlap_range": [overlap_low, overlap_high],
+                "overlap_width": overlap_width,
+            },
+            "weights": {
+                "max": max(all_weights),
+                "p95": _quantile(all_weights, 0.95),
+            },
+            "balance": {
+                "before": {k: round(v, 4) for k, v in before_balance.items()},
+                "after": {k: round(v, 4) for k, v in after_balance.items()},
+                "mean_abs_smd_before": mean_abs_before,
+                "mean_abs_smd_after": mean_abs_after,
+            },
+        },
+    }
+
+
+def _bootstrap_ates(
+    rows: list[dict[str, Any]],
+    feature_names: list[str],
+    *,
+    overlap_floor: float,
+    bootstrap_samples: int,
+) -> list[float]:
+    rng = random.Random(42)
+    estimates: list[float] = []
+    n = len(rows)
+    if n == 0:
+        return estimates
+
+    for _ in range(bootstrap_samples):
+        sample = [rows[rng.randrange(n)] for _ in range(n)]
+        estimate = _estimate_once(sample, feature_names, overlap_floor=overlap_floor)
+        if estimate is None:
+            continue
+        estimates.append(float(estimate["ate"]))
+    return estimates
@@ -2,7 +2,20 @@
 
 from datetime import date
 
-from kura_workers.causal_inference import estimate_intervention_effect
+import numpy as np
+import pytest
+
+from kura_workers.causal_inference import (
+    _bootstrap_ates,
+    _design_matrix,
+    _estimate_aipw_crossfit,
+    _estimate_once,
+    _fit_linear_regression,
+    _fit_logistic,
+    _normalize_samples,
+    _standardize,
+    estimate_intervention_effect,
+)
 from kura_workers.handlers.causal_inference import (
     OUTCOME_STRENGTH_PER_EXERCISE,
     _append_result_caveats,
@@ -15,6 +28,8 @@ from kura_workers.handlers.causal_inference import (
     _supplement_adherence_intervention_flag,
 )
 
+from tests import _causal_reference as reference
+
 
 def test_causal_effect_insufficient_data():
     samples = [
@@ -386,3 +401,106 @@ def test_supplement_evidence_overlay_downgrades_when_placebo_lead_is_flagged():
         check for check in overlay["checks"] if check["check"] == "placebo_lead_sanity"
     )
     assert placebo_check["strong_pass"] is False
+
+
+def _confounded_samples(count: int = 120) -> list[dict]:
+    samples: list[dict] = []
+    for idx in range(count):
+        baseline = 0.1 + (0.8 * ((idx % 20) / 20.0))
+        sleep_hours = 6.0 + (0.4 * (idx % 5))
+        load_volume = 800.0 + (120.0 * (idx % 7))
+        propensity = 0.18 + (0.55 * baseline) + (0.04 * ((idx % 3) / 2.0))
+        treated = 1 if ((idx * 37) % 100) / 100.0 < max(0.05, min(0.95, propensity)) else 0
+        noise = (((idx * 17) % 13) - 6) / 300.0
+        outcome = (
+            (0.33 * baseline)
+            + (0.015 * (sleep_hours - 6.0))
+            - (0.00005 * load_volume)
+            + (0.09 * treated)
+            + noise
+        )
+        samples.append(
+            {
+                "treated": treated,
+                "outcome": outcome,
+                "confounders": {
+                    "baseline_readiness": baseline,
+                    "baseline_sleep_hours": sleep_hours,
+                    "baseline_load_volume": load_volume,
+                },
+            }
+        )
+    return samples
+
+
+def test_newton_logistic_reaches_gradient_descent_optimum():
+    rows, names = _normalize_samples(_confounded_samples(60))
+    features, treated, _ = _design_matrix(rows, names)
+    standardized, _, _ = _standardize(features)
+
+    bias, weights = _fit_logistic(standardized, treated)
+    ref_bias, ref_weights = reference._fit_logistic(
+        standardized.tolist(), treated.astype(int).tolist(), iterations=4000,
+    )
+
+    assert bias == pytest.approx(ref_bias, abs=5e-3)
+    assert weights.tolist() == pytest.approx(ref_weights, abs=5e-3)
+
+
+def test_ridge_closed_form_matches_gradient_descent():
+    rows, names = _normalize_samples(_confounded_samples(60))
+    features, _, outcomes = _design_matrix(rows, names)
+    standardized, _, _ = _standardize(features)
+
+    bias, weights = _fit_linear_regression(standardized, outcomes)
+    ref_bias, ref_weights = reference._fit_linear_regression(
+        standardized.tolist(), outcomes.tolist(),
+    )
+
+    assert bias == pytest.approx(ref_bias, abs=1e-6)
+    assert weights.tolist() == pytest.approx(ref_weights, abs=1e-4)
+
+
+def test_vectorized_estimates_match_reference_within_tolerance():
+    rows, names = _normalize_samples(_confounded_samples())
+
+    aipw = _estimate_aipw_crossfit(rows, names, overlap_floor=0.03)
+    ref_aipw = reference._estimate_aipw_crossfit(rows, names, overlap_floor=0.03)
+    assert aipw is not None and ref_aipw is not None
+    assert aipw["ate"] == pytest.approx(ref_aipw["ate"], abs=5e-3)
+    assert aipw["ci95"] == pytest.approx(ref_aipw["ci95"], abs=5e-3)
+    assert aipw["fold_sizes"] == ref_aipw["fold_sizes"]
+
+    ipw = _estimate_once(rows, names, overlap_floor=0.03)
+    ref_ipw = reference._estimate_once(rows, names, overlap_floor=0.03)
+    assert ipw is not None and ref_ipw is not None
+    assert ipw["ate"] == pytest.approx(ref_ipw["ate"], abs=5e-3)
+    assert ipw["diagnostics"]["balance"]["before"] == pytest.approx(
+        ref_ipw["diagnostics"]["balance"]["before"], abs=1e-4,
+    )
+    assert ipw["propensities"] == pytest.approx(ref_ipw["propensities"], abs=5e-3)
+
+
+def test_batched_bootstrap_matches_per_resample_estimates():
+    rows, names = _normalize_samples(_confounded_samples(48))
+    batched = _bootstrap_ates(rows, names, overlap_floor=0.03, bootstrap_samples=30)
+
+    indices = np.random.default_rng(42).integers(0, len(rows), size=(30, len(rows)))
+    looped = []
+    for resample in indices:
+        estimate = _estimate_once([rows[i] for i in resample], names, overlap_floor=0.03)
+        if estimate is not None:
+            looped.append(estimate["ate"])
+
+    assert batched == pytest.approx(looped, abs=1e-9)
+
+
+def test_bootstrap_handles_intercept_only_and_degenerate_resamples():
+    samples = [
+        {"treated": 1 if idx == 0 else 0, "outcome": float(idx), "confounders": {}}
+        for idx in range(6)
+    ]
+    rows, names = _normalize_samples(samples)
+    estimates = _bootstrap_ates(rows, names, overlap_floor=0.03, bootstrap_samples=40)
+    assert len(estimates) < 40
+    assert all(np.isfinite(estimates))
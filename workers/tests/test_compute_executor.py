@@ -0,0 +1,134 @@
+"""Tests for the CPU-bound compute process pool."""
+
+from __future__ import annotations
+
+import functools
+import math
+import os
+import time
+
+import pytest
+
+from kura_workers import compute_executor
+from kura_workers.compute_executor import (
+    ComputeTimeoutError,
+    compute_executor_stats,
+    create_compute_executor,
+    install_compute_executor,
+    run_compute,
+    shutdown_compute_executor,
+)
+from kura_workers.config import Config
+from kura_workers.inference_engine import run_strength_inference
+
+
+def _config(**overrides) -> Config:
+    values = {
+        "database_url": "postgresql://app@db/runtime",
+        "listen_database_url": "postgresql://app@db/runtime",
+        "compute_workers": 1,
+        "compute_start_method": "spawn",
+    }
+    values.update(overrides)
+    return Config(**values)
+
+
+@pytest.fixture
+async def compute_pool():
+    config = _config()
+    install_compute_executor(
+        create_compute_executor(config),
+        timeout_seconds=60.0,
+        factory=lambda: create_compute_executor(config),
+    )
+    yield
+    await shutdown_compute_executor()
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    for key in compute_executor._stats:
+        compute_executor._stats[key] = 0
+    compute_executor._cpu_seconds = 0.0
+    yield
+
+
+def test_zero_workers_disables_the_pool():
+    assert create_compute_executor(_config(compute_workers=0)) is None
+
+
+async def test_runs_inline_without_an_installed_executor():
+    assert await run_compute(math.hypot, 3.0, 4.0) == 5.0
+    stats = compute_executor_stats()
+    assert stats["inline"] == 1
+    assert stats["enabled"] is False
+
+
+async def test_offloads_to_child_process(compute_pool):
+    child_pid = await run_compute(os.getpid)
+    assert child_pid != os.getpid()
+
+    points = [(0.0, 100.0), (7.0, 101.5), (14.0, 103.0), (21.0, 104.2)]
+    offloaded = await run_compute(run_strength_inference, points, engine="closed_form")
+    assert offloaded == run_strength_inference(points, engine="closed_form")
+    assert compute_executor_stats()["completed"] == 2
+
+
+def _spin(seconds: float) -> int:
+    deadline = time.process_time() + seconds
+    spins = 0
+    while time.process_time() < deadline:
+        spins += 1
+    return spins
+
+
+async def test_child_cpu_time_is_accumulated(compute_pool):
+    assert await run_compute(_spin, 0.05) > 0
+    assert compute_executor_stats()["cpu_seconds"] >= 0.05
+
+
+async def test_timeout_uses_fallback(compute_pool):
+    result = await run_compute(
+        time.sleep,
+        1.0,
+        timeout=0.2,
+        fallback=lambda: "closed_form",
+    )
+    assert result == "closed_form"
+    stats = compute_executor_stats()
+    assert stats["timeouts"] == 1
+    assert stats["fallbacks"] == 1
+
+
+async def test_timeout_recycles_the_stuck_pool(compute_pool):
+    stuck = compute_executor._executor
+    stuck_pids = list(stuck._processes)
+    await run_compute(time.sleep, 30.0, timeout=0.2, fallback=lambda: None)
+
+    assert compute_executor._executor is not stuck
+    assert compute_executor_stats()["recycled_pools"] == 1
+    # The replacement pool serves the next call instead of queueing behind
+    # the stuck task.
+    assert await run_compute(os.getpid, timeout=10.0) not in stuck_pids
+
+
+async def test_timeout_without_fallback_raises(compute_pool):
+    with pytest.raises(ComputeTimeoutError):
+        await run_compute(time.sleep, 1.0, timeout=0.2)
+
+
+async def test_crashed_child_rebuilds_pool_and_falls_back(compute_pool):
+    broken = compute_executor._executor
+    result = await run_compute(
+        functools.partial(os._exit, 3),
+        fallback=lambda: "fallback",
+    )
+    assert result == "fallback"
+    assert compute_executor._executor is not broken
+    assert compute_executor_stats()["broken_pools"] == 1
+    assert await run_compute(math.sqrt, 16.0) == 4.0
+
+
+async def test_handler_errors_propagate(compute_pool):
+    with pytest.raises(ValueError):
+        await run_compute(math.sqrt, -1.0, fallback=lambda: 0.0)
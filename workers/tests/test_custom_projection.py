@@ -14,6 +14,8 @@ from kura_workers.handlers.custom_projection import (
     _compute_rule,
     _load_active_rules,
     has_matching_custom_rules,
+    invalidate_compiled_rules,
+    recompute_matching_rules,
     update_custom_projections,
 )
 from kura_workers.rule_models import CategorizedTrackingRule, FieldTrackingRule
@@ -43,6 +45,13 @@ def _make_mock_cursor(rows):
     return cursor
 
 
+@pytest.fixture(autouse=True)
+def _fresh_rule_cache():
+    invalidate_compiled_rules()
+    yield
+    invalidate_compiled_rules()
+
+
 class _MockCursorContext:
     """Context manager for mock cursor."""
     def __init__(self, cursor):
@@ -405,7 +414,9 @@ class TestUpdateCustomProjections:
 class TestHasMatchingCustomRules:
     async def test_no_projections(self):
         conn = AsyncMock()
-        with patch("kura_workers.handlers.custom_projection.get_retracted_event_ids",
+        with patch("kura_workers.handlers.custom_projection._rule_events_version",
+                   AsyncMock(return_value=(1, "t1"))), \
+             patch("kura_workers.handlers.custom_projection.get_retracted_event_ids",
                    AsyncMock(return_value=set())), \
              patch("kura_workers.handlers.custom_projection._load_active_rules",
                    AsyncMock(return_value={})):
@@ -422,7 +433,9 @@ class TestHasMatchingCustomRules:
                 "fields": ["hrv_rmssd"],
             }
         }
-        with patch("kura_workers.handlers.custom_projection.get_retracted_event_ids",
+        with patch("kura_workers.handlers.custom_projection._rule_events_version",
+                   AsyncMock(return_value=(1, "t1"))), \
+             patch("kura_workers.handlers.custom_projection.get_retracted_event_ids",
                    AsyncMock(return_value=set())), \
              patch("kura_workers.handlers.custom_projection._load_active_rules",
                    AsyncMock(return_value=active)):
@@ -440,9 +453,129 @@ class TestHasMatchingCustomRules:
                 "group_by": "name",
             }
         }
-        with patch("kura_workers.handlers.custom_projection.get_retracted_event_ids",
+        with patch("kura_workers.handlers.custom_projection._rule_events_version",
+                   AsyncMock(return_value=(1, "t1"))), \
+             patch("kura_workers.handlers.custom_projection.get_retracted_event_ids",
                    AsyncMock(return_value=set())), \
              patch("kura_workers.handlers.custom_projection._load_active_rules",
                    AsyncMock(return_value=active)):
             result = await has_matching_custom_rules(conn, "user-1", "sleep.logged")
         assert result is False
+
+
+# ---------------------------------------------------------------------------
+# Test: compiled rule sets
+# ---------------------------------------------------------------------------
+
+_CP = "kura_workers.handlers.custom_projection"
+
+_HRV_RULE = {
+    "name": "hrv_tracking",
+    "type": "field_tracking",
+    "source_events": ["sleep.logged"],
+    "fields": ["hrv_rmssd"],
+}
+_SUPPLEMENT_RULE = {
+    "name": "supplement_tracking",
+    "type": "categorized_tracking",
+    "source_events": ["supplement.logged", "sleep.logged"],
+    "fields": ["name", "dose_mg"],
+    "group_by": "name",
+}
+
+
+class TestCompiledRuleSet:
+    async def test_users_without_rule_events_skip_replay(self):
+        load_rules = AsyncMock(return_value={})
+        retracted = AsyncMock(return_value=set())
+        with patch(f"{_CP}._rule_events_version", AsyncMock(return_value=(0, None))), \
+             patch(f"{_CP}.get_retracted_event_ids", retracted), \
+             patch(f"{_CP}._load_active_rules", load_rules):
+            assert await has_matching_custom_rules(AsyncMock(), "user-1", "sleep.logged") is False
+        load_rules.assert_not_awaited()
+        retracted.assert_not_awaited()
+
+    async def test_rule_set_is_cached_until_rule_events_change(self):
+        load_rules = AsyncMock(return_value={"hrv_tracking": _HRV_RULE})
+        version = AsyncMock(return_value=(1, "t1"))
+        with patch(f"{_CP}._rule_events_version", version), \
+             patch(f"{_CP}.get_retracted_event_ids", AsyncMock(return_value=set())), \
+             patch(f"{_CP}._load_active_rules", load_rules):
+            assert await has_matching_custom_rules(AsyncMock(), "user-1", "sleep.logged")
+            assert not await has_matching_custom_rules(AsyncMock(), "user-1", "meal.logged")
+            assert load_rules.await_count == 1
+
+            version.return_value = (2, "t2")
+            load_rules.return_value = {}
+            assert not await has_matching_custom_rules(AsyncMock(), "user-1", "sleep.logged")
+            assert load_rules.await_count == 2
+
+    async def test_rule_lifecycle_event_invalidates_cache(self):
+        load_rules = AsyncMock(return_value={"hrv_tracking": _HRV_RULE})
+        with patch(f"{_CP}._rule_events_version", AsyncMock(return_value=(1, "t1"))), \
+             patch(f"{_CP}.get_retracted_event_ids", AsyncMock(return_value=set())), \
+             patch(f"{_CP}._load_active_rules", load_rules), \
+             patch(f"{_CP}._delete_custom_projection", AsyncMock()):
+            await has_matching_custom_rules(AsyncMock(), "user-1", "sleep.logged")
+            conn = AsyncMock()
+            cursor = _make_mock_cursor([{"data": {"name": "hrv_tracking"}}])
+            conn.cursor = MagicMock(return_value=_MockCursorContext(cursor))
+            await update_custom_projections(
+                conn,
+                {"user_id": "user-1", "event_type": "projection_rule.archived", "event_id": "e"},
+            )
+            await has_matching_custom_rules(AsyncMock(), "user-1", "sleep.logged")
+        assert load_rules.await_count == 2
+
+    async def test_recompute_evaluates_all_matching_rules_over_one_event_load(self):
+        events = [
+            _make_event("sleep.logged", {"hrv_rmssd": 55.0, "name": "sleep"},
+                        "2026-02-01T08:00:00+00:00", "evt-1"),
+            _make_event("supplement.logged", {"name": "Creatine", "dose_mg": 5000},
+                        "2026-02-01T09:00:00+00:00", "evt-2"),
+            _make_event("sleep.logged", {"hrv_rmssd": 61.0, "name": "sleep"},
+                        "2026-02-02T08:00:00+00:00", "evt-3"),
+        ]
+        load_events = AsyncMock(return_value=events)
+        upsert = AsyncMock()
+        with patch(f"{_CP}._rule_events_version", AsyncMock(return_value=(2, "t2"))), \
+             patch(f"{_CP}.get_retracted_event_ids", AsyncMock(return_value=set())), \
+             patch(f"{_CP}._load_active_rules", AsyncMock(return_value={
+                 "hrv_tracking": _HRV_RULE, "supplement_tracking": _SUPPLEMENT_RULE,
+             })), \
+             patch(f"{_CP}.load_timezone_preference", AsyncMock(return_value=None)), \
+             patch(f"{_CP}.load_user_events", load_events), \
+             patch(f"{_CP}._upsert_custom_projection", upsert):
+            await recompute_matching_rules(AsyncMock(), "user-1", "sleep.logged", "evt-3")
+
+        load_events.assert_awaited_once()
+        assert load_events.await_args.args[2] == ["sleep.logged", "supplement.logged"]
+        written = {call.args[2]: call.args[3] for call in upsert.await_args_list}
+        assert set(written) == {"hrv_tracking", "supplement_tracking"}
+        assert written["hrv_tracking"]["all_time"]["hrv_rmssd"]["count"] == 2
+        assert written["supplement_tracking"]["data_quality"]["total_events_processed"] == 3
+        assert written["supplement_tracking"]["categories"]["creatine"]["count"] == 1
+
+    async def test_recompute_matches_per_rule_computation(self):
+        events = [
+            _make_event("sleep.logged", {"hrv_rmssd": float(50 + i)},
+                        f"2026-02-{i + 1:02d}T08:00:00+00:00", f"evt-{i}")
+            for i in range(10)
+        ]
+        upsert = AsyncMock()
+        with patch(f"{_CP}._rule_events_version", AsyncMock(return_value=(1, "t1"))), \
+             patch(f"{_CP}.get_retracted_event_ids", AsyncMock(return_value=set())), \
+             patch(f"{_CP}._load_active_rules",
+                   AsyncMock(return_value={"hrv_tracking": _HRV_RULE})), \
+             patch(f"{_CP}.load_timezone_preference", AsyncMock(return_value=None)), \
+             patch(f"{_CP}.load_user_events", AsyncMock(return_value=events)), \
+             patch(f"{_CP}._upsert_custom_projection", upsert):
+            await recompute_matching_rules(AsyncMock(), "user-1", "sleep.logged")
+
+        conn = AsyncMock()
+        cursor = AsyncMock()
+        cursor.execute = AsyncMock()
+        cursor.fetchall = AsyncMock(side_effect=[[], events])
+        conn.cursor = MagicMock(return_value=_MockCursorContext(cursor))
+        expected = await _compute_rule(conn, "user-1", _HRV_RULE, set())
+        assert upsert.await_args.args[3] == expected
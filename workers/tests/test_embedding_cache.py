@@ -0,0 +1,158 @@
+"""Tests for the shared term embedding cache and cross-job batching."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from kura_workers import embedding_cache
+from kura_workers.embedding_cache import (
+    EmbeddingBatcher,
+    EmbeddingLRU,
+    clear_embedding_cache,
+    embed_terms,
+    embedding_cache_key,
+)
+from kura_workers.embeddings import EmbeddingProvider
+
+_DESCRIPTOR = {"provider": "hashing", "model": "m", "dimensions": 8}
+
+
+class _RecordingProvider(EmbeddingProvider):
+    def __init__(self, provider: str = "hashing") -> None:
+        super().__init__()
+        self.provider = provider
+        self.dimensions = 8
+        self.calls: list[list[str]] = []
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return super().embed_many(texts)
+
+
+class _Cursor:
+    def __init__(self, conn: "_CacheConn") -> None:
+        self._conn = conn
+        self._rows: list[dict] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql: str, params=None, **kwargs) -> None:
+        self._conn.statements.append(sql)
+        if "FROM semantic_embedding_cache" in sql:
+            _, keys = params
+            self._rows = [
+                {"content_hash": key, "embedding_f32": self._conn.table[key], "embedding": None}
+                for key in keys
+                if key in self._conn.table
+            ]
+        elif "INSERT INTO semantic_embedding_cache" in sql:
+            for key, packed in zip(params[3], params[5]):
+                self._conn.table.setdefault(key, packed)
+
+    async def fetchall(self):
+        return list(self._rows)
+
+
+class _CacheConn:
+    def __init__(self) -> None:
+        self.table: dict[str, bytes] = {}
+        self.statements: list[str] = []
+
+    def cursor(self, *args, **kwargs):
+        return _Cursor(self)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_embedding_cache()
+    yield
+    clear_embedding_cache()
+
+
+def test_cache_key_uses_normalized_text_and_provider():
+    assert embedding_cache_key(_DESCRIPTOR, "Bench  Press ") == embedding_cache_key(
+        _DESCRIPTOR, "bench press"
+    )
+    assert embedding_cache_key(_DESCRIPTOR, "bench press") != embedding_cache_key(
+        {**_DESCRIPTOR, "provider": "sentence_transformers"}, "bench press"
+    )
+
+
+def test_lru_evicts_least_recently_used():
+    lru = EmbeddingLRU(2)
+    lru.put("a", [1.0])
+    lru.put("b", [2.0])
+    assert lru.get("a") == [1.0]
+    lru.put("c", [3.0])
+
+    assert lru.get("b") is None
+    assert lru.get("a") == [1.0]
+    assert len(lru) == 2
+
+
+async def test_terms_are_embedded_once_across_users():
+    provider = _RecordingProvider()
+    conn = _CacheConn()
+
+    first = await embed_terms(conn, provider, ["bench press", "haferflocken"])
+    assert provider.calls == [["bench press", "haferflocken"]]
+    assert len(conn.table) == 2
+
+    # Another user typing the same terms: answered by the LRU, no query.
+    conn.statements.clear()
+    again = await embed_terms(conn, provider, ["haferflocken", "bench press"])
+    assert again == [first[1], first[0]]
+    assert conn.statements == []
+    assert len(provider.calls) == 1
+
+    # Another worker process: answered by the shared table.
+    clear_embedding_cache()
+    from_table = await embed_terms(conn, provider, ["bench press"])
+    assert from_table == [first[0]]
+    assert len(provider.calls) == 1
+
+
+async def test_batcher_merges_concurrent_requests():
+    provider = _RecordingProvider()
+    batcher = EmbeddingBatcher(provider, max_batch=100, max_wait_seconds=0.01)
+
+    results = await asyncio.gather(
+        batcher.embed_many(["squat", "deadlift"]),
+        batcher.embed_many(["squat"]),
+        batcher.embed_many(["oats"]),
+    )
+
+    assert provider.calls == [["squat", "deadlift", "oats"]]
+    assert batcher.batches == 1
+    assert results[0][0][0] == results[1][0][0]
+    assert all(fell_back is False for _, fell_back in results)
+
+
+async def test_batcher_flushes_at_max_batch():
+    provider = _RecordingProvider()
+    batcher = EmbeddingBatcher(provider, max_batch=2, max_wait_seconds=10.0)
+
+    vectors, _ = await asyncio.wait_for(batcher.embed_many(["a", "b"]), timeout=1.0)
+
+    assert len(vectors) == 2
+    assert provider.calls == [["a", "b"]]
+
+
+async def test_fallback_vectors_are_not_cached(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    provider = _RecordingProvider(provider="openai")
+    monkeypatch.setattr(embedding_cache, "_batchers", {})
+    conn = _CacheConn()
+
+    vectors = await embed_terms(conn, provider, ["rudern"])
+
+    assert len(vectors[0]) == 8
+    assert conn.table == {}
+    await embed_terms(conn, provider, ["rudern"])
+    assert len(provider.calls) == 2
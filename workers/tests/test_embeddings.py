@@ -1,6 +1,13 @@
 """Tests for embedding provider fallback + similarity helpers."""
 
-from kura_workers.embeddings import EmbeddingProvider, cosine_similarity
+import struct
+
+from kura_workers.embeddings import (
+    EmbeddingProvider,
+    cosine_similarity,
+    decode_embedding,
+    encode_embedding,
+)
 
 
 def test_hashing_embeddings_are_deterministic(monkeypatch):
@@ -21,3 +28,21 @@ def test_cosine_similarity_basic_behavior():
     assert abs(cosine_similarity([1.0, 0.0], [1.0, 0.0]) - 1.0) < 1e-6
     assert abs(cosine_similarity([1.0, 0.0], [0.0, 1.0])) < 1e-6
     assert cosine_similarity([], []) == 0.0
+
+
+def test_float32_embedding_round_trip_and_legacy_json():
+    vec = [0.25, -0.5, 1.0 / 3.0]
+    packed = encode_embedding(vec)
+
+    # Same layout as Postgres float4send (big-endian float32).
+    assert packed == struct.pack(">3f", *vec)
+    decoded = decode_embedding(packed).tolist()
+    assert decoded[:2] == [0.25, -0.5]
+    assert abs(decoded[2] - 1.0 / 3.0) < 1e-7
+    assert decode_embedding(memoryview(packed)).tolist() == decoded
+
+    assert decode_embedding([0.25, -0.5]).tolist() == [0.25, -0.5]
+    assert decode_embedding("[0.25, -0.5]").tolist() == [0.25, -0.5]
+    assert decode_embedding([0.25, None]).size == 0
+    assert decode_embedding(b"\x00\x01").size == 0
+    assert decode_embedding(None).size == 0
@@ -1,8 +1,10 @@
 """Unit tests for offline replay evaluation harness."""
 
 import asyncio
+import os
 from datetime import date, datetime, timedelta, timezone
 
+from kura_workers import eval_harness
 from kura_workers.eval_harness import (
     _shadow_tier_variants,
     build_cross_capability_release_gate,
@@ -24,6 +26,7 @@ from kura_workers.eval_harness import (
     summarize_projection_results,
     summarize_projection_results_by_source,
 )
+from kura_workers.inference_engine import run_strength_inference
 
 
 def _strength_history(values):
@@ -90,6 +93,106 @@ def test_evaluate_strength_history_insufficient_data():
     assert result["metrics"]["mae"] is None
 
 
+def test_evaluate_strength_history_replay_matches_per_window_refits(monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_FORECAST_DAYS", "14")
+    history = _strength_history(
+        [100, 101, 99.5, 102, 104, 103, 105, 108, 107.5, 109, 110, 109, 112, 113]
+    )
+    replayed = evaluate_strength_history("bench_press", history, strength_engine="closed_form")
+
+    def _refit_windows(model_points, strength_engine, stride, pool=None):
+        for i in range(2, len(model_points), stride):
+            yield i, run_strength_inference(model_points[: i + 1], engine=strength_engine)
+
+    monkeypatch.setattr(eval_harness, "_iter_strength_replay_windows", _refit_windows)
+    refit = evaluate_strength_history("bench_press", history, strength_engine="closed_form")
+
+    assert replayed == refit
+    assert replayed["replay_windows"] == 12
+    assert replayed["replay_window_stride"] == 1
+
+
+def test_evaluate_strength_history_pymc_fits_strided_windows(monkeypatch):
+    monkeypatch.setenv("KURA_EVAL_PYMC_WINDOW_STRIDE", "3")
+    monkeypatch.setenv("KURA_EVAL_PYMC_WORKERS", "1")
+    fitted: list[tuple[int, str]] = []
+
+    def _fit(points, strength_engine):
+        fitted.append((len(points), strength_engine))
+        return run_strength_inference(points, engine="closed_form")
+
+    monkeypatch.setattr(eval_harness, "_fit_strength_window", _fit)
+    result = evaluate_strength_history(
+        "bench_press",
+        _strength_history([100, 101, 102, 104, 105, 106, 108, 109, 110, 111]),
+        strength_engine="pymc",
+    )
+
+    assert fitted == [(3, "pymc"), (6, "pymc"), (9, "pymc")]
+    assert result["replay_windows"] == 3
+    assert result["replay_window_stride"] == 3
+
+
+def test_pymc_replay_pool_is_shared_across_histories(monkeypatch):
+    monkeypatch.setenv("KURA_EVAL_PYMC_WORKERS", "4")
+    pools: list["_InlinePool"] = []
+
+    class _InlinePool:
+        def __init__(self, **kwargs):
+            self.maps = 0
+            pools.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, *iterables):
+            self.maps += 1
+            return map(fn, *iterables)
+
+    monkeypatch.setattr(eval_harness, "ProcessPoolExecutor", _InlinePool)
+    monkeypatch.setattr(
+        eval_harness,
+        "_fit_strength_window",
+        lambda points, engine: run_strength_inference(points, engine="closed_form"),
+    )
+    rows = [
+        {
+            "id": f"{exercise}-{i}",
+            "event_type": "set.logged",
+            "timestamp": datetime(2026, 1, 1, 10, 0, tzinfo=timezone.utc) + timedelta(days=i * 7),
+            "data": {"exercise_id": exercise, "weight_kg": 100 + i, "reps": 5},
+            "metadata": {"session_id": f"session-{i}"},
+        }
+        for exercise in ("bench_press", "barbell_back_squat")
+        for i in range(12)
+    ]
+
+    results = evaluate_from_event_store_rows(
+        rows,
+        projection_types=["strength_inference"],
+        strength_engine="pymc",
+    )
+
+    assert len(results) == 2
+    assert len(pools) == 1
+    assert pools[0].maps == 2
+
+
+def test_eval_pymc_env_falls_back_on_invalid_values(monkeypatch):
+    monkeypatch.setenv("KURA_EVAL_PYMC_WINDOW_STRIDE", "every-other")
+    monkeypatch.setenv("KURA_EVAL_PYMC_WORKERS", "many")
+    assert eval_harness._eval_pymc_window_stride() == 4
+    assert eval_harness._eval_pymc_workers() == (os.cpu_count() or 1)
+
+    monkeypatch.setenv("KURA_EVAL_PYMC_WINDOW_STRIDE", "0")
+    monkeypatch.setenv("KURA_EVAL_PYMC_WORKERS", "-2")
+    assert eval_harness._eval_pymc_window_stride() == 1
+    assert eval_harness._eval_pymc_workers() == 1
+
+
 def test_evaluate_readiness_daily_scores_ok():
     result = evaluate_readiness_daily_scores(
         "overview",
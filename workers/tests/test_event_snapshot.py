@@ -0,0 +1,184 @@
+"""Tests for the per-dispatch event snapshot shared by projection handlers."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from kura_workers.event_snapshot import active_event_snapshot, event_snapshot
+from kura_workers.handlers.router import handle_projection_update
+from kura_workers.utils import (
+    get_alias_map,
+    get_retracted_event_ids,
+    load_set_corrections,
+    load_timezone_preference,
+    load_user_events,
+)
+
+_T0 = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _event(event_id: str, event_type: str, minutes: int, **data) -> dict:
+    return {
+        "id": event_id,
+        "event_type": event_type,
+        "timestamp": _T0 + timedelta(minutes=minutes),
+        "data": data,
+        "metadata": {},
+    }
+
+
+_EVENTS = [
+    _event("00000000-0000-0000-0000-000000000001", "set.logged", 0, exercise_id="bench"),
+    _event("00000000-0000-0000-0000-000000000002", "exercise.alias_created", 1,
+           alias="bp", exercise_id="bench"),
+    _event("00000000-0000-0000-0000-000000000003", "set.corrected", 2,
+           target_event_id="00000000-0000-0000-0000-000000000001"),
+    _event("00000000-0000-0000-0000-000000000004", "set.logged", 2, exercise_id="squat"),
+    _event("00000000-0000-0000-0000-000000000005", "preference.set", 3,
+           key="timezone", value="Europe/Berlin"),
+]
+_RETRACTED = "00000000-0000-0000-0000-000000000004"
+
+
+class _ScriptedCursor:
+    def __init__(self, conn: "_ScriptedConn") -> None:
+        self._conn = conn
+        self._rows: list[dict] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql: str, params=None) -> None:
+        self._conn.queries.append(sql)
+        if "FROM event_retractions" in sql:
+            self._rows = [{"retracted_id": _RETRACTED}]
+        elif "target_event_id' = ANY(%s)" in sql:
+            targets = set(params[1])
+            self._rows = [
+                dict(row) for row in _EVENTS
+                if row["event_type"] == "set.corrected"
+                and row["data"].get("target_event_id") in targets
+            ]
+        elif "event_type = ANY(%s)" in sql:
+            types = set(params[1])
+            self._rows = [dict(row) for row in _EVENTS if row["event_type"] in types]
+        elif "'exercise.alias_created'" in sql:
+            self._rows = [dict(row) for row in _EVENTS if row["event_type"] == "exercise.alias_created"]
+        elif "'preference.set'" in sql:
+            self._rows = [dict(row) for row in _EVENTS if row["event_type"] == "preference.set"]
+        else:
+            self._rows = []
+
+    async def fetchall(self):
+        return self._rows
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+
+class _ScriptedConn:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    def cursor(self, row_factory=None):
+        return _ScriptedCursor(self)
+
+
+async def _load_everything(conn, user_id: str) -> dict:
+    retracted = await get_retracted_event_ids(conn, user_id)
+    return {
+        "retracted": retracted,
+        "alias_map": await get_alias_map(conn, user_id, retracted_ids=retracted),
+        "timezone": await load_timezone_preference(conn, user_id, retracted),
+        "sets": await load_user_events(conn, user_id, ("set.logged",), retracted_ids=retracted),
+        "mixed": await load_user_events(
+            conn, user_id, ("set.corrected", "set.logged"), retracted_ids=retracted
+        ),
+        "corrections": await load_set_corrections(
+            conn,
+            user_id,
+            ["00000000-0000-0000-0000-000000000001"],
+            retracted_ids=retracted,
+        ),
+    }
+
+
+@pytest.mark.asyncio
+async def test_snapshot_serves_the_same_results_as_direct_queries():
+    direct_conn = _ScriptedConn()
+    direct = await _load_everything(direct_conn, "u1")
+
+    snapshot_conn = _ScriptedConn()
+    with event_snapshot("u1", {"set.logged", "set.corrected", "exercise.alias_created"}):
+        first = await _load_everything(snapshot_conn, "u1")
+        queries_after_first = len(snapshot_conn.queries)
+        second = await _load_everything(snapshot_conn, "u1")
+
+    assert first == direct == second
+    assert [row["id"][-1] for row in first["mixed"]] == ["1", "3"]
+    assert first["alias_map"] == {"bp": "bench"}
+    assert first["timezone"] == "Europe/Berlin"
+    # retractions + alias map + timezone + one event scan; the second
+    # handler's loads are all served from the snapshot.
+    assert queries_after_first == 4
+    assert len(snapshot_conn.queries) == queries_after_first
+
+
+@pytest.mark.asyncio
+async def test_snapshot_rows_are_copies_and_uncovered_types_query():
+    conn = _ScriptedConn()
+    with event_snapshot("u1", {"set.logged"}) as snapshot:
+        rows = await load_user_events(conn, "u1", ("set.logged",), retracted_ids=set())
+        rows[0]["effective_data"] = {"mutated": True}
+        again = await load_user_events(conn, "u1", ("set.logged",), retracted_ids=set())
+        assert "effective_data" not in again[0]
+
+        await load_user_events(conn, "u1", ("preference.set",), retracted_ids=set())
+        assert len(conn.queries) == 2
+
+        snapshot.invalidate()
+        await load_user_events(conn, "u1", ("set.logged",), retracted_ids=set())
+        assert len(conn.queries) == 3
+
+        # Other users never see this dispatch's snapshot.
+        assert active_event_snapshot("u2") is None
+    assert active_event_snapshot("u1") is None
+
+
+@pytest.mark.asyncio
+async def test_router_opens_snapshot_over_declared_event_types():
+    seen: list[frozenset] = []
+
+    async def handler(conn, payload):
+        seen.append(active_event_snapshot("u1").event_types)
+
+    handler.__name__ = "snapshot_probe_handler"
+    conn = AsyncMock()
+    conn.transaction = MagicMock(return_value=AsyncMock())
+    cursor = AsyncMock()
+    cursor.fetchone = AsyncMock(return_value=(True,))
+    cursor.__aenter__.return_value = cursor
+    conn.cursor = MagicMock(return_value=cursor)
+
+    with patch("kura_workers.handlers.router.get_projection_handlers", return_value=[handler]), \
+         patch(
+             "kura_workers.handlers.router.get_handler_event_types",
+             return_value=frozenset({"set.logged", "session.logged"}),
+         ), \
+         patch(
+             "kura_workers.handlers.custom_projection.has_matching_custom_rules",
+             new_callable=AsyncMock,
+             return_value=False,
+         ):
+        await handle_projection_update(
+            conn, {"event_type": "set.logged", "user_id": "u1", "event_id": "e1"}
+        )
+
+    assert seen == [frozenset({"set.logged", "session.logged"})]
+    assert active_event_snapshot("u1") is None
@@ -1,10 +1,26 @@
 """Tests for exercise_progression handler pure functions and data handling."""
 
+import json
+import math
+import random
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from kura_workers.capability_estimation_runtime import (
+    summarize_observations,
+    summarize_running_observations,
+)
 from kura_workers.handlers.exercise_progression import (
+    _CONTEXT_SCOPE_WINDOW,
+    _SESSION_FILTER_BYTES,
+    _STATE_ANOMALY_LIMIT,
+    _fold_progression_row,
+    _fold_progression_rows,
     _infer_rir_from_rpe,
     _iso_week,
     _manifest_contribution,
     _normalize_rir,
+    _ProgressionAccumulator,
     _resolve_set_rir,
 )
 from kura_workers.utils import (
@@ -13,7 +29,6 @@ from kura_workers.utils import (
     resolve_exercise_key,
     resolve_through_aliases,
 )
-from datetime import date
 
 
 class TestEpley1RM:
@@ -180,3 +195,248 @@ class TestRirHelpers:
         rir, source = _resolve_set_rir({"rpe": 8}, 8.0)
         assert rir == 2.0
         assert source == "inferred_from_rpe"
+
+
+# ---------------------------------------------------------------------------
+# Incremental accumulator: replay equivalence
+# ---------------------------------------------------------------------------
+
+_TZ_CONTEXT = {
+    "timezone": "Europe/Berlin",
+    "source": "preference",
+    "assumed": False,
+    "assumption_disclosure": None,
+}
+
+
+# Module-local generator: event ids stay deterministic without touching the
+# global random state other tests may rely on.
+_ID_RNG = random.Random(20260303)
+
+
+def _set_row(ts: datetime, data: dict, metadata: dict | None = None) -> dict:
+    return {
+        "id": str(uuid.UUID(int=_ID_RNG.getrandbits(128))),
+        "event_type": "set.logged",
+        "timestamp": ts,
+        "data": data,
+        "metadata": metadata or {},
+    }
+
+
+def _synthetic_history(seed: int = 7) -> list[dict]:
+    """~40 weeks of squat sets: explicit + inferred sessions, mixed effort fields."""
+    rng = random.Random(seed)
+    rows: list[dict] = []
+    start = datetime(2025, 3, 3, 17, 0, tzinfo=timezone.utc)
+    for week in range(40):
+        for day_offset in (0, 3):
+            day = start + timedelta(weeks=week, days=day_offset)
+            explicit_session = week % 3 == 0
+            session_meta = {"session_id": f"s-{week}-{day_offset}"} if explicit_session else {}
+            for set_index in range(3):
+                data: dict = {
+                    "exercise_id": "barbell_back_squat",
+                    "weight_kg": 80 + week * 1.5 + rng.choice([0, 2.5, 5]),
+                    "reps": rng.choice([3, 5, 8]),
+                }
+                if set_index == 0:
+                    data["rest_seconds"] = 120
+                if rng.random() < 0.5:
+                    data["rpe"] = rng.choice([7, 8, 8.5, 9])
+                elif rng.random() < 0.3:
+                    data["rir"] = rng.choice([1, 2, 3])
+                if week == 12 and set_index == 1:
+                    data["grip"] = "wide"  # unknown field -> observed_attributes
+                if week == 20 and set_index == 2:
+                    data["weight_kg"] = 900  # anomaly
+                if week == 25 and day_offset == 3 and set_index == 0:
+                    data["implements_type"] = "smith_machine"  # secondary group
+                rows.append(
+                    _set_row(day + timedelta(minutes=4 * set_index), data, dict(session_meta))
+                )
+    rows.sort(key=lambda r: (r["timestamp"], r["id"]))
+    return rows
+
+
+def _roundtrip(acc: _ProgressionAccumulator) -> _ProgressionAccumulator:
+    restored = _ProgressionAccumulator.from_state(json.loads(json.dumps(acc.to_state())))
+    assert restored is not None
+    return restored
+
+
+def _assert_close(left, right, path="$"):
+    if path.endswith(".generated_at"):
+        return
+    if isinstance(left, float) or isinstance(right, float):
+        assert math.isclose(float(left), float(right), rel_tol=1e-9, abs_tol=1e-6), path
+    elif isinstance(left, dict):
+        assert set(left) == set(right), path
+        for key in left:
+            _assert_close(left[key], right[key], f"{path}.{key}")
+    elif isinstance(left, list):
+        assert len(left) == len(right), path
+        for index, (a, b) in enumerate(zip(left, right)):
+            _assert_close(a, b, f"{path}[{index}]")
+    else:
+        assert left == right, path
+
+
+class TestProgressionAccumulatorReplayEquivalence:
+    def test_incremental_fold_matches_full_replay_at_every_step(self):
+        rows = _synthetic_history()
+        alias_keys = ["barbell_back_squat"]
+        acc = _fold_progression_rows(rows[:1], timezone_name="Europe/Berlin", alias_keys=alias_keys)
+        fallbacks = 0
+
+        for index in range(1, len(rows)):
+            row = rows[index]
+            acc = _roundtrip(acc)
+            blocker = acc.incremental_blocker(
+                row, alias_keys=alias_keys, timezone_name="Europe/Berlin",
+            )
+            if blocker is None:
+                _fold_progression_row(acc, row)
+            else:
+                fallbacks += 1
+                acc = _fold_progression_rows(
+                    rows[: index + 1], timezone_name="Europe/Berlin", alias_keys=alias_keys,
+                )
+
+            full = _fold_progression_rows(
+                rows[: index + 1], timezone_name="Europe/Berlin", alias_keys=alias_keys,
+            )
+            _assert_close(
+                acc.build_projection("barbell_back_squat", _TZ_CONTEXT),
+                full.build_projection("barbell_back_squat", _TZ_CONTEXT),
+            )
+
+        # Only the secondary-group set and the set after it leave the fast path.
+        assert fallbacks == 2
+
+    def test_state_is_pruned_to_windows(self):
+        rows = _synthetic_history()
+        acc = _fold_progression_rows(
+            rows, timezone_name="Europe/Berlin", alias_keys=["barbell_back_squat"],
+        )
+        state = acc.to_state()
+        assert len(state["week_data"]) == 26
+        assert len({entry["_session_key"] for entry in state["recent_sets"]}) == 5
+        assert len(state["recent_sets"]) < len(rows)
+        assert len(state["session_last_ts"]) == 5
+        assert state["session_count"] == 80
+        assert len(state["context_defaults"]) == _CONTEXT_SCOPE_WINDOW
+        assert _roundtrip(acc).build_projection(
+            "barbell_back_squat", _TZ_CONTEXT,
+        )["total_sessions"] == 80
+
+    def test_pruned_context_scope_forces_full_replay(self):
+        rows = _synthetic_history()
+        acc = _fold_progression_rows(
+            rows, timezone_name="Europe/Berlin", alias_keys=["barbell_back_squat"],
+        )
+        restored = _roundtrip(acc)
+        # Isolate the scope check from the session filter.
+        restored.session_filter = bytearray(_SESSION_FILTER_BYTES)
+        late = _set_row(
+            rows[-1]["timestamp"] + timedelta(days=1),
+            {"exercise_id": "barbell_back_squat", "weight_kg": 100, "reps": 5},
+            {"session_id": "s-0-0"},
+        )
+        assert restored.incremental_blocker(
+            late, alias_keys=["barbell_back_squat"], timezone_name="Europe/Berlin",
+        ) == "context_scope_outside_window"
+
+    def test_anomalies_are_emitted_in_full_and_block_persisting(self):
+        start = datetime(2025, 3, 3, 17, 0, tzinfo=timezone.utc)
+        rows = [
+            _set_row(
+                start + timedelta(days=index),
+                {"exercise_id": "barbell_back_squat", "weight_kg": 900, "reps": 5},
+            )
+            for index in range(_STATE_ANOMALY_LIMIT + 10)
+        ]
+        acc = _fold_progression_rows(
+            rows[:_STATE_ANOMALY_LIMIT],
+            timezone_name="Europe/Berlin",
+            alias_keys=["barbell_back_squat"],
+        )
+        assert acc.fits_state_limits()
+
+        acc = _fold_progression_rows(
+            rows, timezone_name="Europe/Berlin", alias_keys=["barbell_back_squat"],
+        )
+        anomalies = acc.build_projection("barbell_back_squat", _TZ_CONTEXT)["data_quality"]["anomalies"]
+        assert len(anomalies) == len(rows)
+        assert anomalies[-1]["event_id"] == rows[-1]["id"]
+        assert not acc.fits_state_limits()
+
+    def test_running_summary_matches_two_pass_summary(self):
+        values = [101.5, 99.0, 104.25, 97.5, 110.0]
+        count, mean, m2 = 0, 0.0, 0.0
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+        expected_mean, expected_sd = summarize_observations(values)
+        running_mean, running_sd = summarize_running_observations(count, mean, m2)
+        assert math.isclose(running_mean, expected_mean)
+        assert math.isclose(running_sd, expected_sd)
+        assert summarize_running_observations(1, 80.0, 0.0) == summarize_observations([80.0])
+        assert summarize_running_observations(0, 0.0, 0.0) == summarize_observations([])
+
+
+class TestProgressionAccumulatorBlockers:
+    def _acc(self):
+        rows = _synthetic_history()[:30]
+        return rows, _fold_progression_rows(
+            rows, timezone_name="Europe/Berlin", alias_keys=["barbell_back_squat"],
+        )
+
+    def test_out_of_order_and_duplicate_events_need_full_replay(self):
+        rows, acc = self._acc()
+        kwargs = {"alias_keys": ["barbell_back_squat"], "timezone_name": "Europe/Berlin"}
+        assert acc.incremental_blocker(rows[-1], **kwargs) == "out_of_order"
+        backdated = _set_row(
+            rows[0]["timestamp"] - timedelta(days=1),
+            {"exercise_id": "barbell_back_squat", "weight_kg": 80, "reps": 5},
+        )
+        assert acc.incremental_blocker(backdated, **kwargs) == "out_of_order"
+
+    def test_alias_and_timezone_changes_need_full_replay(self):
+        rows, acc = self._acc()
+        new_row = _set_row(
+            rows[-1]["timestamp"] + timedelta(days=1),
+            {"exercise_id": "barbell_back_squat", "weight_kg": 100, "reps": 5},
+        )
+        assert acc.incremental_blocker(
+            new_row, alias_keys=["barbell_back_squat", "kniebeuge"], timezone_name="Europe/Berlin",
+        ) == "alias_map_changed"
+        assert acc.incremental_blocker(
+            new_row, alias_keys=["barbell_back_squat"], timezone_name="UTC",
+        ) == "timezone_changed"
+        assert acc.incremental_blocker(
+            new_row, alias_keys=["barbell_back_squat"], timezone_name="Europe/Berlin",
+        ) is None
+
+    def test_set_joining_pruned_session_needs_full_replay(self):
+        rows = _synthetic_history()
+        acc = _roundtrip(_fold_progression_rows(
+            rows, timezone_name="Europe/Berlin", alias_keys=["barbell_back_squat"],
+        ))
+        late_set = _set_row(
+            rows[-1]["timestamp"] + timedelta(hours=1),
+            {"exercise_id": "barbell_back_squat", "weight_kg": 100, "reps": 5},
+            {"session_id": "s-0-0"},
+        )
+        assert acc.incremental_blocker(
+            late_set, alias_keys=["barbell_back_squat"], timezone_name="Europe/Berlin",
+        ) == "session_outside_window"
+
+    def test_incompatible_state_version_is_discarded(self):
+        _rows, acc = self._acc()
+        state = acc.to_state()
+        state["version"] = -1
+        assert _ProgressionAccumulator.from_state(state) is None
+        assert _ProgressionAccumulator.from_state(None) is None
@@ -1,8 +1,12 @@
 """Tests for Bayesian inference utility functions."""
 
+import pytest
+
 from kura_workers.inference_engine import (
+    replay_strength_inference,
     run_readiness_inference,
     run_strength_inference,
+    run_strength_inference_batch,
     weekly_phase_from_date,
 )
 
@@ -69,6 +73,72 @@ def test_strength_inference_applies_population_prior():
     assert result["population_prior"]["cohort_key"] == "tm:strength|el:intermediate"
 
 
+def test_strength_inference_conditions_on_stored_batch_pooling(monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_ENGINE", "closed_form")
+    points = [(0.0, 100.0), (7.0, 100.5), (14.0, 100.4), (21.0, 100.9)]
+    pooling = {
+        "applied": True,
+        "source": "hierarchical_batch",
+        "beta_shift": 0.5,
+        "tau_beta": 0.05,
+        "batch_size": 3,
+    }
+
+    unpooled = run_strength_inference(points)
+    pooled = run_strength_inference(points, pooling=pooling)
+
+    assert unpooled["pooling"] == {"applied": False}
+    assert pooled["pooling"] == pooling
+    assert pooled["trend"]["slope_kg_per_day"] > unpooled["trend"]["slope_kg_per_day"]
+    # Degenerate hyperparameters are ignored rather than collapsing the prior.
+    ignored = run_strength_inference(points, pooling={**pooling, "tau_beta": 0.0})
+    assert ignored == unpooled
+
+
+def test_strength_inference_batch_matches_single_series_without_pymc(monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_ENGINE", "closed_form")
+    series = {
+        "bench_press": [(0.0, 100.0), (7.0, 101.5), (14.0, 103.0), (21.0, 104.2)],
+        "squat": [(0.0, 140.0), (5.0, 141.0), (12.0, 143.5)],
+        "deadlift": [(0.0, 180.0), (7.0, 181.0)],
+    }
+    prior = {"mean": 0.2, "var": 0.01, "blend_weight": 0.4, "target_key": "squat"}
+
+    batch = run_strength_inference_batch(series, population_priors={"squat": prior})
+
+    assert list(batch) == ["bench_press", "squat", "deadlift"]
+    assert batch["bench_press"] == run_strength_inference(series["bench_press"])
+    assert batch["squat"] == run_strength_inference(series["squat"], population_prior=prior)
+    assert batch["squat"]["population_prior"]["applied"] is True
+    assert batch["deadlift"]["status"] == "insufficient_data"
+
+
+@pytest.mark.parametrize("engine", ["closed_form", "hierarchical_bayes"])
+def test_strength_replay_matches_per_prefix_inference(engine):
+    # Same-day duplicates and gaps exercise the skipped derivative samples.
+    points = [
+        (0, 100.0), (3, 101.0), (3, 100.5), (7, 103.0), (10, 102.0),
+        (17, 104.5), (17, 105.0), (24, 104.0), (31, 107.5), (45, 108.0),
+    ]
+    prior = {"mean": 0.2, "var": 0.01, "blend_weight": 0.4, "target_key": "squat"}
+
+    replayed = list(replay_strength_inference(points, population_prior=prior, engine=engine))
+
+    assert len(replayed) == len(points)
+    for i, result in enumerate(replayed):
+        assert result == run_strength_inference(
+            points[: i + 1], population_prior=prior, engine=engine
+        )
+
+
+def test_strength_replay_rejects_pymc_and_unsorted_points():
+    points = [(0.0, 100.0), (7.0, 101.0), (14.0, 102.0)]
+    with pytest.raises(ValueError):
+        list(replay_strength_inference(points, engine="pymc"))
+    with pytest.raises(ValueError):
+        list(replay_strength_inference(list(reversed(points)), engine="closed_form"))
+
+
 def test_readiness_inference_insufficient_data():
     result = run_readiness_inference([0.6, 0.55, 0.62])
     assert result["status"] == "insufficient_data"
@@ -0,0 +1,223 @@
+"""Tests for change-aware nightly refit selection."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from kura_workers.handlers import inference_nightly
+from kura_workers.handlers.inference_nightly import (
+    _enqueue_projection_updates_for_user_set,
+    _in_user_range,
+    _refit_event_types_by_user,
+    _refit_watermark_payload,
+    advance_refit_watermark,
+    handle_inference_nightly_stage,
+)
+from kura_workers.nightly_pipeline import NightlyRunProgress
+from kura_workers.inference_event_registry import (
+    NIGHTLY_REFIT_FAMILY_EVENT_TYPES,
+    NIGHTLY_REFIT_TRIGGER_EVENT_TYPES,
+)
+
+
+class _RecordingCursor:
+    def __init__(self, calls, row=None):
+        self._calls = calls
+        self._row = row
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    async def execute(self, query, params=None, **kwargs):
+        self._calls.append((query, params))
+
+    async def fetchone(self):
+        return self._row
+
+
+class _Savepoint:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _RecordingConnection:
+    def __init__(self, row=None):
+        self.calls = []
+        self.row = row
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(self.calls, self.row)
+
+    def transaction(self):
+        return _Savepoint()
+
+
+def test_refit_families_cover_nightly_trigger_event_types():
+    family_event_types = [
+        event_type
+        for event_types in NIGHTLY_REFIT_FAMILY_EVENT_TYPES.values()
+        for event_type in event_types
+    ]
+    assert len(family_event_types) == len(set(family_event_types))
+    assert set(family_event_types) == set(NIGHTLY_REFIT_TRIGGER_EVENT_TYPES)
+
+
+def test_refit_event_types_limited_to_lagging_families():
+    selected = _refit_event_types_by_user(
+        {"u1": {"recovery"}},
+        [],
+        families=NIGHTLY_REFIT_FAMILY_EVENT_TYPES,
+    )
+    assert selected == {"u1": NIGHTLY_REFIT_FAMILY_EVENT_TYPES["recovery"]}
+
+
+def test_prior_change_refits_all_families_without_new_evidence():
+    selected = _refit_event_types_by_user(
+        {"u2": {"training"}},
+        ["u1", "u2"],
+        families=NIGHTLY_REFIT_FAMILY_EVENT_TYPES,
+    )
+    assert list(selected) == ["u1", "u2"]
+    assert set(selected["u1"]) == set(NIGHTLY_REFIT_TRIGGER_EVENT_TYPES)
+    assert selected["u2"] == selected["u1"]
+
+
+def test_no_lagging_users_enqueue_nothing():
+    assert _refit_event_types_by_user({}, [], families=NIGHTLY_REFIT_FAMILY_EVENT_TYPES) == {}
+
+
+@pytest.mark.asyncio
+async def test_advance_refit_watermark_waits_for_sibling_jobs():
+    conn = _RecordingConnection()
+    at = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    watermark = _refit_watermark_payload(
+        run_id="run-1", family="training", event_id="e2", event_at=at
+    )
+    await advance_refit_watermark(
+        conn,
+        user_id="u1",
+        watermark=watermark,
+        job_type="projection.update",
+        event_type="set.logged",
+    )
+
+    assert len(conn.calls) == 1
+    query, params = conn.calls[0]
+    assert "ON CONFLICT (user_id, projection_family)" in query
+    assert "status IN ('pending', 'processing', 'failed', 'dead')" in query
+    assert params["run_id"] == "run-1"
+    assert params["family"] == "training"
+    assert params["last_event_id"] == "e2"
+    assert params["last_event_at"] == at.isoformat()
+    assert params["handler_name"] == ""
+
+
+@pytest.mark.asyncio
+async def test_batch_refit_flags_first_job_per_family(monkeypatch):
+    latest = {"session.logged": "e1", "set.corrected": "e2", "sleep.logged": "e3"}
+    enqueued = []
+
+    async def fake_latest(conn, user_id, event_type):
+        return latest.get(event_type)
+
+    async def fake_enqueue(conn, **kwargs):
+        enqueued.append((kwargs["event_type"], kwargs["extra"]))
+        return True
+
+    monkeypatch.setattr(inference_nightly, "_latest_event_id_for_type", fake_latest)
+    monkeypatch.setattr(inference_nightly, "_enqueue_projection_update_dedup", fake_enqueue)
+
+    watermark = {"run_id": "run-1", "family": "training"}
+    count = await _enqueue_projection_updates_for_user_set(
+        _RecordingConnection(),
+        user_ids=["u1"],
+        event_types=NIGHTLY_REFIT_TRIGGER_EVENT_TYPES,
+        source="inference.nightly_refit",
+        families=NIGHTLY_REFIT_FAMILY_EVENT_TYPES,
+        watermarks={"training": watermark},
+    )
+
+    assert count == 3
+    assert enqueued == [
+        ("session.logged", {"batch_refit": True, "refit_watermark": watermark}),
+        ("set.corrected", {"batch_refit": False, "refit_watermark": watermark}),
+        ("sleep.logged", {"batch_refit": True}),
+    ]
+
+
+def test_in_user_range_is_half_open():
+    low = "00000000-0000-0000-0000-000000000010"
+    high = "00000000-0000-0000-0000-000000000020"
+    assert _in_user_range(low, low, high)
+    assert not _in_user_range(high, low, high)
+    assert _in_user_range(high, None, None)
+    assert not _in_user_range("00000000-0000-0000-0000-000000000001", low, None)
+
+
+def _stage_shard(status="queued"):
+    return {
+        "run_id": "run-1",
+        "stage": "issue_clusters",
+        "shard": 0,
+        "status": status,
+        "user_id_from": None,
+        "user_id_to": None,
+    }
+
+
+@pytest.fixture
+def stage_calls(monkeypatch):
+    calls = {"completed": [], "advanced": []}
+
+    async def fake_complete_shard(conn, **kwargs):
+        calls["completed"].append(kwargs)
+
+    async def fake_advance(conn, **kwargs):
+        calls["advanced"].append(kwargs)
+        return NightlyRunProgress()
+
+    monkeypatch.setattr(inference_nightly, "complete_shard", fake_complete_shard)
+    monkeypatch.setattr(inference_nightly, "advance_nightly_run", fake_advance)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_nightly_stage_failure_is_recorded_and_run_advances(monkeypatch, stage_calls):
+    async def failing_stage(conn, shard):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(inference_nightly._NIGHTLY_STAGE_RUNNERS, "issue_clusters", failing_stage)
+    conn = _RecordingConnection(row=_stage_shard())
+
+    await handle_inference_nightly_stage(
+        conn, {"run_id": "run-1", "stage": "issue_clusters", "shard": 0, "scheduler_key": "k"}
+    )
+
+    [completed] = stage_calls["completed"]
+    assert completed["status"] == "failed"
+    assert completed["summary"] == {"status": "failed", "error": "boom"}
+    assert completed["duration_ms"] >= 0.0
+    assert stage_calls["advanced"] == [{"run_id": "run-1", "scheduler_key": "k"}]
+
+
+@pytest.mark.asyncio
+async def test_nightly_stage_skips_finished_shard(monkeypatch, stage_calls):
+    async def unexpected_stage(conn, shard):
+        raise AssertionError("finished shard must not run again")
+
+    monkeypatch.setitem(
+        inference_nightly._NIGHTLY_STAGE_RUNNERS, "issue_clusters", unexpected_stage
+    )
+    conn = _RecordingConnection(row=_stage_shard(status="completed"))
+
+    await handle_inference_nightly_stage(
+        conn, {"run_id": "run-1", "stage": "issue_clusters", "shard": 0}
+    )
+
+    assert stage_calls == {"completed": [], "advanced": []}
@@ -47,6 +47,7 @@ from kura_workers.handlers.inference_nightly import (
     handle_inference_capability_backfill,
     handle_inference_objective_backfill,
     handle_inference_nightly_refit,
+    handle_inference_nightly_stage,
 )
 from kura_workers.semantic_bootstrap import ensure_semantic_catalog
 
@@ -191,7 +192,7 @@ async def prepare_nightly_scheduler_for_test(conn) -> None:
             UPDATE background_jobs
             SET status = 'completed',
                 completed_at = NOW()
-            WHERE job_type = 'inference.nightly_refit'
+            WHERE job_type IN ('inference.nightly_refit', 'inference.nightly_stage')
               AND status IN ('pending', 'processing')
             """
         )
@@ -211,11 +212,44 @@ async def prepare_nightly_scheduler_for_test(conn) -> None:
                 in_flight_job_id = NULL,
                 in_flight_started_at = NULL,
                 last_run_status = 'idle',
+                current_run_id = NULL,
                 updated_at = NOW()
             """
         )
 
 
+async def run_nightly_refit_for_test(conn, payload) -> str:
+    """Plan a nightly run and work off its stage jobs inline, in claim order."""
+    run_id = str(uuid.uuid4())
+    await handle_inference_nightly_refit(conn, {**payload, "run_id": run_id})
+    while True:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT id, payload
+                FROM background_jobs
+                WHERE job_type = 'inference.nightly_stage'
+                  AND status = 'pending'
+                  AND payload->>'run_id' = %s
+                ORDER BY id
+                LIMIT 1
+                """,
+                (run_id,),
+            )
+            job = await cur.fetchone()
+            if job is None:
+                return run_id
+            await handle_inference_nightly_stage(conn, job["payload"])
+            await cur.execute(
+                """
+                UPDATE background_jobs
+                SET status = 'completed', completed_at = NOW()
+                WHERE id = %s
+                """,
+                (job["id"],),
+            )
+
+
 # ---------------------------------------------------------------------------
 # Body Composition
 # ---------------------------------------------------------------------------
@@ -1795,7 +1829,7 @@ class TestInferenceNightlyRefitIntegration:
             nightly_count_before = int((await cur.fetchone())["count"])
 
         await db.execute("SET ROLE app_worker")
-        await handle_inference_nightly_refit(db, {"interval_hours": 12})
+        await run_nightly_refit_for_test(db, {"interval_hours": 12})
         await db.execute("RESET ROLE")
 
         async with db.cursor(row_factory=dict_row) as cur:
@@ -1840,8 +1874,8 @@ class TestInferenceNightlyRefitIntegration:
 
         await db.execute("SET ROLE app_worker")
         await prepare_nightly_scheduler_for_test(db)
-        await handle_inference_nightly_refit(db, payload)
-        await handle_inference_nightly_refit(db, payload)
+        await run_nightly_refit_for_test(db, payload)
+        await run_nightly_refit_for_test(db, payload)
         await db.execute("RESET ROLE")
 
         async with db.cursor(row_factory=dict_row) as cur:
@@ -2104,7 +2138,7 @@ class TestInferenceNightlyRefitIntegration:
         )
 
         await db.execute("SET ROLE app_worker")
-        await handle_inference_nightly_refit(db, {"interval_hours": 24})
+        await run_nightly_refit_for_test(db, {"interval_hours": 24})
         await db.execute("RESET ROLE")
 
         async with db.cursor(row_factory=dict_row) as cur:
@@ -2223,7 +2257,7 @@ class TestInferenceNightlyRefitIntegration:
         )
 
         await db.execute("SET ROLE app_worker")
-        await handle_inference_nightly_refit(db, {"interval_hours": 24})
+        await run_nightly_refit_for_test(db, {"interval_hours": 24})
         await db.execute("RESET ROLE")
 
         async with db.cursor(row_factory=dict_row) as cur:
@@ -2391,7 +2425,7 @@ class TestInferenceNightlyRefitIntegration:
         )
 
         await db.execute("SET ROLE app_worker")
-        await handle_inference_nightly_refit(db, {"interval_hours": 24})
+        await run_nightly_refit_for_test(db, {"interval_hours": 24})
         await db.execute("RESET ROLE")
 
         async with db.cursor(row_factory=dict_row) as cur:
@@ -2432,7 +2466,7 @@ class TestInferenceNightlyRefitIntegration:
             )
 
         await db.execute("SET ROLE app_worker")
-        await handle_inference_nightly_refit(db, {"interval_hours": 24})
+        await run_nightly_refit_for_test(db, {"interval_hours": 24})
         await db.execute("RESET ROLE")
 
         async with db.cursor(row_factory=dict_row) as cur:
@@ -0,0 +1,72 @@
+"""Tests for coalescing redundant projection.update jobs in a claimed batch."""
+
+from __future__ import annotations
+
+from kura_workers.job_coalescing import coalesce_projection_updates, payload_event_ids
+
+
+def _job(job_id: int, user_id: str, event_type: str, **payload_extra) -> dict:
+    return {
+        "id": job_id,
+        "user_id": user_id,
+        "job_type": "projection.update",
+        "payload": {
+            "event_id": f"e{job_id}",
+            "event_type": event_type,
+            "user_id": user_id,
+            **payload_extra,
+        },
+        "attempt": 1,
+        "max_retries": 3,
+    }
+
+
+def test_same_user_and_event_type_collapse_onto_last_job():
+    jobs = [
+        _job(1, "a", "set.logged"),
+        _job(2, "b", "set.logged"),
+        _job(3, "a", "set.logged"),
+        _job(4, "a", "meal.logged"),
+        _job(5, "a", "set.logged"),
+    ]
+    batch = coalesce_projection_updates(jobs)
+
+    assert [job["id"] for job in batch.jobs] == [2, 4, 5]
+    assert batch.absorbed == {5: [1, 3]}
+    assert batch.jobs_saved == 2
+    survivor = batch.jobs[-1]["payload"]
+    assert survivor["event_id"] == "e5"
+    assert survivor["event_ids"] == ["e1", "e3", "e5"]
+    # Claimed job dicts are not mutated.
+    assert "event_ids" not in jobs[-1]["payload"]
+
+
+def test_retractions_rule_events_and_other_job_types_are_kept():
+    jobs = [
+        _job(1, "a", "event.retracted"),
+        _job(2, "a", "event.retracted"),
+        _job(3, "a", "projection_rule.created"),
+        _job(4, "a", "projection_rule.created"),
+        {**_job(5, "a", "set.logged"), "job_type": "projection.retry"},
+        {**_job(6, "a", "set.logged"), "job_type": "projection.retry"},
+    ]
+    batch = coalesce_projection_updates(jobs)
+    assert [job["id"] for job in batch.jobs] == [1, 2, 3, 4, 5, 6]
+    assert batch.absorbed == {}
+
+
+def test_source_separates_groups_and_prior_event_ids_are_kept():
+    jobs = [
+        _job(1, "a", "set.logged", source="inference.nightly_refit"),
+        _job(2, "a", "set.logged", event_ids=["e0", "e2"]),
+        _job(3, "a", "set.logged"),
+    ]
+    batch = coalesce_projection_updates(jobs)
+    assert [job["id"] for job in batch.jobs] == [1, 3]
+    assert batch.jobs[1]["payload"]["event_ids"] == ["e0", "e2", "e3"]
+
+
+def test_payload_event_ids_falls_back_to_single_event_id():
+    assert payload_event_ids({"event_id": "e1"}) == ["e1"]
+    assert payload_event_ids({"event_id": "e2", "event_ids": ["e1", "e2"]}) == ["e1", "e2"]
+    assert payload_event_ids({}) == []
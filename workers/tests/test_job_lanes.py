@@ -0,0 +1,151 @@
+"""Tests for per-user lane scheduling used by the concurrent worker mode."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from kura_workers.job_lanes import group_jobs_by_user, run_lanes
+from kura_workers.metrics import get_metrics, record_queue_wait, record_slot_batch
+
+
+def _job(job_id: int, user_id: str | None) -> dict:
+    return {"id": job_id, "user_id": user_id, "job_type": "projection.update"}
+
+
+class TestGroupJobsByUser:
+    def test_groups_same_user_and_preserves_claim_order(self):
+        jobs = [_job(1, "a"), _job(2, "b"), _job(3, "a"), _job(4, "c"), _job(5, "b")]
+        lanes = group_jobs_by_user(jobs)
+        assert [[j["id"] for j in lane] for lane in lanes] == [[1, 3], [2, 5], [4]]
+
+    def test_jobs_without_user_get_their_own_lane(self):
+        lanes = group_jobs_by_user([_job(1, None), _job(2, None), _job(3, "a")])
+        assert [[j["id"] for j in lane] for lane in lanes] == [[1], [2], [3]]
+
+    def test_empty(self):
+        assert group_jobs_by_user([]) == []
+
+
+def _connection_factory(opened: list[int]):
+    @asynccontextmanager
+    async def _open():
+        conn_id = len(opened)
+        opened.append(conn_id)
+        yield conn_id
+
+    return _open
+
+
+class TestRunLanes:
+    @pytest.mark.asyncio
+    async def test_same_user_serialized_different_users_parallel(self):
+        running: dict[str, int] = {}
+        max_parallel = 0
+        max_per_user: dict[str, int] = {}
+
+        async def run_job(conn, job):
+            nonlocal max_parallel
+            user = job["user_id"]
+            running[user] = running.get(user, 0) + 1
+            max_per_user[user] = max(max_per_user.get(user, 0), running[user])
+            max_parallel = max(max_parallel, sum(running.values()))
+            await asyncio.sleep(0.01)
+            running[user] -= 1
+
+        jobs = [_job(i, user) for i, user in enumerate(["a", "a", "b", "b", "c", "c"])]
+        opened: list[int] = []
+        stats = await run_lanes(
+            group_jobs_by_user(jobs),
+            slot_count=3,
+            open_connection=_connection_factory(opened),
+            run_job=run_job,
+        )
+
+        assert max_per_user == {"a": 1, "b": 1, "c": 1}
+        assert max_parallel == 3
+        assert stats.slots == 3
+        assert len(opened) == 3
+        assert len(stats.queue_wait_ms) == 6
+
+    @pytest.mark.asyncio
+    async def test_slow_lane_does_not_block_other_users(self):
+        finished: list[int] = []
+
+        async def run_job(conn, job):
+            await asyncio.sleep(0.05 if job["user_id"] == "slow" else 0.001)
+            finished.append(job["id"])
+
+        jobs = [_job(1, "slow"), _job(2, "a"), _job(3, "b"), _job(4, "c")]
+        await run_lanes(
+            group_jobs_by_user(jobs),
+            slot_count=2,
+            open_connection=_connection_factory([]),
+            run_job=run_job,
+        )
+
+        assert finished[-1] == 1
+        assert sorted(finished) == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_slot_count_capped_by_lane_count(self):
+        async def run_job(conn, job):
+            return None
+
+        opened: list[int] = []
+        stats = await run_lanes(
+            group_jobs_by_user([_job(1, "a"), _job(2, "a")]),
+            slot_count=8,
+            open_connection=_connection_factory(opened),
+            run_job=run_job,
+        )
+        assert stats.slots == 1
+        assert opened == [0]
+
+    @pytest.mark.asyncio
+    async def test_failing_slot_does_not_abort_others(self):
+        done: list[int] = []
+
+        async def run_job(conn, job):
+            if job["user_id"] == "broken":
+                raise RuntimeError("connection lost")
+            await asyncio.sleep(0.001)
+            done.append(job["id"])
+
+        jobs = [_job(1, "broken"), _job(2, "a"), _job(3, "b")]
+        stats = await run_lanes(
+            group_jobs_by_user(jobs),
+            slot_count=2,
+            open_connection=_connection_factory([]),
+            run_job=run_job,
+        )
+        assert sorted(done) == [2, 3]
+        assert len(stats.slot_busy_ms) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_lanes_open_no_connections(self):
+        opened: list[int] = []
+        stats = await run_lanes(
+            [],
+            slot_count=4,
+            open_connection=_connection_factory(opened),
+            run_job=lambda conn, job: None,
+        )
+        assert stats.slots == 0
+        assert opened == []
+        assert stats.utilization == 0.0
+
+
+def test_slot_and_queue_wait_metrics_exposed():
+    before = get_metrics()
+    record_slot_batch(slots=2, wall_ms=100.0, busy_ms=150.0)
+    record_queue_wait(40.0)
+    after = get_metrics()
+
+    assert after["slots"]["batches"] == before["slots"]["batches"] + 1
+    assert after["slots"]["capacity_ms"] >= before["slots"]["capacity_ms"] + 200.0
+    assert 0.0 < after["slots"]["utilization"] <= 1.0
+    assert after["queue_wait"]["count"] == before["queue_wait"]["count"] + 1
+    assert after["queue_wait"]["max_ms"] >= 40.0
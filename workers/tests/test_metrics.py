@@ -0,0 +1,117 @@
+"""Tests for latency histograms and the Prometheus exposition."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from kura_workers import metrics
+from kura_workers.health import start_health_server
+from kura_workers.metrics import (
+    LATENCY_BUCKETS_MS,
+    count_rows_loaded,
+    get_metrics,
+    histogram_quantile,
+    record_handler_invocation,
+    record_job_duration,
+    record_lock_contention,
+    record_queue_lag,
+    render_prometheus,
+    track_rows_loaded,
+)
+
+
+def test_histogram_memory_is_constant_and_quantiles_interpolate():
+    for value in range(1, 1001):
+        record_handler_invocation("hist_test_handler", float(value), success=True)
+
+    stats = metrics._metrics["handlers"]["hist_test_handler"]
+    assert len(stats["latency"]["buckets"]) == len(LATENCY_BUCKETS_MS) + 1
+    assert stats["latency"]["count"] == 1000
+
+    # Uniform 1..1000 ms: the true p95 is 950 ms, inside the 750–1000 bucket.
+    p95 = histogram_quantile(stats["latency"], 0.95)
+    assert 750.0 <= p95 <= 1000.0
+    assert abs(p95 - 950.0) < 50.0
+
+    snapshot = get_metrics()["handlers"]["hist_test_handler"]
+    assert snapshot["invocations"] == 1000
+    assert snapshot["p95_ms"] == pytest.approx(p95, abs=0.1)
+    assert "latency" not in snapshot
+
+
+def test_overflow_values_report_largest_finite_bound():
+    record_handler_invocation("hist_overflow_handler", 120_000.0, success=False)
+    latency = metrics._metrics["handlers"]["hist_overflow_handler"]["latency"]
+    assert histogram_quantile(latency, 0.99) == LATENCY_BUCKETS_MS[-1]
+
+
+def test_rows_loaded_are_counted_only_inside_a_tracking_scope():
+    count_rows_loaded(5)
+    with track_rows_loaded() as outer:
+        count_rows_loaded(3)
+        with track_rows_loaded() as inner:
+            count_rows_loaded(2)
+        count_rows_loaded(1)
+    assert outer[0] == 4
+    assert inner[0] == 2
+
+    record_handler_invocation("rows_test_handler", 1.0, success=True, rows_loaded=outer[0])
+    assert get_metrics()["handlers"]["rows_test_handler"]["rows_loaded"] == 4
+
+
+def test_cpu_counters_are_process_level_and_lock_contention_is_accumulated():
+    before = get_metrics()["lock_contention"]
+    record_lock_contention()
+
+    snapshot = get_metrics()
+    assert snapshot["process_cpu_seconds"] > 0
+    assert snapshot["lock_contention"] == before + 1
+    text = render_prometheus()
+    assert "kura_worker_handler_cpu_seconds_total" not in text
+    assert "kura_worker_process_cpu_seconds_total " in text
+    assert "kura_worker_compute_cpu_seconds_total " in text
+    assert f"kura_worker_lock_contention_total {before + 1}" in text
+
+
+def test_prometheus_exposition_is_cumulative_and_labelled():
+    record_handler_invocation('prom "quoted" handler', 30.0, success=True, rows_loaded=7)
+    record_job_duration("prom.test_job", 12.0)
+    record_queue_lag("prom.test_job", 2500.0)
+
+    text = render_prometheus()
+    lines = text.splitlines()
+    label = 'handler="prom \\"quoted\\" handler"'
+    buckets = [
+        line for line in lines
+        if line.startswith("kura_worker_handler_duration_seconds_bucket{" + label)
+    ]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1].endswith('le="+Inf"} 1')
+    assert f"kura_worker_handler_rows_loaded_total{{{label}}} 7" in lines
+    assert 'kura_worker_queue_lag_seconds{job_type="prom.test_job"} 2.5' in lines
+    assert 'kura_worker_job_duration_seconds_count{job_type="prom.test_job"} 1' in lines
+    assert "# TYPE kura_worker_handler_duration_seconds histogram" in lines
+    assert text.endswith("\n")
+
+
+@pytest.mark.asyncio
+async def test_health_server_serves_prometheus_metrics():
+    server = await start_health_server(0, "postgresql://unused")
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    head, _, body = response.partition("\r\n\r\n")
+    assert head.startswith("HTTP/1.1 200 OK")
+    assert "text/plain; version=0.0.4" in head
+    assert "kura_worker_uptime_seconds" in body
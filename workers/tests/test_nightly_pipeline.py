@@ -0,0 +1,121 @@
+"""Tests for the nightly maintenance stage DAG."""
+
+from datetime import datetime, timedelta, timezone
+
+from kura_workers.handlers.inference_nightly import _NIGHTLY_STAGE_RUNNERS
+from kura_workers.nightly_pipeline import (
+    NIGHTLY_STAGE_BY_NAME,
+    NIGHTLY_STAGES,
+    NightlyRunProgress,
+    nightly_run_retention_days,
+    nightly_shard_user_count,
+    ready_stages,
+    stage_rollup,
+    user_range_bounds,
+)
+
+
+def _shard(status, *, started_s=None, ended_s=None, duration_ms=None):
+    t0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    return {
+        "status": status,
+        "started_at": t0 + timedelta(seconds=started_s) if started_s is not None else None,
+        "completed_at": t0 + timedelta(seconds=ended_s) if ended_s is not None else None,
+        "duration_ms": duration_ms,
+    }
+
+
+def _rollups(**statuses):
+    return {
+        stage.name: {"status": statuses.get(stage.name, "waiting")}
+        for stage in NIGHTLY_STAGES
+    }
+
+
+def test_stage_dag_is_ordered_and_fully_runnable():
+    seen: set[str] = set()
+    for stage in NIGHTLY_STAGES:
+        assert set(stage.depends_on) <= seen
+        seen.add(stage.name)
+    assert set(_NIGHTLY_STAGE_RUNNERS) == set(NIGHTLY_STAGE_BY_NAME)
+
+
+def test_user_range_bounds_cover_the_id_space_contiguously():
+    user_ids = [f"u{i}" for i in range(5)]
+    assert user_range_bounds(user_ids, 2) == [(None, "u2"), ("u2", "u4"), ("u4", None)]
+    assert user_range_bounds(user_ids, 10) == [(None, None)]
+    assert user_range_bounds([], 3) == [(None, None)]
+
+
+def test_nightly_shard_user_count_env(monkeypatch):
+    monkeypatch.delenv("KURA_NIGHTLY_SHARD_USERS", raising=False)
+    assert nightly_shard_user_count() == 500
+    monkeypatch.setenv("KURA_NIGHTLY_SHARD_USERS", "0")
+    assert nightly_shard_user_count() == 1
+    monkeypatch.setenv("KURA_NIGHTLY_SHARD_USERS", "abc")
+    assert nightly_shard_user_count() == 500
+
+
+def test_nightly_run_retention_days_env(monkeypatch):
+    monkeypatch.delenv("KURA_NIGHTLY_RUN_RETENTION_DAYS", raising=False)
+    assert nightly_run_retention_days() == 14
+    monkeypatch.setenv("KURA_NIGHTLY_RUN_RETENTION_DAYS", "0")
+    assert nightly_run_retention_days() == 1
+    monkeypatch.setenv("KURA_NIGHTLY_RUN_RETENTION_DAYS", "soon")
+    assert nightly_run_retention_days() == 14
+
+
+def test_stage_rollup_status_and_durations():
+    assert stage_rollup([_shard("waiting"), _shard("waiting")])["status"] == "waiting"
+    assert stage_rollup([_shard("completed", started_s=0, ended_s=1), _shard("queued")])[
+        "status"
+    ] == "running"
+
+    rollup = stage_rollup(
+        [
+            _shard("completed", started_s=0, ended_s=2, duration_ms=2000.0),
+            _shard("failed", started_s=1, ended_s=5, duration_ms=4000.0),
+        ]
+    )
+    assert rollup == {
+        "status": "failed",
+        "shards": 2,
+        "shards_completed": 1,
+        "shards_failed": 1,
+        "duration_ms": 6000.0,
+        "wall_ms": 5000.0,
+    }
+
+
+def test_ready_stages_wait_for_all_dependencies():
+    assert ready_stages(_rollups()) == [
+        "population_priors",
+        "issue_clusters",
+        "extraction_calibration",
+        "unknown_dimensions",
+        "consistency_inbox",
+    ]
+
+    partial = _rollups(
+        population_priors="completed",
+        issue_clusters="completed",
+        extraction_calibration="running",
+        unknown_dimensions="failed",
+        consistency_inbox="running",
+    )
+    assert ready_stages(partial) == ["refit_enqueue"]
+
+    # Failed dependencies still release their dependents, like the old
+    # per-stage try/except of the single nightly job.
+    partial["extraction_calibration"] = {"status": "completed"}
+    assert ready_stages(partial) == ["refit_enqueue", "learning_backlog"]
+
+
+def test_run_progress_finished_and_failed_stages():
+    progress = NightlyRunProgress(
+        stages={"a": {"status": "completed"}, "b": {"status": "failed"}}
+    )
+    assert progress.finished
+    assert progress.failed_stages == ["b"]
+    assert not NightlyRunProgress().finished
+    assert not NightlyRunProgress(stages={"a": {"status": "running"}}).finished
@@ -1,21 +1,82 @@
 """Unit tests for population prior aggregation logic."""
 
+import math
+from datetime import UTC, datetime
+
 from kura_workers.population_priors import (
     CAUSAL_OUTCOME_STRENGTH_PER_EXERCISE,
     STRENGTH_FALLBACK_TARGET_KEY,
+    CohortStats,
     _bool_from_any,
     _build_causal_lookup_targets,
     _build_causal_prior_rows,
     _build_readiness_prior_rows,
     _build_strength_prior_rows,
+    _changed_cohort_keys,
     _cohort_key_from_user_profile,
+    _diff_prior_rows,
+    _drifted_prior_keys,
+    _prior_identity,
+    _prior_row_signature,
     _quality_health_status_from_projection,
+    _stale_contributors,
+    _users_affected_by_cohorts,
     _weighted_stats,
     build_causal_estimand_target_key,
     population_prior_blend_weight,
+    users_affected_by_prior_change,
 )
 
 
+def _profile(training_modality, experience_level):
+    return {
+        "user": {
+            "profile": {
+                "training_modality": training_modality,
+                "experience_level": experience_level,
+            }
+        }
+    }
+
+
+class _RangeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+        self._rows = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql, params=None):
+        self._conn.calls.append((sql, params))
+        if "FROM event_retractions" in sql:
+            self._rows = []
+        elif "preference.set" in sql:
+            self._rows = [
+                {"id": "e1", "user_id": "u1", "timestamp": None, "data": {"value": True}},
+                {"id": "e2", "user_id": "u2", "timestamp": None, "data": {"value": True}},
+            ]
+        else:
+            self._rows = [
+                {"user_id": "u1", "data": _profile("strength", "advanced")},
+                {"user_id": "u2", "data": _profile("endurance", "beginner")},
+            ]
+
+    async def fetchall(self):
+        return self._rows
+
+
+class _RangeConn:
+    def __init__(self):
+        self.calls = []
+
+    def cursor(self, *args, **kwargs):
+        return _RangeCursor(self)
+
+
 def test_bool_from_any_parses_common_values():
     assert _bool_from_any(True) is True
     assert _bool_from_any(False) is False
@@ -256,3 +317,190 @@ def test_build_causal_prior_rows():
 def test_population_prior_blend_weight_clamped(monkeypatch):
     monkeypatch.setenv("KURA_POPULATION_PRIOR_BLEND_WEIGHT", "1.5")
     assert population_prior_blend_weight() == 0.95
+
+
+def _prior_row(cohort_key, mean):
+    return {
+        "projection_type": "strength_inference",
+        "target_key": "bench_press",
+        "cohort_key": cohort_key,
+        "prior_payload": {"mean": mean, "var": 0.1},
+        "participants_count": 5,
+        "sample_size": 5,
+        "min_cohort_size": 3,
+        "source_window_days": 180,
+    }
+
+
+def test_changed_cohort_keys_detects_added_removed_and_updated_priors():
+    unchanged = _prior_row("tm:strength|el:beginner|om:unknown", 0.1)
+    updated = _prior_row("tm:strength|el:advanced|om:unknown", 0.2)
+    removed = _prior_row("tm:endurance|el:unknown|om:unknown", 0.3)
+    previous = {
+        (row["projection_type"], row["target_key"], row["cohort_key"]): _prior_row_signature(row)
+        for row in (unchanged, updated, removed)
+    }
+    added = _prior_row("tm:hybrid|el:unknown|om:unknown", 0.4)
+
+    changed = _changed_cohort_keys(
+        previous,
+        [unchanged, {**updated, "prior_payload": {"mean": 0.25, "var": 0.1}}, added],
+    )
+
+    assert changed == {
+        "tm:strength|el:advanced|om:unknown",
+        "tm:endurance|el:unknown|om:unknown",
+        "tm:hybrid|el:unknown|om:unknown",
+    }
+
+
+def test_users_affected_by_cohorts_follows_lookup_variants():
+    cohort_by_user = {
+        "u1": "tm:strength|el:advanced|om:coach",
+        "u2": "tm:endurance|el:beginner|om:journal",
+    }
+    assert _users_affected_by_cohorts(cohort_by_user, set()) == []
+    assert _users_affected_by_cohorts(cohort_by_user, {"tm:strength|el:advanced"}) == ["u1"]
+    assert _users_affected_by_cohorts(
+        cohort_by_user, {"tm:endurance|el:beginner|om:journal"}
+    ) == ["u2"]
+    assert _users_affected_by_cohorts(cohort_by_user, {"tm:unknown|el:unknown"}) == ["u1", "u2"]
+
+
+async def test_users_affected_by_prior_change_resolves_one_user_range():
+    conn = _RangeConn()
+    assert await users_affected_by_prior_change(conn, []) == []
+    assert conn.calls == []
+
+    affected = await users_affected_by_prior_change(
+        conn,
+        [_cohort_key_from_user_profile(_profile("strength", "advanced"))],
+        user_id_from="00000000-0000-0000-0000-000000000001",
+        user_id_to="00000000-0000-0000-0000-000000000009",
+    )
+    assert affected == ["u1"]
+    sql, params = conn.calls[1]
+    assert "preference.set" in sql
+    assert params[1:] == (
+        "00000000-0000-0000-0000-000000000001",
+        "00000000-0000-0000-0000-000000000001",
+        "00000000-0000-0000-0000-000000000009",
+        "00000000-0000-0000-0000-000000000009",
+    )
+
+
+def test_cohort_stats_merge_matches_weighted_stats_over_all_samples():
+    values = [0.4, 0.9, -0.2, 1.3, 0.7, 0.05]
+    weights = [0.8, 0.1, 0.5, 0.9, 0.0, 0.6]
+    per_user = [
+        CohortStats.from_samples(values[:2], weights[:2]),
+        CohortStats.from_samples(values[2:3], weights[2:3]),
+        CohortStats.from_samples(values[3:], weights[3:]),
+    ]
+    merged = per_user[0].merge(per_user[1]).merge(per_user[2])
+
+    mean, var = merged.mean_var()
+    expected_mean, expected_var = _weighted_stats(values, weights)
+    assert math.isclose(mean, expected_mean, rel_tol=1e-12)
+    assert math.isclose(var, expected_var, rel_tol=1e-12)
+    assert merged.participants == 3
+    assert merged.sample_size == 6
+    assert (merged.min_value, merged.max_value) == (-0.2, 1.3)
+
+
+def test_cohort_stats_all_zero_weights_fall_back_to_equal_weights():
+    values = [1.0, 2.0, 4.0]
+    merged = CohortStats.from_samples(values[:1], [0.0]).merge(
+        CohortStats.from_samples(values[1:], [0.0, 0.0])
+    )
+    mean, var = merged.mean_var()
+    expected_mean, expected_var = _weighted_stats(values, [0.0, 0.0, 0.0])
+    assert math.isclose(mean, expected_mean, rel_tol=1e-12)
+    assert math.isclose(var, expected_var, rel_tol=1e-12)
+
+
+def test_stale_contributors_recomputes_only_changed_users_and_drops_ineligible():
+    seen_at = datetime(2026, 3, 1, 8, 0, tzinfo=UTC)
+    cohort = "tm:strength|el:advanced|om:coach"
+    states = {
+        "unchanged": (cohort, 3, seen_at, 180),
+        "updated": (cohort, 3, seen_at, 180),
+        "moved_cohort": (cohort, 2, seen_at, 180),
+        "emptied": (cohort, 1, seen_at, 180),
+        "opted_out": (cohort, 4, seen_at, 180),
+    }
+    fingerprints = {
+        "unchanged": (3, seen_at),
+        "updated": (3, datetime(2026, 3, 2, 8, 0, tzinfo=UTC)),
+        "moved_cohort": (2, seen_at),
+        "new_user": (1, seen_at),
+    }
+    cohort_by_user = {
+        "unchanged": cohort,
+        "updated": cohort,
+        "moved_cohort": "tm:endurance|el:beginner|om:journal",
+        "emptied": cohort,
+        "new_user": cohort,
+        "never_logged": cohort,
+    }
+
+    recompute, dropped = _stale_contributors(
+        ["emptied", "moved_cohort", "never_logged", "new_user", "unchanged", "updated"],
+        cohort_by_user,
+        fingerprints,
+        states,
+        window_days=180,
+    )
+
+    assert sorted(recompute) == ["emptied", "moved_cohort", "new_user", "updated"]
+    assert recompute["emptied"] == (cohort, 0, None, 180)
+    assert recompute["moved_cohort"][0] == "tm:endurance|el:beginner|om:journal"
+    assert dropped == ["opted_out"]
+
+
+def test_stale_contributors_recomputes_everyone_when_window_changes():
+    seen_at = datetime(2026, 3, 1, 8, 0, tzinfo=UTC)
+    recompute, dropped = _stale_contributors(
+        ["u1"],
+        {"u1": "tm:unknown|el:unknown|om:unknown"},
+        {"u1": (2, seen_at)},
+        {"u1": ("tm:unknown|el:unknown|om:unknown", 2, seen_at, 180)},
+        window_days=90,
+    )
+    assert list(recompute) == ["u1"]
+    assert dropped == []
+
+
+def test_diff_prior_rows_upserts_changed_rows_and_deletes_missing_ones():
+    unchanged = _prior_row("tm:strength|el:beginner|om:unknown", 0.1)
+    updated = _prior_row("tm:strength|el:advanced|om:unknown", 0.2)
+    removed = _prior_row("tm:endurance|el:unknown|om:unknown", 0.3)
+    previous = {
+        (row["projection_type"], row["target_key"], row["cohort_key"]): _prior_row_signature(row)
+        for row in (unchanged, updated, removed)
+    }
+    changed_row = {**updated, "sample_size": 6}
+
+    upserts, deletes = _diff_prior_rows(previous, [unchanged, changed_row])
+
+    assert upserts == [changed_row]
+    assert deletes == [
+        (removed["projection_type"], removed["target_key"], removed["cohort_key"])
+    ]
+
+
+def test_drifted_prior_keys_flags_priors_whose_contributions_changed():
+    kept = _prior_row("tm:strength|el:beginner|om:unknown", 0.1)
+    shrunk = _prior_row("tm:strength|el:advanced|om:unknown", 0.2)
+    orphaned = _prior_row("tm:endurance|el:unknown|om:unknown", 0.3)
+    existing = {
+        (row["projection_type"], row["target_key"], row["cohort_key"]): _prior_row_signature(row)
+        for row in (kept, shrunk, orphaned)
+    }
+
+    drifted = _drifted_prior_keys(
+        existing,
+        {_prior_identity(kept): (5, 5), _prior_identity(shrunk): (4, 4)},
+    )
+
+    assert drifted == {_prior_identity(shrunk), _prior_identity(orphaned)}
@@ -0,0 +1,309 @@
+"""Tests for the process-local PyMC runtime caches (model, posterior, warm start)."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from kura_workers import pymc_runtime
+from kura_workers.inference_engine import run_strength_inference, run_strength_inference_batch
+from kura_workers.pymc_runtime import (
+    HierarchicalStrengthPosterior,
+    StrengthPosterior,
+    get_pymc_runtime_stats,
+    group_bucket,
+    posterior_cache_key,
+    reset_pymc_runtime,
+    sample_hierarchical_strength_posterior,
+    sample_strength_posterior,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_runtime():
+    reset_pymc_runtime()
+    yield
+    reset_pymc_runtime()
+
+
+@pytest.fixture
+def fake_sampler(monkeypatch):
+    """Replace PyMC compile/sample with deterministic fakes and record calls."""
+    calls: list[dict] = []
+    compiled = object()
+
+    def _compiled():
+        hit = bool(calls)
+        pymc_runtime._stats["model_hits" if hit else "model_misses"] += 1
+        return compiled, hit, 0.0 if hit else 12.5
+
+    def _sample(model, x_centered, y, *, alpha_mu, beta_mu, beta_sigma, warm_state):
+        calls.append({"warm_state": warm_state, "n": len(y), "beta_mu": beta_mu})
+        rng = np.random.default_rng(len(calls))
+        posterior = StrengthPosterior(
+            alpha=alpha_mu + rng.normal(0.0, 0.5, 1200),
+            beta=beta_mu + rng.normal(0.1, 0.02, 1200),
+            sigma=np.abs(rng.normal(2.0, 0.1, 1200)),
+            rhat=1.001,
+            ess=900.0,
+            step_size=0.42,
+        )
+        return posterior, 200 if warm_state else 600
+
+    monkeypatch.setattr(pymc_runtime, "_compiled_strength_model", _compiled)
+    monkeypatch.setattr(pymc_runtime, "_sample_compiled", _sample)
+    return calls
+
+
+@pytest.fixture
+def fake_hierarchical_sampler(monkeypatch):
+    """Fake the hierarchical compile/sample pair; draws follow each group's data."""
+    calls: list[dict] = []
+
+    def _compiled(groups):
+        hit = any(call["groups"] == groups for call in calls)
+        pymc_runtime._stats["model_hits" if hit else "model_misses"] += 1
+        return object(), hit, 0.0 if hit else 40.0
+
+    def _sample(model, x_centered, y, group_index, *, alpha_mu, beta_mu, beta_sigma, warm_state):
+        groups = len(alpha_mu)
+        calls.append({"groups": groups, "warm_state": warm_state, "n": len(y)})
+        rng = np.random.default_rng(len(calls))
+        slopes = np.array(
+            [
+                np.polyfit(x_centered[group_index == g], y[group_index == g], 1)[0]
+                if np.count_nonzero(group_index == g) >= 2
+                else 0.0
+                for g in range(groups)
+            ]
+        )
+        draws = 1200
+        posterior = HierarchicalStrengthPosterior(
+            alpha=alpha_mu + rng.normal(0.0, 0.5, (draws, groups)),
+            beta=slopes + rng.normal(0.0, 0.01, (draws, groups)),
+            sigma=np.abs(rng.normal(2.0, 0.1, (draws, groups))),
+            beta_offset=rng.normal(0.0, 1.0, (draws, groups)),
+            beta_shift=rng.normal(0.0, 0.05, draws),
+            tau_beta=np.abs(rng.normal(0.3, 0.05, draws)),
+            sigma_scale=np.abs(rng.normal(3.0, 0.2, draws)),
+            rhat=1.002,
+            ess=750.0,
+            step_size=0.31,
+        )
+        return posterior, 200 if warm_state else 600
+
+    monkeypatch.setattr(pymc_runtime, "_compiled_hierarchical_model", _compiled)
+    monkeypatch.setattr(pymc_runtime, "_sample_hierarchical_compiled", _sample)
+    return calls
+
+
+def _series(n: int) -> tuple[np.ndarray, np.ndarray]:
+    x = np.arange(n, dtype=float) * 3.0
+    y = 100.0 + 0.2 * x
+    return x - x.mean(), y
+
+
+def test_unchanged_series_is_served_from_posterior_cache(fake_sampler):
+    x, y = _series(6)
+    first, runtime_first = sample_strength_posterior(x, y, beta_mu=0.0, beta_sigma=2.0)
+    second, runtime_second = sample_strength_posterior(x, y, beta_mu=0.0, beta_sigma=2.0)
+
+    assert len(fake_sampler) == 1
+    assert second is first
+    assert runtime_first["posterior_cache"] == "miss"
+    assert runtime_first["model_cache"] == "miss"
+    assert runtime_first["compile_ms"] > 0.0
+    assert runtime_second["posterior_cache"] == "hit"
+    assert runtime_second["cache_stats"]["posterior_hit_rate"] == 0.5
+
+
+def test_refit_of_same_series_warm_starts(fake_sampler):
+    x, y = _series(6)
+    sample_strength_posterior(x, y, beta_mu=0.0, beta_sigma=2.0, series_key="u1:bench")
+    x2, y2 = _series(7)
+    _, runtime = sample_strength_posterior(x2, y2, beta_mu=0.0, beta_sigma=2.0, series_key="u1:bench")
+    _, other = sample_strength_posterior(x2, y2 + 1.0, beta_mu=0.0, beta_sigma=2.0, series_key="u1:squat")
+
+    assert fake_sampler[0]["warm_state"] is None
+    warm = fake_sampler[1]["warm_state"]
+    assert warm is not None
+    assert warm["step_size"] == pytest.approx(0.42)
+    assert set(warm["mean"]) == {"alpha", "beta", "sigma_log__"}
+    assert all(value > 0.0 for value in warm["var"].values())
+    assert runtime["warm_start"] is True
+    assert runtime["tune"] == 200
+    assert runtime["model_cache"] == "hit"
+    assert other["warm_start"] is False
+
+    stats = get_pymc_runtime_stats()
+    assert stats["warm_starts"] == 1
+    assert stats["cold_starts"] == 2
+    assert stats["model_hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_posterior_cache_key_covers_data_and_priors():
+    x, y = _series(5)
+    base = posterior_cache_key(x, y, alpha_mu=1.0, beta_mu=0.0, beta_sigma=2.0)
+    assert base == posterior_cache_key(x.copy(), y.copy(), alpha_mu=1.0, beta_mu=0.0, beta_sigma=2.0)
+    assert base != posterior_cache_key(x, y + 0.01, alpha_mu=1.0, beta_mu=0.0, beta_sigma=2.0)
+    assert base != posterior_cache_key(x, y, alpha_mu=1.0, beta_mu=0.1, beta_sigma=2.0)
+    assert base != posterior_cache_key(x, y, alpha_mu=1.0, beta_mu=0.0, beta_sigma=1.5)
+
+
+def test_posterior_cache_is_bounded(fake_sampler, monkeypatch):
+    monkeypatch.setenv("KURA_PYMC_CACHE_SIZE", "2")
+    for n in (4, 5, 6):
+        x, y = _series(n)
+        sample_strength_posterior(x, y, beta_mu=0.0, beta_sigma=2.0)
+    assert get_pymc_runtime_stats()["posterior_cache_entries"] == 2
+
+    x, y = _series(4)
+    _, runtime = sample_strength_posterior(x, y, beta_mu=0.0, beta_sigma=2.0)
+    assert runtime["posterior_cache"] == "miss"
+
+
+def test_strength_inference_reports_runtime_telemetry(fake_sampler, monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_ENGINE", "pymc")
+    points = [(0.0, 100.0), (7.0, 101.5), (14.0, 103.0), (21.0, 104.2)]
+
+    first = run_strength_inference(points, series_key="u1:bench")
+    second = run_strength_inference(points, series_key="u1:bench")
+
+    assert first["engine"] == "pymc"
+    assert first["runtime"]["posterior_cache"] == "miss"
+    assert second["runtime"]["posterior_cache"] == "hit"
+    assert second["trend"] == first["trend"]
+    assert "runtime" not in first["diagnostics"]
+
+
+def _batch_series() -> dict[str, list[tuple[float, float]]]:
+    return {
+        "bench_press": [(0.0, 100.0), (7.0, 101.4), (14.0, 102.9), (21.0, 104.1)],
+        "squat": [(0.0, 140.0), (4.0, 140.2), (9.0, 140.1), (15.0, 140.4), (20.0, 140.3)],
+        "deadlift": [(0.0, 180.0), (7.0, 181.0)],
+    }
+
+
+def test_batch_fits_all_eligible_exercises_in_one_sampler_run(fake_hierarchical_sampler, monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_ENGINE", "pymc")
+    results = run_strength_inference_batch(_batch_series(), series_key="u1")
+
+    assert len(fake_hierarchical_sampler) == 1
+    assert fake_hierarchical_sampler[0]["groups"] == 2
+    assert fake_hierarchical_sampler[0]["n"] == 9
+    assert results["deadlift"]["status"] == "insufficient_data"
+
+    bench = results["bench_press"]
+    squat = results["squat"]
+    assert bench["engine"] == squat["engine"] == "hierarchical_bayes_mcmc"
+    assert bench["diagnostics"]["hierarchical"] is True
+    assert bench["diagnostics"]["batch_size"] == 2
+    assert "runtime" not in bench["diagnostics"]
+    assert bench["runtime"]["model_key"] == "strength_hierarchical.v1"
+    # Draws are split back per exercise.
+    assert bench["trend"]["slope_kg_per_day"] == pytest.approx(0.195, abs=0.02)
+    assert squat["trend"]["slope_kg_per_day"] == pytest.approx(0.014, abs=0.02)
+    assert bench["estimated_1rm"]["mean"] > 100.0
+    assert squat["estimated_1rm"]["mean"] > 139.0
+    assert bench["dynamics"]["model_velocity_per_day"] == bench["trend"]["slope_kg_per_day"]
+    assert bench["pooling"]["applied"] is True
+    assert bench["pooling"]["batch_size"] == 2
+    assert results["deadlift"]["pooling"] == {"applied": False}
+
+
+def test_batch_refit_warm_starts_and_caches_unchanged_batches(fake_hierarchical_sampler, monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_ENGINE", "pymc")
+    series = _batch_series()
+    run_strength_inference_batch(series, series_key="u1")
+    repeat = run_strength_inference_batch(series, series_key="u1")
+    assert repeat["bench_press"]["runtime"]["posterior_cache"] == "hit"
+    assert len(fake_hierarchical_sampler) == 1
+
+    series["squat"] = series["squat"] + [(27.0, 140.6)]
+    refit = run_strength_inference_batch(series, series_key="u1")
+    warm = fake_hierarchical_sampler[1]["warm_state"]
+    assert warm is not None
+    assert len(warm["mean"]["alpha"]) == 2
+    assert set(warm["mean"]) == {
+        "alpha",
+        "beta_shift",
+        "tau_beta_log__",
+        "beta_offset",
+        "sigma_scale_log__",
+        "sigma_log__",
+    }
+    assert refit["squat"]["runtime"]["warm_start"] is True
+    assert refit["squat"]["runtime"]["model_cache"] == "hit"
+
+
+def test_group_bucket_pads_to_few_sizes():
+    assert [group_bucket(k) for k in (1, 2, 3, 4, 5, 9, 64, 65, 130)] == [
+        2, 2, 4, 4, 8, 16, 64, 128, 192,
+    ]
+
+
+def test_hierarchical_fit_runs_on_padded_bucket(fake_hierarchical_sampler):
+    series = [_series(n) for n in (4, 5, 6)]
+    x = np.concatenate([part[0] for part in series])
+    y = np.concatenate([part[1] + 10.0 * g for g, part in enumerate(series)])
+    group_index = np.concatenate(
+        [np.full(len(part[0]), g, dtype=np.int64) for g, part in enumerate(series)]
+    )
+    posterior, runtime = sample_hierarchical_strength_posterior(
+        x,
+        y,
+        group_index,
+        alpha_mu=np.full(3, 100.0),
+        beta_mu=np.zeros(3),
+        beta_sigma=np.full(3, 2.0),
+        series_key="u1",
+    )
+
+    assert fake_hierarchical_sampler[0]["groups"] == 4
+    assert runtime["groups"] == 3
+    assert runtime["group_bucket"] == 4
+    assert posterior.alpha.shape == posterior.beta.shape == (1200, 3)
+    assert posterior.beta_shift.shape == (1200,)
+    stats = get_pymc_runtime_stats()
+    assert stats["hierarchical_posterior_cache_entries"] == 1
+    assert stats["posterior_cache_entries"] == 0
+
+
+def test_compiled_models_are_bounded(monkeypatch):
+    monkeypatch.setenv("KURA_PYMC_MODEL_CACHE_SIZE", "2")
+    monkeypatch.setattr(pymc_runtime, "_build_hierarchical_model", lambda groups: object())
+    for groups in (2, 4, 8):
+        pymc_runtime._compiled_hierarchical_model(groups)
+    assert get_pymc_runtime_stats()["compiled_model_entries"] == 2
+    _, hit, _ = pymc_runtime._compiled_hierarchical_model(2)
+    assert hit is False
+
+
+def test_batch_falls_back_per_exercise_when_hierarchical_fit_fails(fake_sampler, monkeypatch):
+    monkeypatch.setenv("KURA_BAYES_ENGINE", "pymc")
+
+    def _broken(*args, **kwargs):
+        raise RuntimeError("divergent")
+
+    monkeypatch.setattr(pymc_runtime, "sample_hierarchical_strength_posterior", _broken)
+    results = run_strength_inference_batch(_batch_series(), series_key="u1")
+
+    assert results["bench_press"]["engine"] == "pymc"
+    assert results["squat"]["engine"] == "pymc"
+    assert len(fake_sampler) == 2
+
+
+def test_hierarchical_cache_key_covers_grouping(fake_hierarchical_sampler):
+    x = np.array([-1.0, 0.0, 1.0, -1.0, 0.0, 1.0])
+    y = np.array([100.0, 101.0, 102.0, 140.0, 140.5, 141.0])
+    priors = {
+        "alpha_mu": np.array([101.0, 140.5]),
+        "beta_mu": np.zeros(2),
+        "beta_sigma": np.full(2, 2.0),
+    }
+    sample_hierarchical_strength_posterior(x, y, np.array([0, 0, 0, 1, 1, 1]), **priors)
+    _, runtime = sample_hierarchical_strength_posterior(
+        x, y, np.array([0, 0, 1, 1, 1, 1]), **priors
+    )
+    assert runtime["posterior_cache"] == "miss"
+    assert runtime["groups"] == 2
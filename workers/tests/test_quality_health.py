@@ -2,6 +2,9 @@
 
 from datetime import datetime, timezone
 
+import pytest
+
+from kura_workers.handlers import quality_health
 from kura_workers.handlers.quality_health import (
     _autonomy_policy_from_slos,
     _auto_apply_decision,
@@ -11,6 +14,7 @@ from kura_workers.handlers.quality_health import (
     _compute_integrity_slos,
     _compute_quality_score,
     _compute_response_mode_outcomes,
+    _evaluate_invariants_offloaded,
     _evaluate_read_only_invariants,
     _generate_repair_proposals,
     _simulate_repair_proposals,
@@ -34,6 +38,25 @@ def _event_row(
     return row
 
 
+async def test_timed_out_invariant_scan_is_skipped_not_rerun_inline(monkeypatch):
+    async def _timed_out(fn, /, *args, fallback=None, **kwargs):
+        return fallback()
+
+    monkeypatch.setattr(quality_health, "run_compute", _timed_out)
+    monkeypatch.setattr(
+        quality_health,
+        "_evaluate_read_only_invariants",
+        lambda *args, **kwargs: pytest.fail("scan must not re-run inline"),
+    )
+    result = await _evaluate_invariants_offloaded(
+        [_row("set.logged", {"exercise": "squat", "reps": 5})],
+        {},
+        import_job_rows=[],
+        raw_event_rows=[],
+    )
+    assert result is None
+
+
 class TestEvaluateReadOnlyInvariants:
     def test_detects_unresolved_set_identity(self):
         rows = [
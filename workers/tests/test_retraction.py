@@ -12,6 +12,7 @@ Retraction design:
 
 import os
 import uuid
+from datetime import datetime, timezone
 
 import psycopg
 import pytest
@@ -27,6 +28,7 @@ from kura_workers.handlers.router import handle_projection_update
 from kura_workers.handlers.training_plan import update_training_plan
 from kura_workers.handlers.training_timeline import update_training_timeline
 from kura_workers.handlers.user_profile import update_user_profile
+from kura_workers.utils import get_retracted_event_ids
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="DATABASE_URL not set")
@@ -99,6 +101,47 @@ async def get_projection(conn, user_id, projection_type, key="overview"):
         return await cur.fetchone()
 
 
+# ---------------------------------------------------------------------------
+# Retraction side table
+# ---------------------------------------------------------------------------
+
+
+class TestEventRetractionsTable:
+    async def test_retraction_insert_populates_side_table(self, db, test_user_id):
+        """event.retracted inserts are mirrored into event_retractions in the same transaction."""
+        await create_test_user(db, test_user_id)
+        ev1 = await insert_event(db, test_user_id, "bodyweight.logged", {"weight_kg": 82.5})
+        await retract_event(db, test_user_id, ev1, "bodyweight.logged",
+                            "TIMESTAMP '2026-02-03 08:00:00+01'")
+        # Retracting twice keeps the first retraction.
+        await retract_event(db, test_user_id, ev1, "bodyweight.logged",
+                            "TIMESTAMP '2026-02-04 08:00:00+01'")
+
+        async with db.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                "SELECT user_id::text AS user_id, retracted_at FROM event_retractions "
+                "WHERE retracted_event_id = %s",
+                (ev1,),
+            )
+            rows = await cur.fetchall()
+        assert len(rows) == 1
+        assert rows[0]["user_id"] == test_user_id
+        assert rows[0]["retracted_at"] == datetime(2026, 2, 3, 7, 0, tzinfo=timezone.utc)
+
+        await db.execute("SET ROLE app_worker")
+        assert await get_retracted_event_ids(db, test_user_id) == {ev1}
+        await db.execute("RESET ROLE")
+
+    async def test_malformed_retraction_target_is_ignored(self, db, test_user_id):
+        """A non-UUID target must not fail the event write."""
+        await create_test_user(db, test_user_id)
+        await retract_event(db, test_user_id, "not-a-uuid")
+
+        await db.execute("SET ROLE app_worker")
+        assert await get_retracted_event_ids(db, test_user_id) == set()
+        await db.execute("RESET ROLE")
+
+
 # ---------------------------------------------------------------------------
 # Body Composition Retraction
 # ---------------------------------------------------------------------------
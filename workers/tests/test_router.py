@@ -277,6 +277,38 @@ class TestHandleProjectionUpdate:
         handler_b.assert_awaited_once()
 
 
+    @pytest.mark.asyncio
+    async def test_refit_watermark_advances_only_when_handlers_succeed(self, mock_conn):
+        """Nightly refit jobs move their family watermark on success only."""
+        watermark = {"run_id": "run-1", "family": "training"}
+        payload = {
+            "event_type": "set.logged",
+            "user_id": "user-1",
+            "event_id": "evt-1",
+            "refit_watermark": watermark,
+        }
+        ok = AsyncMock()
+        ok.__name__ = "ok_handler"
+        broken = AsyncMock(side_effect=RuntimeError("boom"))
+        broken.__name__ = "broken_handler"
+
+        with patch(
+            "kura_workers.handlers.router.advance_refit_watermark", new_callable=AsyncMock
+        ) as advance, _no_custom_rules():
+            with patch("kura_workers.handlers.router.get_projection_handlers", return_value=[ok]):
+                await handle_projection_update(mock_conn, payload)
+            advance.assert_awaited_once()
+            assert advance.call_args.kwargs["watermark"] == watermark
+            assert advance.call_args.kwargs["job_type"] == "projection.update"
+
+            advance.reset_mock()
+            with patch(
+                "kura_workers.handlers.router.get_projection_handlers", return_value=[ok, broken]
+            ):
+                await handle_projection_update(mock_conn, payload)
+            advance.assert_not_awaited()
+
+
 class TestResolveRetraction:
     @pytest.mark.asyncio
     async def test_retraction_event_lookup_is_user_scoped(self):
@@ -364,6 +396,27 @@ class TestHandleProjectionRetry:
         assert lock_call.args[1] == ("user-42",)
 
 
+    @pytest.mark.asyncio
+    async def test_successful_retry_advances_refit_watermark(self, mock_conn):
+        """A succeeded retry of a nightly refit handler advances the watermark."""
+        handler = AsyncMock()
+        watermark = {"run_id": "run-1", "family": "training"}
+        payload = {
+            "handler_name": "update_strength_inference",
+            "event_type": "set.logged",
+            "user_id": "user-1",
+            "refit_watermark": watermark,
+        }
+
+        with patch("kura_workers.handlers.router.get_projection_handler_by_name", return_value=handler), \
+             patch("kura_workers.handlers.router.advance_refit_watermark", new_callable=AsyncMock) as advance:
+            await handle_projection_retry(mock_conn, payload)
+
+        advance.assert_awaited_once()
+        assert advance.call_args.kwargs["job_type"] == "projection.retry"
+        assert advance.call_args.kwargs["handler_name"] == "update_strength_inference"
+
+
 class TestConcurrencySafety:
     """Verify that pg_try_advisory_xact_lock serializes concurrent handler execution.
 
@@ -0,0 +1,159 @@
+"""Tests for the content-hashed semantic catalog bootstrap."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from kura_workers import semantic_bootstrap
+from kura_workers.embeddings import EmbeddingProvider
+from kura_workers.semantic_bootstrap import (
+    catalog_content_hash,
+    embedding_content_hash,
+    ensure_semantic_catalog,
+)
+from kura_workers.semantic_catalog import CatalogEntry, all_catalog_entries
+
+
+class _Cursor:
+    def __init__(self, conn: "_CatalogConn") -> None:
+        self._conn = conn
+        self._rows: list[dict] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql: str, params=None) -> None:
+        conn = self._conn
+        conn.statements.append(sql)
+        if "FROM semantic_catalog_state" in sql:
+            stored = conn.catalog_hash.get(params[0])
+            self._rows = [{"catalog_hash": stored}] if stored else []
+        elif "FROM information_schema.columns" in sql:
+            self._rows = []
+        elif "INSERT INTO semantic_catalog " in sql:
+            domains, keys = params[0], params[1]
+            self._rows = [
+                {"id": f"id-{domain}-{key}", "domain": domain, "canonical_key": key}
+                for domain, key in zip(domains, keys)
+            ]
+        elif "FROM semantic_catalog_embeddings" in sql:
+            self._rows = [
+                {"catalog_id": catalog_id, "content_hash": content_hash}
+                for catalog_id, content_hash in conn.embedding_hashes.items()
+            ]
+        elif "INSERT INTO semantic_catalog_state" in sql:
+            model, catalog_hash, _ = params
+            conn.catalog_hash[model] = catalog_hash
+
+    async def executemany(self, sql: str, params_seq) -> None:
+        conn = self._conn
+        conn.statements.append(sql)
+        params_seq = list(params_seq)
+        conn.batches.append(len(params_seq))
+        if "INSERT INTO semantic_catalog_embeddings" in sql:
+            for params in params_seq:
+                conn.embedding_hashes[params[0]] = params[-1]
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    async def fetchall(self):
+        return list(self._rows)
+
+
+class _CatalogConn:
+    def __init__(self) -> None:
+        self.catalog_hash: dict[str, str] = {}
+        self.embedding_hashes: dict[str, str | None] = {}
+        self.statements: list[str] = []
+        self.batches: list[int] = []
+
+    def cursor(self, *args, **kwargs):
+        return _Cursor(self)
+
+
+class _CountingProvider(EmbeddingProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.embedded: list[str] = []
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return super().embed_many(texts)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.delenv("KURA_EMBEDDING_PROVIDER", raising=False)
+    monkeypatch.delenv("KURA_EMBEDDING_DIMENSIONS", raising=False)
+    instance = _CountingProvider()
+    with patch.object(semantic_bootstrap, "get_embedding_provider", return_value=instance):
+        yield instance
+
+
+def test_catalog_hash_tracks_entries_and_provider():
+    entries = all_catalog_entries()
+    descriptor = {"provider": "hashing", "model": "m", "dimensions": 384}
+
+    assert catalog_content_hash(entries, descriptor) == catalog_content_hash(entries, dict(descriptor))
+    assert catalog_content_hash(entries, descriptor) != catalog_content_hash(
+        entries, {**descriptor, "dimensions": 256}
+    )
+    changed = (CatalogEntry("food", "oats", "Oats", ("oatmeal",)),) + entries[1:]
+    assert catalog_content_hash(entries, descriptor) != catalog_content_hash(changed, descriptor)
+    assert embedding_content_hash("a", descriptor) != embedding_content_hash("b", descriptor)
+
+
+async def test_second_bootstrap_is_a_single_lookup(provider):
+    conn = _CatalogConn()
+
+    await ensure_semantic_catalog(conn)
+    assert len(provider.embedded) == len(all_catalog_entries())
+    # Variants and embeddings go out as one batch each.
+    assert len(conn.batches) == 2
+
+    conn.statements.clear()
+    provider.embedded.clear()
+    await ensure_semantic_catalog(conn)
+
+    assert provider.embedded == []
+    assert len(conn.statements) == 1
+    assert "semantic_catalog_state" in conn.statements[0]
+
+
+async def test_changed_catalog_re_embeds_only_changed_entries(provider):
+    conn = _CatalogConn()
+    await ensure_semantic_catalog(conn)
+
+    entries = all_catalog_entries()
+    first = entries[0]
+    edited = CatalogEntry(
+        first.domain,
+        first.canonical_key,
+        first.canonical_label,
+        (*first.variants, "hocke"),
+        first.metadata,
+    )
+    provider.embedded.clear()
+    with patch.object(
+        semantic_bootstrap, "all_catalog_entries", return_value=(edited, *entries[1:])
+    ):
+        await ensure_semantic_catalog(conn)
+
+    assert provider.embedded == [", ".join((edited.canonical_label, *edited.variants))]
+
+
+async def test_fallback_embeddings_are_not_recorded_as_current(provider, monkeypatch):
+    monkeypatch.setattr(provider, "provider", "openai")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    conn = _CatalogConn()
+
+    await ensure_semantic_catalog(conn)
+
+    assert conn.catalog_hash == {}
+    assert set(conn.embedding_hashes.values()) == {None}
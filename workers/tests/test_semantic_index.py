@@ -0,0 +1,193 @@
+"""Tests for the vectorized semantic catalog index."""
+
+from __future__ import annotations
+
+import random
+
+import psycopg
+
+from kura_workers.embeddings import encode_embedding, get_embedding_provider
+from kura_workers.handlers.semantic_memory import _best_matches
+from kura_workers.semantic_catalog import all_catalog_entries
+from kura_workers.semantic_index import (
+    CatalogIndex,
+    best_match_reference,
+    cached_catalog_index,
+    invalidate_catalog_indexes,
+    pgvector_best_matches,
+    store_catalog_index,
+)
+
+
+def _catalog(vectors: list[list[float]]) -> list[dict]:
+    return [
+        {"canonical_key": f"key_{idx}", "canonical_label": f"Label {idx}", "embedding": vec}
+        for idx, vec in enumerate(vectors)
+    ]
+
+
+def _random_vec(rng: random.Random, dims: int) -> list[float]:
+    return [rng.gauss(0.0, 1.0) for _ in range(dims)]
+
+
+def test_matches_reference_on_random_catalog():
+    rng = random.Random(7)
+    catalog = _catalog([_random_vec(rng, 32) for _ in range(200)])
+    terms = [_random_vec(rng, 32) for _ in range(50)]
+    # Terms that sit exactly on (scaled) catalog rows.
+    terms += [[v * 3.0 for v in catalog[idx]["embedding"]] for idx in (0, 17, 199)]
+
+    index = CatalogIndex.build(catalog)
+
+    assert index.best_matches(terms) == [best_match_reference(t, catalog) for t in terms]
+
+
+def test_matches_reference_on_seed_catalog():
+    provider = get_embedding_provider()
+    entries = [entry for entry in all_catalog_entries() if entry.domain == "exercise"]
+    vectors = provider.embed_many([", ".join((e.canonical_label, *e.variants)) for e in entries])
+    catalog = [
+        {"canonical_key": e.canonical_key, "canonical_label": e.canonical_label, "embedding": vec}
+        for e, vec in zip(entries, vectors)
+    ]
+    terms = provider.embed_many(["bankdrücken", "squat", "kniebeuge", "deadlift", "xyz"])
+
+    index = CatalogIndex.build(catalog)
+
+    assert index.best_matches(terms) == [best_match_reference(t, catalog) for t in terms]
+
+
+def test_duplicate_rows_keep_first_row_tie_break():
+    catalog = _catalog([[1.0, 0.0], [0.0, 1.0], [0.0, 2.0], [1.0, 0.0]])
+
+    index = CatalogIndex.build(catalog)
+
+    assert index.best_matches([[0.0, 1.0], [5.0, 0.0]]) == [
+        ("key_1", "Label 1", 1.0),
+        ("key_0", "Label 0", 1.0),
+    ]
+
+
+def test_zero_and_foreign_dimension_rows_score_zero():
+    catalog = _catalog([[-1.0, 0.0], [0.0, 0.0], [1.0, 0.0, 0.0], [-1.0, -1.0]])
+    terms = [[1.0, 0.0], [0.0, 0.0], [1.0, 2.0, 3.0], [-1.0, 0.0]]
+
+    index = CatalogIndex.build(catalog)
+
+    assert index.best_matches(terms) == [best_match_reference(t, catalog) for t in terms]
+    # Every real row scores negative, so the first zero-scoring row wins.
+    assert index.best_matches([[1.0, 0.0]]) == [("key_1", "Label 1", 0.0)]
+
+
+def test_empty_catalog_has_no_matches():
+    assert CatalogIndex.build([]).best_matches([[1.0, 0.0]]) == [None]
+
+
+def test_cache_is_keyed_by_version():
+    invalidate_catalog_indexes()
+    index = CatalogIndex.build(_catalog([[1.0, 0.0]]), version=(1, "t1"))
+    store_catalog_index("exercise", "m", index)
+
+    assert cached_catalog_index("exercise", "m", (1, "t1")) is index
+    assert cached_catalog_index("exercise", "m", (2, "t2")) is None
+    assert cached_catalog_index("food", "m", (1, "t1")) is None
+
+    invalidate_catalog_indexes()
+    assert cached_catalog_index("exercise", "m", (1, "t1")) is None
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConn") -> None:
+        self._conn = conn
+        self._rows: list = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql: str, params=None, **kwargs) -> None:
+        self._conn.queries.append(sql)
+        if "<=>" in sql:
+            if self._conn.pgvector_error is not None:
+                raise self._conn.pgvector_error
+            self._rows = self._conn.neighbour_rows
+        elif "COUNT(*)" in sql:
+            self._rows = [(len(self._conn.catalog), "t1", "t1")]
+        else:
+            self._rows = self._conn.catalog
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    async def fetchall(self):
+        return list(self._rows)
+
+
+class _FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeConn:
+    def __init__(self, catalog: list[dict], neighbour_rows: list | None = None) -> None:
+        self.catalog = catalog
+        self.neighbour_rows = neighbour_rows or []
+        self.pgvector_error: Exception | None = None
+        self.queries: list[str] = []
+
+    def cursor(self, *args, **kwargs):
+        return _FakeCursor(self)
+
+    def transaction(self):
+        return _FakeTransaction()
+
+
+async def test_pgvector_mode_rescores_shortlist_per_term():
+    neighbours = [
+        (1, "bench_press", "Bench Press", None, [0.6, 0.8]),
+        (1, "squat", "Squat", encode_embedding([1.0, 0.0]), None),
+        (2, "squat", "Squat", None, [1.0, 0.0]),
+        (2, "back_squat", "Back Squat", encode_embedding([2.0, 0.0]), None),
+    ]
+    conn = _FakeConn([], neighbours)
+
+    matches = await pgvector_best_matches(
+        conn, "exercise", "m", [[1.0, 0.1], [1.0, 0.0], [0.0, 1.0]], shortlist=2,
+    )
+
+    assert matches[0][0] == "squat"
+    # Exact ties go to the smaller canonical key.
+    assert matches[1] == ("back_squat", "Back Squat", 1.0)
+    # A short shortlist (here: none) is left for the caller to resolve.
+    assert matches[2] is None
+    assert "hnsw.ef_search" in conn.queries[0]
+
+
+async def test_short_pgvector_shortlist_is_matched_in_process():
+    invalidate_catalog_indexes()
+    catalog = _catalog([[1.0, 0.0], [0.0, 1.0]])
+    # The filtered HNSW scan returned one row where five were asked for.
+    conn = _FakeConn(catalog, [(1, "key_0", "Label 0", None, [1.0, 0.0])])
+
+    matches = await _best_matches(conn, "exercise", "m", [[0.0, 2.0]], use_pgvector=True)
+
+    assert matches == [("key_1", "Label 1", 1.0)]
+    invalidate_catalog_indexes()
+
+
+async def test_pgvector_failure_falls_back_to_in_process_index():
+    invalidate_catalog_indexes()
+    catalog = _catalog([[1.0, 0.0], [0.0, 1.0]])
+    conn = _FakeConn(catalog)
+    conn.pgvector_error = psycopg.errors.UndefinedFunction("operator does not exist: vector <=> vector")
+
+    matches = await _best_matches(conn, "exercise", "m", [[0.0, 2.0]], use_pgvector=True)
+
+    assert matches == [("key_1", "Label 1", 1.0)]
+    assert any("<=>" in sql for sql in conn.queries)
+    invalidate_catalog_indexes()
@@ -0,0 +1,130 @@
+"""Tests for streaming global analytics scans (server-side cursors)."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from kura_workers.utils import (
+    ANALYTICS_FETCH_SIZE_DEFAULT,
+    PerUserCappedBuckets,
+    analytics_fetch_size,
+    iter_server_rows,
+)
+
+
+class _NamedCursor:
+    def __init__(self, rows: list[dict], calls: list[tuple]) -> None:
+        self._rows = rows
+        self._calls = calls
+        self.itersize = 100
+
+    async def __aenter__(self) -> "_NamedCursor":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._calls.append(("closed",))
+        return False
+
+    async def execute(self, query: str, params=None, **kwargs) -> None:
+        self._calls.append(("execute", params, self.itersize))
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield row
+
+
+class _Conn:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.calls: list[tuple] = []
+        self.cursor_kwargs: list[dict] = []
+
+    def cursor(self, **kwargs) -> _NamedCursor:
+        self.cursor_kwargs.append(kwargs)
+        return _NamedCursor(self.rows, self.calls)
+
+
+def test_analytics_fetch_size_reads_env_with_fallback(monkeypatch) -> None:
+    monkeypatch.delenv("KURA_ANALYTICS_FETCH_SIZE", raising=False)
+    assert analytics_fetch_size() == ANALYTICS_FETCH_SIZE_DEFAULT
+    monkeypatch.setenv("KURA_ANALYTICS_FETCH_SIZE", "250")
+    assert analytics_fetch_size() == 250
+    monkeypatch.setenv("KURA_ANALYTICS_FETCH_SIZE", "0")
+    assert analytics_fetch_size() == 1
+    monkeypatch.setenv("KURA_ANALYTICS_FETCH_SIZE", "lots")
+    assert analytics_fetch_size() == ANALYTICS_FETCH_SIZE_DEFAULT
+
+
+@pytest.mark.asyncio
+async def test_iter_server_rows_uses_named_cursor_with_bounded_fetch_size(monkeypatch) -> None:
+    monkeypatch.setenv("KURA_ANALYTICS_FETCH_SIZE", "50")
+    conn = _Conn([{"event_id": "a"}, {"event_id": "b"}])
+
+    rows = [
+        row
+        async for row in iter_server_rows(conn, "SELECT 1", (7,), name="scan_test")
+    ]
+
+    assert rows == [{"event_id": "a"}, {"event_id": "b"}]
+    assert conn.cursor_kwargs[0]["name"] == "scan_test"
+    assert conn.calls[0] == ("execute", (7,), 50)
+    assert conn.calls[-1] == ("closed",)
+
+
+@pytest.mark.asyncio
+async def test_iter_server_rows_explicit_fetch_size_wins(monkeypatch) -> None:
+    monkeypatch.setenv("KURA_ANALYTICS_FETCH_SIZE", "50")
+    conn = _Conn([])
+
+    rows = [
+        row
+        async for row in iter_server_rows(conn, "SELECT 1", name="scan_test", fetch_size=5)
+    ]
+
+    assert rows == []
+    assert conn.calls[0] == ("execute", None, 5)
+
+
+def _sort_then_cap(samples: list[tuple[str, int, str]], cap: int) -> tuple[list, int]:
+    per_user: dict[str, int] = {}
+    kept = []
+    dropped = 0
+    for sample in sorted(samples, key=lambda item: (item[1], item[2])):
+        count = per_user.get(sample[0], 0)
+        if count >= cap:
+            dropped += 1
+            continue
+        per_user[sample[0]] = count + 1
+        kept.append(sample)
+    return kept, dropped
+
+
+def test_per_user_capped_buckets_match_sort_then_cap_for_any_arrival_order() -> None:
+    rng = random.Random(7)
+    samples = [
+        (f"u{rng.randrange(4)}", rng.randrange(40), f"e{index}")
+        for index in range(120)
+    ]
+    expected = {
+        group: _sort_then_cap([s for s in samples if s[1] % 3 == group], cap=3)
+        for group in range(3)
+    }
+
+    rng.shuffle(samples)
+    buckets: PerUserCappedBuckets[tuple[str, int, str]] = PerUserCappedBuckets(
+        max_per_user=3,
+        sort_key=lambda item: (item[1], item[2]),
+        user_key=lambda item: item[0],
+    )
+    for sample in samples:
+        buckets.add(sample[1] % 3, sample)
+
+    assert buckets.groups() == [0, 1, 2]
+    for group in range(3):
+        kept, dropped = buckets.capped(group)
+        assert (kept, dropped) == expected[group]
@@ -0,0 +1,167 @@
+"""Tests for Worker batch processing on top of the shared connection pool."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from kura_workers.config import Config
+from kura_workers.db_pool import configure_worker_connection
+from kura_workers.metrics import get_metrics, set_pool_stats_source
+from kura_workers.worker import Worker
+
+
+class _FakePool:
+    def __init__(self) -> None:
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+
+    @asynccontextmanager
+    async def connection(self):
+        self.checked_out += 1
+        self.checkouts += 1
+        self.max_checked_out = max(self.max_checked_out, self.checked_out)
+        conn = AsyncMock()
+        conn.cursor = MagicMock(return_value=AsyncMock())
+        try:
+            yield conn
+        finally:
+            self.checked_out -= 1
+
+
+def _worker(concurrency: int = 1) -> tuple[Worker, _FakePool]:
+    worker = Worker(
+        Config(
+            database_url="postgresql://x",
+            listen_database_url="postgresql://x",
+            concurrency=concurrency,
+        )
+    )
+    pool = _FakePool()
+    worker._pool = pool  # type: ignore[assignment]
+    return worker, pool
+
+
+def _jobs(*users: str) -> list[dict]:
+    return [
+        {"id": i, "user_id": u, "job_type": "projection.update", "payload": {}}
+        for i, u in enumerate(users)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_configure_sets_role_once_per_connection():
+    conn = AsyncMock()
+    await configure_worker_connection(conn)
+    conn.execute.assert_awaited_once_with("SET ROLE app_worker")
+    conn.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_sequential_batch_uses_single_pooled_connection():
+    worker, pool = _worker()
+    with patch("kura_workers.worker.ensure_nightly_inference_scheduler", new_callable=AsyncMock), \
+         patch("kura_workers.worker.ensure_log_retention_job", new_callable=AsyncMock), \
+         patch.object(worker, "_claim_jobs", AsyncMock(return_value=_jobs("a", "b"))), \
+         patch.object(worker, "_process_job", AsyncMock()) as process_job:
+        await worker._process_batch()
+
+    assert process_job.await_count == 2
+    assert pool.checkouts == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batch_releases_claim_connection_before_slots():
+    worker, pool = _worker(concurrency=2)
+
+    async def _slow_job(conn, job):
+        await asyncio.sleep(0.01)
+
+    with patch("kura_workers.worker.ensure_nightly_inference_scheduler", new_callable=AsyncMock), \
+         patch("kura_workers.worker.ensure_log_retention_job", new_callable=AsyncMock), \
+         patch.object(worker, "_claim_jobs", AsyncMock(return_value=_jobs("a", "b", "a"))), \
+         patch.object(worker, "_process_job", AsyncMock(side_effect=_slow_job)) as process_job:
+        await worker._process_batch()
+
+    assert process_job.await_count == 3
+    assert pool.checkouts == 3  # claim + two slots
+    assert pool.max_checked_out == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_tick_throttled_to_poll_interval():
+    worker, _ = _worker()
+    with patch(
+        "kura_workers.worker.ensure_nightly_inference_scheduler", new_callable=AsyncMock
+    ) as nightly, \
+         patch("kura_workers.worker.ensure_log_retention_job", new_callable=AsyncMock), \
+         patch.object(worker, "_claim_jobs", AsyncMock(return_value=[])):
+        await worker._process_batch()
+        await worker._process_batch()
+        await worker._process_batch()
+
+    assert nightly.await_count == 1
+
+
+def test_pool_stats_exported_with_metrics():
+    set_pool_stats_source(lambda: {"pool_size": 3, "pool_available": 2})
+    try:
+        assert get_metrics()["db_pool"] == {"pool_size": 3, "pool_available": 2}
+    finally:
+        set_pool_stats_source(None)
+    assert get_metrics()["db_pool"] == {}
+
+
+def _event_jobs(*specs: tuple[str, str]) -> list[dict]:
+    return [
+        {
+            "id": i,
+            "user_id": user_id,
+            "job_type": "projection.update",
+            "payload": {"event_id": f"e{i}", "event_type": event_type, "user_id": user_id},
+            "attempt": 1,
+            "max_retries": 3,
+        }
+        for i, (user_id, event_type) in enumerate(specs)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_claimed_batch_coalesces_projection_updates():
+    worker, _ = _worker()
+    claimed = _event_jobs(("a", "set.logged"), ("a", "set.logged"), ("b", "set.logged"))
+    before = get_metrics()["coalescing"]
+    with patch("kura_workers.worker.ensure_nightly_inference_scheduler", new_callable=AsyncMock), \
+         patch("kura_workers.worker.ensure_log_retention_job", new_callable=AsyncMock), \
+         patch("kura_workers.worker.get_projection_handlers", return_value=[object()] * 4), \
+         patch.object(worker, "_claim_jobs", AsyncMock(return_value=claimed)), \
+         patch.object(worker, "_process_job", AsyncMock()) as process_job:
+        await worker._process_batch()
+
+    dispatched = [call.args[1] for call in process_job.await_args_list]
+    assert [job["id"] for job in dispatched] == [1, 2]
+    assert dispatched[0]["payload"]["event_ids"] == ["e0", "e1"]
+
+    after = get_metrics()["coalescing"]
+    assert after["jobs"] - before["jobs"] == 1
+    assert after["handler_invocations_saved"] - before["handler_invocations_saved"] == 4
+
+
+@pytest.mark.asyncio
+async def test_process_job_records_job_type_latency():
+    worker, _ = _worker()
+    conn = AsyncMock()
+    conn.transaction = MagicMock(return_value=AsyncMock())
+    handler = AsyncMock()
+    with patch("kura_workers.worker.get_handler", return_value=handler):
+        await worker._process_job(
+            conn,
+            {"id": 7, "job_type": "latency.test", "payload": {}, "attempt": 1, "max_retries": 3},
+        )
+
+    handler.assert_awaited_once()
+    assert get_metrics()["job_types"]["latency.test"]["count"] == 1
@@ -33,3 +33,50 @@ def test_config_from_env_honors_dedicated_listen_url(
     cfg = Config.from_env()
     assert cfg.database_url == "postgresql://app@db/runtime"
     assert cfg.listen_database_url == "postgresql://app@db/direct"
+
+
+def test_config_from_env_concurrency_defaults_to_sequential(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("DATABASE_URL", "postgresql://app@db/runtime")
+    monkeypatch.delenv("KURA_WORKER_CONCURRENCY", raising=False)
+    assert Config.from_env().concurrency == 1
+
+    monkeypatch.setenv("KURA_WORKER_CONCURRENCY", "4")
+    assert Config.from_env().concurrency == 4
+
+    monkeypatch.setenv("KURA_WORKER_CONCURRENCY", "0")
+    assert Config.from_env().concurrency == 1
+
+
+def test_config_from_env_pool_sizes(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", "postgresql://app@db/runtime")
+    monkeypatch.delenv("KURA_DB_POOL_MIN_SIZE", raising=False)
+    monkeypatch.delenv("KURA_DB_POOL_MAX_SIZE", raising=False)
+    monkeypatch.setenv("KURA_WORKER_CONCURRENCY", "4")
+
+    cfg = Config.from_env()
+    assert cfg.db_pool_min_size == 1
+    assert cfg.db_pool_max_size == 8
+
+    monkeypatch.setenv("KURA_DB_POOL_MIN_SIZE", "6")
+    monkeypatch.setenv("KURA_DB_POOL_MAX_SIZE", "3")
+    cfg = Config.from_env()
+    assert cfg.db_pool_min_size == 6
+    assert cfg.db_pool_max_size == 6
+
+
+def test_config_from_env_compute_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DATABASE_URL", "postgresql://app@db/runtime")
+    monkeypatch.delenv("KURA_COMPUTE_WORKERS", raising=False)
+    monkeypatch.delenv("KURA_COMPUTE_TIMEOUT", raising=False)
+
+    cfg = Config.from_env()
+    assert cfg.compute_workers == 1
+    assert cfg.compute_timeout_seconds == 120.0
+
+    monkeypatch.setenv("KURA_COMPUTE_WORKERS", "-2")
+    monkeypatch.setenv("KURA_COMPUTE_TIMEOUT", "30")
+    cfg = Config.from_env()
+    assert cfg.compute_workers == 0
+    assert cfg.compute_timeout_seconds == 30.0